@@ -0,0 +1,109 @@
+"""
+Benchmark budowania i walidacji drzewa pozycji kontraktu.
+
+    PYTHONPATH=src python -m benchmarks.cost_node_tree
+    PYTHONPATH=src python -m benchmarks.cost_node_tree --sizes 1000 10000 100000 --repeat 5
+
+Dla każdego rozmiaru mierzy trzy kształty drzewa:
+- wide     – ROOT + płaska lista pozycji (głębokość 1)
+- balanced – każdy węzeł ma `--branching` dzieci (głębokość ~log n)
+- chain    – łańcuch rodzic -> dziecko (głębokość n)
+
+Czas na węzeł powinien być w przybliżeniu stały przy rosnącym n i głębokości.
+"""
+import argparse
+import time
+from decimal import Decimal
+from typing import Callable
+from uuid import uuid4
+
+from contract_costs.builders.cost_node_tree_builder import DefaultCostNodeTreeBuilder
+from contract_costs.model.cost_node import CostNodeInput
+from contract_costs.services.contracts.validators.cost_node_tree_validator import (
+    CostNodeEntityValidator,
+)
+
+SHAPES = ("wide", "balanced", "chain")
+
+
+def make_tree_input(count: int, shape: str, branching: int = 8) -> CostNodeInput:
+    """ROOT + (count - 1) pozycji; budowane iteracyjnie (chain bez rekurencji)"""
+    def item(i: int) -> CostNodeInput:
+        return {
+            "code": f"N{i:06d}",
+            "name": f"Pozycja {i}",
+            "budget": Decimal(i % 1000),
+            "quantity": None,
+            "unit": None,
+            "is_active": True,
+            "children": [],
+        }
+
+    root: CostNodeInput = {**item(0), "code": "ROOT", "name": "Contract root"}
+    created = [root]
+
+    for i in range(1, count):
+        if shape == "wide":
+            parent = root
+        elif shape == "chain":
+            parent = created[-1]
+        else:
+            parent = created[(i - 1) // branching]
+        node = item(i)
+        parent["children"].append(node)
+        created.append(node)
+
+    return root
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(sizes: list[int], repeat: int, branching: int) -> list[dict]:
+    builder = DefaultCostNodeTreeBuilder()
+    validator = CostNodeEntityValidator()
+    contract_id = uuid4()
+    rows = []
+
+    for count in sizes:
+        for shape in SHAPES:
+            tree = make_tree_input(count, shape, branching)
+
+            build_s, nodes = best_of(repeat, lambda: builder.build(contract_id, [tree]))
+            validate_s, _ = best_of(repeat, lambda: validator.validate(nodes))
+
+            rows.append({
+                "nodes": count,
+                "shape": shape,
+                "build_ms": build_s * 1000,
+                "validate_ms": validate_s * 1000,
+                "us_per_node": (build_s + validate_s) / count * 1_000_000,
+            })
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--branching", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'shape':<9} {'build ms':>10} {'validate ms':>12} {'us/node':>8}")
+    for row in run(args.sizes, args.repeat, args.branching):
+        print(
+            f"{row['nodes']:>8} {row['shape']:<9} {row['build_ms']:>10.1f} "
+            f"{row['validate_ms']:>12.1f} {row['us_per_node']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""
+Deterministyczny generator danych do benchmarków.
+
+Ten sam (scale, seed) daje zawsze te same firmy, kontrakty, drzewa pozycji,
+faktury i linie (łącznie z UUID) – wyniki z różnych commitów są porównywalne.
+"""
+import random
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+from contract_costs.model.amount import Amount, TaxTreatment, VatRate
+from contract_costs.model.company import Address, BankAccount, Company, CompanyType, Contact
+from contract_costs.model.contract import Contract, ContractStatus
+from contract_costs.model.cost_node import CostNode, CostNodeInput
+from contract_costs.model.cost_type import CostType
+from contract_costs.model.invoice import Invoice, InvoiceStatus, PaymentMethod, PaymentStatus
+from contract_costs.model.invoice_line import InvoiceLine
+from contract_costs.model.unit_of_measure import UnitOfMeasure
+from contract_costs.services.invoices.commands.invoice_command import InvoiceCommand
+from contract_costs.services.invoices.dto.common import (
+    InvoiceExcelBatch,
+    InvoiceLineUpdate,
+    InvoiceUpdate,
+)
+from contract_costs.services.invoices.dto.export.company_export import CompanyExport
+from contract_costs.services.invoices.dto.parse import CompanyInput
+
+DEFAULT_SEED = 20240101
+START_DATE = date(2024, 1, 1)
+
+COST_TYPE_CODES = ("MATERIAL", "SERVICE", "SUBCONTRACTOR", "LABOR", "EQUIPMENT", "TRANSPORT", "OTHER")
+CITIES = ("Kraków", "Warszawa", "Gdańsk", "Poznań", "Wrocław", "Katowice", "Lublin")
+WORDS = ("Bud", "Max", "Stal", "Eko", "Trans", "Dach", "Beton", "Inwest", "Tech", "Pol")
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    companies: int
+    contracts: int
+    nodes_per_contract: int
+    branching: int
+    invoices: int
+    lines_per_invoice: int
+    # rozmiary scenariuszy
+    evaluate_inputs: int
+    parse_files: int
+    excel_invoices: int
+    structure_changes: int
+
+
+SCALES: dict[str, Scale] = {
+    s.name: s for s in (
+        Scale("tiny", 20, 2, 40, 4, 40, 3, 20, 5, 10, 4),
+        Scale("small", 200, 5, 300, 6, 1_000, 4, 200, 50, 100, 20),
+        Scale("medium", 1_000, 20, 1_000, 8, 5_000, 5, 500, 100, 500, 50),
+        Scale("large", 5_000, 50, 3_000, 10, 20_000, 6, 1_000, 200, 2_000, 150),
+    )
+}
+
+
+@dataclass
+class SyntheticDataset:
+    scale: Scale
+    seed: int
+    owner: Company
+    client: Company
+    suppliers: list[Company]
+    cost_types: list[CostType]
+    contracts: list[Contract]
+    cost_nodes: dict[UUID, list[CostNode]]
+    invoices: list[Invoice]
+    invoice_lines: list[InvoiceLine]
+    # wejścia scenariuszy
+    company_inputs: list[CompanyInput] = field(default_factory=list)
+
+    @property
+    def companies(self) -> list[Company]:
+        return [self.owner, self.client, *self.suppliers]
+
+    def leaves(self, contract_id: UUID) -> list[CostNode]:
+        parents = {n.parent_id for n in self.cost_nodes[contract_id]}
+        return [n for n in self.cost_nodes[contract_id] if n.id not in parents]
+
+
+def generate(scale: Scale | str, seed: int = DEFAULT_SEED) -> SyntheticDataset:
+    scale = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed)
+
+    tax_numbers = iter(rng.sample(range(1_000_000_000, 10_000_000_000), scale.companies + 2))
+    owner = _company(rng, next(tax_numbers), CompanyType.OWN, "Właściciel")
+    client = _company(rng, next(tax_numbers), CompanyType.CLIENT, "Inwestor")
+    suppliers = [
+        _company(rng, next(tax_numbers), CompanyType.SUPPLIER, f"Dostawca {i}")
+        for i in range(scale.companies)
+    ]
+
+    cost_types = [
+        CostType(id=_uuid(rng), code=code, name=code.title(), description=None)
+        for code in COST_TYPE_CODES
+    ]
+
+    contracts = [
+        Contract(
+            id=_uuid(rng),
+            code=f"K{i:03d}",
+            name=f"Kontrakt {i}",
+            owner=owner,
+            client=client,
+            description=None,
+            start_date=START_DATE,
+            end_date=START_DATE + timedelta(days=365),
+            budget=Decimal(rng.randint(1_000_000, 50_000_000)),
+            path=Path(f"contracts/K{i:03d}"),
+            status=ContractStatus.ACTIVE,
+        )
+        for i in range(scale.contracts)
+    ]
+    cost_nodes = {c.id: _cost_nodes(rng, c, scale) for c in contracts}
+
+    dataset = SyntheticDataset(
+        scale=scale,
+        seed=seed,
+        owner=owner,
+        client=client,
+        suppliers=suppliers,
+        cost_types=cost_types,
+        contracts=contracts,
+        cost_nodes=cost_nodes,
+        invoices=[],
+        invoice_lines=[],
+    )
+    _invoices(rng, dataset)
+    dataset.company_inputs = _company_inputs(rng, dataset)
+    return dataset
+
+
+# ---------- wejścia scenariuszy ----------
+
+def excel_batch(dataset: SyntheticDataset) -> InvoiceExcelBatch:
+    """
+    Arkusz przypisań: pierwsze `excel_invoices` faktur NEW, każda linia
+    przypisana do kontraktu / liścia / rodzaju kosztu (po kodach, jak w Excelu).
+    """
+    rng = random.Random(dataset.seed + 1)
+    companies = {c.id: c for c in dataset.companies}
+    new_invoices = [i for i in dataset.invoices if i.status == InvoiceStatus.NEW]
+    selected = new_invoices[:dataset.scale.excel_invoices]
+    selected_ids = {i.id for i in selected}
+    numbers = {i.id: i.invoice_number for i in selected}
+    leaves = {c.id: dataset.leaves(c.id) for c in dataset.contracts}
+
+    invoices = [
+        InvoiceUpdate(
+            command=InvoiceCommand.APPLY,
+            invoice_number=i.invoice_number,
+            old_invoice_number=None,
+            invoice_date=i.invoice_date,
+            selling_date=i.selling_date,
+            buyer_tax_number=companies[i.buyer_id].tax_number,
+            seller_tax_number=companies[i.seller_id].tax_number,
+            payment_method=i.payment_method,
+            due_date=i.due_date,
+            payment_status=i.payment_status,
+            status=InvoiceStatus.IN_PROGRESS,
+        )
+        for i in selected
+    ]
+
+    lines = []
+    for line in dataset.invoice_lines:
+        if line.invoice_id not in selected_ids:
+            continue
+        contract = rng.choice(dataset.contracts)
+        lines.append(InvoiceLineUpdate(
+            invoice_line_id=line.id,
+            invoice_number=numbers[line.invoice_id],
+            item_name=line.item_name,
+            description=line.description,
+            quantity=line.quantity,
+            unit=line.unit,
+            amount=line.amount,
+            contract_id=contract.code,
+            cost_node_id=rng.choice(leaves[contract.id]).code,
+            cost_type_id=rng.choice(dataset.cost_types).code,
+        ))
+
+    sellers = {i.seller_id for i in selected}
+    return InvoiceExcelBatch(
+        invoices=invoices,
+        lines=lines,
+        buyers=[_export(dataset.owner)],
+        sellers=[_export(companies[s]) for s in sorted(sellers)],
+    )
+
+
+def parse_results(dataset: SyntheticDataset) -> list[dict]:
+    """
+    Dane dla FakeInvoiceParser: numer faktury, sprzedawca i linie per plik
+    (nabywca = właściciel, więc każdy plik to faktura kosztowa).
+    """
+    rng = random.Random(dataset.seed + 2)
+    return [
+        {
+            "invoice_number": f"PDF/{i:05d}/2024",
+            "invoice_date": START_DATE + timedelta(days=rng.randrange(365)),
+            "buyer": _company_input(dataset.owner),
+            "seller": _company_input(rng.choice(dataset.suppliers)),
+            "amounts": [_money(rng) for _ in range(dataset.scale.lines_per_invoice)],
+        }
+        for i in range(dataset.scale.parse_files)
+    ]
+
+
+def changed_structure(
+    dataset: SyntheticDataset,
+    contract: Contract,
+    changes: int,
+) -> list[CostNodeInput]:
+    """
+    Drzewo kontraktu z `changes` zmianami: zmiana nazwy, przeniesienie
+    węzła pod inny węzeł, nowa pozycja, usunięcie liścia bez kosztów
+    (ani w historii, ani w arkuszu excel_batch – ścieżka SAFE go przepuści).
+    """
+    rng = random.Random(dataset.seed + 3)
+    nodes = [replace(n) for n in dataset.cost_nodes[contract.id]]
+    leaf_ids = {n.id for n in dataset.leaves(contract.id)}
+    inner = [n for n in nodes if n.parent_id is not None and n.id not in leaf_ids] or [nodes[0]]
+
+    costed = {line.cost_node_id for line in dataset.invoice_lines}
+    costed_codes = {line.cost_node_id for line in excel_batch(dataset).lines if line.contract_id == contract.code}
+    # liście nie dostają dzieci (cel przeniesienia / rodzic nowej pozycji to węzeł z `inner`)
+    removable = [n for n in nodes if n.id in leaf_ids and n.id not in costed and n.code not in costed_codes]
+
+    for i in range(changes):
+        kind = i % 4
+        if kind == 0:
+            node = rng.choice(nodes[1:])
+            node.name = f"{node.name} (zm.)"
+        elif kind == 1:
+            node = rng.choice(nodes[1:])
+            target = rng.choice(inner)
+            if target.id != node.id and not _is_descendant(nodes, target, node):
+                node.parent_id = target.id
+        elif kind == 2:
+            parent = rng.choice(inner)
+            nodes.append(replace(
+                parent,
+                id=_uuid(rng),
+                parent_id=parent.id,
+                code=f"{contract.code}.NEW{i:04d}",
+                name=f"Nowa pozycja {i}",
+                budget=_money(rng),
+            ))
+        elif removable:
+            node = removable.pop(rng.randrange(len(removable)))
+            nodes.remove(node)
+
+    return [_to_input(nodes)]
+
+
+# ---------- internals ----------
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _money(rng: random.Random) -> Decimal:
+    return Decimal(rng.randint(100, 2_000_000)) / 100
+
+
+def _company(rng: random.Random, tax_number: int, role: CompanyType, name: str) -> Company:
+    word = f"{rng.choice(WORDS)}{rng.choice(WORDS).lower()}"
+    slug = f"{word.lower()}{tax_number % 10_000}"
+    return Company(
+        id=_uuid(rng),
+        name=f"{word} {name} Sp. z o.o.",
+        description=None,
+        tax_number=str(tax_number),
+        address=Address(
+            street=f"ul. {rng.choice(WORDS)}owa {rng.randint(1, 200)}",
+            city=rng.choice(CITIES),
+            zip_code=f"{rng.randint(10, 99)}-{rng.randint(100, 999)}",
+            country="PL",
+        ),
+        contact=Contact(
+            phone_number=f"+48{rng.randint(500_000_000, 899_999_999)}",
+            email=f"biuro@{slug}.pl",
+        ),
+        bank_account=BankAccount("".join(str(rng.randint(0, 9)) for _ in range(26)), "PL"),
+        role=role,
+        tags=set(),
+        is_active=True,
+    )
+
+
+def _cost_nodes(rng: random.Random, contract: Contract, scale: Scale) -> list[CostNode]:
+    """Drzewo jak z buildera: ROOT + pozycje, rodzic i -> (i - 1) // branching"""
+    nodes: list[CostNode] = []
+    count = scale.nodes_per_contract
+    first_leaf = (count - 2) // scale.branching + 1
+
+    for i in range(count):
+        nodes.append(CostNode(
+            id=_uuid(rng),
+            contract_id=contract.id,
+            code="ROOT" if i == 0 else f"{contract.code}.{i:05d}",
+            name="Contract root" if i == 0 else f"Pozycja {i}",
+            parent_id=None if i == 0 else nodes[(i - 1) // scale.branching].id,
+            quantity=Decimal(rng.randint(1, 500)) if i >= first_leaf else None,
+            unit=UnitOfMeasure.PIECE if i >= first_leaf else None,
+            budget=_money(rng) * 10 if i >= first_leaf else None,
+            is_active=True,
+        ))
+    return nodes
+
+
+def _invoices(rng: random.Random, dataset: SyntheticDataset) -> None:
+    """60% faktur PROCESSED z przypisanymi liniami (historia), reszta NEW"""
+    scale = dataset.scale
+    leaves = {c.id: dataset.leaves(c.id) for c in dataset.contracts}
+
+    for i in range(scale.invoices):
+        day = START_DATE + timedelta(days=rng.randrange(365))
+        processed = rng.random() < 0.6
+        invoice = Invoice(
+            id=_uuid(rng),
+            invoice_number=f"FV/{i:06d}/2024",
+            invoice_date=day,
+            selling_date=day,
+            buyer_id=dataset.owner.id,
+            seller_id=rng.choice(dataset.suppliers).id,
+            payment_method=PaymentMethod.BANK_TRANSFER,
+            due_date=day + timedelta(days=30),
+            payment_status=PaymentStatus.UNPAID,
+            status=InvoiceStatus.PROCESSED if processed else InvoiceStatus.NEW,
+            timestamp=datetime.combine(day, datetime.min.time()),
+        )
+        dataset.invoices.append(invoice)
+
+        for j in range(scale.lines_per_invoice):
+            contract = rng.choice(dataset.contracts) if processed else None
+            dataset.invoice_lines.append(InvoiceLine(
+                id=_uuid(rng),
+                invoice_id=invoice.id,
+                contract_id=contract.id if contract else None,
+                cost_node_id=rng.choice(leaves[contract.id]).id if contract else None,
+                cost_type_id=rng.choice(dataset.cost_types).id if contract else None,
+                item_name=f"Pozycja {j} faktury {i}",
+                quantity=Decimal(rng.randint(1, 100)),
+                unit=UnitOfMeasure.PIECE,
+                amount=Amount(
+                    _money(rng),
+                    rng.choice((VatRate.VAT_23, VatRate.VAT_8)),
+                    TaxTreatment.NON_DEDUCTIBLE if rng.random() < 0.1 else TaxTreatment.TAX_DEDUCTIBLE,
+                ),
+                description=None,
+            ))
+
+
+def _company_inputs(rng: random.Random, dataset: SyntheticDataset) -> list[CompanyInput]:
+    """
+    Mieszanka jak z OCR: NIP w innym formacie, tylko e-mail / konto,
+    oraz nowe firmy (brak kandydatów -> utworzenie).
+    """
+    inputs = []
+    for i in range(dataset.scale.evaluate_inputs):
+        company = rng.choice(dataset.suppliers)
+        base = _company_input(company)
+        kind = i % 4
+
+        if kind == 0:
+            nip = company.tax_number
+            inputs.append(replace(base, tax_number=f"PL {nip[:3]}-{nip[3:6]}-{nip[6:8]}-{nip[8:]}"))
+        elif kind == 1:
+            inputs.append(replace(base, tax_number=None, phone_number=None, street=None))
+        elif kind == 2:
+            inputs.append(replace(base, tax_number=None, email=None, name=company.name.upper()))
+        else:
+            new = _company(rng, rng.randrange(10_000_000_000, 20_000_000_000), CompanyType.SUPPLIER, f"Nowy {i}")
+            inputs.append(_company_input(new))
+    return inputs
+
+
+def _company_input(company: Company) -> CompanyInput:
+    return CompanyInput(
+        name=company.name,
+        tax_number=company.tax_number,
+        street=company.address.street if company.address else None,
+        city=company.address.city if company.address else None,
+        state=None,
+        zip_code=company.address.zip_code if company.address else None,
+        country=company.address.country if company.address else None,
+        phone_number=company.contact.phone_number if company.contact else None,
+        email=company.contact.email if company.contact else None,
+        bank_account=company.bank_account.number if company.bank_account else None,
+        role=company.role.value,
+    )
+
+
+def _export(company: Company) -> CompanyExport:
+    return CompanyExport(id=company.id, name=company.name, tax_number=company.tax_number)
+
+
+def _is_descendant(nodes: list[CostNode], node: CostNode, ancestor: CostNode) -> bool:
+    by_id = {n.id: n for n in nodes}
+    current = node
+    while current.parent_id is not None:
+        if current.parent_id == ancestor.id:
+            return True
+        current = by_id[current.parent_id]
+    return False
+
+
+def _to_input(nodes: list[CostNode]) -> CostNodeInput:
+    """Lista węzłów -> zagnieżdżony CostNodeInput (iteracyjnie)"""
+    inputs: dict[UUID, CostNodeInput] = {}
+    root: CostNodeInput | None = None
+
+    for n in nodes:
+        inputs[n.id] = {
+            "code": n.code,
+            "name": n.name,
+            "budget": n.budget,
+            "quantity": n.quantity,
+            "unit": n.unit,
+            "is_active": n.is_active,
+            "children": [],
+        }
+    for n in nodes:
+        if n.parent_id is None:
+            root = inputs[n.id]
+        else:
+            inputs[n.parent_id]["children"].append(inputs[n.id])
+
+    if root is None:
+        raise ValueError("Cost node list has no root")
+    return root
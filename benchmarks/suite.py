@@ -0,0 +1,410 @@
+"""
+Benchmark głównych ścieżek aplikacji na syntetycznych danych.
+
+    PYTHONPATH=src python -m benchmarks.suite --scale small
+    PYTHONPATH=src python -m benchmarks.suite --scale small --save-baseline
+    PYTHONPATH=src python -m benchmarks.suite --scale small --compare --threshold 1.25
+    APP_ENV=test PYTHONPATH=src python -m benchmarks.suite --backend mysql --scale small
+
+Scenariusze (w kolejności workflow, każdy na stanie po poprzednim):
+- company_evaluate            CompanyEvaluateOrchestrator.evaluate
+- parse_invoice_from_file     ParseInvoiceFromFileService + FakeInvoiceParser
+- generate_invoice_assignment GenerateInvoiceAssignmentService (Excel do pliku tymczasowego)
+- apply_invoice_excel_batch   ApplyInvoiceExcelBatchService
+- contract_cost_report        ContractCostReportRunner (każdy kontrakt)
+- update_contract_structure   UpdateContractStructureService (SAFE, diff drzewa)
+
+Dane z benchmarks.data_generator (ten sam --seed = te same dane).
+Baseline: benchmarks/baselines/<backend>-<scale>.json – lokalny, poza repo
+(wyniki zależą od maszyny). Najpierw --save-baseline, potem --compare;
+--compare odrzuca baseline z innej wersji Pythona (major.minor) lub platformy.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.data_generator import (
+    DEFAULT_SEED,
+    SCALES,
+    SyntheticDataset,
+    changed_structure,
+    excel_batch,
+    generate,
+    parse_results,
+)
+from contract_costs.cli.context import Services
+from contract_costs.model.amount import Amount, VatRate
+from contract_costs.model.invoice import InvoiceStatus
+from contract_costs.model.unit_of_measure import UnitOfMeasure
+from contract_costs.repository.factory.repository_factory import RepoBackend
+from contract_costs.services.catalogues.invoice_file_organizer import InvoiceFileOrganizer
+from contract_costs.services.invoices.parse_invoice_from_file import ParseInvoiceFromFileService
+from contract_costs.services.invoices.parsers.fake_invoice_parser import FakeInvoiceParser
+from contract_costs.services.reports.contract_cost_report_runner import ContractCostReportRunner
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+# krótsze pomiary to głównie szum – nie zgłaszamy ich jako regresji
+NOISE_FLOOR_S = 0.01
+
+
+# ---------- wiring ----------
+
+class DatasetInvoiceParser(FakeInvoiceParser):
+    """FakeInvoiceParser z numerem, firmami i liniami z danych syntetycznych (po nazwie pliku)"""
+
+    def __init__(self, results: dict[str, dict]) -> None:
+        self._results = results
+
+    @property
+    def file_names(self) -> list[str]:
+        return list(self._results)
+
+    def parse(self, file_path):
+        base = super().parse(file_path)
+        data = self._results[Path(file_path).name]
+        template = base.lines[0]
+        return replace(
+            base,
+            invoice=replace(
+                base.invoice,
+                invoice_number=data["invoice_number"],
+                invoice_date=data["invoice_date"],
+                selling_date=data["invoice_date"],
+            ),
+            lines=[
+                replace(
+                    template,
+                    invoice_number=data["invoice_number"],
+                    item_name=f"Pozycja {i}",
+                    unit=UnitOfMeasure.PIECE,
+                    amount=Amount(amount, VatRate.VAT_23),
+                )
+                for i, amount in enumerate(data["amounts"])
+            ],
+            buyer=data["buyer"],
+            seller=data["seller"],
+        )
+
+
+class NullFileOrganizer(InvoiceFileOrganizer):
+    """Benchmark nie przenosi plików"""
+
+    @staticmethod
+    def move_to_owner(file_path, owner, issue_date, seller_name, invoice_number) -> Path:
+        return file_path
+
+    @staticmethod
+    def move_to_failed(file_path, reason) -> Path:
+        return file_path
+
+
+class BenchmarkServices(Services):
+    """
+    Produkcyjne połączenie serwisów, poza: parser = DatasetInvoiceParser,
+    bez klienta OpenAI (evaluate go nie używa) i bez przenoszenia plików.
+    """
+
+    def __init__(self, backend: RepoBackend, parser: DatasetInvoiceParser) -> None:
+        super().__init__(backend)
+        self.parser = parser
+
+    @property
+    def open_ai_invoice_service(self):
+        return None
+
+    @property
+    def parse_invoice_from_file(self):
+        if self._parse_invoice_from_file is None:
+            self._parse_invoice_from_file = ParseInvoiceFromFileService(
+                parser=self.parser,
+                company_evaluate_orchestrator=self.company_evaluate_orchestrator,
+                invoice_file_organizer=NullFileOrganizer(),
+                company_repository=self.company_repository,
+                normalizer=self._normalizer,
+                orchestrator=self.invoice_ingest_orchestrator,
+                file_hash_repository=self.invoice_file_hash_repository,
+            )
+        return self._parse_invoice_from_file
+
+
+# ---------- scenariusze ----------
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    # (services, dataset, workdir) -> funkcja mierzona + liczba elementów
+    prepare: Callable[[BenchmarkServices, SyntheticDataset, Path], tuple[Callable[[], None], int]]
+
+
+def _company_evaluate(services, dataset, workdir):
+    inputs = dataset.company_inputs
+    orchestrator = services.company_evaluate_orchestrator
+
+    def run():
+        for company_input in inputs:
+            orchestrator.evaluate(company_input)
+
+    return run, len(inputs)
+
+
+def _parse_invoice_from_file(services, dataset, workdir):
+    files = []
+    for name in services.parser.file_names:
+        path = workdir / name
+        path.write_bytes(f"%PDF-1.4 {name}".encode())
+        files.append(path)
+    service = services.parse_invoice_from_file
+
+    def run():
+        for path in files:
+            service.execute(path)
+
+    return run, len(files)
+
+
+def _generate_invoice_assignment(services, dataset, workdir):
+    output = workdir / "invoice_assignment.xlsx"
+    service = services.generate_invoice_assignment_excel
+
+    def run():
+        service.execute([InvoiceStatus.NEW, InvoiceStatus.IN_PROGRESS], output)
+
+    return run, len(dataset.invoices)
+
+
+def _apply_invoice_excel_batch(services, dataset, workdir):
+    batch = excel_batch(dataset)
+    service = services.apply_invoice_excel_batch
+
+    def run():
+        service.apply(batch)
+
+    return run, len(batch.lines)
+
+
+def _contract_cost_report(services, dataset, workdir):
+    runner = ContractCostReportRunner(services.contract_cost_report)
+
+    def run():
+        for contract in dataset.contracts:
+            runner.run(contract_id=contract.id, group_by=["cost_node", "cost_type"])
+
+    return run, len(dataset.contracts)
+
+
+def _update_contract_structure(services, dataset, workdir):
+    changes = [
+        (contract, changed_structure(dataset, contract, dataset.scale.structure_changes))
+        for contract in dataset.contracts
+    ]
+    service = services.update_contract_structure_service
+
+    def run():
+        for contract, cost_node_input in changes:
+            service.execute(
+                contract_id=contract.id,
+                contract_starter=contract.__dict__,
+                cost_node_input=cost_node_input,
+            )
+
+    return run, sum(len(dataset.cost_nodes[c.id]) for c in dataset.contracts)
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario("company_evaluate", _company_evaluate),
+    Scenario("parse_invoice_from_file", _parse_invoice_from_file),
+    Scenario("generate_invoice_assignment", _generate_invoice_assignment),
+    Scenario("apply_invoice_excel_batch", _apply_invoice_excel_batch),
+    Scenario("contract_cost_report", _contract_cost_report),
+    Scenario("update_contract_structure", _update_contract_structure),
+]
+
+
+# ---------- przebieg ----------
+
+def load_dataset(services: Services, dataset: SyntheticDataset) -> None:
+    """Zapis danych bazowych przez repozytoria (poza pomiarem scenariuszy)"""
+    for company in dataset.companies:
+        services.company_repository.add(company)
+    for cost_type in dataset.cost_types:
+        services.cost_type_repository.add(cost_type)
+    for contract in dataset.contracts:
+        services.contract_repository.add(contract)
+        services.cost_node_repository.add_all(dataset.cost_nodes[contract.id])
+    for invoice in dataset.invoices:
+        services.invoice_repository.add(invoice)
+    services.invoice_line_repository.upsert_many(dataset.invoice_lines)
+
+
+def run_once(
+    backend: RepoBackend,
+    dataset: SyntheticDataset,
+    workdir: Path,
+    scenarios: list[Scenario] = SCENARIOS,
+) -> dict[str, dict]:
+    parser = DatasetInvoiceParser({
+        f"invoice_{i:05d}.pdf": data for i, data in enumerate(parse_results(dataset))
+    })
+    services = BenchmarkServices(backend, parser)
+
+    if backend == RepoBackend.MYSQL and services.company_repository.list_all():
+        raise SystemExit(
+            "MySQL benchmark needs an empty, migrated database "
+            "(point DB_NAME at a dedicated schema) – refusing to write into existing data."
+        )
+
+    start = time.perf_counter()
+    load_dataset(services, dataset)
+    timings = {"load_dataset": {"items": len(dataset.invoice_lines), "seconds": time.perf_counter() - start}}
+
+    for scenario in scenarios:
+        run, items = scenario.prepare(services, dataset, workdir)
+        start = time.perf_counter()
+        run()
+        timings[scenario.name] = {"items": items, "seconds": time.perf_counter() - start}
+
+    return timings
+
+
+def run_suite(
+    backend: RepoBackend,
+    scale: str,
+    *,
+    seed: int = DEFAULT_SEED,
+    repeat: int = 3,
+    scenarios: list[Scenario] = SCENARIOS,
+) -> dict:
+    """
+    Każde powtórzenie na świeżych repozytoriach z tymi samymi danymi.
+    MySQL: jedno powtórzenie (dane zostają w bazie).
+    """
+    if backend == RepoBackend.MYSQL:
+        repeat = 1
+
+    dataset = generate(scale, seed)
+    runs: list[dict[str, dict]] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="contract_costs_bench_") as tmp:
+            runs.append(run_once(backend, dataset, Path(tmp), scenarios))
+
+    results = {}
+    for name in runs[0]:
+        seconds = [r[name]["seconds"] for r in runs]
+        results[name] = {
+            "items": runs[0][name]["items"],
+            "best_s": round(min(seconds), 6),
+            "median_s": round(statistics.median(seconds), 6),
+        }
+
+    return {
+        "backend": backend.value,
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+# ---------- baseline ----------
+
+def baseline_path(backend: str, scale: str) -> Path:
+    return BASELINE_DIR / f"{backend}-{scale}.json"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Scenariusze wolniejsze niż baseline * threshold (porównanie best_s)"""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or max(base["best_s"], result["best_s"]) < NOISE_FLOOR_S:
+            continue
+        if result["best_s"] > base["best_s"] * threshold:
+            regressions.append(name)
+    return regressions
+
+
+def environment_mismatch(current: dict, baseline: dict) -> list[str]:
+    """Różnice środowiska, przy których porównanie czasów nie ma sensu"""
+    mismatches = []
+    if current["python"].split(".")[:2] != baseline.get("python", "").split(".")[:2]:
+        mismatches.append(f"python {baseline.get('python')} != {current['python']}")
+    if current["platform"] != baseline.get("platform"):
+        mismatches.append(f"platform {baseline.get('platform')} != {current['platform']}")
+    return mismatches
+
+
+def print_report(current: dict, baseline: dict | None) -> None:
+    print(
+        f"backend={current['backend']} scale={current['scale']} seed={current['seed']} "
+        f"repeat={current['repeat']} python={current['python']}"
+    )
+    print(f"{'scenario':<30} {'items':>7} {'best s':>9} {'median s':>9} {'items/s':>10} {'baseline':>9} {'ratio':>6}")
+
+    for name, r in current["results"].items():
+        rate = r["items"] / r["best_s"] if r["best_s"] else 0
+        base = (baseline or {}).get("results", {}).get(name)
+        base_s = f"{base['best_s']:>9.3f}" if base else f"{'-':>9}"
+        ratio = f"{r['best_s'] / base['best_s']:>6.2f}" if base and base["best_s"] else f"{'-':>6}"
+        print(f"{name:<30} {r['items']:>7} {r['best_s']:>9.3f} {r['median_s']:>9.3f} {rate:>10.0f} {base_s} {ratio}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Contract costs benchmark suite")
+    parser.add_argument("--backend", choices=[b.value for b in RepoBackend], default=RepoBackend.MEMORY.value)
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS],
+                        help="tylko wybrane scenariusze (można powtarzać)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="kod wyjścia 1 przy regresji")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        # serwisy logują każdą fakturę / firmę – nie mierzymy I/O konsoli
+        logging.getLogger("contract_costs").setLevel(logging.ERROR)
+
+    backend = RepoBackend(args.backend)
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    current = run_suite(backend, args.scale, seed=args.seed, repeat=args.repeat, scenarios=scenarios)
+
+    path = baseline_path(backend.value, args.scale)
+    baseline = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    print_report(current, baseline)
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved: {path}")
+
+    if args.compare:
+        if baseline is None:
+            raise SystemExit(f"No baseline at {path} (run with --save-baseline first)")
+        if mismatches := environment_mismatch(current, baseline):
+            raise SystemExit(
+                f"Baseline {path} comes from another environment ({'; '.join(mismatches)}) "
+                "– re-run with --save-baseline on this machine"
+            )
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"Slower than baseline x{args.threshold}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
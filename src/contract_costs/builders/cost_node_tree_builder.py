@@ -87,53 +87,51 @@ class DefaultCostNodeTreeBuilder(CostNodeTreeBuilder):
             existing_nodes: dict[str, CostNode],
             parent_id: UUID | None,
     ) -> list[CostNode]:
-
-        code = node_input["code"]
-
-        if code in existing_nodes:
-            node_id = existing_nodes[code].id
-        else:
-            node_id = uuid4()
-
-        node = CostNode(
-            id=node_id,
-            contract_id=contract_id,
-            parent_id=parent_id,
-            code=code,
-            name=node_input["name"],
-            budget=node_input.get("budget"),
-            quantity=node_input.get("quantity"),
-            unit=node_input.get("unit"),
-            is_active=node_input.get("is_active", True),
-        )
-
-        nodes = [node]
-
-        for child in node_input.get("children", []):
-            nodes.extend(
-                self._build_subtree(
-                    contract_id,
-                    child,
-                    existing_nodes=existing_nodes,
-                    parent_id=node_id,
-                )
-            )
+        """
+        Preorder (dzieci w kolejności z wejścia), iteracyjnie – bez limitu
+        rekurencji i bez kopiowania list dzieci: O(n), stos = oczekujące węzły.
+        """
+        nodes: list[CostNode] = []
+        stack: list[tuple[CostNodeInput, UUID | None]] = [(node_input, parent_id)]
+
+        while stack:
+            current, current_parent_id = stack.pop()
+            code = current["code"]
+
+            existing = existing_nodes.get(code)
+            node_id = existing.id if existing is not None else uuid4()
+
+            nodes.append(CostNode(
+                id=node_id,
+                contract_id=contract_id,
+                parent_id=current_parent_id,
+                code=code,
+                name=current["name"],
+                budget=current.get("budget"),
+                quantity=current.get("quantity"),
+                unit=current.get("unit"),
+                is_active=current.get("is_active", True),
+            ))
+
+            children = current.get("children") or []
+            stack.extend((child, node_id) for child in reversed(children))
 
         return nodes
 
     # ------------------------------------------------------------------
 
     def _sum_budgets(self, nodes: list[CostNodeInput]) -> Decimal | None:
-        budgets = []
+        """Suma wszystkich podanych budżetów w całym lesie (None gdy brak)"""
+        total = Decimal("0")
+        found = False
+        stack = list(nodes)
 
-        for node in nodes:
+        while stack:
+            node = stack.pop()
             budget = node.get("budget")
             if budget is not None:
-                budgets.append(budget)
-
-            children = node.get("children") or []
-            child_budget = self._sum_budgets(children)
-            if child_budget is not None:
-                budgets.append(child_budget)
+                total += budget
+                found = True
+            stack.extend(node.get("children") or [])
 
-        return sum(budgets, Decimal("0")) if budgets else None
\ No newline at end of file
+        return total if found else None
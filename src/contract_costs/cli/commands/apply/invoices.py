@@ -42,9 +42,13 @@ def handle_apply_invoices(args):
     batch = load_invoice_excel_batch(excel_path)
 
     service = services.apply_invoice_excel_batch
-    service.apply(batch)
+    stats = service.apply(batch)
 
     logger.info(f"Invoices applied from: {excel_path}")
+    print(
+        f"Companies evaluated: {stats.evaluated} / {stats.requested} lookups "
+        f"(reused {stats.reused}, saved {stats.provider_queries_saved} provider queries)"
+    )
 
 
 REGISTRY.register_group("apply", build_apply_invoices)
@@ -0,0 +1,2 @@
+from contract_costs.cli.commands.db.migrate import build_db_migrate
+from contract_costs.cli.commands.db.explain import build_db_explain
@@ -0,0 +1,29 @@
+import sys
+
+from contract_costs.cli.registry import REGISTRY
+from contract_costs.infrastructure.db.query_plan_check import HOT_QUERIES, check_query_plans
+
+
+def build_db_explain(subparsers):
+    p = subparsers.add_parser(
+        "explain",
+        help="EXPLAIN repository hot queries and report full table scans",
+    )
+
+    p.set_defaults(handler=handle_db_explain)
+
+
+def handle_db_explain(args):
+    issues = check_query_plans()
+
+    if not issues:
+        print(f"OK: {len(HOT_QUERIES)} queries checked, no full table scans.")
+        return
+
+    for i in issues:
+        print(f"FULL SCAN | {i.query:<34} | table={i.table} rows={i.rows}")
+
+    sys.exit(1)
+
+
+REGISTRY.register_group("db", build_db_explain)
@@ -0,0 +1,40 @@
+import logging
+
+from contract_costs.cli.registry import REGISTRY
+from contract_costs.infrastructure.db.migrations.runner import MigrationRunner
+
+logger = logging.getLogger(__name__)
+
+
+def build_db_migrate(subparsers):
+    p = subparsers.add_parser(
+        "migrate",
+        help="Apply pending database schema migrations",
+    )
+
+    p.add_argument("--target", type=int, default=None, help="Migrate up to this version")
+    p.add_argument("--status", action="store_true", help="Only list applied / pending migrations")
+
+    p.set_defaults(handler=handle_db_migrate)
+
+
+def handle_db_migrate(args):
+    runner = MigrationRunner()
+
+    if args.status:
+        applied = runner.applied_versions()
+        for m in runner.migrations:
+            state = "applied" if m.version in applied else "pending"
+            print(f"{m.label:<40} {state}")
+        return
+
+    done = runner.migrate(target=args.target)
+    if not done:
+        print("Database schema is up to date.")
+        return
+
+    for m in done:
+        print(f"Applied {m.label}")
+
+
+REGISTRY.register_group("db", build_db_migrate)
@@ -1 +1,3 @@
-from contract_costs.cli.commands.reports.costs import build_report_costs  # noqa
\ No newline at end of file
+from contract_costs.cli.commands.reports.costs import build_report_costs  # noqa
+from contract_costs.cli.commands.reports.snapshot import build_report_snapshot  # noqa
+from contract_costs.cli.commands.reports.progress import build_report_progress  # noqa
@@ -2,8 +2,9 @@ from contract_costs.cli.context import get_services
 from contract_costs.config import REPORTS_DIR
 from contract_costs.services.reports.contract_cost_report_runner import (
     ContractCostReportRunner,
+    ContractCostTreeReportRunner,
 )
-from contract_costs.services.reports.renders.cli import render_stdout
+from contract_costs.services.reports.renders.cli import render_stdout, render_tree_stdout
 from contract_costs.services.reports.renders.excel import ExcelReportRenderer
 from uuid import UUID
 from contract_costs.cli.registry import REGISTRY
@@ -17,6 +18,7 @@ def build_report_costs(subparsers):
     p.add_argument("--invoice", nargs="+", help="Filter by invoice numbers")
     p.add_argument("--status", nargs="+",choices=["NEW", "IN_PROGRESS","PROCESSED", "PAID","NOT_PAID", "DELETED"],
         help="Filter by invoice status")
+    p.add_argument("--tree", action="store_true", help="Budget vs actual for every cost node level (ignores --group-by)")
 
     p.set_defaults(handler=handle_report_costs)
 
@@ -39,6 +41,10 @@ def handle_report_costs(args):
     if contract is None:
         raise ValueError(f"Contract '{args.contract_ref}' not found")
 
+    if args.tree:
+        _report_tree(args, services, contract)
+        return
+
     runner = ContractCostReportRunner(
         services.contract_cost_report
     )
@@ -57,4 +63,20 @@ def handle_report_costs(args):
     else:
         render_stdout(df)
 
+
+def _report_tree(args, services, contract):
+    df = ContractCostTreeReportRunner(services.contract_cost_report).run(
+        contract_id=contract.id,
+        invoice_numbers=args.invoice,
+        invoice_statuses=args.status,
+    )
+
+    if args.output == "excel":
+        path = REPORTS_DIR / f"contract_costs_tree_{contract.code}.xlsx"
+        ExcelReportRenderer().render(df, output_path=path, level_column="Poziom")
+        print(f"Report saved to {path}")
+    else:
+        render_tree_stdout(df)
+
+
 REGISTRY.register_group("report", build_report_costs)
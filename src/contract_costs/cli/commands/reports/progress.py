@@ -0,0 +1,69 @@
+from datetime import date
+
+from contract_costs.cli.commands.reports.costs import resolve_contract_ref
+from contract_costs.cli.context import get_services
+from contract_costs.cli.registry import REGISTRY
+
+
+def build_report_progress(subparsers):
+    p = subparsers.add_parser("progress", help="Cost progress history and burn rate (from snapshots)")
+
+    p.add_argument("contract_ref", help="Contract UUID or code")
+    p.add_argument("--node", help="Cost node code (default: whole contract)")
+    p.add_argument("--from", dest="date_from", type=date.fromisoformat, default=None, help="From date YYYY-MM-DD")
+    p.add_argument("--to", dest="date_to", type=date.fromisoformat, default=None, help="To date YYYY-MM-DD")
+
+    p.set_defaults(handler=handle_report_progress)
+
+
+def handle_report_progress(args):
+    services = get_services()
+
+    contract = resolve_contract_ref(services.contract_repository, args.contract_ref)
+    if contract is None:
+        raise ValueError(f"Contract '{args.contract_ref}' not found")
+
+    cost_node_id = None
+    if args.node:
+        node = next(
+            (n for n in services.cost_node_repository.list_by_contract(contract.id)
+             if n.code == args.node),
+            None,
+        )
+        if node is None:
+            raise ValueError(f"Cost node '{args.node}' not found in contract {contract.code}")
+        cost_node_id = node.id
+
+    history = services.cost_progress_history
+    rows = history.history(
+        contract.id, cost_node_id, date_from=args.date_from, date_to=args.date_to
+    )
+    if not rows:
+        print("No snapshots. Run: report snapshot")
+        return
+
+    print(f"{'DATE':<12} {'PLANNED':>15} {'EXECUTED':>15} {'DELTA':>13} {'PROGRESS':>9}")
+    print("-" * 68)
+    for r in rows:
+        print(
+            f"{r['snapshot_date'].isoformat():<12} "
+            f"{r['planned_amount']:>15,.2f} "
+            f"{r['executed_amount']:>15,.2f} "
+            f"{r['executed_delta']:>13,.2f} "
+            f"{r['progress_percent'] * 100:>8.0f}%"
+        )
+
+    burn = history.burn_rate(
+        contract.id, cost_node_id, date_from=args.date_from, date_to=args.date_to
+    )
+    if burn is None:
+        return
+
+    print()
+    print(f"Burn rate:  {burn.daily_rate:,.2f} / day over {burn.days} day(s)")
+    print(f"Remaining:  {burn.remaining:,.2f}")
+    if burn.projected_exhaustion:
+        print(f"Budget exhausted around: {burn.projected_exhaustion.isoformat()}")
+
+
+REGISTRY.register_group("report", build_report_progress)
@@ -0,0 +1,45 @@
+from datetime import date
+
+from contract_costs.cli.commands.reports.costs import resolve_contract_ref
+from contract_costs.cli.context import get_services
+from contract_costs.cli.registry import REGISTRY
+
+
+def build_report_snapshot(subparsers):
+    p = subparsers.add_parser(
+        "snapshot",
+        help="Store cost progress snapshots for active contracts (cron-friendly, idempotent per day)",
+    )
+
+    p.add_argument("--date", type=date.fromisoformat, default=None, help="Snapshot date YYYY-MM-DD (default: today)")
+    p.add_argument("--full", action="store_true", help="Recompute every contract from all invoice lines (by default contracts with changes since the previous snapshot are recomputed, the rest extended from it)")
+    p.add_argument("--contract", nargs="+", help="Only these contracts (UUID or code)")
+
+    p.set_defaults(handler=handle_report_snapshot)
+
+
+def handle_report_snapshot(args):
+    services = get_services()
+
+    contract_ids = None
+    if args.contract:
+        contract_ids = []
+        for ref in args.contract:
+            contract = resolve_contract_ref(services.contract_repository, ref)
+            if contract is None:
+                raise ValueError(f"Contract '{ref}' not found")
+            contract_ids.append(contract.id)
+
+    result = services.cost_progress_snapshot.run(
+        args.date,
+        full=args.full,
+        contract_ids=contract_ids,
+    )
+
+    print(
+        f"Snapshot {result.snapshot_date}: {result.contracts} contract(s), "
+        f"{result.incremental} incremental, {result.snapshots} row(s) saved"
+    )
+
+
+REGISTRY.register_group("report", build_report_snapshot)
@@ -2,4 +2,5 @@ from contract_costs.cli.commands.show.companies import build_show_companies
 from contract_costs.cli.commands.show.contracts import build_show_contracts
 from contract_costs.cli.commands.show.invoices import build_show_invoices
 from contract_costs.cli.commands.show.invoice import build_show_invoice
+from contract_costs.cli.commands.show.dedup import build_show_dedup
 
@@ -0,0 +1,41 @@
+from contract_costs.cli.context import get_services
+from contract_costs.cli.registry import REGISTRY
+
+
+def build_show_dedup(subparsers):
+    p = subparsers.add_parser(
+        "dedup",
+        help="Show duplicate invoice PDF statistics",
+    )
+
+    p.add_argument("--limit", type=int, default=20)
+
+    p.set_defaults(handler=handle_show_dedup)
+
+
+def handle_show_dedup(args):
+    services = get_services()
+    repo = services.invoice_file_hash_repository
+
+    stats = repo.stats()
+    seen = stats.files + stats.duplicates_skipped
+    hit_rate = stats.duplicates_skipped / seen * 100 if seen else 0.0
+
+    print(f"Indexed files:        {stats.files}")
+    print(f"Duplicates skipped:   {stats.duplicates_skipped}")
+    print(f"Files with duplicates:{stats.files_with_duplicates:>5}")
+    print(f"Dedup hit rate:       {hit_rate:.1f}%")
+
+    duplicated = repo.list_duplicated(limit=args.limit)
+    if not duplicated:
+        return
+
+    print()
+    for e in duplicated:
+        print(
+            f"{e.hit_count:>4}x | {e.sha256[:12]} | {e.file_name} | "
+            f"{e.outcome} | {e.invoice_number or '-'}"
+        )
+
+
+REGISTRY.register_group("show", build_show_dedup)
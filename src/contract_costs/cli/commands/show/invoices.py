@@ -1,7 +1,7 @@
 import logging
 from contract_costs.cli.context import get_services
 from contract_costs.cli.registry import REGISTRY
-from contract_costs.model.invoice import InvoiceStatus, PaymentStatus
+from contract_costs.model.invoice import InvoiceStatus
 
 logger = logging.getLogger(__name__)
 
@@ -35,23 +35,15 @@ def build_show_invoices(subparsers):
 
 def handle_show_invoices(args) -> None:
     services = get_services()
-    invoice_details_service = services.invoice_query_service
-
-    inv_repo = services.invoice_repository
 
     statuses = [InvoiceStatus[s] for s in args.status] if args.status else None
-    invoices = inv_repo.list_invoices()
-    invoices = sorted(invoices, key=lambda x: x.timestamp, reverse=True)
-    # companies = comp_repo.list_companies()
-    # lines = line_repo.list_lines()
-    if args.unpaid:
-        invoices = [i for i in invoices if i.payment_status == PaymentStatus.UNPAID]
-
-    if statuses:
-        invoices = [i for i in invoices if i.status in statuses]
-    if args.last:
-        invoices = invoices[:args.last]
 
+    # filtry, sortowanie i limit liczone w bazie – jedno zapytanie
+    invoices = services.invoice_summary_query_service.list_summaries(
+        statuses=statuses,
+        unpaid=args.unpaid,
+        limit=args.last,
+    )
 
     if not invoices:
         print("No invoices found.")
@@ -72,8 +64,7 @@ def handle_show_invoices(args) -> None:
         f"{fmt("ZAPŁ. DO", 10)}"
     )
 
-    for i in invoices:
-        inv = invoice_details_service.get_by_invoice_number(i.invoice_number)
+    for inv in invoices:
         print(
             f"{fmt(inv.invoice_number, 65)} "
             f"{fmt(inv.status, 10)} "
@@ -9,6 +9,10 @@ from contract_costs.services.companies.providers.email import EmailCandidateProv
 from contract_costs.services.companies.providers.excact_nip import ExactNipCandidateProvider
 from contract_costs.services.companies.create_company_service import CreateCompanyService
 from contract_costs.services.companies.providers.name import NameCandidateProvider
+from contract_costs.services.companies.index.company_name_index import (
+    CompanyNameIndex,
+    NameIndexedCompanyRepository,
+)
 from contract_costs.services.companies.providers.phone import PhoneCandidateProvider
 from contract_costs.services.companies.update_company_service import UpdateCompanyService
 from contract_costs.services.contracts.create_contract_service import CreateContractService
@@ -65,16 +69,28 @@ from contract_costs.services.workers.ai_invoice_worker import InvoiceAIWorker
 
 class Services:
     def __init__(self, backend: RepoBackend = RepoBackend.MYSQL) -> None:
-        self._factory = RepositoryFactory(backend)
+        from contract_costs.config import COMPANY_NAME_INDEX_TTL, REFERENCE_CACHE_TTL
+
+        # memory backend już trzyma wszystko w procesie – cache tylko dla MySQL
+        self._factory = RepositoryFactory(
+            backend,
+            reference_cache_ttl=REFERENCE_CACHE_TTL if backend == RepoBackend.MYSQL else None,
+        )
+
+        self._company_name_index_ttl = COMPANY_NAME_INDEX_TTL
 
         # repos
         self._company_repo = None
+        self._company_name_index = None
         self._invoice_repo = None
         self._invoice_line_repo = None
         self._contract_repo = None
         self._cost_node_repo = None
         self._cost_type_repo = None
         self._cost_progress_snapshot_repo = None
+        self._invoice_file_hash_repo = None
+        self._contract_cost_report_repo = None
+        self._unit_of_work = None
 
         # services
         # self._company_resolver = None
@@ -92,12 +108,18 @@ class Services:
         self._apply_contract_structure_excel = None
         self._generate_contract_structure_excel = None
         self._invoice_ai_worker = None
+        self._openai_rate_limiter = None
+        self._extraction_cache = None
+        self._invoice_queue = None
 
         self._contract_cost_report =None
+        self._cost_progress_snapshot = None
+        self._cost_progress_history = None
         self._open_ai_invoice_service = None
         self._company_evaluate_orchestrator =None
 
         self._invoice_query_service = None
+        self._invoice_summary_query_service = None
 
         self._normalizer = InvoiceParseNormalizer()
 
@@ -106,9 +128,21 @@ class Services:
     @property
     def company_repository(self):
         if self._company_repo is None:
-            self._company_repo = self._factory.company_repository()
+            inner = self._factory.company_repository()
+            self._company_name_index = CompanyNameIndex(
+                inner, max_age=self._company_name_index_ttl
+            )
+            self._company_repo = NameIndexedCompanyRepository(
+                inner, self._company_name_index
+            )
         return self._company_repo
 
+    @property
+    def company_name_index(self):
+        if self._company_name_index is None:
+            _ = self.company_repository
+        return self._company_name_index
+
     @property
     def invoice_repository(self):
         if self._invoice_repo is None:
@@ -130,7 +164,9 @@ class Services:
     @property
     def cost_node_repository(self):
         if self._cost_node_repo is None:
-            self._cost_node_repo = self._factory.cost_node_repository()
+            self._cost_node_repo = self._factory.cost_node_repository(
+                invoice_line_repository=self.invoice_line_repository,
+            )
         return self._cost_node_repo
 
     @property
@@ -145,15 +181,68 @@ class Services:
             self._cost_progress_snapshot_repo = self._factory.cost_progress_snapshot_repository()
         return self._cost_progress_snapshot_repo
 
+    @property
+    def invoice_file_hash_repository(self):
+        if self._invoice_file_hash_repo is None:
+            self._invoice_file_hash_repo = self._factory.invoice_file_hash_repository()
+        return self._invoice_file_hash_repo
+
+    @property
+    def contract_cost_report_repository(self):
+        if self._contract_cost_report_repo is None:
+            self._contract_cost_report_repo = self._factory.contract_cost_report_repository(
+                invoice_line_repository=self.invoice_line_repository,
+                cost_node_repository=self.cost_node_repository,
+                cost_type_repository=self.cost_type_repository,
+                invoice_repository=self.invoice_repository,
+            )
+        return self._contract_cost_report_repo
+
+    def reference_cache_stats(self):
+        return self._factory.reference_cache_stats()
+
+    @property
+    def unit_of_work(self):
+        if self._unit_of_work is None:
+            self._unit_of_work = self._factory.unit_of_work()
+        return self._unit_of_work
 
     # ---------- domain services ----------
+    @property
+    def openai_rate_limiter(self):
+        # jeden limiter RPM/TPM na proces – dzielą go wszyscy workerzy AI
+        if self._openai_rate_limiter is None:
+            from contract_costs.config import OPENAI_RPM, OPENAI_TPM
+            from contract_costs.infrastructure.rate_limiter import TokenBucketRateLimiter
+
+            self._openai_rate_limiter = TokenBucketRateLimiter(
+                rpm=OPENAI_RPM,
+                tpm=OPENAI_TPM,
+            )
+        return self._openai_rate_limiter
+
+    @property
+    def extraction_cache(self):
+        # wspólny cache OCR + AI (retry / re-ingest bez kosztów)
+        if self._extraction_cache is None:
+            from contract_costs.config import EXTRACTION_CACHE_DB, EXTRACTION_CACHE_MAX_MB
+            from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache
+
+            self._extraction_cache = DiskLRUCache(
+                EXTRACTION_CACHE_DB,
+                max_bytes=EXTRACTION_CACHE_MAX_MB * 1024 * 1024,
+            )
+        return self._extraction_cache
+
     @property
     def open_ai_invoice_service(self):
         if self._open_ai_invoice_service is None:
             from contract_costs.services.invoices.parsers.ocr_pdf_invoice_parser import (
                 OpenAIInvoiceClient,
             )
-            self._open_ai_invoice_service = OpenAIInvoiceClient()
+            self._open_ai_invoice_service = OpenAIInvoiceClient(
+                rate_limiter=self.openai_rate_limiter,
+            )
         return self._open_ai_invoice_service
 
 
@@ -176,6 +265,7 @@ class Services:
                     self.cost_node_repository,
                     self.cost_type_repository,
                 ),
+                unit_of_work=self.unit_of_work,
             )
         return self._invoice_ingest_orchestrator
 
@@ -189,7 +279,7 @@ class Services:
                      BankAccountCandidateProvider(self.company_repository),
                      EmailCandidateProvider(self.company_repository),
                      AddressCandidateProvider(self.company_repository),
-                     NameCandidateProvider(self.company_repository),
+                     NameCandidateProvider(self.company_repository, self.company_name_index),
                      PhoneCandidateProvider(self.company_repository)
                      ]
                 ),  self.open_ai_invoice_service )
@@ -200,10 +290,31 @@ class Services:
         if self._parse_invoice_from_file is None:
             from contract_costs.services.invoices.parsers.ocr_pdf_invoice_parser import (
                 OCRAIAgentInvoiceParser,
+                OpenAIInvoiceClient,
+                PdfTextExtractor,
+            )
+            from contract_costs.services.invoices.parsers.schema import AI_SCHEMA, AI_PROMPT
+            from contract_costs.config import (
+                OCR_WORKERS,
+                PDFPLUMBER_MAX_TASKS,
+                PDFPLUMBER_WORKERS,
             )
 
             self._parse_invoice_from_file = ParseInvoiceFromFileService(
-                parser=OCRAIAgentInvoiceParser(),
+                parser=OCRAIAgentInvoiceParser(
+                    ai_client=OpenAIInvoiceClient(
+                        AI_SCHEMA,
+                        AI_PROMPT,
+                        rate_limiter=self.openai_rate_limiter,
+                        cache=self.extraction_cache,
+                    ),
+                    text_extractor=PdfTextExtractor(
+                        cache=self.extraction_cache,
+                        ocr_workers=OCR_WORKERS or None,
+                        pdfplumber_workers=PDFPLUMBER_WORKERS,
+                        pdfplumber_max_tasks=PDFPLUMBER_MAX_TASKS,
+                    ),
+                ),
                 company_evaluate_orchestrator=self.company_evaluate_orchestrator,
 
                 # company_resolve_service=self.company_resolver,
@@ -211,6 +322,7 @@ class Services:
                 company_repository=self.company_repository,
                 normalizer=self._normalizer,
                 orchestrator=self.invoice_ingest_orchestrator,
+                file_hash_repository=self.invoice_file_hash_repository,
             )
         return self._parse_invoice_from_file
 
@@ -221,6 +333,7 @@ class Services:
                 InvoiceExcelBatchResolver( company_evaluate_orchestrator=self.company_evaluate_orchestrator),
                 ApplyCompanyExcelBatchService(self.company_repository),
                 self.invoice_ingest_orchestrator,
+                unit_of_work=self.unit_of_work,
             )
         return self._apply_invoice_excel_batch
 
@@ -232,15 +345,42 @@ class Services:
             )
             self._invoice_watcher_service = InvoiceWatcherService(
                 watch_dir=INVOICE_INPUT_DIR,
+                queue=self.invoice_queue,
             )
         return self._invoice_watcher_service
 
+    @property
+    def invoice_queue(self):
+        if self._invoice_queue is None:
+            from contract_costs.config import (
+                INVOICE_QUEUE_DB,
+                INVOICE_QUEUE_MAX_ATTEMPTS,
+                INVOICE_QUEUE_VISIBILITY_TIMEOUT,
+            )
+            from contract_costs.services.queue.invoice_queue import PersistentInvoiceQueue
+
+            self._invoice_queue = PersistentInvoiceQueue(
+                INVOICE_QUEUE_DB,
+                max_attempts=INVOICE_QUEUE_MAX_ATTEMPTS,
+                visibility_timeout=INVOICE_QUEUE_VISIBILITY_TIMEOUT,
+            )
+        return self._invoice_queue
+
     @property
     def invoice_ai_worker(self):
         if self._invoice_ai_worker is None:
+            from contract_costs.config import AI_JOB_TIMEOUT, AI_WORKERS
+
             self._invoice_ai_worker = InvoiceAIWorker(
-            rpm=3,
-            timeout=180,
+                # budowany tu, nie leniwie w wątkach workerów
+                process=self.parse_invoice_from_file.execute,
+                queue=self.invoice_queue,
+                workers=AI_WORKERS,
+                job_timeout=AI_JOB_TIMEOUT,
+                on_failed=lambda file_path: InvoiceFileOrganizer.move_to_failed(
+                    file_path=file_path,
+                    reason="ai_processing_failed",
+                ),
             )
         return self._invoice_ai_worker
 
@@ -306,6 +446,7 @@ class Services:
                 self.cost_node_repository,
                 DefaultCostNodeTreeBuilder(),
                 CostNodeEntityValidator(),
+                unit_of_work=self.unit_of_work,
             )
         return self._update_contract_structure_service
 
@@ -337,12 +478,36 @@ class Services:
             )
             self._contract_cost_report = ContractCostReportService(
                 self.contract_repository,
-                self.invoice_line_repository,
                 self.cost_node_repository,
-                self.cost_type_repository
+                self.contract_cost_report_repository,
             )
         return self._contract_cost_report
 
+    @property
+    def cost_progress_snapshot(self):
+        if self._cost_progress_snapshot is None:
+            from contract_costs.services.reports.cost_progress_snapshot_service import (
+                CostProgressSnapshotService,
+            )
+            self._cost_progress_snapshot = CostProgressSnapshotService(
+                self.contract_repository,
+                self.cost_node_repository,
+                self.cost_progress_snapshot_repository,
+                self.contract_cost_report_repository,
+            )
+        return self._cost_progress_snapshot
+
+    @property
+    def cost_progress_history(self):
+        if self._cost_progress_history is None:
+            from contract_costs.services.reports.cost_progress_history_service import (
+                CostProgressHistoryService,
+            )
+            self._cost_progress_history = CostProgressHistoryService(
+                self.cost_progress_snapshot_repository,
+            )
+        return self._cost_progress_history
+
     @property
     def invoice_query_service(self):
         if self._invoice_query_service is None:
@@ -356,6 +521,21 @@ class Services:
             )
         return self._invoice_query_service
 
+    @property
+    def invoice_summary_query_service(self):
+        if self._invoice_summary_query_service is None:
+            from contract_costs.services.invoices.invoice_summary_query_service import (
+                InvoiceSummaryQueryService,
+            )
+            self._invoice_summary_query_service = InvoiceSummaryQueryService(
+                self._factory.invoice_summary_repository(
+                    invoice_repository=self.invoice_repository,
+                    invoice_line_repository=self.invoice_line_repository,
+                    company_repository=self.company_repository,
+                )
+            )
+        return self._invoice_summary_query_service
+
 
 _services: Dict[str, Services] = {}
 
@@ -104,7 +104,11 @@ def main(argv: list[str] | None = None) -> None:
     # ---------- ROUTING ----------
 
     if hasattr(args, "handler"):
-        args.handler(args)
+        from contract_costs.infrastructure.db.mysql_connection import close_pool
+        try:
+            args.handler(args)
+        finally:
+            close_pool()
         return
 
     # if args.command == "init":
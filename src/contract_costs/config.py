@@ -83,6 +83,7 @@ OWNERS_DIR = WORK_DIR / "companies"
 INVOICES_DIR = WORK_DIR / "invoices"
 INVOICE_INPUT_DIR = INVOICES_DIR / "incoming"
 INVOICE_FAILED_DIR = INVOICES_DIR / "failed"
+INVOICE_QUEUE_DB = INVOICES_DIR / "invoice_queue.sqlite3"
 
 # --- inputs (Excel jako UI) ---
 INPUTS_DIR = WORK_DIR / "inputs"
@@ -106,6 +107,18 @@ INPUTS_INVOICES_PROCESSED_DIR = INPUTS_INVOICES_DIR / "processed"
 REPORTS_DIR = WORK_DIR / "reports"
 LOGS_DIR = WORK_DIR / "logs"
 
+# --- cache (OCR / AI) ---
+CACHE_DIR = WORK_DIR / "cache"
+EXTRACTION_CACHE_DB = CACHE_DIR / "extraction_cache.sqlite3"
+EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", 256))
+
+# procesy OCR (0 = liczba rdzeni)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", 0))
+
+# stałe procesy pdfplumber; wymiana po N plikach lub po zawieszeniu
+PDFPLUMBER_WORKERS = int(os.getenv("PDFPLUMBER_WORKERS", 2))
+PDFPLUMBER_MAX_TASKS = int(os.getenv("PDFPLUMBER_MAX_TASKS", 100))
+
 # -------------------------------------------------
 # DATABASE
 # -------------------------------------------------
@@ -120,6 +133,32 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD"),
 }
 
+# pula połączeń (infrastructure.db.mysql_connection)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", 30))
+
+# cache kontraktów / cost nodes / cost types w procesie (sekundy, 0 = wyłączony)
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", 300))
+
+# indeks nazw firm (watcher): po tylu sekundach przebudowa z bazy, żeby
+# zobaczyć firmy zapisane przez inne procesy (0 = przy każdym wyszukiwaniu)
+COMPANY_NAME_INDEX_TTL = float(os.getenv("COMPANY_NAME_INDEX_TTL", 300))
+
+# -------------------------------------------------
+# AI (OpenAI) – worker pool + limity konta
+# -------------------------------------------------
+
+AI_WORKERS = int(os.getenv("AI_WORKERS", 4))
+# limit na jedną fakturę (OCR + API); musi być < INVOICE_QUEUE_VISIBILITY_TIMEOUT
+AI_JOB_TIMEOUT = float(os.getenv("AI_JOB_TIMEOUT", 180))
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", 500))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", 200_000))
+
+# trwała kolejka faktur (services.queue.invoice_queue)
+INVOICE_QUEUE_MAX_ATTEMPTS = int(os.getenv("INVOICE_QUEUE_MAX_ATTEMPTS", 3))
+INVOICE_QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("INVOICE_QUEUE_VISIBILITY_TIMEOUT", 600))
+
 # -------------------------------------------------
 # SAFETY CHECK
 # -------------------------------------------------
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiskCacheStats:
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key          TEXT PRIMARY KEY,
+    value        TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    accessed_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed
+    ON cache_entries (accessed_at);
+"""
+
+
+def cache_key(*parts: str) -> str:
+    """Stabilny klucz z dowolnych składowych (prompt, tekst, ustawienia...)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """
+    Cache tekstowy na dysku (SQLite) z limitem rozmiaru i eviction LRU.
+
+    Używany przez ekstrakcję PDF / OCR i wywołania AI – ponowne
+    przetworzenie tego samego pliku nie kosztuje CPU ani API.
+    """
+
+    def __init__(self, db_path: Path, *, max_bytes: int = 256 * 1024 * 1024) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self._db_path = db_path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self._max_bytes:
+            logger.debug("Value too large for cache (%d bytes), skipping", size)
+            return
+
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO cache_entries (key, value, size, accessed_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        size = excluded.size,
+                        accessed_at = excluded.accessed_at
+                    """,
+                    (key, value, size, time.time()),
+                )
+                self._evict(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def stats(self) -> DiskCacheStats:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        with self._lock:
+            return DiskCacheStats(
+                entries=entries,
+                size_bytes=size,
+                max_bytes=self._max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    # ---------- helpers ----------
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        if total <= self._max_bytes:
+            return
+
+        # najdawniej używane idą pierwsze, aż zmieścimy się w limicie
+        to_free = total - self._max_bytes
+        victims: list[str] = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+        ):
+            victims.append(key)
+            to_free -= size
+            if to_free <= 0:
+                break
+
+        conn.executemany(
+            "DELETE FROM cache_entries WHERE key = ?",
+            [(k,) for k in victims],
+        )
+        self._evictions += len(victims)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,35 @@
+from typing import Any, Iterable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# limit parametrów / rozmiaru pakietu dla IN (...)
+BATCH_SIZE = 1000
+
+
+def chunks(items: Sequence[T], size: int = BATCH_SIZE) -> list[Sequence[T]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def fetch_in(
+    cur: Any,
+    sql: str,
+    values: Iterable[Any],
+    *,
+    size: int = BATCH_SIZE,
+) -> list[dict]:
+    """
+    SELECT ... WHERE col IN (...) w paczkach po `size` parametrów.
+
+    `sql` zawiera znacznik {placeholders}, np.
+    "SELECT * FROM contracts WHERE id IN ({placeholders})".
+    Duplikaty wartości są pomijane, kolejność wierszy – jak zwróci baza.
+    """
+    unique = list(dict.fromkeys(values))
+    rows: list[dict] = []
+
+    for chunk in chunks(unique, size):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cur.execute(sql.format(placeholders=placeholders), tuple(chunk))
+        rows.extend(cur.fetchall())
+
+    return rows
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(RuntimeError):
+    """Brak wolnego połączenia w puli w zadanym czasie."""
+
+
+class PoolClosedError(RuntimeError):
+    """Pula została zamknięta (shutdown)."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    open: int
+    idle: int
+    in_use: int
+    checkouts: int
+    hits: int
+    created: int
+    waits: int
+    wait_seconds: float
+    health_failures: int
+
+
+class PooledConnection:
+    """
+    Proxy na surowe połączenie MySQL.
+
+    - close() / wyjście z `with` oddaje połączenie do puli zamiast je zamykać
+    - pozostałe atrybuty (cursor, commit, rollback, ...) są delegowane
+    """
+
+    def __init__(self, pool: "MySQLConnectionPool", raw: Any) -> None:
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name: str) -> Any:
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise AttributeError(f"Connection already returned to pool ({name})")
+        return getattr(raw, name)
+
+    def close(self) -> None:
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # siatka bezpieczeństwa dla kodu, który zapomniał o close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class MySQLConnectionPool:
+    """
+    Prosta, thread-safe pula połączeń.
+
+    - połączenie jest wydawane jednemu wątkowi naraz
+    - połączenia tworzone leniwie, maksymalnie `size`
+    - health check (ping) połączeń bezczynnych dłużej niż `ping_interval`
+    - przy oddaniu wycofujemy niezacommitowaną transakcję
+      (inaczej kolejny użytkownik widziałby stary snapshot REPEATABLE READ)
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        size: int = 5,
+        timeout: float = 30.0,
+        ping_interval: float = 30.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be >= 1")
+
+        self._connect = connect
+        self._size = size
+        self._timeout = timeout
+        self._ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._open = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._hits = 0
+        self._created = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._health_failures = 0
+
+    # ---------- checkout ----------
+
+    def acquire(self) -> PooledConnection:
+        deadline = time.monotonic() + self._timeout
+        waited = False
+        wait_started = 0.0
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed")
+
+                    if self._idle:
+                        raw, last_used = self._idle.pop()
+                        self._checkouts += 1
+                        break
+
+                    if self._open < self._size:
+                        self._open += 1
+                        self._checkouts += 1
+                        raw, last_used = None, 0.0
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No free DB connection after {self._timeout}s "
+                            f"(pool size={self._size})"
+                        )
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._waits += 1
+                    self._cond.wait(remaining)
+
+                if waited:
+                    self._wait_seconds += time.monotonic() - wait_started
+                    waited = False
+
+            if raw is None:
+                return PooledConnection(self, self._create())
+
+            if self._is_healthy(raw, last_used):
+                with self._cond:
+                    self._hits += 1
+                return PooledConnection(self, raw)
+
+            # martwe połączenie -> wyrzucamy i próbujemy dalej
+            self._discard(raw)
+            with self._cond:
+                self._health_failures += 1
+
+    def release(self, raw: Any) -> None:
+        try:
+            if getattr(raw, "in_transaction", False):
+                raw.rollback()
+        except Exception:
+            logger.warning("Rollback on release failed, dropping connection", exc_info=True)
+            self._discard(raw)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+                self._close_raw(raw)
+            else:
+                self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    # ---------- lifecycle ----------
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+        logger.info("DB pool closed: %s", self.stats())
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return PoolStats(
+                size=self._size,
+                open=self._open,
+                idle=len(self._idle),
+                in_use=self._open - len(self._idle),
+                checkouts=self._checkouts,
+                hits=self._hits,
+                created=self._created,
+                waits=self._waits,
+                wait_seconds=self._wait_seconds,
+                health_failures=self._health_failures,
+            )
+
+    # ---------- helpers ----------
+
+    def _create(self) -> Any:
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._created += 1
+        return raw
+
+    def _is_healthy(self, raw: Any, last_used: float) -> bool:
+        if time.monotonic() - last_used < self._ping_interval:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            logger.info("Stale DB connection detected, reconnecting")
+            return False
+
+    def _discard(self, raw: Any) -> None:
+        self._close_raw(raw)
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_raw(raw: Any) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
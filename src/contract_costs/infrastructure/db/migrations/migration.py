@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Jedna wersja schematu.
+
+    upgrade(conn) musi być idempotentne – baza postawiona z aktualnego
+    schema.sql ma już zmiany, a migrate i tak je przejdzie.
+    """
+    version: int
+    name: str
+    upgrade: Callable[[Any], None]
+
+    @property
+    def label(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+
+# ---------- helpers dla migracji ----------
+
+def table_exists(cur, table: str) -> bool:
+    cur.execute(
+        """
+        SELECT 1 FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,),
+    )
+    return cur.fetchone() is not None
+
+
+def column_exists(cur, table: str, column: str) -> bool:
+    cur.execute(
+        """
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (table, column),
+    )
+    return cur.fetchone() is not None
+
+
+def index_exists(cur, table: str, index: str) -> bool:
+    cur.execute(
+        """
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+        """,
+        (table, index),
+    )
+    return cur.fetchone() is not None
+
+
+def add_index(cur, table: str, index: str, columns: str) -> None:
+    if not index_exists(cur, table, index):
+        cur.execute(f"CREATE INDEX `{index}` ON `{table}` ({columns})")
+
+
+def add_column(cur, table: str, column: str, definition: str) -> None:
+    if not column_exists(cur, table, column):
+        cur.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}")
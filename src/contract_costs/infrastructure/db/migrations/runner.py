@@ -0,0 +1,120 @@
+import logging
+from typing import Any, Callable
+
+from contract_costs.infrastructure.db.migrations import (
+    v0001_hot_query_indexes,
+    v0002_company_match_keys,
+    v0003_snapshot_history_index,
+    v0004_cost_node_hierarchy,
+    v0005_invoice_file_hashes,
+    v0006_cost_change_tracking,
+)
+from contract_costs.infrastructure.db.migrations.migration import Migration
+
+logger = logging.getLogger(__name__)
+
+# kolejność = kolejność wykonania; nowe migracje dopisujemy na końcu
+MIGRATIONS: list[Migration] = [
+    v0001_hot_query_indexes.MIGRATION,
+    v0002_company_match_keys.MIGRATION,
+    v0003_snapshot_history_index.MIGRATION,
+    v0004_cost_node_hierarchy.MIGRATION,
+    v0005_invoice_file_hashes.MIGRATION,
+    v0006_cost_change_tracking.MIGRATION,
+]
+
+LOCK_NAME = "contract_costs_migrate"
+LOCK_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS `schema_migrations` (
+  `version` int NOT NULL,
+  `name` varchar(128) NOT NULL,
+  `applied_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+"""
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+class MigrationRunner:
+    """
+    Wersjonowane migracje schematu (tabela schema_migrations).
+
+    - migracje wykonywane rosnąco po wersji, każda raz
+    - wersja zapisywana dopiero po udanym upgrade (DDL w MySQL
+      i tak commituje się sam – migracje muszą być idempotentne)
+    - GET_LOCK chroni przed dwoma równoległymi migrate
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any] | None = None,
+        migrations: list[Migration] | None = None,
+    ) -> None:
+        if connection_factory is None:
+            from contract_costs.infrastructure.db.mysql_connection import get_connection
+            connection_factory = get_connection
+
+        self._connect = connection_factory
+        self._migrations = list(MIGRATIONS if migrations is None else migrations)
+
+        versions = [m.version for m in self._migrations]
+        if versions != sorted(set(versions)):
+            raise MigrationError(f"Migration versions must be unique and ascending: {versions}")
+
+    @property
+    def migrations(self) -> list[Migration]:
+        return list(self._migrations)
+
+    def applied_versions(self) -> set[int]:
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_SCHEMA)
+                cur.execute("SELECT version FROM schema_migrations")
+                rows = cur.fetchall()
+        return {row[0] for row in rows}
+
+    def pending(self) -> list[Migration]:
+        applied = self.applied_versions()
+        return [m for m in self._migrations if m.version not in applied]
+
+    def migrate(self, target: int | None = None) -> list[Migration]:
+        """Wykonuje oczekujące migracje (do `target` włącznie). Zwraca wykonane."""
+        done: list[Migration] = []
+
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+                (locked,) = cur.fetchone()
+                if locked != 1:
+                    raise MigrationError("Another migration is running")
+
+            try:
+                for migration in self.pending():
+                    if target is not None and migration.version > target:
+                        break
+
+                    logger.info("Applying migration %s", migration.label)
+                    try:
+                        migration.upgrade(conn)
+                        with conn.cursor() as cur:
+                            cur.execute(
+                                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                                (migration.version, migration.name),
+                            )
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        raise MigrationError(f"Migration {migration.label} failed: {e}") from e
+
+                    done.append(migration)
+            finally:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                    cur.fetchone()
+
+        return done
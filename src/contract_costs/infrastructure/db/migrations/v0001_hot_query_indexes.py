@@ -0,0 +1,14 @@
+from contract_costs.infrastructure.db.migrations.migration import Migration, add_index
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        # get_by_invoice_number (prefiks) + get_unique_invoice
+        add_index(cur, "invoices", "ix_invoices_number_seller", "`invoice_number`, `seller_id`")
+        # get_for_assignment: WHERE status IN (...) ORDER BY invoice_date
+        add_index(cur, "invoices", "ix_invoices_status_date", "`status`, `invoice_date`")
+        # cost_node.get_by_code – unikalny klucz to (contract_id, code)
+        add_index(cur, "cost_nodes", "ix_cost_nodes_code", "`code`")
+
+
+MIGRATION = Migration(1, "hot_query_indexes", upgrade)
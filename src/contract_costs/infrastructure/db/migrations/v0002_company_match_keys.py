@@ -0,0 +1,45 @@
+import logging
+
+from contract_costs.infrastructure.db.migrations.migration import (
+    Migration,
+    add_column,
+    add_index,
+    table_exists,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        add_column(cur, "companies", "bank_account_key", "varchar(32) DEFAULT NULL")
+        add_column(cur, "companies", "phone_key", "varchar(16) DEFAULT NULL")
+        add_column(cur, "companies", "email_key", "varchar(64) DEFAULT NULL")
+
+        add_index(cur, "companies", "ix_companies_bank_account_key", "`bank_account_key`")
+        add_index(cur, "companies", "ix_companies_phone_key", "`phone_key`")
+        add_index(cur, "companies", "ix_companies_email_key", "`email_key`")
+
+        if not table_exists(cur, "company_street_tokens"):
+            cur.execute(
+                """
+                CREATE TABLE `company_street_tokens` (
+                  `token` varchar(64) NOT NULL,
+                  `company_id` char(36) NOT NULL,
+                  PRIMARY KEY (`token`,`company_id`),
+                  KEY `ix_company_street_tokens_company` (`company_id`),
+                  CONSTRAINT `fk_company_street_tokens_company`
+                    FOREIGN KEY (`company_id`) REFERENCES `companies` (`id`) ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+                """
+            )
+
+    # klucze liczone w Pythonie (te same reguły co providery); na połączeniu
+    # migracji – pod GET_LOCK i w jej obsłudze błędów (commit robi runner)
+    from contract_costs.repository.mysql.company_repository import MySQLCompanyRepository
+
+    count = MySQLCompanyRepository().rebuild_match_keys(conn)
+    logger.info("Company match keys rebuilt for %d companies", count)
+
+
+MIGRATION = Migration(2, "company_match_keys", upgrade)
@@ -0,0 +1,15 @@
+from contract_costs.infrastructure.db.migrations.migration import Migration, add_index
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        # list_latest_before / list_history / zastępowanie dnia w add_many
+        add_index(
+            cur,
+            "cost_progress_snapshots",
+            "ix_snapshots_contract_date",
+            "`contract_id`, `snapshot_date`",
+        )
+
+
+MIGRATION = Migration(3, "snapshot_history_index", upgrade)
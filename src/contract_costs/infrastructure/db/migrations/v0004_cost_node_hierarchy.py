@@ -0,0 +1,46 @@
+import logging
+
+from contract_costs.infrastructure.db.migrations.migration import (
+    Migration,
+    add_column,
+    add_index,
+    table_exists,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        add_column(cur, "cost_nodes", "depth", "int NOT NULL DEFAULT 0")
+        add_column(cur, "cost_nodes", "is_leaf", "tinyint(1) NOT NULL DEFAULT 1")
+        # list_leaves / list_leaf_nodes_for_active_contracts / raport liści
+        add_index(cur, "cost_nodes", "ix_cost_nodes_contract_leaf", "`contract_id`, `is_leaf`")
+
+        if not table_exists(cur, "cost_node_closure"):
+            cur.execute(
+                """
+                CREATE TABLE `cost_node_closure` (
+                  `contract_id` char(36) NOT NULL,
+                  `ancestor_id` char(36) NOT NULL,
+                  `descendant_id` char(36) NOT NULL,
+                  `distance` int NOT NULL,
+                  PRIMARY KEY (`ancestor_id`,`descendant_id`),
+                  KEY `ix_cost_node_closure_descendant` (`descendant_id`,`distance`),
+                  KEY `ix_cost_node_closure_contract` (`contract_id`),
+                  CONSTRAINT `fk_cost_node_closure_ancestor`
+                    FOREIGN KEY (`ancestor_id`) REFERENCES `cost_nodes` (`id`) ON DELETE CASCADE,
+                  CONSTRAINT `fk_cost_node_closure_descendant`
+                    FOREIGN KEY (`descendant_id`) REFERENCES `cost_nodes` (`id`) ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+                """
+            )
+
+    from contract_costs.repository.mysql.cost_node_repository import MySQLCostNodeRepository
+
+    # na połączeniu migracji (commit robi runner)
+    count = MySQLCostNodeRepository().rebuild_hierarchy(conn)
+    logger.info("Cost node hierarchy rebuilt for %d contracts", count)
+
+
+MIGRATION = Migration(4, "cost_node_hierarchy", upgrade)
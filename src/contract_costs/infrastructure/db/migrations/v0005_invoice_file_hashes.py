@@ -0,0 +1,29 @@
+from contract_costs.infrastructure.db.migrations.migration import Migration, table_exists
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        # deduplikacja PDF po treści (ParseInvoiceFromFileService)
+        if not table_exists(cur, "invoice_file_hashes"):
+            cur.execute(
+                """
+                CREATE TABLE `invoice_file_hashes` (
+                  `sha256` char(64) NOT NULL,
+                  `file_name` varchar(255) NOT NULL,
+                  `outcome` varchar(32) NOT NULL,
+                  `invoice_id` char(36) DEFAULT NULL,
+                  `invoice_number` varchar(128) DEFAULT NULL,
+                  `parse_result` json DEFAULT NULL,
+                  `hit_count` int NOT NULL DEFAULT '0',
+                  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+                  `last_hit_at` timestamp NULL DEFAULT NULL,
+                  PRIMARY KEY (`sha256`),
+                  KEY `fk_invoice_file_hash_invoice` (`invoice_id`),
+                  CONSTRAINT `fk_invoice_file_hash_invoice`
+                    FOREIGN KEY (`invoice_id`) REFERENCES `invoices` (`id`) ON DELETE SET NULL
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+                """
+            )
+
+
+MIGRATION = Migration(5, "invoice_file_hashes", upgrade)
@@ -0,0 +1,27 @@
+from contract_costs.infrastructure.db.migrations.migration import (
+    Migration,
+    add_column,
+    add_index,
+)
+
+UPDATED_AT = "timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+
+
+def upgrade(conn) -> None:
+    with conn.cursor() as cur:
+        # zmiany po znaczniku snapshotu -> pełne przeliczenie kontraktu
+        add_column(cur, "invoice_lines", "updated_at", UPDATED_AT)
+        add_column(cur, "invoices", "updated_at", UPDATED_AT)
+        add_column(cur, "cost_nodes", "updated_at", UPDATED_AT)
+
+        add_index(cur, "invoice_lines", "ix_invoice_lines_contract_created", "`contract_id`, `created_at`")
+        add_index(cur, "invoice_lines", "ix_invoice_lines_contract_updated", "`contract_id`, `updated_at`")
+        add_index(cur, "invoices", "ix_invoices_updated", "`updated_at`")
+        add_index(cur, "cost_nodes", "ix_cost_nodes_contract_updated", "`contract_id`, `updated_at`")
+
+        # znacznik linii policzonych w snapshocie (wiersz kontraktu)
+        add_column(cur, "cost_progress_snapshots", "counted_at", "timestamp NULL DEFAULT NULL")
+        add_column(cur, "cost_progress_snapshots", "counted_lines", "int DEFAULT NULL")
+
+
+MIGRATION = Migration(6, "cost_change_tracking", upgrade)
@@ -1,6 +1,149 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
 import mysql.connector
-from contract_costs.config import DB_CONFIG
+from contract_costs.config import (
+    DB_CONFIG,
+    DB_POOL_PING_INTERVAL,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+from contract_costs.infrastructure.db.connection_pool import (
+    MySQLConnectionPool,
+    PooledConnection,
+    PoolStats,
+)
+
+logger = logging.getLogger(__name__)
+
+_pool: MySQLConnectionPool | None = None
+_pool_pid: int | None = None
+_lock = threading.Lock()
+
+# aktywna transakcja (unit of work) bieżącego wątku
+_local = threading.local()
+
+
+def _connect_args() -> dict:
+    args: dict = dict(DB_CONFIG)
+    # połączenie jest współdzielone (pula / UoW) – nieodczytane wiersze
+    # po fetchone() nie mogą blokować kolejnego zapytania
+    args.setdefault("consume_results", True)
+    return args
+
+
+def get_pool() -> MySQLConnectionPool:
+    """
+    Zwraca pulę współdzieloną przez wszystkie repozytoria MySQL.
+
+    Pula jest per-proces: po fork (np. worker AI w multiprocessing)
+    dziecko tworzy własną pulę i nie dotyka socketów rodzica.
+    """
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _lock:
+        if _pool is None or _pool_pid != pid:
+            connect_args = _connect_args()
+            _pool = MySQLConnectionPool(
+                lambda: mysql.connector.connect(**connect_args),
+                size=DB_POOL_SIZE,
+                timeout=DB_POOL_TIMEOUT,
+                ping_interval=DB_POOL_PING_INTERVAL,
+            )
+            _pool_pid = pid
+            logger.debug("DB pool created (pid=%s)", pid)
+        return _pool
+
+
+class TransactionConnection:
+    """
+    Połączenie wydawane repozytoriom wewnątrz transaction().
+
+    commit() i close() są no-op – zatwierdza / oddaje do puli
+    dopiero transaction() na końcu bloku.
+    """
+
+    def __init__(self, conn: PooledConnection) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TransactionConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+def get_connection() -> PooledConnection | TransactionConnection:
+    """
+    Pobiera połączenie z puli.
+    close() / wyjście z `with` oddaje je do puli.
+
+    Wewnątrz transaction() zwraca połączenie transakcji.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return TransactionConnection(conn)
+    return get_pool().acquire()
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """
+    Unit of work: wszystkie zapisy repozytoriów MySQL w tym wątku
+    idą jednym połączeniem i jednym commitem.
+
+    - wyjątek -> rollback całości
+    - zagnieżdżone transaction() dołącza do zewnętrznej
+    """
+    if getattr(_local, "conn", None) is not None:
+        yield
+        return
+
+    conn = get_pool().acquire()
+    _local.conn = conn
+    try:
+        yield
+        conn.commit()
+    except BaseException:
+        logger.warning("Transaction rolled back")
+        conn.rollback()
+        raise
+    finally:
+        _local.conn = None
+        conn.close()
+
+
+def pool_stats() -> PoolStats | None:
+    if _pool is None or _pool_pid != os.getpid():
+        return None
+    return _pool.stats()
+
+
+def close_pool() -> None:
+    """Zamyka pulę przy wyłączaniu aplikacji (CLI / watcher)."""
+    global _pool, _pool_pid
 
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            return
+        pool = _pool
+        _pool = None
+        _pool_pid = None
 
-def get_connection():
-    return mysql.connector.connect(**DB_CONFIG)
+    pool.close()
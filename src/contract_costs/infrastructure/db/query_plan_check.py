@@ -0,0 +1,151 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from contract_costs.repository.mysql import company_repository as companies
+from contract_costs.repository.mysql import contract_repository as contracts
+from contract_costs.repository.mysql import cost_node_repository as cost_nodes
+from contract_costs.repository.mysql import cost_type_repository as cost_types
+from contract_costs.repository.mysql import invoice_line_repository as invoice_lines
+from contract_costs.repository.mysql import invoice_repository as invoices
+
+logger = logging.getLogger(__name__)
+
+# przykładowe wartości parametrów – EXPLAIN patrzy na plan, nie na dane
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass(frozen=True)
+class RepositoryQuery:
+    name: str
+    sql: str
+    params: tuple = ()
+
+
+@dataclass(frozen=True)
+class QueryPlanIssue:
+    query: str
+    table: str
+    access_type: str
+    rows: int | None
+    key: str | None
+
+
+# zapytania repozytoriów MySQL wykonywane per faktura / per firma – SQL
+# brany z modułów repozytoriów (te same stałe wykonuje repozytorium);
+# świadome pełne skany (list_all, list_invoices, eksporty) nie trafiają tutaj
+HOT_QUERIES: list[RepositoryQuery] = [
+    RepositoryQuery(
+        "invoice.get_by_invoice_number",
+        invoices.GET_BY_INVOICE_NUMBER_SQL,
+        ("FV/1/2024",),
+    ),
+    RepositoryQuery(
+        "invoice.get_unique_invoice",
+        invoices.GET_UNIQUE_INVOICE_SQL,
+        ("FV/1/2024", SAMPLE_ID),
+    ),
+    RepositoryQuery(
+        "invoice.get_for_assignment",
+        invoices.GET_FOR_ASSIGNMENT_SQL.format(placeholders="%s"),
+        ("new",),
+    ),
+    RepositoryQuery(
+        "invoice_line.list_by_invoice",
+        invoice_lines.LIST_BY_INVOICE_SQL,
+        (SAMPLE_ID,),
+    ),
+    RepositoryQuery(
+        "invoice_line.list_by_contract",
+        invoice_lines.LIST_BY_CONTRACT_SQL,
+        (SAMPLE_ID,),
+    ),
+    RepositoryQuery(
+        "company.get_by_tax_number",
+        companies.GET_BY_TAX_NUMBER_SQL,
+        ("1234567890",),
+    ),
+    RepositoryQuery(
+        "company.find_by_bank_account",
+        companies.FIND_BY_BANK_ACCOUNT_SQL,
+        ("61109010140000071219812874",),
+    ),
+    RepositoryQuery(
+        "company.find_by_email",
+        companies.FIND_BY_EMAIL_SQL,
+        ("biuro@example.com",),
+    ),
+    RepositoryQuery(
+        "company.find_by_phone",
+        companies.FIND_BY_PHONE_SQL,
+        ("600100200",),
+    ),
+    RepositoryQuery(
+        "company.find_by_street_tokens",
+        companies.find_by_street_tokens_sql(2),
+        (companies.like_prefix("RYNEK"), companies.like_prefix("28")) * 2,
+    ),
+    RepositoryQuery(
+        "cost_node.list_by_contract",
+        cost_nodes.LIST_BY_CONTRACT_SQL,
+        (SAMPLE_ID,),
+    ),
+    RepositoryQuery(
+        "cost_node.get_by_code",
+        cost_nodes.GET_BY_CODE_SQL,
+        ("K001_01",),
+    ),
+    RepositoryQuery(
+        "contract.get_by_code",
+        contracts.GET_BY_CODE_SQL,
+        ("K001",),
+    ),
+    RepositoryQuery(
+        "cost_type.get_by_code",
+        cost_types.GET_BY_CODE_SQL,
+        ("MAT",),
+    ),
+]
+
+
+def find_full_scans(query: RepositoryQuery, plan: list[dict]) -> list[QueryPlanIssue]:
+    """Wiersze EXPLAIN z type=ALL na tabeli bazowej (derived <...> pomijamy)."""
+    issues = []
+    for row in plan:
+        table = row.get("table") or ""
+        if row.get("type") != "ALL" or table.startswith("<"):
+            continue
+        issues.append(
+            QueryPlanIssue(
+                query=query.name,
+                table=table,
+                access_type=row["type"],
+                rows=row.get("rows"),
+                key=row.get("key"),
+            )
+        )
+    return issues
+
+
+def check_query_plans(
+    queries: list[RepositoryQuery] | None = None,
+    connection_factory: Callable[[], Any] | None = None,
+) -> list[QueryPlanIssue]:
+    """Uruchamia EXPLAIN dla zapytań repozytoriów i zwraca pełne skany tabel."""
+    if connection_factory is None:
+        from contract_costs.infrastructure.db.mysql_connection import get_connection
+        connection_factory = get_connection
+
+    issues: list[QueryPlanIssue] = []
+
+    with connection_factory() as conn:
+        with conn.cursor(dictionary=True) as cur:
+            for query in HOT_QUERIES if queries is None else queries:
+                cur.execute(f"EXPLAIN {query.sql}", query.params)
+                plan = cur.fetchall()
+                found = find_full_scans(query, plan)
+                if found:
+                    logger.warning("Full table scan in %s", query.name)
+                issues.extend(found)
+
+    return issues
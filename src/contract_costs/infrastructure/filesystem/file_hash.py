@@ -0,0 +1,13 @@
+import hashlib
+from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(file_path: Path) -> str:
+    """SHA-256 treści pliku (czytane porcjami – bez ładowania całego PDF)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
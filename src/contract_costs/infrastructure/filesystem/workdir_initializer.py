@@ -18,6 +18,7 @@ class WorkDirInitializer:
             cfg.INPUTS_INVOICES_PROCESSED_DIR,
             cfg.REPORTS_DIR,
             cfg.LOGS_DIR,
+            cfg.CACHE_DIR,
         ]
 
         for d in dirs:
@@ -1,32 +1,53 @@
 import json
 import os
 import re
-from openai import OpenAI
-
-
-import json
-import os
-import re
-import time
 import logging
+import time
 from openai import OpenAI
 from openai import RateLimitError
 
+from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache, cache_key
+from contract_costs.infrastructure.rate_limiter import TokenBucketRateLimiter
 from contract_costs.model.company import Company
 from contract_costs.services.invoices.dto.parse import CompanyInput
 
 logger = logging.getLogger(__name__)
 
+MODEL = "gpt-4.1-mini"
+
+# szacunek tokenów odpowiedzi (JSON faktury) doliczany do limitu TPM
+RESPONSE_TOKENS_ESTIMATE = 1000
+
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
 
 class OpenAIInvoiceClient:
-    def __init__(self, schema: dict | None =None, prompt_template: str | None=None) -> None:
+    def __init__(
+        self,
+        schema: dict | None =None,
+        prompt_template: str | None=None,
+        *,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        max_retries: int = 5,
+        request_timeout: float = 120.0,
+        cache: DiskLRUCache | None = None,
+    ) -> None:
         self._schema = schema
         self._prompt_template = prompt_template
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._max_retries = max_retries
 
         if not os.getenv("OPENAI_API_KEY"):
             raise RuntimeError("OPENAI_API_KEY not set")
 
-        self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # retry po 429 robimy sami (wspólny limiter), nie SDK
+        self._client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0,
+            timeout=request_timeout,
+        )
 
     def extract(self, text: str) -> dict:
         if not self._prompt_template or not self._schema:
@@ -37,22 +58,81 @@ class OpenAIInvoiceClient:
             .replace("{TEXT}", text[:6000])
         )
 
+        key = cache_key("ai-extract", MODEL, prompt)
+        cached = self._cache.get(key) if self._cache else None
+        if cached is not None:
+            logger.info("AI extraction taken from cache")
+            return self._clean_json(cached)
+
         try:
-            response = self._client.responses.create(
-                model="gpt-4.1-mini",
-                input=prompt,
-            )
-        except RateLimitError as e:
-            logger.warning(
-                "OpenAI rate limit hit, backing off for 20s"
-            )
-            time.sleep(20)
-            raise  # WAŻNE – worker musi to zobaczyć
+            output = self._create_response(prompt)
         except Exception:
             logger.exception("OpenAI request failed")
-            raise
+            raise  # WAŻNE – worker musi to zobaczyć
+
+        result = self._clean_json(output)
+        # do cache tylko odpowiedź, z której dało się wyciągnąć JSON
+        if self._cache:
+            self._cache.set(key, output)
+        return result
 
-        return self._clean_json(response.output_text)
+    def _create_response(self, prompt: str) -> str:
+        """
+        Wywołanie API przez wspólny limiter RPM/TPM.
+        Szacunek tokenów z acquire() jest po odpowiedzi rozliczany
+        z response.usage (settle), żeby kubełek nie odjeżdżał od TPM konta.
+        429 -> backoff całego limitera (retry-after z nagłówków
+        lub wykładniczo) i ponowienie, max `max_retries` razy.
+        """
+        estimated_tokens = len(prompt) // 4 + RESPONSE_TOKENS_ESTIMATE
+
+        attempt = 0
+        while True:
+            if self._rate_limiter:
+                self._rate_limiter.acquire(estimated_tokens)
+            try:
+                response = self._client.responses.create(
+                    model=MODEL,
+                    input=prompt,
+                )
+                self._settle_usage(estimated_tokens, response)
+                return response.output_text
+            except RateLimitError as e:
+                if attempt == self._max_retries:
+                    raise
+                delay = self._retry_after(e) or min(
+                    BACKOFF_BASE_SECONDS * 2 ** attempt,
+                    BACKOFF_MAX_SECONDS,
+                )
+                logger.warning(
+                    "OpenAI rate limit hit (attempt %d/%d), backing off for %.1fs",
+                    attempt + 1,
+                    self._max_retries,
+                    delay,
+                )
+                if self._rate_limiter:
+                    self._rate_limiter.backoff(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+
+    def _settle_usage(self, estimated_tokens: int, response) -> None:
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None)
+        if self._rate_limiter and used is not None:
+            self._rate_limiter.settle(estimated_tokens, used)
+
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> float | None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+        return None
 
     def _schema_as_text(self) -> str:
         if not self._schema:
@@ -184,11 +264,7 @@ class OpenAIInvoiceClient:
     """
 
     def _call_llm(self, prompt: str) -> str:
-        response = self._client.responses.create(
-            model="gpt-4.1-mini",
-            input=prompt,
-        )
-        return response.output_text
+        return self._create_response(prompt)
     @staticmethod
     def _parse_company_resolution(raw: str) -> dict | None:
         match = re.search(r"\{.*}", raw, re.S)
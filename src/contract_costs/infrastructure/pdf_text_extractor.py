@@ -1,5 +1,10 @@
 import logging
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 
 
 import cv2
@@ -7,11 +12,19 @@ import numpy as np
 
 import pytesseract #typed: ignore
 from pathlib import Path
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
-from multiprocessing import Process, Queue
 import pdfplumber
 
+from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache, cache_key
+from contract_costs.infrastructure.filesystem.file_hash import sha256_file
+from contract_costs.infrastructure.supervised_process_pool import (
+    SupervisedProcessPool,
+    WorkerCrashedError,
+    WorkerTaskError,
+    WorkerTimeoutError,
+)
+
 
 logger = logging.getLogger(__name__)
 
@@ -21,23 +34,91 @@ custom_config = r"""
 -c preserve_interword_spaces=1
 """
 
+OCR_DPI = 300
+OCR_LANG = "pol"
+PDFPLUMBER_TIMEOUT = 5
+
+# zmiana sposobu ekstrakcji = podbić wersję (unieważnia cache)
+EXTRACTOR_VERSION = "1"
+
+
+def _ocr_page(pdf_path: Path, page_number: int, tesseract_cmd: str) -> str:
+    """
+    Rasteryzacja + OCR jednej strony (proces puli OCR).
+    W pamięci jest tylko ta jedna strona.
+    """
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    images = convert_from_path(
+        pdf_path,
+        dpi=OCR_DPI,
+        fmt="png",
+        grayscale=True,
+        first_page=page_number,
+        last_page=page_number,
+    )
+    if not images:
+        return ""
+    return PdfTextExtractor._extract_with_ocr(images[0])
+
+
 class PdfTextExtractor:
+    def __init__(
+        self,
+        cache: DiskLRUCache | None = None,
+        ocr_workers: int | None = None,
+        pdfplumber_workers: int = 2,
+        pdfplumber_max_tasks: int = 100,
+    ) -> None:
+        self._cache = cache
+        # domyślnie tyle procesów OCR, ile rdzeni
+        self._ocr_workers = ocr_workers or os.cpu_count() or 1
+        self._ocr_pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        # stałe procesy pdfplumber (timeout per plik bez forka per plik)
+        self._pdfplumber_pool = SupervisedProcessPool(
+            PdfTextExtractor._pdfplumber_text,
+            size=pdfplumber_workers,
+            max_tasks=pdfplumber_max_tasks,
+        )
+
     def extract(self, pdf_path: Path) -> str:
-        text = self.extract_with_pdfplumber_safe(pdf_path, timeout=5)
+        if self._cache is None:
+            return self._extract(pdf_path)
+
+        key = cache_key(
+            "pdf-text",
+            sha256_file(pdf_path),
+            self._settings_fingerprint(),
+        )
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info("PDF text taken from cache: %s", pdf_path)
+            return cached
+
+        text = self._extract(pdf_path)
+        # pusty wynik (np. brak tesseracta) nie idzie do cache – retry ma sens
+        if text.strip():
+            self._cache.set(key, text)
+        return text
+
+    @staticmethod
+    def _settings_fingerprint() -> str:
+        return "|".join(
+            [EXTRACTOR_VERSION, str(OCR_DPI), OCR_LANG, custom_config, str(PDFPLUMBER_TIMEOUT)]
+        )
+
+    def _extract(self, pdf_path: Path) -> str:
+        text = self.extract_with_pdfplumber_safe(pdf_path, timeout=PDFPLUMBER_TIMEOUT)
         if text.strip():
             logger.info("PDF extractor used pdfplumber")
             return text
 
         logger.info("Fallback to OCR (tesseract)")
-        images = convert_from_path(     pdf_path,
-                                        dpi=300,          # MINIMUM
-                                        fmt="png",
-                                        grayscale=True)
+        page_texts = self._ocr_pages(pdf_path, self._page_count(pdf_path))
 
         texts = []
 
-        for i, img in enumerate(images, start=1):
-            page_text = self._extract_with_ocr(img)
+        for i, page_text in enumerate(page_texts, start=1):
             if page_text:
                 texts.append(
                     f"\n=== PAGE {i} ===\n{page_text}"
@@ -45,6 +126,60 @@ class PdfTextExtractor:
 
         return "\n".join(texts)
 
+    def close(self) -> None:
+        self._pdfplumber_pool.close()
+        with self._pool_lock:
+            pool, self._ocr_pool = self._ocr_pool, None
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _ocr_pages(self, pdf_path: Path, page_count: int) -> list[str]:
+        """
+        OCR strona po stronie (first_page/last_page), równolegle w puli
+        procesów – pamięć ograniczona do ~ocr_workers stron naraz.
+        """
+        pages = range(1, page_count + 1)
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+
+        if page_count > 1 and self._ocr_workers > 1:
+            pool = self._get_ocr_pool()
+            try:
+                return list(
+                    pool.map(
+                        _ocr_page, repeat(pdf_path), pages, repeat(tesseract_cmd)
+                    )
+                )
+            except BrokenProcessPool:
+                logger.exception("OCR pool broken, falling back to serial OCR")
+                self._discard_ocr_pool(pool)
+
+        return [_ocr_page(pdf_path, page, tesseract_cmd) for page in pages]
+
+    def _discard_ocr_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        Tylko pula OCR – następne _get_ocr_pool utworzy nową. Pula pdfplumber
+        zostaje (close() zamknąłby ją na stałe dla całego procesu watchera).
+        """
+        with self._pool_lock:
+            # inny wątek mógł już podmienić zepsutą pulę
+            if self._ocr_pool is pool:
+                self._ocr_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_ocr_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._ocr_pool is None:
+                self._ocr_pool = ProcessPoolExecutor(max_workers=self._ocr_workers)
+            return self._ocr_pool
+
+    @staticmethod
+    def _page_count(pdf_path: Path) -> int:
+        try:
+            return int(pdfinfo_from_path(str(pdf_path))["Pages"])
+        except Exception:
+            logger.warning("pdfinfo failed for %s, assuming single page", pdf_path)
+            return 1
+
     @staticmethod
     def _extract_with_pdfplumber(pdf_path: Path) -> str:
         text = ""
@@ -60,25 +195,14 @@ class PdfTextExtractor:
         except Exception:
             logging.exception("pdfplumber failed")
         return text
-    @staticmethod
-    def extract_with_pdfplumber_safe(pdf_path: Path, timeout: int = 5) -> str:
-        q: Queue = Queue()
-        p = Process(target=PdfTextExtractor._pdfplumber_worker, args=(pdf_path, q))
-        p.start()
-        p.join(timeout)
-
-        if p.is_alive():
-            logger.warning("pdfplumber timeout, killing process")
-            p.terminate()
-            p.join()
-            return ""
-
+    def extract_with_pdfplumber_safe(self, pdf_path: Path, timeout: int = 5) -> str:
         try:
-            return q.get_nowait()
-        except Exception:
-            return ""
-
-
+            return self._pdfplumber_pool.run(pdf_path, timeout=timeout)
+        except WorkerTimeoutError:
+            logger.warning("pdfplumber timeout, worker recycled: %s", pdf_path)
+        except (WorkerCrashedError, WorkerTaskError):
+            logger.exception("pdfplumber worker failed: %s", pdf_path)
+        return ""
 
     @staticmethod
     def _extract_with_ocr(image: Image.Image) -> str:
@@ -107,7 +231,7 @@ class PdfTextExtractor:
 
             text = pytesseract.image_to_string(
                 thresh,
-                lang="pol",
+                lang=OCR_LANG,
                 config=custom_config
             )
 
@@ -155,7 +279,8 @@ class PdfTextExtractor:
     #         q.put("")
 
     @staticmethod
-    def _pdfplumber_worker(pdf_path: Path, q: Queue):
+    def _pdfplumber_text(pdf_path: Path) -> str:
+        """Uruchamiane w procesie puli pdfplumber."""
         try:
             text_parts: list[str] = []
 
@@ -221,10 +346,9 @@ class PdfTextExtractor:
 
             # ❌ jeśli NIE udało się wydobyć pełnego tekstu z żadnej strony
             if not text_parts:
-                q.put("")
-            else:
-                q.put("\n\n".join(text_parts))
+                return ""
+            return "\n\n".join(text_parts)
 
         except Exception:
-            q.put("")
+            return ""
 
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    requests: int
+    tokens: int
+    waits: int
+    wait_seconds: float
+    backoffs: int
+
+
+class TokenBucketRateLimiter:
+    """
+    Wspólny limiter dla wszystkich workerów AI (thread-safe).
+
+    Dwa kubełki odnawiane w sposób ciągły:
+    - requests per minute (RPM)
+    - tokens per minute (TPM)
+
+    acquire() blokuje, aż oba kubełki mają pojemność.
+    settle() koryguje kubełek TPM o różnicę między szacunkiem
+    z acquire() a faktycznym zużyciem z odpowiedzi API.
+    backoff() (np. po 429) wstrzymuje wszystkich wywołujących
+    do upływu podanego czasu.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rpm < 1 or tpm < 1:
+            raise ValueError("rpm and tpm must be >= 1")
+
+        self._rpm = rpm
+        self._tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+        self._acquired_requests = 0
+        self._acquired_tokens = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._backoffs = 0
+
+    def acquire(self, tokens: int = 1) -> None:
+        tokens = self._cap(tokens)
+        waited = False
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+
+                delay = self._paused_until - now
+                if delay <= 0:
+                    delay = max(
+                        (1 - self._requests) * 60 / self._rpm,
+                        (tokens - self._tokens) * 60 / self._tpm,
+                    )
+
+                if delay <= 0:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    self._acquired_requests += 1
+                    self._acquired_tokens += tokens
+                    return
+
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                self._wait_seconds += delay
+
+            self._sleep(delay)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """
+        Rozliczenie po odpowiedzi: `reserved` – wartość przekazana do
+        acquire(), `used` – tokeny z usage odpowiedzi. Niedoszacowanie
+        zadłuża kubełek (kolejne acquire() poczekają), nadwyżka wraca.
+        """
+        difference = max(0, used) - self._cap(reserved)
+        if difference == 0:
+            return
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tpm, self._tokens - difference)
+            self._acquired_tokens += difference
+
+    def backoff(self, seconds: float) -> None:
+        """Wstrzymuje limiter (wszystkie wątki) na `seconds`."""
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._backoffs += 1
+            # po 429 nie ufamy lokalnemu stanowi kubełka
+            self._requests = min(self._requests, 0.0)
+        logger.warning("Rate limit backoff: %.1fs", seconds)
+
+    def stats(self) -> RateLimiterStats:
+        with self._lock:
+            return RateLimiterStats(
+                requests=self._acquired_requests,
+                tokens=self._acquired_tokens,
+                waits=self._waits,
+                wait_seconds=self._wait_seconds,
+                backoffs=self._backoffs,
+            )
+
+    def _cap(self, tokens: int) -> int:
+        # pojedyncze żądanie większe niż TPM nigdy by nie przeszło
+        return max(1, min(tokens, self._tpm))
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed <= 0:
+            return
+        self._updated = now
+        self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60)
+        self._tokens = min(self._tpm, self._tokens + elapsed * self._tpm / 60)
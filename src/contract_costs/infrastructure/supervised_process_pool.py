@@ -0,0 +1,227 @@
+import logging
+import multiprocessing
+import threading
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerTimeoutError(RuntimeError):
+    """Zadanie nie skończyło się w czasie – worker został zabity."""
+
+
+class WorkerCrashedError(RuntimeError):
+    """Proces workera umarł w trakcie zadania."""
+
+
+class WorkerTaskError(RuntimeError):
+    """Zadanie rzuciło wyjątek wewnątrz workera."""
+
+
+class WorkerPoolClosedError(RuntimeError):
+    """Pula została zamknięta (shutdown)."""
+
+
+@dataclass(frozen=True)
+class SupervisedPoolStats:
+    size: int
+    alive: int
+    idle: int
+    tasks: int
+    spawned: int
+    recycled: int
+    timeouts: int
+    crashes: int
+
+
+def _worker_main(conn: Connection, target: Callable[[Any], Any]) -> None:
+    """Pętla procesu workera: zadanie z pipe -> wynik do pipe."""
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        try:
+            conn.send((True, target(task)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, process: multiprocessing.Process, conn: Connection) -> None:
+        self.process = process
+        self.conn = conn
+        self.tasks = 0
+
+
+class SupervisedProcessPool:
+    """
+    Długożyjące procesy robocze dla zadań, które mogą się zawiesić
+    (np. pdfplumber na uszkodzonym PDF).
+
+    - proces startuje raz (importy pdfplumber itp. płacimy raz)
+    - każde zadanie ma timeout; zawieszony worker jest zabijany
+      i zastępowany nowym przy następnym zadaniu
+    - po `max_tasks` zadaniach worker jest wymieniany (wycieki pamięci)
+    - wynik wraca przez pipe
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        *,
+        size: int = 2,
+        max_tasks: int = 100,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be >= 1")
+
+        self._target = target
+        self._size = size
+        self._max_tasks = max_tasks
+
+        self._cond = threading.Condition()
+        self._idle: list[_Worker] = []
+        self._alive = 0
+        self._closed = False
+
+        self._tasks = 0
+        self._spawned = 0
+        self._recycled = 0
+        self._timeouts = 0
+        self._crashes = 0
+
+    def run(self, task: Any, timeout: float) -> Any:
+        worker = self._checkout()
+
+        try:
+            worker.conn.send(task)
+            if not worker.conn.poll(timeout):
+                self._kill(worker)
+                with self._cond:
+                    self._timeouts += 1
+                raise WorkerTimeoutError(f"Task exceeded {timeout}s, worker killed")
+            ok, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            self._kill(worker)
+            with self._cond:
+                self._crashes += 1
+            raise WorkerCrashedError("Worker process died during task")
+
+        worker.tasks += 1
+        with self._cond:
+            self._tasks += 1
+
+        if worker.tasks >= self._max_tasks:
+            self._retire(worker)
+        else:
+            self._checkin(worker)
+
+        if not ok:
+            raise WorkerTaskError(payload)
+        return payload
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+
+        for worker in idle:
+            self._retire(worker, recycled=False)
+
+    def stats(self) -> SupervisedPoolStats:
+        with self._cond:
+            return SupervisedPoolStats(
+                size=self._size,
+                alive=self._alive,
+                idle=len(self._idle),
+                tasks=self._tasks,
+                spawned=self._spawned,
+                recycled=self._recycled,
+                timeouts=self._timeouts,
+                crashes=self._crashes,
+            )
+
+    # ---------- helpers ----------
+
+    def _checkout(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise WorkerPoolClosedError("Worker pool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.process.is_alive():
+                        return worker
+                    # umarł bezczynny (np. OOM killer) – zwalniamy slot
+                    worker.conn.close()
+                    self._alive -= 1
+                    self._crashes += 1
+                if self._alive < self._size:
+                    self._alive += 1
+                    break
+                self._cond.wait()
+
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, worker: _Worker) -> None:
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._idle.append(worker)
+                self._cond.notify()
+        if closed:
+            self._retire(worker, recycled=False)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(child_conn, self._target),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        with self._cond:
+            self._spawned += 1
+        logger.debug("Worker process started (pid=%s)", process.pid)
+        return _Worker(process, parent_conn)
+
+    def _retire(self, worker: _Worker, *, recycled: bool = True) -> None:
+        try:
+            worker.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        worker.process.join(timeout=1)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        self._release_slot(worker, recycled=recycled)
+
+    def _kill(self, worker: _Worker) -> None:
+        logger.warning("Killing worker process (pid=%s)", worker.process.pid)
+        worker.process.kill()
+        worker.process.join()
+        self._release_slot(worker)
+
+    def _release_slot(self, worker: _Worker, *, recycled: bool = False) -> None:
+        worker.conn.close()
+        with self._cond:
+            self._alive -= 1
+            if recycled:
+                self._recycled += 1
+            self._cond.notify()
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 
 
 class TaxTreatment(Enum):
@@ -34,7 +34,8 @@ class Amount:
             return Decimal("0.00")
         if self.vat_rate.value is None:
             return Decimal("0.00")
-        return (self.value * self.vat_rate.value).quantize(Decimal("0.01"))
+        # pół grosza w górę (od zera) – jak ROUND() na DECIMAL w MySQL i przepisy VAT
+        return (self.value * self.vat_rate.value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
     @property
     def gross(self) -> Decimal:
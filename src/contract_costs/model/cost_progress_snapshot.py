@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
 @dataclass
@@ -12,4 +12,8 @@ class CostProgressSnapshot:
 
     planned_amount: Decimal
     executed_amount: Decimal
-    progress_percent: Decimal
\ No newline at end of file
+    progress_percent: Decimal
+
+    # znacznik linii policzonych w snapshocie (tylko wiersz kontraktu)
+    counted_at: datetime | None = None
+    counted_lines: int | None = None
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass
+class InvoiceFileHash:
+    """Wpis indeksu deduplikacji PDF: SHA-256 treści -> wynik importu."""
+    sha256: str
+    file_name: str
+    outcome: str                 # imported | revenue_not_supported | no_owner
+    invoice_id: UUID | None
+    invoice_number: str | None
+    parse_result: str | None     # InvoiceParseResult jako JSON
+
+    hit_count: int = 0
+    created_at: datetime | None = None
+    last_hit_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class InvoiceFileHashStats:
+    files: int
+    duplicates_skipped: int
+    files_with_duplicates: int
@@ -0,0 +1,60 @@
+from operator import attrgetter
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Identity map na czas jednego żądania (wywołania serwisu) + łączenie
+    pojedynczych get() w jedno repo.get_many().
+
+    - prime(ids) tylko zapamiętuje klucze, pierwsze load() pobiera
+      wszystkie oczekujące naraz (jeden round trip na typ encji)
+    - brakujące rekordy też są zapamiętane (None) – bez ponownych zapytań
+    - loader nie śledzi zapisów: tworzymy go per żądanie, nie globalnie
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[list[K]], Iterable[V]],
+        *,
+        key: Callable[[V], K] = attrgetter("id"),
+    ) -> None:
+        self._fetch_many = fetch_many
+        self._key = key
+        self._loaded: dict[K, V | None] = {}
+        self._pending: dict[K, None] = {}
+
+    def prime(self, keys: Iterable[K | None]) -> "BatchLoader[K, V]":
+        for k in keys:
+            if k is not None and k not in self._loaded:
+                self._pending[k] = None
+        return self
+
+    def load(self, key: K | None) -> V | None:
+        if key is None:
+            return None
+        if key not in self._loaded:
+            self.prime([key])
+            self._dispatch()
+        return self._loaded[key]
+
+    def load_many(self, keys: Iterable[K | None]) -> list[V]:
+        """Istniejące rekordy w kolejności kluczy (bez duplikatów i braków)."""
+        unique: list[K] = [k for k in dict.fromkeys(keys) if k is not None]
+        self.prime(unique)
+        self._dispatch()
+        return [v for k in unique if (v := self._loaded[k]) is not None]
+
+    def _dispatch(self) -> None:
+        if not self._pending:
+            return
+        keys = list(self._pending)
+        self._pending.clear()
+
+        for k in keys:
+            self._loaded[k] = None
+        for value in self._fetch_many(keys):
+            self._loaded[self._key(value)] = value
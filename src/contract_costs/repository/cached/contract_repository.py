@@ -0,0 +1,66 @@
+from uuid import UUID
+
+from contract_costs.model.contract import Contract
+from contract_costs.repository.cached.reference_cache import ReferenceCache
+from contract_costs.repository.contract_repository import ContractRepository
+
+
+class CachedContractRepository(ContractRepository):
+    """Read-through cache kontraktów (indeksy id + code); zapisy czyszczą cache."""
+
+    def __init__(self, inner: ContractRepository, cache: ReferenceCache | None = None) -> None:
+        self._inner = inner
+        self._cache = cache or ReferenceCache("contracts")
+
+    @property
+    def cache(self) -> ReferenceCache:
+        return self._cache
+
+    # ---------- writes ----------
+
+    def add(self, contract: Contract) -> None:
+        self._inner.add(contract)
+        self._cache.invalidate()
+
+    def update(self, contract: Contract) -> None:
+        self._inner.update(contract)
+        self._cache.invalidate()
+
+    # ---------- reads ----------
+
+    def get(self, contract_id: UUID) -> Contract | None:
+        contract = self._cache.get_or_load(("id", contract_id), lambda: self._inner.get(contract_id))
+        self._remember(contract)
+        return contract
+
+    def get_by_code(self, contract_code: str) -> Contract | None:
+        contract = self._cache.get_or_load(
+            ("code", contract_code), lambda: self._inner.get_by_code(contract_code)
+        )
+        self._remember(contract)
+        return contract
+
+    def get_many(self, contract_ids: list[UUID]) -> list[Contract]:
+        return self._cache.get_many_by(
+            "id", contract_ids, self._inner.get_many, self._remember
+        )
+
+    def list_by_codes(self, contract_codes: list[str]) -> list[Contract]:
+        return self._cache.get_many_by(
+            "code", contract_codes, self._inner.list_by_codes, self._remember
+        )
+
+    def exists(self, contract_id: UUID) -> bool:
+        return self.get(contract_id) is not None
+
+    def list(self) -> list[Contract]:
+        contracts = self._cache.get_or_load(("list",), self._inner.list)
+        for contract in contracts:
+            self._remember(contract)
+        return list(contracts)
+
+    def _remember(self, contract: Contract | None) -> None:
+        if contract is None:
+            return
+        self._cache.store(("id", contract.id), contract)
+        self._cache.store(("code", contract.code), contract)
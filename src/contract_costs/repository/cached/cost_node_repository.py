@@ -0,0 +1,144 @@
+from uuid import UUID
+
+from contract_costs.model.cost_node import CostNode
+from contract_costs.repository.cached.reference_cache import MISSING, ReferenceCache
+from contract_costs.repository.cost_node_repository import CostNodeRepository
+
+
+class CachedCostNodeRepository(CostNodeRepository):
+    """
+    Read-through cache węzłów kosztowych; zapisy czyszczą cache.
+
+    Nie cache'ujemy zapytań zależnych od innych tabel
+    (has_costs / node_has_costs / nodes_with_costs – linie faktur,
+    list_leaf_nodes_for_active_contracts – status kontraktu).
+    """
+
+    def __init__(self, inner: CostNodeRepository, cache: ReferenceCache | None = None) -> None:
+        self._inner = inner
+        self._cache = cache or ReferenceCache("cost_nodes")
+
+    @property
+    def cache(self) -> ReferenceCache:
+        return self._cache
+
+    # ---------- writes ----------
+
+    def add(self, cost_node: CostNode) -> None:
+        self._inner.add(cost_node)
+        self._cache.invalidate()
+
+    def add_all(self, cost_nodes: list[CostNode]) -> None:
+        self._inner.add_all(cost_nodes)
+        self._cache.invalidate()
+
+    def update(self, cost_node: CostNode) -> None:
+        self._inner.update(cost_node)
+        self._cache.invalidate()
+
+    def update_many(self, nodes: list[CostNode]) -> None:
+        self._inner.update_many(nodes)
+        self._cache.invalidate()
+
+    def delete_by_contract(self, contract_id: UUID) -> None:
+        self._inner.delete_by_contract(contract_id)
+        self._cache.invalidate()
+
+    def delete_many(self, ids: list[UUID]) -> None:
+        self._inner.delete_many(ids)
+        self._cache.invalidate()
+
+    # ---------- reads ----------
+
+    def get(self, cost_node_id: UUID) -> CostNode | None:
+        node = self._cache.get_or_load(("id", cost_node_id), lambda: self._inner.get(cost_node_id))
+        self._remember(node)
+        return node
+
+    def get_many(self, cost_node_ids: list[UUID]) -> list[CostNode]:
+        return self._cache.get_many_by(
+            "id", cost_node_ids, self._inner.get_many, self._remember
+        )
+
+    def get_by_code(self, cost_node_code: str) -> CostNode | None:
+        node = self._cache.get_or_load(
+            ("code", cost_node_code), lambda: self._inner.get_by_code(cost_node_code)
+        )
+        self._remember(node)
+        return node
+
+    def list_by_codes(self, cost_node_codes: list[str]) -> list[CostNode]:
+        # kod nie jest unikalny między kontraktami – indeks kod -> lista węzłów
+        found: list[CostNode] = []
+        missing: list[str] = []
+        for code in dict.fromkeys(cost_node_codes):
+            nodes = self._cache.lookup(("codes", code))
+            if nodes is MISSING:
+                missing.append(code)
+            else:
+                found.extend(nodes)
+
+        if missing:
+            # tylko znalezione kody – brak nie jest cache'owany (węzeł z innego procesu)
+            by_code: dict[str, list[CostNode]] = {}
+            for node in self._inner.list_by_codes(missing):
+                self._remember(node)
+                by_code.setdefault(node.code, []).append(node)
+                found.append(node)
+            for code, nodes in by_code.items():
+                self._cache.store(("codes", code), nodes)
+        return found
+
+    def list_nodes(self) -> list[CostNode]:
+        return self._cached_list(("list",), self._inner.list_nodes)
+
+    def list_by_parent(self, parent_id: UUID) -> list[CostNode]:
+        return self._cached_list(("parent", parent_id), lambda: self._inner.list_by_parent(parent_id))
+
+    def list_by_contract(self, contract_id: UUID) -> list[CostNode]:
+        return self._cached_list(
+            ("contract", contract_id), lambda: self._inner.list_by_contract(contract_id)
+        )
+
+    def list_leaves(self, contract_id: UUID) -> list[CostNode]:
+        return self._cached_list(("leaves", contract_id), lambda: self._inner.list_leaves(contract_id))
+
+    def list_subtree(self, cost_node_id: UUID) -> list[CostNode]:
+        return self._cached_list(
+            ("subtree", cost_node_id), lambda: self._inner.list_subtree(cost_node_id)
+        )
+
+    def list_ancestors(self, cost_node_id: UUID) -> list[CostNode]:
+        return self._cached_list(
+            ("ancestors", cost_node_id), lambda: self._inner.list_ancestors(cost_node_id)
+        )
+
+    def exists(self, cost_node_id: UUID) -> bool:
+        return self.get(cost_node_id) is not None
+
+    # ---------- pass-through ----------
+
+    def list_leaf_nodes_for_active_contracts(self) -> list[CostNode]:
+        return self._inner.list_leaf_nodes_for_active_contracts()
+
+    def has_costs(self, contract_id: UUID) -> bool:
+        return self._inner.has_costs(contract_id)
+
+    def node_has_costs(self, cost_node_id: UUID) -> bool:
+        return self._inner.node_has_costs(cost_node_id)
+
+    def nodes_with_costs(self, cost_node_ids: list[UUID]) -> set[UUID]:
+        return self._inner.nodes_with_costs(cost_node_ids)
+
+    # ---------- helpers ----------
+
+    def _cached_list(self, key: tuple, loader) -> list[CostNode]:
+        nodes = self._cache.get_or_load(key, loader)
+        for node in nodes:
+            self._remember(node)
+        return list(nodes)
+
+    def _remember(self, node: CostNode | None) -> None:
+        if node is None:
+            return
+        self._cache.store(("id", node.id), node)
@@ -0,0 +1,64 @@
+from uuid import UUID
+
+from contract_costs.model.cost_type import CostType
+from contract_costs.repository.cached.reference_cache import ReferenceCache
+from contract_costs.repository.cost_type_repository import CostTypeRepository
+
+
+class CachedCostTypeRepository(CostTypeRepository):
+    """Read-through cache typów kosztów (indeksy id + code); zapisy czyszczą cache."""
+
+    def __init__(self, inner: CostTypeRepository, cache: ReferenceCache | None = None) -> None:
+        self._inner = inner
+        self._cache = cache or ReferenceCache("cost_types")
+
+    @property
+    def cache(self) -> ReferenceCache:
+        return self._cache
+
+    # ---------- writes ----------
+
+    def add(self, cost_type: CostType) -> None:
+        self._inner.add(cost_type)
+        self._cache.invalidate()
+
+    def update(self, cost_type: CostType) -> None:
+        self._inner.update(cost_type)
+        self._cache.invalidate()
+
+    # ---------- reads ----------
+
+    def get(self, cost_type_id: UUID) -> CostType | None:
+        cost_type = self._cache.get_or_load(("id", cost_type_id), lambda: self._inner.get(cost_type_id))
+        self._remember(cost_type)
+        return cost_type
+
+    def get_by_code(self, code: str) -> CostType | None:
+        cost_type = self._cache.get_or_load(("code", code), lambda: self._inner.get_by_code(code))
+        self._remember(cost_type)
+        return cost_type
+
+    def get_many(self, cost_type_ids: list[UUID]) -> list[CostType]:
+        return self._cache.get_many_by(
+            "id", cost_type_ids, self._inner.get_many, self._remember
+        )
+
+    def list_by_codes(self, codes: list[str]) -> list[CostType]:
+        return self._cache.get_many_by(
+            "code", codes, self._inner.list_by_codes, self._remember
+        )
+
+    def exists(self, cost_type_id: UUID) -> bool:
+        return self.get(cost_type_id) is not None
+
+    def list(self) -> list[CostType]:
+        cost_types = self._cache.get_or_load(("list",), self._inner.list)
+        for cost_type in cost_types:
+            self._remember(cost_type)
+        return list(cost_types)
+
+    def _remember(self, cost_type: CostType | None) -> None:
+        if cost_type is None:
+            return
+        self._cache.store(("id", cost_type.id), cost_type)
+        self._cache.store(("code", cost_type.code), cost_type)
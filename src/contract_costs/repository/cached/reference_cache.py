@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class ReferenceCacheStats:
+    name: str
+    entries: int
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class ReferenceCache:
+    """
+    Pamięć podręczna danych słownikowych (kontrakty, cost nodes, cost types).
+
+    - klucze dowolne: ("id", uuid), ("code", "K001"), ("list",) ...
+    - każdy zapis przez repozytorium-dekorator czyści całość
+      (zapisy są rzadkie, a listy / indeksy kodów łatwo rozjechać)
+    - po `max_age` sekundach cache wygasa – zapisy z innych procesów
+    - None nie jest cache'owane (nowy rekord z innego procesu będzie widoczny)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._name = name
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._data: dict[Hashable, Any] = {}
+        self._filled_at: float | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def lookup(self, key: Hashable) -> Any:
+        """Wartość albo MISSING (liczy hit / miss)."""
+        with self._lock:
+            self._expire()
+            value = self._data.get(key, MISSING)
+            if value is MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def store(self, key: Hashable, value: Any) -> None:
+        if value is None:
+            return
+        with self._lock:
+            self._expire()
+            if self._filled_at is None:
+                self._filled_at = self._clock()
+            self._data[key] = value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.lookup(key)
+        if value is not MISSING:
+            return value
+        value = loader()
+        self.store(key, value)
+        return value
+
+    def get_many_by(
+        self,
+        kind: str,
+        keys: Iterable[Hashable],
+        loader: Callable[[list], Iterable[Any]],
+        remember: Callable[[Any], None],
+    ) -> list[Any]:
+        """
+        Wartości dla kluczy (kind, key); brakujące ładowane jednym
+        wywołaniem `loader(missing)`, a `remember` dopisuje je do indeksów.
+        """
+        found: list[Any] = []
+        missing: list[Hashable] = []
+        for key in dict.fromkeys(keys):
+            value = self.lookup((kind, key))
+            if value is MISSING:
+                missing.append(key)
+            else:
+                found.append(value)
+
+        if missing:
+            for value in loader(missing):
+                remember(value)
+                found.append(value)
+        return found
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._filled_at = None
+            self._invalidations += 1
+
+    def stats(self) -> ReferenceCacheStats:
+        with self._lock:
+            return ReferenceCacheStats(
+                name=self._name,
+                entries=len(self._data),
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+            )
+
+    def _expire(self) -> None:
+        if self._filled_at is not None and self._clock() - self._filled_at > self._max_age:
+            self._data.clear()
+            self._filled_at = None
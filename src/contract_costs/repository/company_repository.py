@@ -25,6 +25,14 @@ class CompanyRepository(ABC):
     def get(self, company_id: UUID) -> Company | None:
         ...
 
+    @abstractmethod
+    def get_many(self, company_ids: list[UUID]) -> list[Company]:
+        """
+        Return existing companies for given ids (chunked IN query).
+        Missing ids are ignored.
+        """
+        ...
+
     @abstractmethod
     def exists(self, company_id: UUID) -> bool:
         ...
@@ -0,0 +1,88 @@
+from datetime import date, datetime
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from contract_costs.model.invoice import InvoiceStatus
+
+
+class ContractCostReportRepository(ABC):
+    """
+    Silnik zapytań raportu kosztów kontraktu.
+
+    Zwraca wiersze JUŻ zagregowane (suma per liść cost node + cost type,
+    opcjonalnie + numer faktury) – filtr kontraktu, join liści
+    i sumy liczone są po stronie źródła danych.
+    """
+
+    @abstractmethod
+    def aggregate_costs(
+        self,
+        contract_id: UUID,
+        *,
+        group_by_invoice: bool = False,
+        invoice_numbers: list[str] | None = None,
+        invoice_statuses: list[InvoiceStatus] | None = None,
+        paid: bool | None = None,
+        leaves_only: bool = True,
+    ) -> list[dict]:
+        """
+        leaves_only=False: także koszty zaksięgowane bezpośrednio
+        na pozycjach nadrzędnych (raport drzewa / rollup).
+
+        Row keys:
+        cost_node_id, cost_node_code, cost_node_name, cost_node_budget,
+        cost_type_code, cost_type_name, invoice_number,
+        net_amount, vat_amount, gross_amount, non_tax_amount, line_count
+        """
+        ...
+
+    @abstractmethod
+    def mark_lines(self, contract_ids: list[UUID]) -> tuple[datetime, dict[UUID, int]]:
+        """
+        Znacznik stanu linii – brany PRZED odczytem executed_by_node.
+
+        Zwraca (czas źródła danych, liczba linii per kontrakt dodanych
+        do tego czasu). Snapshot zapisuje znacznik, kolejny przebieg
+        dokłada tylko linie dodane po nim (changed_since pilnuje reszty).
+        """
+        ...
+
+    @abstractmethod
+    def changed_since(self, marks: dict[UUID, tuple[datetime, int]]) -> set[UUID]:
+        """
+        Kontrakty, których nie da się policzyć przyrostowo od znacznika
+        (contract_id -> (czas, liczba linii) z mark_lines):
+        - linia dodana przed znacznikiem zmieniona, przeniesiona albo usunięta
+        - faktura takiej linii zmieniona (status, daty)
+        - pozycja kontraktu zmieniona (np. nowy rodzic)
+
+        Wynik może być nadmiarowy (pełne przeliczenie), nigdy niepełny.
+        """
+        ...
+
+    @abstractmethod
+    def executed_by_node(
+        self,
+        contract_ids: list[UUID],
+        *,
+        until: date,
+        as_of: datetime | None = None,
+        after: date | None = None,
+        counted_at: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Wykonanie (suma amount.value) per kontrakt + cost node
+        dla faktur z datą <= until.
+
+        as_of: tylko linie dodane do tego znacznika (mark_lines).
+        after + counted_at: pomija linie już policzone w poprzednim
+        snapshocie – z datą <= after dodane do znacznika counted_at.
+        Linie dodane później wchodzą niezależnie od daty faktury.
+
+        Data faktury: invoice_date -> selling_date -> timestamp.
+        Faktury usunięte (DELETED) i linie bez faktury są pomijane.
+
+        Row keys:
+        contract_id, cost_node_id (None = linia bez pozycji), executed_amount
+        """
+        ...
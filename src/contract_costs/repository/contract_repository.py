@@ -16,6 +16,16 @@ class ContractRepository(ABC):
         """Get contract by id"""
         ...
 
+    @abstractmethod
+    def get_many(self, contract_ids: list[UUID]) -> list[Contract]:
+        """Get contracts for many ids at once (missing ids are ignored)"""
+        ...
+
+    @abstractmethod
+    def list_by_codes(self, contract_codes: list[str]) -> list[Contract]:
+        """Get contracts for many codes at once (one query)"""
+        ...
+
     @abstractmethod
     def list(self) -> list[Contract]:
         """List all contracts"""
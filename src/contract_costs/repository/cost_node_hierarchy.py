@@ -0,0 +1,58 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass(frozen=True)
+class CostNodeHierarchy(Generic[K]):
+    """
+    Hierarchia pozycji w postaci do zapisania obok cost_nodes:
+    - depth / is_leaf per węzeł
+    - paths: tabela domknięcia (przodek, potomek, odległość), łącznie z (w, w, 0)
+    """
+    depth: dict[K, int]
+    is_leaf: dict[K, bool]
+    paths: list[tuple[K, K, int]]
+
+
+def build_hierarchy(parents: Mapping[K, K | None]) -> CostNodeHierarchy[K]:
+    """
+    parents: id węzła -> id rodzica (None = korzeń).
+
+    Iteracyjnie (bez rekurencji), O(rozmiar tabeli domknięcia).
+    Rodzic spoza zbioru = korzeń; węzły w cyklu dostają tylko (w, w, 0).
+    """
+    children: dict[K, list[K]] = defaultdict(list)
+    roots: list[K] = []
+    for node, parent in parents.items():
+        if parent is None or parent not in parents:
+            roots.append(node)
+        else:
+            children[parent].append(node)
+
+    depth: dict[K, int] = {}
+    paths: list[tuple[K, K, int]] = []
+
+    stack: list[tuple[K, tuple[K, ...]]] = [(r, ()) for r in roots]
+    while stack:
+        node, chain = stack.pop()
+        depth[node] = len(chain)
+        paths.append((node, node, 0))
+        for distance, ancestor in enumerate(reversed(chain), start=1):
+            paths.append((ancestor, node, distance))
+
+        below = chain + (node,)
+        stack.extend((child, below) for child in children.get(node, ()))
+
+    for node in parents:
+        if node not in depth:
+            depth[node] = 0
+            paths.append((node, node, 0))
+
+    return CostNodeHierarchy(
+        depth=depth,
+        is_leaf={node: node not in children for node in parents},
+        paths=paths,
+    )
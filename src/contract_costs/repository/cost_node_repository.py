@@ -23,11 +23,21 @@ class CostNodeRepository(ABC):
         """Get cost node by id"""
         ...
 
+    @abstractmethod
+    def get_many(self, cost_node_ids: list[UUID]) -> list[CostNode]:
+        """Get cost nodes for many ids at once (missing ids are ignored)"""
+        ...
+
     @abstractmethod
     def get_by_code(self, cost_node_code: str) -> CostNode | None:
         """Get cost node by code"""
         ...
 
+    @abstractmethod
+    def list_by_codes(self, cost_node_codes: list[str]) -> list[CostNode]:
+        """Get cost nodes for many codes at once (one query)"""
+        ...
+
     @abstractmethod
     def list_nodes(self) -> list[CostNode]:
         """List all cost nodes"""
@@ -36,6 +46,21 @@ class CostNodeRepository(ABC):
     def list_leaf_nodes_for_active_contracts(self) -> list[CostNode]:
         ...
 
+    @abstractmethod
+    def list_leaves(self, contract_id: UUID) -> list[CostNode]:
+        """Leaf nodes of one contract, ordered by code"""
+        ...
+
+    @abstractmethod
+    def list_subtree(self, cost_node_id: UUID) -> list[CostNode]:
+        """Node + all descendants, ordered by depth then code"""
+        ...
+
+    @abstractmethod
+    def list_ancestors(self, cost_node_id: UUID) -> list[CostNode]:
+        """Ancestors from the root down to the direct parent"""
+        ...
+
     @abstractmethod
     def list_by_parent(self, parent_id: UUID) -> list[CostNode]:
         """List all cost nodes with parent id"""
@@ -73,4 +98,9 @@ class CostNodeRepository(ABC):
 
     @abstractmethod
     def node_has_costs(self, cost_node_id: UUID) -> bool:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    def nodes_with_costs(self, cost_node_ids: list[UUID]) -> set[UUID]:
+        """Te z podanych węzłów, do których są przypisane linie faktur (jedno zapytanie)"""
+        ...
@@ -1,3 +1,4 @@
+from datetime import date
 from uuid import UUID
 from abc import ABC, abstractmethod
 
@@ -9,10 +10,39 @@ class CostProgressSnapshotRepository(ABC):
     def add(self, snapshot: CostProgressSnapshot) -> None:
         ...
 
+    @abstractmethod
+    def add_many(self, snapshots: list[CostProgressSnapshot]) -> None:
+        """
+        Zapis wsadowy. Istniejące wiersze tych samych kontraktów
+        z tą samą datą są zastępowane (ponowny przebieg dnia jest idempotentny).
+        """
+        ...
+
     @abstractmethod
     def get_by_contract(self, contract_id: UUID) -> list[CostProgressSnapshot]:
         ...
 
     @abstractmethod
     def get_latest(self, contract_id: UUID, cost_node_id: UUID | None) -> CostProgressSnapshot | None:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    def list_latest_before(
+        self,
+        contract_ids: list[UUID],
+        before: date,
+    ) -> list[CostProgressSnapshot]:
+        """Wszystkie wiersze ostatniego snapshotu < before, per kontrakt (jedno zapytanie)"""
+        ...
+
+    @abstractmethod
+    def list_history(
+        self,
+        contract_id: UUID,
+        cost_node_id: UUID | None,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[CostProgressSnapshot]:
+        """Snapshoty jednej pozycji (None = cały kontrakt) rosnąco po dacie"""
+        ...
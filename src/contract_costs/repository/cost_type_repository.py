@@ -10,9 +10,15 @@ class CostTypeRepository(ABC):
     def get(self, cost_type_id: UUID) -> CostType | None:
         ...
     @abstractmethod
+    def get_many(self, cost_type_ids: list[UUID]) -> list[CostType]:
+        ...
+    @abstractmethod
     def get_by_code(self, code: str) -> CostType | None:
         ...
     @abstractmethod
+    def list_by_codes(self, codes: list[str]) -> list[CostType]:
+        ...
+    @abstractmethod
     def list(self) -> list[CostType]:
         ...
     @abstractmethod
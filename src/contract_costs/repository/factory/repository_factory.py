@@ -7,6 +7,12 @@ from contract_costs.repository.cost_type_repository import CostTypeRepository
 from contract_costs.repository.cost_progress_snapshot_repository import (
     CostProgressSnapshotRepository,
 )
+from contract_costs.repository.invoice_file_hash_repository import InvoiceFileHashRepository
+from contract_costs.repository.unit_of_work import UnitOfWork, NullUnitOfWork
+from contract_costs.repository.contract_cost_report_repository import (
+    ContractCostReportRepository,
+)
+from contract_costs.repository.invoice_summary_repository import InvoiceSummaryRepository
 
 # mysql
 from contract_costs.repository.mysql.company_repository import MySQLCompanyRepository
@@ -18,6 +24,22 @@ from contract_costs.repository.mysql.cost_type_repository import MySQLCostTypeRe
 from contract_costs.repository.mysql.cost_progress_snapshot_repository import (
     MySQLCostProgressSnapshotRepository,
 )
+from contract_costs.repository.mysql.invoice_file_hash_repository import (
+    MySQLInvoiceFileHashRepository,
+)
+from contract_costs.repository.mysql.unit_of_work import MySQLUnitOfWork
+from contract_costs.repository.mysql.contract_cost_report_repository import (
+    MySQLContractCostReportRepository,
+)
+from contract_costs.repository.mysql.invoice_summary_repository import (
+    MySQLInvoiceSummaryRepository,
+)
+
+# cache danych słownikowych (dekoratory)
+from contract_costs.repository.cached.reference_cache import ReferenceCache, ReferenceCacheStats
+from contract_costs.repository.cached.contract_repository import CachedContractRepository
+from contract_costs.repository.cached.cost_node_repository import CachedCostNodeRepository
+from contract_costs.repository.cached.cost_type_repository import CachedCostTypeRepository
 
 # in-memory
 from contract_costs.repository.inmemory.company_repository import InMemoryCompanyRepository
@@ -29,6 +51,15 @@ from contract_costs.repository.inmemory.cost_type_repository import InMemoryCost
 from contract_costs.repository.inmemory.cost_progress_snapshot_repository import (
     InMemoryCostProgressSnapshotRepository,
 )
+from contract_costs.repository.inmemory.contract_cost_report_repository import (
+    InMemoryContractCostReportRepository,
+)
+from contract_costs.repository.inmemory.invoice_file_hash_repository import (
+    InMemoryInvoiceFileHashRepository,
+)
+from contract_costs.repository.inmemory.invoice_summary_repository import (
+    InMemoryInvoiceSummaryRepository,
+)
 from enum import Enum
 
 
@@ -38,8 +69,29 @@ class RepoBackend(str, Enum):
 
 
 class RepositoryFactory:
-    def __init__(self, backend: RepoBackend) -> None:
+    def __init__(
+        self,
+        backend: RepoBackend,
+        *,
+        reference_cache_ttl: float | None = None,
+    ) -> None:
+        """
+        reference_cache_ttl: >0 -> kontrakty / cost nodes / cost types
+        owinięte read-through cache (CachedXRepository) z tym TTL.
+        """
         self.backend = backend
+        self._reference_cache_ttl = reference_cache_ttl
+        self._reference_caches: list[ReferenceCache] = []
+
+    def reference_cache_stats(self) -> list[ReferenceCacheStats]:
+        return [c.stats() for c in self._reference_caches]
+
+    def _reference_cache(self, name: str) -> ReferenceCache | None:
+        if not self._reference_cache_ttl or self._reference_cache_ttl <= 0:
+            return None
+        cache = ReferenceCache(name, max_age=self._reference_cache_ttl)
+        self._reference_caches.append(cache)
+        return cache
 
     def company_repository(self) -> CompanyRepository:
         return (
@@ -63,25 +115,36 @@ class RepositoryFactory:
         )
 
     def contract_repository(self) -> ContractRepository:
-        return (
+        repo = (
             MySQLContractRepository()
             if self.backend == RepoBackend.MYSQL
             else InMemoryContractRepository()
         )
+        cache = self._reference_cache("contracts")
+        return CachedContractRepository(repo, cache) if cache else repo
 
-    def cost_node_repository(self) -> CostNodeRepository:
-        return (
+    def cost_node_repository(
+        self,
+        *,
+        invoice_line_repository: InvoiceLineRepository | None = None,
+    ) -> CostNodeRepository:
+        # in-memory sprawdza koszty węzłów na tej samej instancji linii co reszta aplikacji
+        repo = (
             MySQLCostNodeRepository()
             if self.backend == RepoBackend.MYSQL
-            else InMemoryCostNodeRepository()
+            else InMemoryCostNodeRepository(invoice_line_repository)
         )
+        cache = self._reference_cache("cost_nodes")
+        return CachedCostNodeRepository(repo, cache) if cache else repo
 
     def cost_type_repository(self) -> CostTypeRepository:
-        return (
+        repo = (
             MySQLCostTypeRepository()
             if self.backend == RepoBackend.MYSQL
             else InMemoryCostTypeRepository()
         )
+        cache = self._reference_cache("cost_types")
+        return CachedCostTypeRepository(repo, cache) if cache else repo
 
     def cost_progress_snapshot_repository(self) -> CostProgressSnapshotRepository:
         return (
@@ -89,3 +152,54 @@ class RepositoryFactory:
             if self.backend == RepoBackend.MYSQL
             else InMemoryCostProgressSnapshotRepository()
         )
+
+    def invoice_file_hash_repository(self) -> InvoiceFileHashRepository:
+        return (
+            MySQLInvoiceFileHashRepository()
+            if self.backend == RepoBackend.MYSQL
+            else InMemoryInvoiceFileHashRepository()
+        )
+
+    def unit_of_work(self) -> UnitOfWork:
+        return (
+            MySQLUnitOfWork()
+            if self.backend == RepoBackend.MYSQL
+            else NullUnitOfWork()
+        )
+
+    def contract_cost_report_repository(
+        self,
+        *,
+        invoice_line_repository: InvoiceLineRepository,
+        cost_node_repository: CostNodeRepository,
+        cost_type_repository: CostTypeRepository,
+        invoice_repository: InvoiceRepository,
+    ) -> ContractCostReportRepository:
+        # in-memory liczy na tych samych instancjach repozytoriów co reszta aplikacji
+        return (
+            MySQLContractCostReportRepository()
+            if self.backend == RepoBackend.MYSQL
+            else InMemoryContractCostReportRepository(
+                invoice_line_repository,
+                cost_node_repository,
+                cost_type_repository,
+                invoice_repository,
+            )
+        )
+
+    def invoice_summary_repository(
+        self,
+        *,
+        invoice_repository: InvoiceRepository,
+        invoice_line_repository: InvoiceLineRepository,
+        company_repository: CompanyRepository,
+    ) -> InvoiceSummaryRepository:
+        return (
+            MySQLInvoiceSummaryRepository()
+            if self.backend == RepoBackend.MYSQL
+            else InMemoryInvoiceSummaryRepository(
+                invoice_repository,
+                invoice_line_repository,
+                company_repository,
+            )
+        )
@@ -24,6 +24,13 @@ class InMemoryCompanyRepository(CompanyRepository):
     def get(self, company_id: UUID) -> Company | None:
         return self._companies.get(company_id)
 
+    def get_many(self, company_ids: list[UUID]) -> list[Company]:
+        return [
+            item
+            for id_ in dict.fromkeys(company_ids)
+            if (item := self._companies.get(id_)) is not None
+        ]
+
     def list_all(self) -> list[Company]:
         return list(self._companies.values())
 
@@ -0,0 +1,246 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from contract_costs.model.invoice import Invoice, InvoiceStatus, PaymentStatus
+from contract_costs.model.invoice_line import InvoiceLine
+from contract_costs.repository.contract_cost_report_repository import (
+    ContractCostReportRepository,
+)
+from contract_costs.repository.cost_node_repository import CostNodeRepository
+from contract_costs.repository.cost_type_repository import CostTypeRepository
+from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
+from contract_costs.repository.invoice_repository import InvoiceRepository
+
+
+class InMemoryContractCostReportRepository(ContractCostReportRepository):
+    """
+    Odpowiednik zapytania SQL liczony na repozytoriach:
+    - linie pobierane indeksem contract_id (list_by_contract)
+    - liście / cost types / faktury jako słowniki po id
+    - jedna pętla agregująca
+
+    Znaczniki (mark_lines) zapamiętują stan linii i drzewa kontraktu –
+    bez kolumn created_at / updated_at porównujemy z tą kopią.
+    """
+
+    def __init__(
+        self,
+        invoice_line_repository: InvoiceLineRepository,
+        cost_node_repository: CostNodeRepository,
+        cost_type_repository: CostTypeRepository,
+        invoice_repository: InvoiceRepository | None = None,
+    ) -> None:
+        self._invoice_lines = invoice_line_repository
+        self._cost_nodes = cost_node_repository
+        self._cost_types = cost_type_repository
+        self._invoices = invoice_repository
+        # znacznik -> contract_id -> (stan linii po id, rodzic po id pozycji)
+        self._marks: dict[datetime, dict[UUID, tuple[dict[UUID, tuple], dict[UUID, UUID | None]]]] = {}
+
+    def aggregate_costs(
+        self,
+        contract_id: UUID,
+        *,
+        group_by_invoice: bool = False,
+        invoice_numbers: list[str] | None = None,
+        invoice_statuses: list[InvoiceStatus] | None = None,
+        paid: bool | None = None,
+        leaves_only: bool = True,
+    ) -> list[dict]:
+        nodes = self._cost_nodes.list_by_contract(contract_id)
+        parents = {n.parent_id for n in nodes if n.parent_id} if leaves_only else set()
+        leaf_by_id = {n.id: n for n in nodes if n.id not in parents}
+
+        cost_types = {ct.id: ct for ct in self._cost_types.list()}
+
+        needs_invoice = (
+            group_by_invoice
+            or bool(invoice_numbers)
+            or bool(invoice_statuses)
+            or paid is not None
+        )
+        invoices: dict[UUID, Invoice | None] = {}
+
+        numbers = set(invoice_numbers or ())
+        statuses = set(invoice_statuses or ())
+
+        buckets: dict[tuple, dict] = {}
+
+        for line in self._invoice_lines.list_by_contract(contract_id):
+            node = leaf_by_id.get(line.cost_node_id) if line.cost_node_id else None
+            if node is None:
+                continue  # tylko leaf
+
+            invoice = None
+            if needs_invoice and line.invoice_id is not None:
+                if line.invoice_id not in invoices:
+                    invoices[line.invoice_id] = (
+                        self._invoices.get(line.invoice_id) if self._invoices else None
+                    )
+                invoice = invoices[line.invoice_id]
+
+            if numbers and (invoice is None or invoice.invoice_number not in numbers):
+                continue
+            if statuses and (invoice is None or invoice.status not in statuses):
+                continue
+            if paid is not None and (
+                invoice is None
+                or (invoice.payment_status == PaymentStatus.PAID) != paid
+            ):
+                continue
+
+            invoice_number = invoice.invoice_number if group_by_invoice and invoice else None
+            key = (node.id, line.cost_type_id, invoice_number)
+
+            row = buckets.get(key)
+            if row is None:
+                cost_type = cost_types.get(line.cost_type_id) if line.cost_type_id else None
+                row = buckets[key] = {
+                    "cost_node_id": node.id,
+                    "cost_node_code": node.code,
+                    "cost_node_name": node.name,
+                    "cost_node_budget": node.budget,
+                    "cost_type_code": cost_type.code if cost_type else None,
+                    "cost_type_name": cost_type.name if cost_type else None,
+                    "invoice_number": invoice_number,
+                    "net_amount": Decimal("0"),
+                    "vat_amount": Decimal("0"),
+                    "gross_amount": Decimal("0"),
+                    "non_tax_amount": Decimal("0"),
+                    "line_count": 0,
+                }
+
+            amount = line.amount
+            row["net_amount"] += amount.net or Decimal("0")
+            row["vat_amount"] += amount.tax
+            row["gross_amount"] += amount.gross
+            row["non_tax_amount"] += amount.non_tax_cost
+            row["line_count"] += 1
+
+        return sorted(
+            buckets.values(),
+            key=lambda r: (r["cost_node_code"], r["cost_type_code"] or ""),
+        )
+
+    def mark_lines(self, contract_ids: list[UUID]) -> tuple[datetime, dict[UUID, int]]:
+        marked_at = datetime.now()
+        if self._marks:
+            marked_at = max(marked_at, max(self._marks) + timedelta(microseconds=1))
+
+        state = {}
+        for contract_id in dict.fromkeys(contract_ids):
+            lines = self._invoice_lines.list_by_contract(contract_id)
+            invoices = self._invoices_by_id(lines)
+            state[contract_id] = (
+                {line.id: self._line_state(line, invoices) for line in lines},
+                {n.id: n.parent_id for n in self._cost_nodes.list_by_contract(contract_id)},
+            )
+        self._marks[marked_at] = state
+
+        return marked_at, {c: len(lines) for c, (lines, _) in state.items()}
+
+    def changed_since(self, marks: dict[UUID, tuple[datetime, int]]) -> set[UUID]:
+        changed = set()
+        for contract_id, (marked_at, _) in marks.items():
+            marked = self._marks.get(marked_at, {}).get(contract_id)
+            if marked is None:
+                changed.add(contract_id)
+                continue
+
+            marked_lines, marked_parents = marked
+            current = self._invoice_lines.get_many(list(marked_lines))
+            invoices = self._invoices_by_id(current)
+            parents = {
+                n.id: n.parent_id for n in self._cost_nodes.list_by_contract(contract_id)
+            }
+            if (
+                len(current) != len(marked_lines)
+                or any(marked_lines[l.id] != self._line_state(l, invoices) for l in current)
+                or parents != marked_parents
+            ):
+                changed.add(contract_id)
+        return changed
+
+    def executed_by_node(
+        self,
+        contract_ids: list[UUID],
+        *,
+        until: date,
+        as_of: datetime | None = None,
+        after: date | None = None,
+        counted_at: datetime | None = None,
+    ) -> list[dict]:
+        if self._invoices is None:
+            raise ValueError("executed_by_node requires invoice_repository")
+
+        present = self._marked_line_ids(as_of)
+        counted = self._marked_line_ids(counted_at)
+
+        lines = [
+            line
+            for contract_id in dict.fromkeys(contract_ids)
+            for line in self._invoice_lines.list_by_contract(contract_id)
+            if line.invoice_id is not None
+            and (present is None or line.id in present)
+        ]
+        invoices = self._invoices_by_id(lines)
+
+        totals: dict[tuple, Decimal] = {}
+        for line in lines:
+            invoice = invoices.get(line.invoice_id)
+            if invoice is None or invoice.status == InvoiceStatus.DELETED:
+                continue
+            day = self._invoice_day(invoice)
+            if day is None or day > until:
+                continue
+            if after is not None and day <= after and (
+                counted is None or line.id in counted
+            ):
+                continue  # już w poprzednim snapshocie
+
+            key = (line.contract_id, line.cost_node_id)
+            totals[key] = totals.get(key, Decimal("0")) + line.amount.value
+
+        return [
+            {
+                "contract_id": contract_id,
+                "cost_node_id": cost_node_id,
+                "executed_amount": amount,
+            }
+            for (contract_id, cost_node_id), amount in totals.items()
+        ]
+
+    def _marked_line_ids(self, marked_at: datetime | None) -> set[UUID] | None:
+        if marked_at is None:
+            return None
+        return {
+            line_id
+            for lines, _ in self._marks.get(marked_at, {}).values()
+            for line_id in lines
+        }
+
+    def _invoices_by_id(self, lines: list[InvoiceLine]) -> dict[UUID | None, Invoice]:
+        if self._invoices is None:
+            raise ValueError("executed_by_node requires invoice_repository")
+        ids = list({line.invoice_id for line in lines if line.invoice_id is not None})
+        return {i.id: i for i in self._invoices.get_many(ids)}
+
+    def _line_state(self, line: InvoiceLine, invoices: dict[UUID | None, Invoice]) -> tuple:
+        invoice = invoices.get(line.invoice_id)
+        return (
+            line.contract_id,
+            line.cost_node_id,
+            line.amount.value,
+            line.invoice_id,
+            invoice.status if invoice else None,
+            self._invoice_day(invoice) if invoice else None,
+        )
+
+    @staticmethod
+    def _invoice_day(invoice: Invoice) -> date | None:
+        if invoice.invoice_date is not None:
+            return invoice.invoice_date
+        if invoice.selling_date is not None:
+            return invoice.selling_date
+        return invoice.timestamp.date() if invoice.timestamp else None
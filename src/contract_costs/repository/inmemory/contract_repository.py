@@ -14,6 +14,17 @@ class InMemoryContractRepository(ContractRepository):
     def get(self, contract_id: UUID) -> Contract | None:
         return self._contracts.get(contract_id)
 
+    def get_many(self, contract_ids: list[UUID]) -> list[Contract]:
+        return [
+            item
+            for id_ in dict.fromkeys(contract_ids)
+            if (item := self._contracts.get(id_)) is not None
+        ]
+
+    def list_by_codes(self, contract_codes: list[str]) -> list[Contract]:
+        codes = set(contract_codes)
+        return [c for c in self._contracts.values() if c.code in codes]
+
     def list(self) -> list[Contract]:
         return list(self._contracts.values())
 
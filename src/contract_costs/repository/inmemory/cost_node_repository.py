@@ -1,12 +1,19 @@
 from uuid import UUID
 from contract_costs.model.cost_node import CostNode
 from contract_costs.repository.cost_node_repository import CostNodeRepository
+from contract_costs.repository.cost_node_hierarchy import build_hierarchy
+from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 
 
 class InMemoryCostNodeRepository(CostNodeRepository):
+    """
+    Koszty węzłów (has_costs / node_has_costs / nodes_with_costs) wymagają
+    repozytorium linii – bez niego zostaje dawne zachowanie.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, invoice_line_repository: InvoiceLineRepository | None = None) -> None:
         self._nodes: dict[UUID, CostNode] = {}
+        self._invoice_lines = invoice_line_repository
 
     def add(self, cost_node: CostNode) -> None:
         self._nodes[cost_node.id] = cost_node
@@ -18,12 +25,23 @@ class InMemoryCostNodeRepository(CostNodeRepository):
     def get(self, cost_node_id: UUID) -> CostNode | None:
         return self._nodes.get(cost_node_id)
 
+    def get_many(self, cost_node_ids: list[UUID]) -> list[CostNode]:
+        return [
+            item
+            for id_ in dict.fromkeys(cost_node_ids)
+            if (item := self._nodes.get(id_)) is not None
+        ]
+
     def get_by_code(self, cost_node_code: str) -> CostNode | None:
         for cost_node in self._nodes.values():
             if cost_node.code == cost_node_code:
                 return cost_node
         return None
 
+    def list_by_codes(self, cost_node_codes: list[str]) -> list[CostNode]:
+        codes = set(cost_node_codes)
+        return [n for n in self._nodes.values() if n.code in codes]
+
     def list_nodes(self) -> list[CostNode]:
         return list(self._nodes.values())
 
@@ -61,6 +79,44 @@ class InMemoryCostNodeRepository(CostNodeRepository):
         # Najczystsze rozwiązanie:
         return leaf_nodes
 
+    def list_leaves(self, contract_id: UUID) -> list[CostNode]:
+        nodes = self.list_by_contract(contract_id)
+        hierarchy = build_hierarchy({n.id: n.parent_id for n in nodes})
+        return sorted(
+            (n for n in nodes if hierarchy.is_leaf[n.id]),
+            key=lambda n: n.code,
+        )
+
+    def list_subtree(self, cost_node_id: UUID) -> list[CostNode]:
+        root = self._nodes.get(cost_node_id)
+        if root is None:
+            return []
+
+        children: dict[UUID, list[CostNode]] = {}
+        for node in self._nodes.values():
+            if node.parent_id is not None:
+                children.setdefault(node.parent_id, []).append(node)
+
+        # wszerz = kolejność po głębokości
+        subtree: list[CostNode] = []
+        level = [root]
+        while level:
+            level.sort(key=lambda n: n.code)
+            subtree.extend(level)
+            level = [c for n in level for c in children.get(n.id, ())]
+        return subtree
+
+    def list_ancestors(self, cost_node_id: UUID) -> list[CostNode]:
+        node = self._nodes.get(cost_node_id)
+        ancestors: list[CostNode] = []
+        seen = {cost_node_id}
+        while node is not None and node.parent_id not in seen:
+            node = self._nodes.get(node.parent_id) if node.parent_id else None
+            if node is not None:
+                seen.add(node.id)
+                ancestors.append(node)
+        return ancestors[::-1]
+
     def delete_by_contract(self, contract_id: UUID) -> None:
         to_delete = [
             node_id
@@ -86,12 +142,32 @@ class InMemoryCostNodeRepository(CostNodeRepository):
         return cost_node_id in self._nodes
 
     def has_costs(self, contract_id: UUID) -> bool:
+        if self._invoice_lines is not None:
+            return bool(self._invoice_lines.list_by_contract(contract_id))
         return any(
             node.contract_id == contract_id
             for node in self._nodes.values()
         )
 
     def node_has_costs(self, cost_node_id: UUID) -> bool:
-        raise NotImplementedError(
-            "node_has_costs requires InvoiceLineRepository"
-        )
\ No newline at end of file
+        return bool(self.nodes_with_costs([cost_node_id]))
+
+    def nodes_with_costs(self, cost_node_ids: list[UUID]) -> set[UUID]:
+        if self._invoice_lines is None:
+            raise NotImplementedError(
+                "nodes_with_costs requires InvoiceLineRepository"
+            )
+
+        ids = set(cost_node_ids)
+        # linie tylko z kontraktów podanych węzłów (indeks po contract_id)
+        contract_ids = {
+            node.contract_id
+            for id_ in ids
+            if (node := self._nodes.get(id_)) is not None
+        }
+        return {
+            line.cost_node_id
+            for contract_id in contract_ids
+            for line in self._invoice_lines.list_by_contract(contract_id)
+            if line.cost_node_id is not None and line.cost_node_id in ids
+        }
@@ -1,3 +1,4 @@
+from datetime import date
 from uuid import UUID
 from contract_costs.model.cost_progress_snapshot import CostProgressSnapshot
 from contract_costs.repository.cost_progress_snapshot_repository import (
@@ -13,6 +14,14 @@ class InMemoryCostProgressSnapshotRepository(CostProgressSnapshotRepository):
     def add(self, snapshot: CostProgressSnapshot) -> None:
         self._snapshots.append(snapshot)
 
+    def add_many(self, snapshots: list[CostProgressSnapshot]) -> None:
+        replaced = {(s.contract_id, s.snapshot_date) for s in snapshots}
+        self._snapshots = [
+            s for s in self._snapshots
+            if (s.contract_id, s.snapshot_date) not in replaced
+        ]
+        self._snapshots.extend(snapshots)
+
     def get_by_contract(self, contract_id: UUID) -> list[CostProgressSnapshot]:
         return [
             s for s in self._snapshots
@@ -32,3 +41,39 @@ class InMemoryCostProgressSnapshotRepository(CostProgressSnapshotRepository):
         if not candidates:
             return None
         return max(candidates, key=lambda s: s.snapshot_date)
+
+    def list_latest_before(
+        self,
+        contract_ids: list[UUID],
+        before: date,
+    ) -> list[CostProgressSnapshot]:
+        wanted = set(contract_ids)
+        latest: dict[UUID, date] = {}
+        for s in self._snapshots:
+            if s.contract_id in wanted and s.snapshot_date < before:
+                if s.contract_id not in latest or s.snapshot_date > latest[s.contract_id]:
+                    latest[s.contract_id] = s.snapshot_date
+
+        return [
+            s for s in self._snapshots
+            if latest.get(s.contract_id) == s.snapshot_date
+        ]
+
+    def list_history(
+        self,
+        contract_id: UUID,
+        cost_node_id: UUID | None,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[CostProgressSnapshot]:
+        return sorted(
+            (
+                s for s in self._snapshots
+                if s.contract_id == contract_id
+                and s.cost_node_id == cost_node_id
+                and (date_from is None or s.snapshot_date >= date_from)
+                and (date_to is None or s.snapshot_date <= date_to)
+            ),
+            key=lambda s: s.snapshot_date,
+        )
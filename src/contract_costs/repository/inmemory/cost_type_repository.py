@@ -14,12 +14,23 @@ class InMemoryCostTypeRepository(CostTypeRepository):
     def get(self, cost_type_id: UUID) -> CostType | None:
         return self._items.get(cost_type_id)
 
+    def get_many(self, cost_type_ids: list[UUID]) -> list[CostType]:
+        return [
+            item
+            for id_ in dict.fromkeys(cost_type_ids)
+            if (item := self._items.get(id_)) is not None
+        ]
+
     def get_by_code(self, code: str) -> CostType | None:
         return next(
             (ct for ct in self._items.values() if ct.code == code),
             None
         )
 
+    def list_by_codes(self, codes: list[str]) -> list[CostType]:
+        wanted = set(codes)
+        return [ct for ct in self._items.values() if ct.code in wanted]
+
     def list(self) -> list[CostType]:
         return list(self._items.values())
 
@@ -0,0 +1,43 @@
+from dataclasses import replace
+from datetime import datetime
+
+from contract_costs.model.invoice_file_hash import InvoiceFileHash, InvoiceFileHashStats
+from contract_costs.repository.invoice_file_hash_repository import InvoiceFileHashRepository
+
+
+class InMemoryInvoiceFileHashRepository(InvoiceFileHashRepository):
+
+    def __init__(self) -> None:
+        self._entries: dict[str, InvoiceFileHash] = {}
+
+    def get(self, sha256: str) -> InvoiceFileHash | None:
+        return self._entries.get(sha256)
+
+    def add(self, entry: InvoiceFileHash) -> None:
+        known = self._entries.get(entry.sha256)
+        if known is not None and known.outcome == "imported":
+            return
+        self._entries[entry.sha256] = replace(
+            entry,
+            created_at=entry.created_at or datetime.now(),
+        )
+
+    def register_hit(self, sha256: str) -> None:
+        entry = self._entries.get(sha256)
+        if entry is None:
+            return
+        entry.hit_count += 1
+        entry.last_hit_at = datetime.now()
+
+    def stats(self) -> InvoiceFileHashStats:
+        entries = self._entries.values()
+        return InvoiceFileHashStats(
+            files=len(self._entries),
+            duplicates_skipped=sum(e.hit_count for e in entries),
+            files_with_duplicates=sum(1 for e in entries if e.hit_count),
+        )
+
+    def list_duplicated(self, limit: int = 20) -> list[InvoiceFileHash]:
+        duplicated = [e for e in self._entries.values() if e.hit_count]
+        duplicated.sort(key=lambda e: e.hit_count, reverse=True)
+        return duplicated[:limit]
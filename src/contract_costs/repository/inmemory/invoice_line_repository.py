@@ -1,3 +1,4 @@
+from collections import defaultdict
 from uuid import UUID
 from contract_costs.model.invoice_line import InvoiceLine
 from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
@@ -7,18 +8,31 @@ class InMemoryInvoiceLineRepository(InvoiceLineRepository):
 
     def __init__(self) -> None:
         self._lines: dict[UUID, InvoiceLine] = {}
+        # indeks contract_id -> line ids (raporty kosztów)
+        self._by_contract: defaultdict[UUID | None, set[UUID]] = defaultdict(set)
 
     def add(self, invoice_line: InvoiceLine) -> None:
-        self._lines[invoice_line.id] = invoice_line
+        self._put(invoice_line)
 
     def get(self, invoice_line_id: UUID) -> InvoiceLine | None:
         return self._lines.get(invoice_line_id)
 
-    def list_by_invoice_ids(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
+    def get_many(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
         return [
             line
             for id_ in invoice_line_ids
-            if (line := self.get(id_)) is not None
+            if (line := self._lines.get(id_)) is not None
+        ]
+
+    def upsert_many(self, invoice_lines: list[InvoiceLine]) -> None:
+        for line in invoice_lines:
+            self._put(line)
+
+    def list_by_invoice_ids(self, invoice_ids: list[UUID]) -> list[InvoiceLine]:
+        wanted = set(invoice_ids)
+        return [
+            line for line in self._lines.values()
+            if line.invoice_id in wanted
         ]
 
     def list_by_null_invoice(self) -> list[InvoiceLine]:
@@ -32,8 +46,8 @@ class InMemoryInvoiceLineRepository(InvoiceLineRepository):
 
     def list_by_contract(self, contract_id: UUID) -> list[InvoiceLine]:
         return [
-            line for line in self._lines.values()
-            if line.contract_id == contract_id
+            self._lines[line_id]
+            for line_id in self._by_contract.get(contract_id, ())
         ]
 
     def list_by_invoice(self, invoice_id: UUID) -> list[InvoiceLine]:
@@ -43,7 +57,7 @@ class InMemoryInvoiceLineRepository(InvoiceLineRepository):
         ]
 
     def update(self, invoice_line: InvoiceLine) -> None:
-        self._lines[invoice_line.id] = invoice_line
+        self._put(invoice_line)
 
     def exists(self, invoice_line_id: UUID) -> bool:
         return invoice_line_id in self._lines
@@ -65,7 +79,7 @@ class InMemoryInvoiceLineRepository(InvoiceLineRepository):
             to_delete.append(line_id)
 
         for line_id in to_delete:
-            del self._lines[line_id]
+            self._remove(line_id)
 
         return len(to_delete)
 
@@ -76,3 +90,15 @@ class InMemoryInvoiceLineRepository(InvoiceLineRepository):
                or line.cost_type_id is None
         ]
 
+    # ---------- index ----------
+
+    def _put(self, invoice_line: InvoiceLine) -> None:
+        old = self._lines.get(invoice_line.id)
+        if old is not None:
+            self._by_contract[old.contract_id].discard(old.id)
+        self._lines[invoice_line.id] = invoice_line
+        self._by_contract[invoice_line.contract_id].add(invoice_line.id)
+
+    def _remove(self, invoice_line_id: UUID) -> None:
+        line = self._lines.pop(invoice_line_id)
+        self._by_contract[line.contract_id].discard(invoice_line_id)
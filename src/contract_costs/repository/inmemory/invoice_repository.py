@@ -14,6 +14,13 @@ class InMemoryInvoiceRepository(InvoiceRepository):
     def get(self, invoice_id: UUID) -> Invoice | None:
         return self._invoices.get(invoice_id)
 
+    def get_many(self, invoice_ids: list[UUID]) -> list[Invoice]:
+        return [
+            item
+            for id_ in dict.fromkeys(invoice_ids)
+            if (item := self._invoices.get(id_)) is not None
+        ]
+
     def get_by_invoice_number(self, invoice_number: str) -> Invoice | None:
         for inv in self._invoices.values():
             if inv.invoice_number == invoice_number:
@@ -0,0 +1,76 @@
+from decimal import Decimal
+from uuid import UUID
+
+from contract_costs.model.invoice import InvoiceStatus, PaymentStatus
+from contract_costs.model.invoice_line import InvoiceLine
+from contract_costs.repository.company_repository import CompanyRepository
+from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
+from contract_costs.repository.invoice_repository import InvoiceRepository
+from contract_costs.repository.invoice_summary_repository import InvoiceSummaryRepository
+
+
+class InMemoryInvoiceSummaryRepository(InvoiceSummaryRepository):
+    """
+    Odpowiednik zapytania SQL liczony na repozytoriach:
+    filtr + sort + limit na fakturach, linie grupowane jednym przebiegiem.
+    """
+
+    def __init__(
+        self,
+        invoice_repository: InvoiceRepository,
+        invoice_line_repository: InvoiceLineRepository,
+        company_repository: CompanyRepository,
+    ) -> None:
+        self._invoices = invoice_repository
+        self._invoice_lines = invoice_line_repository
+        self._companies = company_repository
+
+    def list_summaries(
+        self,
+        *,
+        statuses: list[InvoiceStatus] | None = None,
+        unpaid: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        wanted = set(statuses or ())
+
+        invoices = [
+            i for i in self._invoices.list_invoices()
+            if (not wanted or i.status in wanted)
+            and (not unpaid or i.payment_status == PaymentStatus.UNPAID)
+        ]
+        invoices.sort(key=lambda i: i.timestamp, reverse=True)
+        if limit is not None:
+            invoices = invoices[:limit]
+
+        ids = {i.id for i in invoices}
+        lines_by_invoice: dict[UUID, list[InvoiceLine]] = {}
+        for line in self._invoice_lines.list_lines():
+            if line.invoice_id in ids:
+                lines_by_invoice.setdefault(line.invoice_id, []).append(line)
+
+        rows = []
+        for invoice in invoices:
+            buyer = self._companies.get(invoice.buyer_id) if invoice.buyer_id else None
+            seller = self._companies.get(invoice.seller_id) if invoice.seller_id else None
+            lines = lines_by_invoice.get(invoice.id, [])
+
+            rows.append({
+                "invoice_number": invoice.invoice_number,
+                "status": invoice.status.value,
+                "invoice_date": invoice.invoice_date,
+                "due_date": invoice.due_date,
+                "payment_method": invoice.payment_method.value,
+                "payment_status": invoice.payment_status.value,
+                "buyer_name": buyer.name if buyer else None,
+                "buyer_tax_number": buyer.tax_number if buyer else None,
+                "seller_name": seller.name if seller else None,
+                "seller_tax_number": seller.tax_number if seller else None,
+                "net_amount": sum((l.amount.net for l in lines), Decimal("0")),
+                "vat_amount": sum((l.amount.tax for l in lines), Decimal("0")),
+                "gross_amount": sum((l.amount.gross for l in lines), Decimal("0")),
+                "non_tax_amount": sum((l.amount.non_tax_cost for l in lines), Decimal("0")),
+                "line_count": len(lines),
+            })
+
+        return rows
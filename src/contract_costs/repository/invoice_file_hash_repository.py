@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+
+from contract_costs.model.invoice_file_hash import InvoiceFileHash, InvoiceFileHashStats
+
+
+class InvoiceFileHashRepository(ABC):
+
+    @abstractmethod
+    def get(self, sha256: str) -> InvoiceFileHash | None:
+        ...
+
+    @abstractmethod
+    def add(self, entry: InvoiceFileHash) -> None:
+        """
+        Wpis "imported" jest trwały (wygrywa pierwszy import); wpis z innym
+        wynikiem zastępuje wcześniejsze odrzucenie tej samej treści.
+        """
+        ...
+
+    @abstractmethod
+    def register_hit(self, sha256: str) -> None:
+        """Kolejny plik o tej samej treści został pominięty."""
+        ...
+
+    @abstractmethod
+    def stats(self) -> InvoiceFileHashStats:
+        ...
+
+    @abstractmethod
+    def list_duplicated(self, limit: int = 20) -> list[InvoiceFileHash]:
+        """Wpisy z największą liczbą pominiętych duplikatów."""
+        ...
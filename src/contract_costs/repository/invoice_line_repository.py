@@ -16,7 +16,25 @@ class InvoiceLineRepository(ABC):
         ...
 
     @abstractmethod
-    def list_by_invoice_ids(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
+    def get_many(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
+        """
+        Return existing lines for given ids (single IN query).
+        Missing ids are ignored.
+        """
+        ...
+
+    @abstractmethod
+    def upsert_many(self, invoice_lines: list[InvoiceLine]) -> None:
+        """
+        Insert new / overwrite existing lines in one batch.
+        """
+        ...
+
+    @abstractmethod
+    def list_by_invoice_ids(self, invoice_ids: list[UUID]) -> list[InvoiceLine]:
+        """
+        Return lines of all given invoices (chunked IN query on invoice_id).
+        """
         ...
 
     @abstractmethod
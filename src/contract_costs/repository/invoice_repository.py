@@ -15,6 +15,14 @@ class InvoiceRepository(ABC):
     def get(self, invoice_id: UUID) -> Invoice | None:
         ...
 
+    @abstractmethod
+    def get_many(self, invoice_ids: list[UUID]) -> list[Invoice]:
+        """
+        Return existing invoices for given ids (chunked IN query).
+        Missing ids are ignored.
+        """
+        ...
+
     @abstractmethod
     def list_invoices(self) -> list[Invoice]:
         ...
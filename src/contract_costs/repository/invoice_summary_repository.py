@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+from contract_costs.model.invoice import InvoiceStatus
+
+
+class InvoiceSummaryRepository(ABC):
+    """
+    Lista faktur z sumami i nazwami stron – jedno zapytanie
+    zamiast faktura -> linie -> firmy -> słowniki per wiersz.
+
+    Filtry, sortowanie (najnowsze pierwsze) i limit liczone
+    po stronie źródła danych.
+    """
+
+    @abstractmethod
+    def list_summaries(
+        self,
+        *,
+        statuses: list[InvoiceStatus] | None = None,
+        unpaid: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Row keys:
+        invoice_number, status, invoice_date, due_date,
+        payment_method, payment_status,
+        buyer_name, buyer_tax_number, seller_name, seller_tax_number,
+        net_amount, vat_amount, gross_amount, non_tax_amount, line_count
+        """
+        ...
@@ -5,6 +5,45 @@ from contract_costs.model.company import Company, CompanyType
 from contract_costs.model.company import Address, BankAccount, Contact
 from contract_costs.repository.company_repository import CompanyRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import fetch_in
+from contract_costs.services.common.resolve_utils import normalize_bank_account, normalize_phone
+from contract_costs.services.companies.normalize.match_keys import (
+    company_match_keys,
+    email_key,
+)
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+GET_BY_TAX_NUMBER_SQL = "SELECT * FROM companies WHERE tax_number = %s"
+FIND_BY_BANK_ACCOUNT_SQL = "SELECT * FROM companies WHERE bank_account_key = %s"
+FIND_BY_EMAIL_SQL = "SELECT * FROM companies WHERE email_key = %s"
+FIND_BY_PHONE_SQL = "SELECT * FROM companies WHERE phone_key = %s"
+
+
+def find_by_street_tokens_sql(token_count: int) -> str:
+    """
+    Firmy, które dla KAŻDEGO tokenu mają token zaczynający się od niego
+    ("12" -> "12/3", "12A" jak dawny LIKE) – range po PK (token, company_id).
+    Parametry: wzorce LIKE dwa razy (WHERE, potem HAVING).
+    """
+    matches = " OR ".join(["token LIKE %s ESCAPE '!'"] * token_count)
+    every = " AND ".join(["MAX(token LIKE %s ESCAPE '!') = 1"] * token_count)
+    return f"""
+        SELECT c.*
+        FROM companies c
+        JOIN (
+            SELECT company_id
+            FROM company_street_tokens
+            WHERE {matches}
+            GROUP BY company_id
+            HAVING {every}
+        ) t ON t.company_id = c.id
+    """
+
+
+def like_prefix(value: str) -> str:
+    """Wzorzec LIKE 'value%' (escape '!')"""
+    escaped = value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"{escaped}%"
 
 
 class MySQLCompanyRepository(CompanyRepository):
@@ -41,9 +80,22 @@ class MySQLCompanyRepository(CompanyRepository):
             is_active=bool(row["is_active"]),
         )
 
+    @staticmethod
+    def _replace_street_tokens(cur, company_id: UUID, tokens: frozenset[str]) -> None:
+        cur.execute(
+            "DELETE FROM company_street_tokens WHERE company_id = %s",
+            (str(company_id),),
+        )
+        if tokens:
+            cur.executemany(
+                "INSERT INTO company_street_tokens (token, company_id) VALUES (%s, %s)",
+                [(token, str(company_id)) for token in sorted(tokens)],
+            )
+
     # ---------- CRUD ----------
 
     def add(self, company: Company) -> None:
+        keys = company_match_keys(company)
         conn = get_connection()
         cur = conn.cursor()
 
@@ -54,9 +106,10 @@ class MySQLCompanyRepository(CompanyRepository):
                 street, city, zip_code, country,
                 phone_number, email,
                 bank_account_number, bank_account_country_code,
-                role, is_active
+                role, is_active,
+                bank_account_key, phone_key, email_key
             )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
             """,
             (
                 str(company.id),
@@ -73,14 +126,19 @@ class MySQLCompanyRepository(CompanyRepository):
                 company.bank_account.country_code if company.bank_account else None,
                 company.role.value,
                 company.is_active,
+                keys.bank_account,
+                keys.phone,
+                keys.email,
             ),
         )
+        self._replace_street_tokens(cur, company.id, keys.street_tokens)
 
         conn.commit()
         cur.close()
         conn.close()
 
     def update(self, company: Company) -> None:
+        keys = company_match_keys(company)
         conn = get_connection()
         cur = conn.cursor()
 
@@ -99,7 +157,10 @@ class MySQLCompanyRepository(CompanyRepository):
                 bank_account_number=%s,
                 bank_account_country_code=%s,
                 role=%s,
-                is_active=%s
+                is_active=%s,
+                bank_account_key=%s,
+                phone_key=%s,
+                email_key=%s
             WHERE id=%s
             """,
             (
@@ -116,9 +177,13 @@ class MySQLCompanyRepository(CompanyRepository):
                 company.bank_account.country_code if company.bank_account else None,
                 company.role.value,
                 company.is_active,
+                keys.bank_account,
+                keys.phone,
+                keys.email,
                 str(company.id),
             ),
         )
+        self._replace_street_tokens(cur, company.id, keys.street_tokens)
 
         conn.commit()
         cur.close()
@@ -152,6 +217,24 @@ class MySQLCompanyRepository(CompanyRepository):
 
         return self._row_to_company(row) if row else None
 
+    def get_many(self, company_ids: list[UUID]) -> list[Company]:
+        if not company_ids:
+            return []
+
+        conn = get_connection()
+        cur = conn.cursor(dictionary=True)
+
+        rows = fetch_in(
+            cur,
+            "SELECT * FROM companies WHERE id IN ({placeholders})",
+            (str(i) for i in company_ids),
+        )
+
+        cur.close()
+        conn.close()
+
+        return [self._row_to_company(row) for row in rows]
+
     def list_all(self) -> list[Company]:
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
@@ -185,10 +268,7 @@ class MySQLCompanyRepository(CompanyRepository):
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        cur.execute(
-            "SELECT * FROM companies WHERE tax_number = %s",
-            (tax_number,),
-        )
+        cur.execute(GET_BY_TAX_NUMBER_SQL, (tax_number,))
 
         row = cur.fetchone()
         cur.close()
@@ -232,10 +312,7 @@ class MySQLCompanyRepository(CompanyRepository):
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        cur.execute(
-            "SELECT * FROM companies WHERE bank_account_number = %s",
-            (bank_account,),
-        )
+        cur.execute(FIND_BY_BANK_ACCOUNT_SQL, (normalize_bank_account(bank_account),))
 
         rows = cur.fetchall()
         cur.close()
@@ -247,10 +324,7 @@ class MySQLCompanyRepository(CompanyRepository):
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        cur.execute(
-            "SELECT * FROM companies WHERE email = %s",
-            (email,),
-        )
+        cur.execute(FIND_BY_EMAIL_SQL, (email_key(email),))
 
         rows = cur.fetchall()
         cur.close()
@@ -262,10 +336,7 @@ class MySQLCompanyRepository(CompanyRepository):
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        cur.execute(
-            "SELECT * FROM companies WHERE phone_number = %s",
-            (phone_number,),
-        )
+        cur.execute(FIND_BY_PHONE_SQL, (normalize_phone(phone_number),))
 
         rows = cur.fetchall()
         cur.close()
@@ -289,30 +360,44 @@ class MySQLCompanyRepository(CompanyRepository):
         return [self._row_to_company(row) for row in rows]
 
     def find_by_street_tokens(self, tokens: list[str]) -> list[Company]:
-        if not tokens:
+        keys = sorted({t.strip().upper() for t in tokens if t and t.strip()})
+        if not keys:
             return []
 
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        where_clauses = []
-        params = []
-
-        for token in tokens:
-            where_clauses.append("LOWER(street) LIKE %s")
-            params.append(f"%{token.lower()}%")
-
-        sql = f"""
-            SELECT *
-            FROM companies
-            WHERE street IS NOT NULL
-              AND {' AND '.join(where_clauses)}
-        """
-
-        cur.execute(sql, params)
+        patterns = [like_prefix(key) for key in keys]
+        cur.execute(find_by_street_tokens_sql(len(patterns)), [*patterns, *patterns])
         rows = cur.fetchall()
 
         cur.close()
         conn.close()
 
-        return [self._row_to_company(row) for row in rows]
\ No newline at end of file
+        return [self._row_to_company(row) for row in rows]
+
+    # ---------- maintenance ----------
+
+    def rebuild_match_keys(self, conn) -> int:
+        """
+        Przelicza klucze dopasowania wszystkich firm (migracja / zmiana
+        reguł normalizacji) na połączeniu wywołującego – bez commit,
+        zatwierdza właściciel połączenia (np. MigrationRunner).
+        """
+        with conn.cursor(dictionary=True) as cur:
+            cur.execute("SELECT * FROM companies")
+            companies = [self._row_to_company(row) for row in cur.fetchall()]
+
+            for company in companies:
+                keys = company_match_keys(company)
+                cur.execute(
+                    """
+                    UPDATE companies
+                    SET bank_account_key=%s, phone_key=%s, email_key=%s
+                    WHERE id=%s
+                    """,
+                    (keys.bank_account, keys.phone, keys.email, str(company.id)),
+                )
+                self._replace_street_tokens(cur, company.id, keys.street_tokens)
+
+        return len(companies)
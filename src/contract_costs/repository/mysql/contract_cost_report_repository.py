@@ -0,0 +1,249 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from contract_costs.model.amount import TaxTreatment
+from contract_costs.model.invoice import InvoiceStatus, PaymentStatus
+from contract_costs.repository.contract_cost_report_repository import (
+    ContractCostReportRepository,
+)
+from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import BATCH_SIZE, chunks
+
+
+class MySQLContractCostReportRepository(ContractCostReportRepository):
+
+    def aggregate_costs(
+        self,
+        contract_id: UUID,
+        *,
+        group_by_invoice: bool = False,
+        invoice_numbers: list[str] | None = None,
+        invoice_statuses: list[InvoiceStatus] | None = None,
+        paid: bool | None = None,
+        leaves_only: bool = True,
+    ) -> list[dict]:
+        where = ["il.contract_id = %s"]
+        if leaves_only:
+            where.append("cn.is_leaf = 1")
+
+        params: list = [
+            TaxTreatment.TAX_DEDUCTIBLE.value,
+            TaxTreatment.TAX_DEDUCTIBLE.value,
+            TaxTreatment.NON_DEDUCTIBLE.value,
+            str(contract_id),
+            str(contract_id),
+        ]
+
+        if invoice_numbers:
+            where.append(f"i.invoice_number IN ({', '.join(['%s'] * len(invoice_numbers))})")
+            params.extend(invoice_numbers)
+
+        if invoice_statuses:
+            where.append(f"i.status IN ({', '.join(['%s'] * len(invoice_statuses))})")
+            params.extend(s.value for s in invoice_statuses)
+
+        if paid is not None:
+            where.append("i.payment_status = %s" if paid else "i.payment_status <> %s")
+            params.append(PaymentStatus.PAID.value)
+
+        group_by = ["cn.id", "ct.id"]
+        if group_by_invoice:
+            group_by.append("i.invoice_number")
+
+        sql = f"""
+        SELECT
+            cn.id AS cost_node_id,
+            cn.code AS cost_node_code,
+            cn.name AS cost_node_name,
+            cn.budget AS cost_node_budget,
+            ct.code AS cost_type_code,
+            ct.name AS cost_type_name,
+            {"i.invoice_number" if group_by_invoice else "NULL"} AS invoice_number,
+            SUM(CASE WHEN il.tax_treatment = %s
+                     THEN il.amount_value ELSE 0 END) AS net_amount,
+            SUM(CASE WHEN il.tax_treatment = %s
+                      AND il.vat_rate IS NOT NULL AND il.vat_rate <> ''
+                     THEN ROUND(il.amount_value * CAST(il.vat_rate AS DECIMAL(6,4)), 2)
+                     ELSE 0 END) AS vat_amount,
+            SUM(il.amount_value) AS value_amount,
+            SUM(CASE WHEN il.tax_treatment = %s
+                     THEN il.amount_value ELSE 0 END) AS non_tax_amount,
+            COUNT(*) AS line_count
+        FROM invoice_lines il
+        JOIN cost_nodes cn
+          ON cn.id = il.cost_node_id
+         AND cn.contract_id = %s
+        LEFT JOIN cost_types ct ON ct.id = il.cost_type_id
+        LEFT JOIN invoices i ON i.id = il.invoice_id
+        WHERE {" AND ".join(where)}
+        GROUP BY {", ".join(group_by)}
+        ORDER BY cost_node_code, cost_type_code
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, tuple(params))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
+    def mark_lines(self, contract_ids: list[UUID]) -> tuple[datetime, dict[UUID, int]]:
+        ids = list(dict.fromkeys(str(c) for c in contract_ids))
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                # zegar bazy – ten sam, który wypełnia created_at / updated_at
+                cur.execute("SELECT CURRENT_TIMESTAMP AS marked_at")
+                marked_at = cur.fetchone()["marked_at"]
+                counts = self._line_counts(cur, ids, marked_at)
+        return marked_at, counts
+
+    def changed_since(self, marks: dict[UUID, tuple[datetime, int]]) -> set[UUID]:
+        by_time: dict[datetime, list[str]] = defaultdict(list)
+        for contract_id, (marked_at, _) in marks.items():
+            by_time[marked_at].append(str(contract_id))
+
+        # >= : zmiana w tej samej sekundzie co znacznik też unieważnia bazę
+        changed_lines_sql = """
+        SELECT DISTINCT il.contract_id AS contract_id
+        FROM invoice_lines il
+        WHERE il.contract_id IN ({placeholders})
+          AND il.updated_at >= %s
+          AND il.created_at <= %s
+        """
+        changed_invoices_sql = """
+        SELECT DISTINCT il.contract_id AS contract_id
+        FROM invoices i
+        JOIN invoice_lines il ON il.invoice_id = i.id
+        WHERE i.updated_at >= %s
+          AND il.contract_id IN ({placeholders})
+          AND il.created_at <= %s
+        """
+        changed_nodes_sql = """
+        SELECT DISTINCT contract_id
+        FROM cost_nodes
+        WHERE contract_id IN ({placeholders})
+          AND updated_at >= %s
+        """
+
+        changed: set[UUID] = set()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                for marked_at, ids in by_time.items():
+                    # usunięte / przeniesione linie: mniej linii sprzed znacznika
+                    counts = self._line_counts(cur, ids, marked_at)
+                    changed.update(
+                        UUID(c) for c in ids
+                        if counts.get(UUID(c), 0) != marks[UUID(c)][1]
+                    )
+
+                    for chunk in chunks(ids, BATCH_SIZE):
+                        placeholders = ", ".join(["%s"] * len(chunk))
+                        for sql, params in (
+                            (changed_lines_sql, (*chunk, marked_at, marked_at)),
+                            (changed_invoices_sql, (marked_at, *chunk, marked_at)),
+                            (changed_nodes_sql, (*chunk, marked_at)),
+                        ):
+                            cur.execute(sql.format(placeholders=placeholders), params)
+                            changed.update(UUID(r["contract_id"]) for r in cur.fetchall())
+
+        return changed
+
+    def executed_by_node(
+        self,
+        contract_ids: list[UUID],
+        *,
+        until: date,
+        as_of: datetime | None = None,
+        after: date | None = None,
+        counted_at: datetime | None = None,
+    ) -> list[dict]:
+        if not contract_ids:
+            return []
+
+        where = [
+            "il.contract_id IN ({placeholders})",
+            "i.status <> %s",
+            "COALESCE(i.invoice_date, i.selling_date, DATE(i.timestamp)) <= %s",
+        ]
+        params: list = [InvoiceStatus.DELETED.value, until]
+
+        if as_of is not None:
+            where.append("il.created_at <= %s")
+            params.append(as_of)
+
+        if after is not None and counted_at is not None:
+            # już w poprzednim snapshocie: data <= after i dodana do znacznika
+            where.append(
+                "(COALESCE(i.invoice_date, i.selling_date, DATE(i.timestamp)) > %s"
+                " OR il.created_at > %s)"
+            )
+            params.extend((after, counted_at))
+        elif after is not None:
+            where.append("COALESCE(i.invoice_date, i.selling_date, DATE(i.timestamp)) > %s")
+            params.append(after)
+
+        sql = f"""
+        SELECT
+            il.contract_id AS contract_id,
+            il.cost_node_id AS cost_node_id,
+            SUM(il.amount_value) AS executed_amount
+        FROM invoice_lines il
+        JOIN invoices i ON i.id = il.invoice_id
+        WHERE {" AND ".join(where)}
+        GROUP BY il.contract_id, il.cost_node_id
+        """
+
+        rows: list[dict] = []
+        ids = list(dict.fromkeys(str(c) for c in contract_ids))
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                for chunk in chunks(ids, BATCH_SIZE):
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cur.execute(sql.format(placeholders=placeholders), (*chunk, *params))
+                    rows.extend(cur.fetchall())
+
+        return [
+            {
+                "contract_id": UUID(r["contract_id"]),
+                "cost_node_id": UUID(r["cost_node_id"]) if r["cost_node_id"] else None,
+                "executed_amount": Decimal(r["executed_amount"] or 0),
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def _line_counts(cur, ids: list[str], marked_at: datetime) -> dict[UUID, int]:
+        sql = """
+        SELECT contract_id, COUNT(*) AS line_count
+        FROM invoice_lines
+        WHERE contract_id IN ({placeholders})
+          AND created_at <= %s
+        GROUP BY contract_id
+        """
+        counts: dict[UUID, int] = {}
+        for chunk in chunks(ids, BATCH_SIZE):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cur.execute(sql.format(placeholders=placeholders), (*chunk, marked_at))
+            counts.update((UUID(r["contract_id"]), int(r["line_count"])) for r in cur.fetchall())
+        return counts
+
+    # ---------- mapping ----------
+    @staticmethod
+    def _map_row(row: dict) -> dict:
+        vat = Decimal(row["vat_amount"] or 0)
+        return {
+            "cost_node_id": UUID(row["cost_node_id"]),
+            "cost_node_code": row["cost_node_code"],
+            "cost_node_name": row["cost_node_name"],
+            "cost_node_budget": row["cost_node_budget"],
+            "cost_type_code": row["cost_type_code"],
+            "cost_type_name": row["cost_type_name"],
+            "invoice_number": row["invoice_number"],
+            "net_amount": Decimal(row["net_amount"] or 0),
+            "vat_amount": vat,
+            "gross_amount": Decimal(row["value_amount"] or 0) + vat,
+            "non_tax_amount": Decimal(row["non_tax_amount"] or 0),
+            "line_count": int(row["line_count"]),
+        }
@@ -3,6 +3,10 @@ from uuid import UUID
 from contract_costs.model.contract import Contract, ContractStatus
 from contract_costs.repository.contract_repository import ContractRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import fetch_in
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+GET_BY_CODE_SQL = "SELECT * FROM contracts WHERE code = %s"
 
 
 class MySQLContractRepository(ContractRepository):
@@ -93,6 +97,44 @@ class MySQLContractRepository(ContractRepository):
 
         return self._row_to_contract(row) if row else None
 
+    def get_many(self, contract_ids: list[UUID]) -> list[Contract]:
+        if not contract_ids:
+            return []
+
+        conn = get_connection()
+        cur = conn.cursor(dictionary=True)
+
+        rows = fetch_in(
+            cur,
+            "SELECT * FROM contracts WHERE id IN ({placeholders})",
+            (str(i) for i in contract_ids),
+        )
+
+        cur.close()
+        conn.close()
+
+        return [self._row_to_contract(row) for row in rows]
+
+    def list_by_codes(self, contract_codes: list[str]) -> list[Contract]:
+        if not contract_codes:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(contract_codes))
+
+        conn = get_connection()
+        cur = conn.cursor(dictionary=True)
+
+        cur.execute(
+            f"SELECT * FROM contracts WHERE code IN ({placeholders})",
+            tuple(contract_codes),
+        )
+        rows = cur.fetchall()
+
+        cur.close()
+        conn.close()
+
+        return [self._row_to_contract(row) for row in rows]
+
     def list(self) -> list[Contract]:
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
@@ -125,10 +167,7 @@ class MySQLContractRepository(ContractRepository):
         conn = get_connection()
         cur = conn.cursor(dictionary=True)
 
-        cur.execute(
-            "SELECT * FROM contracts WHERE code = %s",
-            (contract_code,),
-        )
+        cur.execute(GET_BY_CODE_SQL, (contract_code,))
         row = cur.fetchone()
 
         cur.close()
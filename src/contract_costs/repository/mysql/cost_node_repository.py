@@ -5,6 +5,17 @@ from contract_costs.model.cost_node import CostNode
 from contract_costs.model.unit_of_measure import UnitOfMeasure
 from contract_costs.repository.cost_node_repository import CostNodeRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import BATCH_SIZE, chunks, fetch_in
+from contract_costs.repository.cost_node_hierarchy import build_hierarchy
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+GET_BY_CODE_SQL = "SELECT * FROM cost_nodes WHERE code = %s"
+LIST_BY_CONTRACT_SQL = """
+SELECT *
+FROM cost_nodes
+WHERE contract_id = %s
+ORDER BY IF(parent_id IS NULL, 0, 1), code
+"""
 
 
 class MySQLCostNodeRepository(CostNodeRepository):
@@ -20,9 +31,9 @@ class MySQLCostNodeRepository(CostNodeRepository):
         INSERT INTO cost_nodes (
             id, contract_id, parent_id,
             code, name,
-            budget, quantity, unit
+            budget, quantity, unit, is_active
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
         values = [
@@ -35,68 +46,92 @@ class MySQLCostNodeRepository(CostNodeRepository):
                 n.budget,
                 n.quantity,
                 n.unit.value if n.unit else None,
+                n.is_active,
             )
             for n in cost_nodes
         ]
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.executemany(sql, values)
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(sql, values)
+                self._refresh_subtrees(
+                    cur,
+                    [n.id for n in cost_nodes],
+                    [n.parent_id for n in cost_nodes if n.parent_id],
+                )
+            conn.commit()
 
     def get(self, cost_node_id: UUID) -> CostNode | None:
         sql = "SELECT * FROM cost_nodes WHERE id = %s"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(cost_node_id),))
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(cost_node_id),))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
+    def get_many(self, cost_node_ids: list[UUID]) -> list[CostNode]:
+        if not cost_node_ids:
+            return []
 
-    def get_by_code(self, cost_node_code: str) -> CostNode | None:
-        sql = "SELECT * FROM cost_nodes WHERE code = %s"
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                rows = fetch_in(
+                    cur,
+                    "SELECT * FROM cost_nodes WHERE id IN ({placeholders})",
+                    (str(i) for i in cost_node_ids),
+                )
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(cost_node_code),))
-            row = cur.fetchone()
+        return [self._map_row(r) for r in rows]
+
+    def get_by_code(self, cost_node_code: str) -> CostNode | None:
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(GET_BY_CODE_SQL, (str(cost_node_code),))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
+    def list_by_codes(self, cost_node_codes: list[str]) -> list[CostNode]:
+        if not cost_node_codes:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(cost_node_codes))
+        sql = f"SELECT * FROM cost_nodes WHERE code IN ({placeholders})"
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, tuple(cost_node_codes))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
     def list_nodes(self) -> list[CostNode]:
         sql = "SELECT * FROM cost_nodes"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
     def list_by_parent(self, parent_id: UUID) -> list[CostNode]:
         sql = "SELECT * FROM cost_nodes WHERE parent_id = %s"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(parent_id),))
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(parent_id),))
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
     def list_by_contract(self, contract_id: UUID) -> list[CostNode]:
-        sql = """
-              SELECT *
-              FROM cost_nodes
-              WHERE contract_id = %s
-              ORDER BY IF(parent_id IS NULL, 0, 1), code 
-              """
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-
-            cur.execute(sql, (str(contract_id),))
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(LIST_BY_CONTRACT_SQL, (str(contract_id),))
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
@@ -105,22 +140,27 @@ class MySQLCostNodeRepository(CostNodeRepository):
               SELECT cn.*
               FROM cost_nodes cn
                        JOIN contracts c ON c.id = cn.contract_id
-                       LEFT JOIN cost_nodes child ON child.parent_id = cn.id
-              WHERE child.id IS NULL
+              WHERE cn.is_leaf = 1
                 AND c.status = "active" 
                   ORDER BY
                     SUBSTRING_INDEX(cn.code, '_', 1),
                         cn.code
               """
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
     def update(self, cost_node: CostNode) -> None:
+        self.update_many([cost_node])
+
+    def update_many(self, nodes: list[CostNode]) -> None:
+        if not nodes:
+            return
+
         sql = """
         UPDATE cost_nodes SET
             parent_id = %s,
@@ -128,37 +168,62 @@ class MySQLCostNodeRepository(CostNodeRepository):
             name = %s,
             budget = %s,
             quantity = %s,
-            unit = %s
+            unit = %s,
+            is_active = %s
         WHERE id = %s
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    str(cost_node.parent_id) if cost_node.parent_id else None,
-                    cost_node.code,
-                    cost_node.name,
-                    cost_node.budget,
-                    cost_node.quantity,
-                    cost_node.unit.value if cost_node.unit else None,
-                    str(cost_node.id),
-                ),
+        values = [
+            (
+                str(n.parent_id) if n.parent_id else None,
+                n.code,
+                n.name,
+                n.budget,
+                n.quantity,
+                n.unit.value if n.unit else None,
+                n.is_active,
+                str(n.id),
             )
-        conn.commit()
+            for n in nodes
+        ]
 
-    def update_many(self, nodes: list[CostNode]) -> None:
-        for n in nodes:
-            self.update(n)
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                old_parents = {
+                    row[0]: row[1]
+                    for row in fetch_in(
+                        cur,
+                        "SELECT id, parent_id FROM cost_nodes WHERE id IN ({placeholders})",
+                        (str(n.id) for n in nodes),
+                    )
+                }
+                for chunk in chunks(values, BATCH_SIZE):
+                    cur.executemany(sql, chunk)
+
+                # hierarchia zmienia się tylko przy nowym rodzicu
+                moved = [
+                    n for n in nodes
+                    if str(n.id) in old_parents
+                    and old_parents[str(n.id)] != (str(n.parent_id) if n.parent_id else None)
+                ]
+                if moved:
+                    self._refresh_subtrees(
+                        cur,
+                        [n.id for n in moved],
+                        [
+                            *(old_parents[str(n.id)] for n in moved),
+                            *(n.parent_id for n in moved),
+                        ],
+                    )
+            conn.commit()
 
     def delete_by_contract(self, contract_id: UUID) -> None:
         sql = "DELETE FROM cost_nodes WHERE contract_id = %s"
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(contract_id),))
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(contract_id),))
+            conn.commit()
 
     def delete_many(self, ids: list[UUID]) -> None:
         if not ids:
@@ -166,19 +231,88 @@ class MySQLCostNodeRepository(CostNodeRepository):
 
         placeholders = ",".join(["%s"] * len(ids))
         sql = f"DELETE FROM cost_nodes WHERE id IN ({placeholders})"
+        params = tuple(str(i) for i in ids)
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT DISTINCT parent_id FROM cost_nodes WHERE id IN ({placeholders})",
+                    params,
+                )
+                parent_ids = [row[0] for row in cur.fetchall() if row[0]]
+
+                # poddrzewa i ich domknięcie znikają kaskadowo – zostaje is_leaf rodziców
+                cur.execute(sql, params)
+                self._refresh_subtrees(cur, [], parent_ids)
+            conn.commit()
+
+    def list_leaves(self, contract_id: UUID) -> list[CostNode]:
+        sql = """
+        SELECT *
+        FROM cost_nodes
+        WHERE contract_id = %s
+          AND is_leaf = 1
+        ORDER BY code
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(contract_id),))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
+    def list_subtree(self, cost_node_id: UUID) -> list[CostNode]:
+        sql = """
+        SELECT cn.*
+        FROM cost_node_closure cl
+        JOIN cost_nodes cn ON cn.id = cl.descendant_id
+        WHERE cl.ancestor_id = %s
+        ORDER BY cn.depth, cn.code
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(cost_node_id),))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
+    def list_ancestors(self, cost_node_id: UUID) -> list[CostNode]:
+        sql = """
+        SELECT cn.*
+        FROM cost_node_closure cl
+        JOIN cost_nodes cn ON cn.id = cl.ancestor_id
+        WHERE cl.descendant_id = %s
+          AND cl.distance > 0
+        ORDER BY cl.distance DESC
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(cost_node_id),))
+                rows = cur.fetchall()
 
-        conn = get_connection()
+        return [self._map_row(r) for r in rows]
+
+    def rebuild_hierarchy(self, conn) -> int:
+        """
+        Przelicza cost_node_closure / depth / is_leaf dla wszystkich kontraktów
+        na połączeniu wywołującego – bez commit (np. MigrationRunner).
+        """
         with conn.cursor() as cur:
-            cur.execute(sql, tuple(str(i) for i in ids))
-        conn.commit()
+            cur.execute("SELECT DISTINCT contract_id FROM cost_nodes")
+            contract_ids = [row[0] for row in cur.fetchall()]
+            self._refresh_hierarchy(cur, contract_ids)
+        return len(contract_ids)
 
     def exists(self, cost_node_id: UUID) -> bool:
         sql = "SELECT 1 FROM cost_nodes WHERE id = %s LIMIT 1"
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(cost_node_id),))
-            return cur.fetchone() is not None
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(cost_node_id),))
+                return cur.fetchone() is not None
 
     def has_costs(self, contract_id: UUID) -> bool:
         sql = """
@@ -188,10 +322,10 @@ class MySQLCostNodeRepository(CostNodeRepository):
         LIMIT 1
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(contract_id),))
-            return cur.fetchone() is not None
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(contract_id),))
+                return cur.fetchone() is not None
 
     def node_has_costs(self, cost_node_id: UUID) -> bool:
         sql = """
@@ -201,10 +335,199 @@ class MySQLCostNodeRepository(CostNodeRepository):
         LIMIT 1
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(cost_node_id),))
-            return cur.fetchone() is not None
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(cost_node_id),))
+                return cur.fetchone() is not None
+
+    def nodes_with_costs(self, cost_node_ids: list[UUID]) -> set[UUID]:
+        if not cost_node_ids:
+            return set()
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                rows = fetch_in(
+                    cur,
+                    """
+                    SELECT DISTINCT cost_node_id
+                    FROM invoice_lines
+                    WHERE cost_node_id IN ({placeholders})
+                    """,
+                    (str(i) for i in cost_node_ids),
+                )
+
+        return {UUID(r["cost_node_id"]) for r in rows}
+
+    # ---------- hierarchy ----------
+    @staticmethod
+    def _refresh_hierarchy(cur, contract_ids) -> None:
+        """
+        Przelicza cost_node_closure + cost_nodes.depth / is_leaf
+        dla całych kontraktów (rebuild_hierarchy): jeden odczyt (id, parent_id),
+        zapisy wsadowe, UPDATE tylko dla węzłów, którym zmienił się depth / is_leaf.
+        Zapisy węzłów używają przyrostowego _refresh_subtrees.
+        """
+        ids = list(dict.fromkeys(str(c) for c in contract_ids))
+        if not ids:
+            return
+
+        rows: list[tuple] = []
+        for id_chunk in chunks(ids, BATCH_SIZE):
+            placeholders = ", ".join(["%s"] * len(id_chunk))
+            cur.execute(
+                "SELECT id, contract_id, parent_id, depth, is_leaf "
+                f"FROM cost_nodes WHERE contract_id IN ({placeholders})",
+                tuple(id_chunk),
+            )
+            rows.extend(cur.fetchall())
+
+            cur.execute(
+                f"DELETE FROM cost_node_closure WHERE contract_id IN ({placeholders})",
+                tuple(id_chunk),
+            )
+
+        hierarchy = build_hierarchy({r[0]: r[2] for r in rows})
+        contract_of = {r[0]: r[1] for r in rows}
+
+        paths = [
+            (contract_of[descendant], ancestor, descendant, distance)
+            for ancestor, descendant, distance in hierarchy.paths
+        ]
+        MySQLCostNodeRepository._insert_paths(cur, paths)
+
+        changed = [
+            (hierarchy.depth[node_id], int(hierarchy.is_leaf[node_id]), node_id)
+            for node_id, _, _, depth, is_leaf in rows
+            if depth != hierarchy.depth[node_id]
+            or bool(is_leaf) != hierarchy.is_leaf[node_id]
+        ]
+        MySQLCostNodeRepository._update_flags(cur, changed)
+
+    @staticmethod
+    def _refresh_subtrees(cur, node_ids: Iterable, parent_ids: Iterable = ()) -> None:
+        """
+        Przyrostowa wersja _refresh_hierarchy po add_all / update_many / delete_many.
+
+        node_ids – węzły dodane albo z nowym rodzicem. Ścieżki zmieniają się
+        tylko w ich (dotychczasowych) poddrzewach: te wiersze domknięcia są
+        liczone od nowa i doklejane do niezmienionych przodków.
+        parent_ids – węzły spoza tych poddrzew, którym mogło się zmienić
+        is_leaf (stary / nowy rodzic, rodzic usuniętego węzła).
+        """
+        roots = list(dict.fromkeys(str(n) for n in node_ids))
+
+        # domknięcie nie jest jeszcze przepięte – to stare poddrzewa
+        affected = set(roots)
+        affected.update(
+            row[0]
+            for row in fetch_in(
+                cur,
+                "SELECT descendant_id FROM cost_node_closure WHERE ancestor_id IN ({placeholders})",
+                roots,
+            )
+        )
+
+        rows = fetch_in(
+            cur,
+            "SELECT id, contract_id, parent_id, depth, is_leaf "
+            "FROM cost_nodes WHERE id IN ({placeholders})",
+            affected,
+        )
+        parent_of = {r[0]: r[2] for r in rows}
+        contract_of = {r[0]: r[1] for r in rows}
+        hierarchy = build_hierarchy(parent_of)
+
+        # rodzice korzeni poddrzew spoza nich – ich ścieżki się nie zmieniają
+        exits = {
+            node_id: parent
+            for node_id, parent in parent_of.items()
+            if hierarchy.depth[node_id] == 0 and parent and parent not in parent_of
+        }
+        exit_depth = {
+            r[0]: r[1]
+            for r in fetch_in(
+                cur,
+                "SELECT id, depth FROM cost_nodes WHERE id IN ({placeholders})",
+                exits.values(),
+            )
+        }
+        exit_paths: dict[str, list[tuple[str, int]]] = {}
+        for r in fetch_in(
+            cur,
+            "SELECT ancestor_id, descendant_id, distance "
+            "FROM cost_node_closure WHERE descendant_id IN ({placeholders})",
+            exits.values(),
+        ):
+            exit_paths.setdefault(r[1], []).append((r[0], r[2]))
+
+        depth = dict(hierarchy.depth)
+        paths = [
+            (contract_of[descendant], ancestor, descendant, distance)
+            for ancestor, descendant, distance in hierarchy.paths
+        ]
+        for top, descendant, distance in hierarchy.paths:
+            parent = exits.get(top)
+            if parent is None or parent not in exit_depth or hierarchy.depth[top] != 0:
+                continue
+            depth[descendant] = exit_depth[parent] + 1 + distance
+            paths.extend(
+                (contract_of[descendant], ancestor, descendant, up + 1 + distance)
+                for ancestor, up in exit_paths.get(parent, ())
+            )
+
+        id_chunks = chunks(list(affected), BATCH_SIZE)
+        for id_chunk in id_chunks:
+            placeholders = ", ".join(["%s"] * len(id_chunk))
+            cur.execute(
+                f"DELETE FROM cost_node_closure WHERE descendant_id IN ({placeholders})",
+                tuple(id_chunk),
+            )
+        MySQLCostNodeRepository._insert_paths(cur, paths)
+
+        changed = [
+            (depth[node_id], int(hierarchy.is_leaf[node_id]), node_id)
+            for node_id, _, _, old_depth, is_leaf in rows
+            if old_depth != depth[node_id]
+            or bool(is_leaf) != hierarchy.is_leaf[node_id]
+        ]
+
+        # is_leaf rodziców spoza poddrzew – z faktycznych dzieci
+        outside = [p for p in dict.fromkeys(str(p) for p in parent_ids if p) if p not in affected]
+        changed.extend(
+            (r[1], int(not r[3]), r[0])
+            for r in fetch_in(
+                cur,
+                """
+                SELECT p.id, p.depth, p.is_leaf,
+                       EXISTS (SELECT 1 FROM cost_nodes c WHERE c.parent_id = p.id) AS has_children
+                FROM cost_nodes p
+                WHERE p.id IN ({placeholders})
+                """,
+                outside,
+            )
+            if bool(r[2]) == bool(r[3])
+        )
+        MySQLCostNodeRepository._update_flags(cur, changed)
+
+    @staticmethod
+    def _insert_paths(cur, paths: list[tuple[str, str, str, int]]) -> None:
+        for path_chunk in chunks(paths, BATCH_SIZE):
+            cur.executemany(
+                """
+                INSERT INTO cost_node_closure (contract_id, ancestor_id, descendant_id, distance)
+                VALUES (%s, %s, %s, %s)
+                """,
+                path_chunk,
+            )
+
+    @staticmethod
+    def _update_flags(cur, changed: list[tuple[int, int, str]]) -> None:
+        """(depth, is_leaf, id) – tylko węzły, którym coś się zmieniło"""
+        for flag_chunk in chunks(changed, BATCH_SIZE):
+            cur.executemany(
+                "UPDATE cost_nodes SET depth = %s, is_leaf = %s WHERE id = %s",
+                flag_chunk,
+            )
 
     # ---------- mapping ----------
     @staticmethod
@@ -1,8 +1,10 @@
+from datetime import date
 from uuid import UUID
 
 from contract_costs.model.cost_progress_snapshot import CostProgressSnapshot
 from contract_costs.repository.cost_progress_snapshot_repository import CostProgressSnapshotRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import BATCH_SIZE, chunks
 
 
 class MySQLCostProgressSnapshotRepository(CostProgressSnapshotRepository):
@@ -16,26 +18,55 @@ class MySQLCostProgressSnapshotRepository(CostProgressSnapshotRepository):
             snapshot_date,
             planned_amount,
             executed_amount,
-            progress_percent
+            progress_percent,
+            counted_at,
+            counted_lines
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    str(snapshot.id),
-                    str(snapshot.contract_id),
-                    str(snapshot.cost_node_id) if snapshot.cost_node_id else None,
-                    snapshot.snapshot_date,
-                    snapshot.planned_amount,
-                    snapshot.executed_amount,
-                    snapshot.progress_percent,
-                ),
-            )
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, self._to_params(snapshot))
+            conn.commit()
+
+    def add_many(self, snapshots: list[CostProgressSnapshot]) -> None:
+        if not snapshots:
+            return
+
+        delete_sql = """
+        DELETE FROM cost_progress_snapshots
+        WHERE contract_id = %s
+          AND snapshot_date = %s
+        """
+
+        insert_sql = """
+        INSERT INTO cost_progress_snapshots (
+            id,
+            contract_id,
+            cost_node_id,
+            snapshot_date,
+            planned_amount,
+            executed_amount,
+            progress_percent,
+            counted_at,
+            counted_lines
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+
+        replaced = list(dict.fromkeys(
+            (str(s.contract_id), s.snapshot_date) for s in snapshots
+        ))
+        values = [self._to_params(s) for s in snapshots]
+
+        # delete + insert w jednej transakcji – bez "dziury" w historii
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(delete_sql, replaced)
+                for chunk in chunks(values, BATCH_SIZE):
+                    cur.executemany(insert_sql, chunk)
+            conn.commit()
 
     def get_by_contract(self, contract_id: UUID) -> list[CostProgressSnapshot]:
         sql = """
@@ -45,10 +76,10 @@ class MySQLCostProgressSnapshotRepository(CostProgressSnapshotRepository):
         ORDER BY snapshot_date
         """
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(contract_id),))
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(contract_id),))
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
@@ -78,14 +109,99 @@ class MySQLCostProgressSnapshotRepository(CostProgressSnapshotRepository):
             """
             params = (str(contract_id), str(cost_node_id)) #type: ignore
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, params)
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, params)
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
+    def list_latest_before(
+        self,
+        contract_ids: list[UUID],
+        before: date,
+    ) -> list[CostProgressSnapshot]:
+        if not contract_ids:
+            return []
+
+        sql = """
+        SELECT s.*
+        FROM cost_progress_snapshots s
+        JOIN (
+            SELECT contract_id, MAX(snapshot_date) AS snapshot_date
+            FROM cost_progress_snapshots
+            WHERE contract_id IN ({placeholders})
+              AND snapshot_date < %s
+            GROUP BY contract_id
+        ) last
+          ON last.contract_id = s.contract_id
+         AND last.snapshot_date = s.snapshot_date
+        """
+
+        rows: list[dict] = []
+        ids = list(dict.fromkeys(str(c) for c in contract_ids))
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                for chunk in chunks(ids, BATCH_SIZE):
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cur.execute(sql.format(placeholders=placeholders), (*chunk, before))
+                    rows.extend(cur.fetchall())
+
+        return [self._map_row(r) for r in rows]
+
+    def list_history(
+        self,
+        contract_id: UUID,
+        cost_node_id: UUID | None,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[CostProgressSnapshot]:
+        where = ["contract_id = %s"]
+        params: list = [str(contract_id)]
+
+        if cost_node_id is None:
+            where.append("cost_node_id IS NULL")
+        else:
+            where.append("cost_node_id = %s")
+            params.append(str(cost_node_id))
+
+        if date_from is not None:
+            where.append("snapshot_date >= %s")
+            params.append(date_from)
+        if date_to is not None:
+            where.append("snapshot_date <= %s")
+            params.append(date_to)
+
+        sql = f"""
+        SELECT *
+        FROM cost_progress_snapshots
+        WHERE {" AND ".join(where)}
+        ORDER BY snapshot_date
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, tuple(params))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
     # ---------- mapping ----------
+    @staticmethod
+    def _to_params(snapshot: CostProgressSnapshot) -> tuple:
+        return (
+            str(snapshot.id),
+            str(snapshot.contract_id),
+            str(snapshot.cost_node_id) if snapshot.cost_node_id else None,
+            snapshot.snapshot_date,
+            snapshot.planned_amount,
+            snapshot.executed_amount,
+            snapshot.progress_percent,
+            snapshot.counted_at,
+            snapshot.counted_lines,
+        )
+
     @staticmethod
     def _map_row(row: dict) -> CostProgressSnapshot:
         return CostProgressSnapshot(
@@ -96,4 +212,6 @@ class MySQLCostProgressSnapshotRepository(CostProgressSnapshotRepository):
             planned_amount=row["planned_amount"],
             executed_amount=row["executed_amount"],
             progress_percent=row["progress_percent"],
+            counted_at=row["counted_at"],
+            counted_lines=row["counted_lines"],
         )
@@ -4,6 +4,19 @@ from typing import Optional
 from contract_costs.model.cost_type import CostType
 from contract_costs.repository.cost_type_repository import CostTypeRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import fetch_in
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+GET_BY_CODE_SQL = """
+SELECT
+    id,
+    code,
+    name,
+    description,
+    is_active
+FROM cost_types
+WHERE code = %s
+"""
 
 
 class MySQLCostTypeRepository(CostTypeRepository):
@@ -55,7 +68,10 @@ class MySQLCostTypeRepository(CostTypeRepository):
 
         return self._map_row(row)
 
-    def get_by_code(self, code: str) -> Optional[CostType]:
+    def get_many(self, cost_type_ids: list[UUID]) -> list[CostType]:
+        if not cost_type_ids:
+            return []
+
         sql = """
         SELECT
             id,
@@ -64,12 +80,19 @@ class MySQLCostTypeRepository(CostTypeRepository):
             description,
             is_active
         FROM cost_types
-        WHERE code = %s
+        WHERE id IN ({placeholders})
         """
 
         with get_connection() as conn:
             with conn.cursor(dictionary=True) as cur:
-                cur.execute(sql, (code,))
+                rows = fetch_in(cur, sql, (str(i) for i in cost_type_ids))
+
+        return [self._map_row(row) for row in rows]
+
+    def get_by_code(self, code: str) -> Optional[CostType]:
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(GET_BY_CODE_SQL, (code,))
                 row = cur.fetchone()
 
         if row is None:
@@ -77,6 +100,29 @@ class MySQLCostTypeRepository(CostTypeRepository):
 
         return self._map_row(row)
 
+    def list_by_codes(self, codes: list[str]) -> list[CostType]:
+        if not codes:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(codes))
+        sql = f"""
+        SELECT
+            id,
+            code,
+            name,
+            description,
+            is_active
+        FROM cost_types
+        WHERE code IN ({placeholders})
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, tuple(codes))
+                rows = cur.fetchall()
+
+        return [self._map_row(row) for row in rows]
+
     def list(self) -> list[CostType]:
         sql = """
         SELECT
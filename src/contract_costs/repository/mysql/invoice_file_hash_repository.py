@@ -0,0 +1,119 @@
+from uuid import UUID
+
+from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.model.invoice_file_hash import InvoiceFileHash, InvoiceFileHashStats
+from contract_costs.repository.invoice_file_hash_repository import InvoiceFileHashRepository
+
+
+class MySQLInvoiceFileHashRepository(InvoiceFileHashRepository):
+
+    def get(self, sha256: str) -> InvoiceFileHash | None:
+        sql = "SELECT * FROM invoice_file_hashes WHERE sha256 = %s"
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (sha256,))
+                row = cur.fetchone()
+
+        return self._map_row(row) if row else None
+
+    def add(self, entry: InvoiceFileHash) -> None:
+        # ten sam plik przetworzony równolegle przez dwa workery – wygrywa pierwszy import;
+        # wcześniejsze odrzucenie jest nadpisywane (outcome na końcu – MySQL
+        # przypisuje od lewej, warunki wyżej widzą jeszcze starą wartość)
+        sql = """
+        INSERT INTO invoice_file_hashes (
+            sha256,
+            file_name,
+            outcome,
+            invoice_id,
+            invoice_number,
+            parse_result
+        )
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            file_name = IF(outcome = 'imported', file_name, VALUES(file_name)),
+            invoice_id = IF(outcome = 'imported', invoice_id, VALUES(invoice_id)),
+            invoice_number = IF(outcome = 'imported', invoice_number, VALUES(invoice_number)),
+            parse_result = IF(outcome = 'imported', parse_result, VALUES(parse_result)),
+            outcome = IF(outcome = 'imported', outcome, VALUES(outcome))
+        """
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql,
+                    (
+                        entry.sha256,
+                        entry.file_name,
+                        entry.outcome,
+                        str(entry.invoice_id) if entry.invoice_id else None,
+                        entry.invoice_number,
+                        entry.parse_result,
+                    ),
+                )
+            conn.commit()
+
+    def register_hit(self, sha256: str) -> None:
+        sql = """
+        UPDATE invoice_file_hashes
+        SET hit_count = hit_count + 1,
+            last_hit_at = CURRENT_TIMESTAMP
+        WHERE sha256 = %s
+        """
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (sha256,))
+            conn.commit()
+
+    def stats(self) -> InvoiceFileHashStats:
+        sql = """
+        SELECT
+            COUNT(*) AS files,
+            COALESCE(SUM(hit_count), 0) AS duplicates_skipped,
+            COALESCE(SUM(hit_count > 0), 0) AS files_with_duplicates
+        FROM invoice_file_hashes
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                row = cur.fetchone()
+
+        return InvoiceFileHashStats(
+            files=int(row["files"]),
+            duplicates_skipped=int(row["duplicates_skipped"]),
+            files_with_duplicates=int(row["files_with_duplicates"]),
+        )
+
+    def list_duplicated(self, limit: int = 20) -> list[InvoiceFileHash]:
+        sql = """
+        SELECT *
+        FROM invoice_file_hashes
+        WHERE hit_count > 0
+        ORDER BY hit_count DESC
+        LIMIT %s
+        """
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (limit,))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
+    # ---------- mapping ----------
+    @staticmethod
+    def _map_row(row: dict) -> InvoiceFileHash:
+        return InvoiceFileHash(
+            sha256=row["sha256"],
+            file_name=row["file_name"],
+            outcome=row["outcome"],
+            invoice_id=UUID(row["invoice_id"]) if row["invoice_id"] else None,
+            invoice_number=row["invoice_number"],
+            parse_result=row["parse_result"],
+            hit_count=row["hit_count"],
+            created_at=row["created_at"],
+            last_hit_at=row["last_hit_at"],
+        )
@@ -7,6 +7,11 @@ from contract_costs.model.amount import Amount, VatRate, TaxTreatment
 from contract_costs.model.unit_of_measure import UnitOfMeasure
 from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import chunks, fetch_in
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+LIST_BY_CONTRACT_SQL = "SELECT * FROM invoice_lines WHERE contract_id = %s"
+LIST_BY_INVOICE_SQL = "SELECT * FROM invoice_lines WHERE invoice_id = %s"
 
 
 class MySQLInvoiceLineRepository(InvoiceLineRepository):
@@ -30,34 +35,34 @@ class MySQLInvoiceLineRepository(InvoiceLineRepository):
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    str(invoice_line.id),
-                    str(invoice_line.invoice_id) if invoice_line.invoice_id else None,
-                    str(invoice_line.contract_id) if invoice_line.contract_id else None,
-                    str(invoice_line.cost_node_id) if invoice_line.cost_node_id else None,
-                    str(invoice_line.cost_type_id) if invoice_line.cost_type_id else None,
-                    invoice_line.item_name,
-                    invoice_line.quantity,
-                    invoice_line.unit.value if invoice_line.unit else None,
-                    invoice_line.amount.value,
-                    invoice_line.amount.vat_rate.value if invoice_line.amount.vat_rate else None,
-                    invoice_line.amount.tax_treatment.value,
-                    invoice_line.description,
-                ),
-            )
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql,
+                    (
+                        str(invoice_line.id),
+                        str(invoice_line.invoice_id) if invoice_line.invoice_id else None,
+                        str(invoice_line.contract_id) if invoice_line.contract_id else None,
+                        str(invoice_line.cost_node_id) if invoice_line.cost_node_id else None,
+                        str(invoice_line.cost_type_id) if invoice_line.cost_type_id else None,
+                        invoice_line.item_name,
+                        invoice_line.quantity,
+                        invoice_line.unit.value if invoice_line.unit else None,
+                        invoice_line.amount.value,
+                        invoice_line.amount.vat_rate.value if invoice_line.amount.vat_rate else None,
+                        invoice_line.amount.tax_treatment.value,
+                        invoice_line.description,
+                    ),
+                )
+            conn.commit()
 
     def get(self, invoice_line_id: UUID) -> InvoiceLine | None:
         sql = "SELECT * FROM invoice_lines WHERE id = %s"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(invoice_line_id),))
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(invoice_line_id),))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
@@ -66,48 +71,122 @@ class MySQLInvoiceLineRepository(InvoiceLineRepository):
     def list_lines(self) -> list[InvoiceLine]:
         sql = "SELECT * FROM invoice_lines"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
     def list_by_contract(self, contract_id: UUID) -> list[InvoiceLine]:
-        sql = "SELECT * FROM invoice_lines WHERE contract_id = %s"
-
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(contract_id),))
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(LIST_BY_CONTRACT_SQL, (str(contract_id),))
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
     def list_by_invoice(self, invoice_id: UUID) -> list[InvoiceLine]:
-        sql = "SELECT * FROM invoice_lines WHERE invoice_id = %s"
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(LIST_BY_INVOICE_SQL, (str(invoice_id),))
+                rows = cur.fetchall()
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(invoice_id),))
-            rows = cur.fetchall()
+        return [self._map_row(r) for r in rows]
+
+    def get_many(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
+        if not invoice_line_ids:
+            return []
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                rows = fetch_in(
+                    cur,
+                    "SELECT * FROM invoice_lines WHERE id IN ({placeholders})",
+                    (str(i) for i in invoice_line_ids),
+                )
 
         return [self._map_row(r) for r in rows]
 
-    def list_by_invoice_ids(self, invoice_line_ids: list[UUID]) -> list[InvoiceLine]:
-        result: list[InvoiceLine] = []
+    def upsert_many(self, invoice_lines: list[InvoiceLine]) -> None:
+        if not invoice_lines:
+            return
+
+        sql = """
+        INSERT INTO invoice_lines (
+            id,
+            invoice_id,
+            contract_id,
+            cost_node_id,
+            cost_type_id,
+            item_name,
+            quantity,
+            unit,
+            amount_value,
+            vat_rate,
+            tax_treatment,
+            description
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            invoice_id = VALUES(invoice_id),
+            contract_id = VALUES(contract_id),
+            cost_node_id = VALUES(cost_node_id),
+            cost_type_id = VALUES(cost_type_id),
+            item_name = VALUES(item_name),
+            quantity = VALUES(quantity),
+            unit = VALUES(unit),
+            amount_value = VALUES(amount_value),
+            vat_rate = VALUES(vat_rate),
+            tax_treatment = VALUES(tax_treatment),
+            description = VALUES(description)
+        """
+
+        values = [
+            (
+                str(line.id),
+                str(line.invoice_id) if line.invoice_id else None,
+                str(line.contract_id) if line.contract_id else None,
+                str(line.cost_node_id) if line.cost_node_id else None,
+                str(line.cost_type_id) if line.cost_type_id else None,
+                line.item_name,
+                line.quantity,
+                line.unit.value if line.unit else None,
+                line.amount.value,
+                line.amount.vat_rate.value if line.amount.vat_rate else None,
+                line.amount.tax_treatment.value,
+                line.description,
+            )
+            for line in invoice_lines
+        ]
+
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                for chunk in chunks(values):
+                    cur.executemany(sql, chunk)
+            conn.commit()
+
+    def list_by_invoice_ids(self, invoice_ids: list[UUID]) -> list[InvoiceLine]:
+        if not invoice_ids:
+            return []
 
-        for invoice_id in invoice_line_ids:
-            result.extend(self.list_by_invoice(invoice_id))
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                rows = fetch_in(
+                    cur,
+                    "SELECT * FROM invoice_lines WHERE invoice_id IN ({placeholders})",
+                    (str(i) for i in invoice_ids),
+                )
 
-        return result
+        return [self._map_row(r) for r in rows]
 
     def list_by_null_invoice(self) -> list[InvoiceLine]:
         sql = "SELECT * FROM invoice_lines WHERE invoice_id is NULL"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql,())
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql,())
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
@@ -128,34 +207,34 @@ class MySQLInvoiceLineRepository(InvoiceLineRepository):
         WHERE id = %s
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    str(invoice_line.invoice_id) if invoice_line.invoice_id else None,
-                    str(invoice_line.contract_id) if invoice_line.contract_id else None,
-                    str(invoice_line.cost_node_id) if invoice_line.cost_node_id else None,
-                    str(invoice_line.cost_type_id) if invoice_line.cost_type_id else None,
-                    invoice_line.item_name,
-                    invoice_line.quantity,
-                    invoice_line.unit.value if invoice_line.unit else None,
-                    invoice_line.amount.value,
-                    invoice_line.amount.vat_rate.value if invoice_line.amount.vat_rate else None,
-                    invoice_line.amount.tax_treatment.value,
-                    invoice_line.description,
-                    str(invoice_line.id),
-                ),
-            )
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql,
+                    (
+                        str(invoice_line.invoice_id) if invoice_line.invoice_id else None,
+                        str(invoice_line.contract_id) if invoice_line.contract_id else None,
+                        str(invoice_line.cost_node_id) if invoice_line.cost_node_id else None,
+                        str(invoice_line.cost_type_id) if invoice_line.cost_type_id else None,
+                        invoice_line.item_name,
+                        invoice_line.quantity,
+                        invoice_line.unit.value if invoice_line.unit else None,
+                        invoice_line.amount.value,
+                        invoice_line.amount.vat_rate.value if invoice_line.amount.vat_rate else None,
+                        invoice_line.amount.tax_treatment.value,
+                        invoice_line.description,
+                        str(invoice_line.id),
+                    ),
+                )
+            conn.commit()
 
     def exists(self, invoice_line_id: UUID) -> bool:
         sql = "SELECT 1 FROM invoice_lines WHERE id = %s LIMIT 1"
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(invoice_line_id),))
-            return cur.fetchone() is not None
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(invoice_line_id),))
+                return cur.fetchone() is not None
 
     def delete_not_in_ids(
             self,
@@ -175,11 +254,11 @@ class MySQLInvoiceLineRepository(InvoiceLineRepository):
             """
             params = (str(invoice_id), *map(str, keep_ids)) #type: ignore
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            conn.commit()
-            return cur.rowcount
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                conn.commit()
+                return cur.rowcount
 
 
     def get_for_assignment(self) -> list[InvoiceLine]:
@@ -190,10 +269,10 @@ class MySQLInvoiceLineRepository(InvoiceLineRepository):
            OR cost_type_id IS NULL
         """
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
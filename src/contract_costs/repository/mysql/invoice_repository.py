@@ -9,6 +9,17 @@ from contract_costs.model.invoice import (
 )
 from contract_costs.repository.invoice_repository import InvoiceRepository
 from contract_costs.infrastructure.db.mysql_connection import get_connection
+from contract_costs.infrastructure.db.batching import fetch_in
+
+# zapytania sprawdzane też przez EXPLAIN (infrastructure.db.query_plan_check)
+GET_BY_INVOICE_NUMBER_SQL = "SELECT * FROM invoices WHERE invoice_number = %s"
+GET_UNIQUE_INVOICE_SQL = "SELECT * FROM invoices WHERE invoice_number = %s AND seller_id = %s"
+GET_FOR_ASSIGNMENT_SQL = """
+SELECT *
+FROM invoices
+WHERE status IN ({placeholders})
+ORDER BY invoice_date
+"""
 
 
 class MySQLInvoiceRepository(InvoiceRepository):
@@ -31,63 +42,73 @@ class MySQLInvoiceRepository(InvoiceRepository):
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    str(invoice.id),
-                    invoice.invoice_number,
-                    invoice.invoice_date,
-                    invoice.selling_date,
-                    str(invoice.buyer_id),
-                    str(invoice.seller_id),
-                    invoice.payment_method.value,
-                    invoice.due_date,
-                    invoice.payment_status.value,
-                    invoice.status.value,
-                    invoice.timestamp,
-                ),
-            )
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql,
+                    (
+                        str(invoice.id),
+                        invoice.invoice_number,
+                        invoice.invoice_date,
+                        invoice.selling_date,
+                        str(invoice.buyer_id),
+                        str(invoice.seller_id),
+                        invoice.payment_method.value,
+                        invoice.due_date,
+                        invoice.payment_status.value,
+                        invoice.status.value,
+                        invoice.timestamp,
+                    ),
+                )
+            conn.commit()
 
     def get(self, invoice_id: UUID) -> Invoice | None:
         sql = "SELECT * FROM invoices WHERE id = %s"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(invoice_id),))
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, (str(invoice_id),))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
-    def get_by_invoice_number(self, invoice_number: str) -> Invoice | None:
-        sql = "SELECT * FROM invoices WHERE invoice_number = %s"
+    def get_many(self, invoice_ids: list[UUID]) -> list[Invoice]:
+        if not invoice_ids:
+            return []
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(invoice_number),))
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                rows = fetch_in(
+                    cur,
+                    "SELECT * FROM invoices WHERE id IN ({placeholders})",
+                    (str(i) for i in invoice_ids),
+                )
+
+        return [self._map_row(r) for r in rows]
+
+    def get_by_invoice_number(self, invoice_number: str) -> Invoice | None:
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(GET_BY_INVOICE_NUMBER_SQL, (str(invoice_number),))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
     def get_unique_invoice(self, invoice_number: str,seller_id: UUID) -> Invoice | None:
-        sql = "SELECT * FROM invoices WHERE invoice_number = %s AND seller_id = %s"
-
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (str(invoice_number),str(seller_id)))
-            row = cur.fetchone()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(GET_UNIQUE_INVOICE_SQL, (str(invoice_number),str(seller_id)))
+                row = cur.fetchone()
 
         return self._map_row(row) if row else None
 
     def list_invoices(self) -> list[Invoice]:
         sql = "SELECT * FROM invoices ORDER BY invoice_date DESC"
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
@@ -107,33 +128,33 @@ class MySQLInvoiceRepository(InvoiceRepository):
         WHERE id = %s
         """
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                sql,
-                (
-                    invoice.invoice_number,
-                    invoice.invoice_date,
-                    invoice.selling_date,
-                    str(invoice.buyer_id),
-                    str(invoice.seller_id),
-                    invoice.payment_method.value,
-                    invoice.due_date,
-                    invoice.payment_status.value,
-                    invoice.status.value,
-                    invoice.timestamp,
-                    str(invoice.id),
-                ),
-            )
-        conn.commit()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql,
+                    (
+                        invoice.invoice_number,
+                        invoice.invoice_date,
+                        invoice.selling_date,
+                        str(invoice.buyer_id),
+                        str(invoice.seller_id),
+                        invoice.payment_method.value,
+                        invoice.due_date,
+                        invoice.payment_status.value,
+                        invoice.status.value,
+                        invoice.timestamp,
+                        str(invoice.id),
+                    ),
+                )
+            conn.commit()
 
     def exists(self, invoice_id: UUID) -> bool:
         sql = "SELECT 1 FROM invoices WHERE id = %s LIMIT 1"
 
-        conn = get_connection()
-        with conn.cursor() as cur:
-            cur.execute(sql, (str(invoice_id),))
-            return cur.fetchone() is not None
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(invoice_id),))
+                return cur.fetchone() is not None
 
     def get_for_assignment(self, status: InvoiceStatus | list[InvoiceStatus]) -> list[Invoice]:
         # --- normalizacja wejścia ---
@@ -149,17 +170,12 @@ class MySQLInvoiceRepository(InvoiceRepository):
         # --- dynamiczne placeholders (%s, %s, ...) ---
         placeholders = ", ".join(["%s"] * len(status_values))
 
-        sql = f"""
-        SELECT *
-        FROM invoices
-        WHERE status IN ({placeholders})
-        ORDER BY invoice_date
-        """
+        sql = GET_FOR_ASSIGNMENT_SQL.format(placeholders=placeholders)
 
-        conn = get_connection()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, status_values)
-            rows = cur.fetchall()
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, status_values)
+                rows = cur.fetchall()
 
         return [self._map_row(r) for r in rows]
 
@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+from contract_costs.model.amount import TaxTreatment
+from contract_costs.model.invoice import InvoiceStatus, PaymentStatus
+from contract_costs.repository.invoice_summary_repository import InvoiceSummaryRepository
+from contract_costs.infrastructure.db.mysql_connection import get_connection
+
+
+class MySQLInvoiceSummaryRepository(InvoiceSummaryRepository):
+
+    def list_summaries(
+        self,
+        *,
+        statuses: list[InvoiceStatus] | None = None,
+        unpaid: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        where: list[str] = []
+        invoice_params: list = []
+
+        if statuses:
+            where.append(f"status IN ({', '.join(['%s'] * len(statuses))})")
+            invoice_params.extend(s.value for s in statuses)
+
+        if unpaid:
+            where.append("payment_status = %s")
+            invoice_params.append(PaymentStatus.UNPAID.value)
+
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        limit_sql = ""
+        if limit is not None:
+            limit_sql = "LIMIT %s"
+            invoice_params.append(limit)
+
+        # najpierw wybór faktur (filtr + sort + limit), potem sumy
+        # tylko ich linii – indeks fk_invoice_line_invoice
+        sql = f"""
+        SELECT
+            i.invoice_number,
+            i.status,
+            i.invoice_date,
+            i.due_date,
+            i.payment_method,
+            i.payment_status,
+            i.timestamp,
+            b.name AS buyer_name,
+            b.tax_number AS buyer_tax_number,
+            s.name AS seller_name,
+            s.tax_number AS seller_tax_number,
+            SUM(CASE WHEN il.tax_treatment = %s
+                     THEN il.amount_value ELSE 0 END) AS net_amount,
+            SUM(CASE WHEN il.tax_treatment = %s
+                      AND il.vat_rate IS NOT NULL AND il.vat_rate <> ''
+                     THEN ROUND(il.amount_value * CAST(il.vat_rate AS DECIMAL(6,4)), 2)
+                     ELSE 0 END) AS vat_amount,
+            SUM(il.amount_value) AS value_amount,
+            SUM(CASE WHEN il.tax_treatment = %s
+                     THEN il.amount_value ELSE 0 END) AS non_tax_amount,
+            COUNT(il.id) AS line_count
+        FROM (
+            SELECT *
+            FROM invoices
+            {where_sql}
+            ORDER BY timestamp DESC
+            {limit_sql}
+        ) i
+        LEFT JOIN companies b ON b.id = i.buyer_id
+        LEFT JOIN companies s ON s.id = i.seller_id
+        LEFT JOIN invoice_lines il ON il.invoice_id = i.id
+        GROUP BY
+            i.id, i.invoice_number, i.status, i.invoice_date, i.due_date,
+            i.payment_method, i.payment_status, i.timestamp,
+            b.name, b.tax_number, s.name, s.tax_number
+        ORDER BY i.timestamp DESC
+        """
+
+        params = [
+            TaxTreatment.TAX_DEDUCTIBLE.value,
+            TaxTreatment.TAX_DEDUCTIBLE.value,
+            TaxTreatment.NON_DEDUCTIBLE.value,
+            *invoice_params,
+        ]
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(sql, tuple(params))
+                rows = cur.fetchall()
+
+        return [self._map_row(r) for r in rows]
+
+    # ---------- mapping ----------
+    @staticmethod
+    def _map_row(row: dict) -> dict:
+        vat = Decimal(row["vat_amount"] or 0)
+        return {
+            "invoice_number": row["invoice_number"],
+            "status": row["status"],
+            "invoice_date": row["invoice_date"],
+            "due_date": row["due_date"],
+            "payment_method": row["payment_method"],
+            "payment_status": row["payment_status"],
+            "buyer_name": row["buyer_name"],
+            "buyer_tax_number": row["buyer_tax_number"],
+            "seller_name": row["seller_name"],
+            "seller_tax_number": row["seller_tax_number"],
+            "net_amount": Decimal(row["net_amount"] or 0),
+            "vat_amount": vat,
+            "gross_amount": Decimal(row["value_amount"] or 0) + vat,
+            "non_tax_amount": Decimal(row["non_tax_amount"] or 0),
+            "line_count": int(row["line_count"]),
+        }
@@ -0,0 +1,10 @@
+from contextlib import AbstractContextManager
+
+from contract_costs.infrastructure.db.mysql_connection import transaction
+from contract_costs.repository.unit_of_work import UnitOfWork
+
+
+class MySQLUnitOfWork(UnitOfWork):
+
+    def transaction(self) -> AbstractContextManager[None]:
+        return transaction()
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+
+
+class UnitOfWork(ABC):
+    """
+    Zakres transakcji obejmujący wszystkie repozytoria.
+
+    Wszystkie zapisy wykonane wewnątrz `transaction()` są zatwierdzane
+    jednym commitem na końcu bloku albo w całości wycofywane przy wyjątku.
+    Zagnieżdżone wywołania dołączają do zewnętrznej transakcji.
+    """
+
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager[None]:
+        ...
+
+
+class NullUnitOfWork(UnitOfWork):
+    """Brak transakcji (in-memory / testy) – każdy zapis jest od razu widoczny."""
+
+    def transaction(self) -> AbstractContextManager[None]:
+        return nullcontext()
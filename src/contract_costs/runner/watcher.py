@@ -4,8 +4,8 @@ import threading
 import sys
 
 from contract_costs.config import INVOICE_INPUT_DIR
-from contract_costs.services.queue.invoice_queue import invoice_queue
-from contract_costs.services.scanner.unprocessed_scanner import scan_unprocessed
+from contract_costs.infrastructure.db.mysql_connection import close_pool, pool_stats
+from contract_costs.services.scanner.unprocessed_scanner import enqueue_unprocessed
 
 
 def run_watcher(services) -> None:
@@ -15,10 +15,16 @@ def run_watcher(services) -> None:
 
     watcher = services.invoice_watcher_service
     worker = services.invoice_ai_worker
+    queue = services.invoice_queue
 
-    # scan przy starcie
-    for file in scan_unprocessed(INVOICE_INPUT_DIR):
-        invoice_queue.put(file)
+    # joby przerwane przez poprzedni proces wracają od razu
+    released = queue.release_in_progress()
+    if released:
+        logging.info("Resuming %d interrupted invoice job(s)", released)
+
+    # scan przy starcie – tylko pliki nieznane kolejce
+    enqueue_unprocessed(INVOICE_INPUT_DIR, queue)
+    logging.info("Invoice queue: %s", queue.stats())
 
     worker_thread = threading.Thread(
         target=worker.run,
@@ -36,5 +42,8 @@ def run_watcher(services) -> None:
         watcher.stop()
         worker.stop()
         worker_thread.join(timeout=5)
+        logging.info("Invoice queue: %s", queue.stats())
+        logging.info("DB pool stats: %s", pool_stats())
+        close_pool()
         logging.info("Shutdown complete")
         sys.exit(0)
@@ -31,6 +31,10 @@ class CompanyEvaluateOrchestrator:
         self._candidate_provider = candidate_provider
         self._normalizator = CompanyNormalizeService()
 
+    @property
+    def provider_count(self) -> int:
+        return self._candidate_provider.provider_count
+
     def evaluate_from_tax(self, input_tax_number: str | None, role: CompanyType) -> Company:
         if not input_tax_number:
             raise ValueError("No tax number provided, unable to evaluate company")
@@ -0,0 +1,69 @@
+import logging
+from dataclasses import dataclass
+
+from contract_costs.model.company import Company, CompanyType
+from contract_costs.services.common.resolve_utils import normalize_tax_number
+from contract_costs.services.companies.company_evaluate_orchestrator import CompanyEvaluateOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CompanyEvaluationStats:
+    requested: int
+    evaluated: int
+    reused: int
+    provider_queries_saved: int
+
+
+class CompanyEvaluationContext:
+    """
+    Pamięć ewaluacji firm w obrębie jednego batcha (import Excela).
+
+    - każdy unikalny NIP jest rozwiązywany raz
+    - wynik współdzielony między fazami (aktualizacja firm -> resolver faktur)
+    - żyje tylko na czas batcha – nie ma problemu nieaktualnego cache
+    """
+
+    def __init__(self, orchestrator: CompanyEvaluateOrchestrator) -> None:
+        self._orchestrator = orchestrator
+        self._by_tax: dict[str, Company] = {}
+        self._requested = 0
+        self._evaluated = 0
+
+    def evaluate_from_tax(self, tax_number: str | None, role: CompanyType) -> Company:
+        self._requested += 1
+
+        key = self._key(tax_number)
+        if key is not None:
+            cached = self._by_tax.get(key)
+            if cached is not None:
+                return cached
+
+        company = self._orchestrator.evaluate_from_tax(tax_number, role=role)
+        self._evaluated += 1
+
+        if key is not None:
+            self._by_tax[key] = company
+        return company
+
+    def remember(self, company: Company) -> None:
+        """Firma zapisana w tym batchu – resolver nie musi jej szukać."""
+        key = self._key(company.tax_number)
+        if key is not None:
+            self._by_tax[key] = company
+
+    def stats(self) -> CompanyEvaluationStats:
+        reused = self._requested - self._evaluated
+        return CompanyEvaluationStats(
+            requested=self._requested,
+            evaluated=self._evaluated,
+            reused=reused,
+            provider_queries_saved=reused * self._orchestrator.provider_count,
+        )
+
+    @staticmethod
+    def _key(tax_number: str | None) -> str | None:
+        if not tax_number:
+            return None
+        return normalize_tax_number(tax_number) or str(tax_number).strip() or None
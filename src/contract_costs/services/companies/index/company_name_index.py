@@ -0,0 +1,234 @@
+import logging
+import threading
+import time
+from typing import Callable
+from uuid import UUID
+
+from contract_costs.model.company import Company
+from contract_costs.repository.company_repository import CompanyRepository
+from contract_costs.services.companies.normalize.name import normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+
+
+def _ngrams(value: str) -> set[str]:
+    return {value[i:i + NGRAM] for i in range(len(value) - NGRAM + 1)}
+
+
+class CompanyNameIndex:
+    """
+    Indeks znormalizowanych nazw firm dla NameCandidateProvider.
+
+    Semantyka jak w dotychczasowym skanie list_all():
+    - exact:      norm(input) == norm(company)
+    - substring:  norm(input) in norm(company)  -> przecięcie list trigramów
+                  norm(company) in norm(input)  -> lookup podciągów inputu
+
+    Wyniki w kolejności list_all() repozytorium (jak skan) – dopasowanie
+    firm rozstrzyga remisy po kolejności kandydatów.
+
+    Budowany leniwie z repozytorium; zapisy przez NameIndexedCompanyRepository
+    aktualizują go na bieżąco. Zapisy z innych procesów (np. CLI obok
+    watchera) są widoczne dopiero po przebudowie – do `max_age` sekund
+    indeks może zwracać nieaktualne obiekty Company
+    (config.COMPANY_NAME_INDEX_TTL, 0 = przebudowa przy każdym find).
+    """
+
+    def __init__(
+        self,
+        company_repository: CompanyRepository,
+        *,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._repo = company_repository
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        self._built_at: float | None = None
+        self._companies: dict[UUID, Company] = {}
+        # pozycja z list_all(); nowe firmy (upsert) na końcu
+        self._positions: dict[UUID, int] = {}
+        self._next_position = 0
+        self._names: dict[UUID, str] = {}
+        self._by_name: dict[str, set[UUID]] = {}
+        self._by_ngram: dict[str, set[UUID]] = {}
+
+    # ---------- lookup ----------
+
+    def find(self, name: str | None) -> list[Company]:
+        normalized = normalize_company_name(name)
+        if not normalized:
+            return []
+
+        with self._lock:
+            self._ensure_fresh()
+
+            ids: set[UUID] = set()
+            ids |= self._contained_in(normalized)
+            ids |= self._containing(normalized)
+
+            return [self._companies[i] for i in sorted(ids, key=self._positions.__getitem__)]
+
+    def _contained_in(self, normalized: str) -> set[UUID]:
+        """Firmy, których nazwa jest podciągiem inputu (w tym exact)."""
+        ids: set[UUID] = set()
+        n = len(normalized)
+        for start in range(n):
+            for end in range(start + 1, n + 1):
+                hit = self._by_name.get(normalized[start:end])
+                if hit:
+                    ids |= hit
+        return ids
+
+    def _containing(self, normalized: str) -> set[UUID]:
+        """Firmy, których nazwa zawiera input."""
+        grams = _ngrams(normalized)
+        if not grams:
+            # input krótszy niż n-gram – rzadki przypadek, pełny przegląd
+            return {i for i, n in self._names.items() if normalized in n}
+
+        postings = sorted(
+            (self._by_ngram.get(g, set()) for g in grams),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+
+        return {i for i in candidates if normalized in self._names[i]}
+
+    # ---------- maintenance ----------
+
+    def upsert(self, company: Company) -> None:
+        with self._lock:
+            if self._built_at is None:
+                return  # zbudujemy przy pierwszym find()
+            position = self._positions.get(company.id)
+            self._remove(company.id)
+            self._put(company, position)
+
+    def remove(self, company_id: UUID) -> None:
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._remove(company_id)
+
+    def rebuild(self) -> None:
+        companies = self._repo.list_all()
+        with self._lock:
+            self._companies.clear()
+            self._positions.clear()
+            self._next_position = 0
+            self._names.clear()
+            self._by_name.clear()
+            self._by_ngram.clear()
+            for company in companies:
+                self._put(company)
+            self._built_at = self._clock()
+        logger.debug("Company name index built (%d companies)", len(companies))
+
+    def _ensure_fresh(self) -> None:
+        if self._built_at is None or self._clock() - self._built_at >= self._max_age:
+            self.rebuild()
+
+    def _put(self, company: Company, position: int | None = None) -> None:
+        self._companies[company.id] = company
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._positions[company.id] = position
+        normalized = normalize_company_name(company.name)
+        if not normalized:
+            return
+        self._names[company.id] = normalized
+        self._by_name.setdefault(normalized, set()).add(company.id)
+        for gram in _ngrams(normalized):
+            self._by_ngram.setdefault(gram, set()).add(company.id)
+
+    def _remove(self, company_id: UUID) -> None:
+        self._companies.pop(company_id, None)
+        self._positions.pop(company_id, None)
+        normalized = self._names.pop(company_id, None)
+        if normalized is None:
+            return
+        self._discard(self._by_name, normalized, company_id)
+        for gram in _ngrams(normalized):
+            self._discard(self._by_ngram, gram, company_id)
+
+    @staticmethod
+    def _discard(index: dict[str, set[UUID]], key: str, company_id: UUID) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(company_id)
+        if not ids:
+            del index[key]
+
+
+class NameIndexedCompanyRepository(CompanyRepository):
+    """
+    Dekorator repozytorium firm: zapisy (add / update / delete)
+    od razu aktualizują CompanyNameIndex. Odczyty bez zmian.
+    """
+
+    def __init__(self, inner: CompanyRepository, name_index: CompanyNameIndex) -> None:
+        self._inner = inner
+        self._index = name_index
+
+    # ---------- CRUD (z synchronizacją indeksu) ----------
+
+    def add(self, company: Company) -> None:
+        self._inner.add(company)
+        self._index.upsert(company)
+
+    def update(self, company: Company) -> None:
+        self._inner.update(company)
+        self._index.upsert(company)
+
+    def delete(self, company_id: UUID) -> None:
+        self._inner.delete(company_id)
+        self._index.remove(company_id)
+
+    # ---------- delegacja ----------
+
+    def get(self, company_id: UUID) -> Company | None:
+        return self._inner.get(company_id)
+
+    def get_many(self, company_ids: list[UUID]) -> list[Company]:
+        return self._inner.get_many(company_ids)
+
+    def exists(self, company_id: UUID) -> bool:
+        return self._inner.exists(company_id)
+
+    def list_all(self) -> list[Company]:
+        return self._inner.list_all()
+
+    def get_by_tax_number(self, tax_number: str) -> Company | None:
+        return self._inner.get_by_tax_number(tax_number)
+
+    def get_owners(self) -> list[Company]:
+        return self._inner.get_owners()
+
+    def exists_owner(self) -> bool:
+        return self._inner.exists_owner()
+
+    def find_by_bank_account(self, bank_account: str) -> list[Company]:
+        return self._inner.find_by_bank_account(bank_account)
+
+    def find_by_email(self, email: str) -> list[Company]:
+        return self._inner.find_by_email(email)
+
+    def find_by_phone(self, phone_number: str) -> list[Company]:
+        return self._inner.find_by_phone(phone_number)
+
+    def find_by_name_like(self, name: str) -> list[Company]:
+        return self._inner.find_by_name_like(name)
+
+    def find_by_street_tokens(self, tokens: list[str]) -> list[Company]:
+        return self._inner.find_by_street_tokens(tokens)
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+from contract_costs.model.company import Company
+from contract_costs.services.common.resolve_utils import normalize_bank_account, normalize_phone
+from contract_costs.services.companies.providers.address import (
+    extract_street_number,
+    extract_street_tokens,
+)
+
+
+@dataclass(frozen=True)
+class CompanyMatchKeys:
+    """
+    Znormalizowane klucze dopasowania firmy – zapisywane obok danych
+    i indeksowane, żeby providery kandydatów robiły lookup po równości.
+    """
+    bank_account: str | None
+    phone: str | None
+    email: str | None
+    street_tokens: frozenset[str]
+
+
+def email_key(email: str | None) -> str | None:
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def street_keys(street: str | None) -> frozenset[str]:
+    """Tokeny nazwy ulicy + numer budynku (wielkie litery)."""
+    if not street:
+        return frozenset()
+
+    keys = set(extract_street_tokens(street))
+    number = extract_street_number(street)
+    if number:
+        keys.add(number)
+    return frozenset(keys)
+
+
+def company_match_keys(company: Company) -> CompanyMatchKeys:
+    contact = company.contact
+    return CompanyMatchKeys(
+        bank_account=(
+            normalize_bank_account(company.bank_account.number)
+            if company.bank_account else None
+        ),
+        phone=normalize_phone(contact.phone_number) if contact else None,
+        email=email_key(contact.email) if contact else None,
+        street_tokens=street_keys(company.address.street if company.address else None),
+    )
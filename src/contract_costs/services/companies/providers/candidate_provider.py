@@ -23,3 +23,8 @@ class CompanyCandidateProvider(ABC):
         Zwraca 0..N potencjalnych kandydatów.
         """
         raise NotImplementedError
+
+    @property
+    def provider_count(self) -> int:
+        """Ile providerów (zapytań do repo) uruchamia jedno find_candidates."""
+        return 1
@@ -20,3 +20,7 @@ class CompositeCompanyCandidateProvider(CompanyCandidateProvider):
             for company in provider.find_candidates(input_):
                 result[company.id] = company  # nadpisanie = deduplikacja
         return list(result.values())
+
+    @property
+    def provider_count(self) -> int:
+        return sum(p.provider_count for p in self._providers)
@@ -1,13 +1,19 @@
 from contract_costs.model.company import Company
 from contract_costs.repository.company_repository import CompanyRepository
+from contract_costs.services.companies.index.company_name_index import CompanyNameIndex
 from contract_costs.services.companies.providers.candidate_provider import CompanyCandidateProvider
 from contract_costs.services.invoices.dto.parse import CompanyInput
 from contract_costs.services.companies.normalize.name import normalize_company_name
 
 class NameCandidateProvider(CompanyCandidateProvider):
 
-    def __init__(self, company_repository: CompanyRepository) -> None:
+    def __init__(
+        self,
+        company_repository: CompanyRepository,
+        name_index: CompanyNameIndex | None = None,
+    ) -> None:
         self._repo = company_repository
+        self._index = name_index
 
     def find_candidates(self, input_: CompanyInput) -> list[Company]:
         if not input_.name or len(input_.name) < 3:
@@ -17,6 +23,10 @@ class NameCandidateProvider(CompanyCandidateProvider):
         if not normalized_input:
             return []
 
+        # ⚡ indeks współdzielony między ewaluacjami – bez list_all()
+        if self._index is not None:
+            return self._index.find(input_.name)
+
         candidates: list[Company] = []
 
         for company in self._repo.list_all():
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from contract_costs.model.cost_node import CostNode
+
+# pola porównywane dla węzłów obecnych w obu drzewach (parent_id osobno -> moved)
+COMPARED_FIELDS = ("code", "name", "budget", "quantity", "unit", "is_active")
+
+
+@dataclass
+class CostNodeStructureDiff:
+    """
+    Różnica między zapisanym a przebudowanym drzewem kontraktu.
+
+    Węzły parujemy po id (builder ponownie używa UUID po code):
+    - unchanged – wszystkie pola bez zmian
+    - updated   – zmienione pola, ten sam rodzic
+    - moved     – zmieniony rodzic (pozostałe pola mogą też się zmienić)
+    - inserted  – tylko w nowym drzewie
+    - deleted   – tylko w zapisanym drzewie (wersja z bazy)
+    """
+
+    unchanged: list[CostNode] = field(default_factory=list)
+    updated: list[CostNode] = field(default_factory=list)
+    moved: list[CostNode] = field(default_factory=list)
+    inserted: list[CostNode] = field(default_factory=list)
+    deleted: list[CostNode] = field(default_factory=list)
+
+    @property
+    def to_update(self) -> list[CostNode]:
+        return self.moved + self.updated
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.updated or self.moved or self.inserted or self.deleted)
+
+
+def diff_cost_nodes(
+    existing_nodes: Iterable[CostNode],
+    new_nodes: Iterable[CostNode],
+) -> CostNodeStructureDiff:
+    """Jedno przejście po każdym drzewie, porównanie pole po polu"""
+    existing_by_id = {n.id: n for n in existing_nodes}
+    diff = CostNodeStructureDiff()
+
+    for node in new_nodes:
+        old = existing_by_id.pop(node.id, None)
+
+        if old is None:
+            diff.inserted.append(node)
+        elif old.parent_id != node.parent_id:
+            diff.moved.append(node)
+        elif any(getattr(old, f) != getattr(node, f) for f in COMPARED_FIELDS):
+            diff.updated.append(node)
+        else:
+            diff.unchanged.append(node)
+
+    diff.deleted.extend(existing_by_id.values())
+    return diff
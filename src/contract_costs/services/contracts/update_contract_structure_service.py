@@ -7,6 +7,8 @@ from contract_costs.model.contract import Contract, ContractStarter
 from contract_costs.model.cost_node import CostNodeInput, CostNode
 from contract_costs.repository.contract_repository import ContractRepository
 from contract_costs.repository.cost_node_repository import CostNodeRepository
+from contract_costs.repository.unit_of_work import UnitOfWork, NullUnitOfWork
+from contract_costs.services.contracts.cost_node_structure_diff import diff_cost_nodes
 from contract_costs.services.contracts.validators.cost_node_tree_validator import CostNodeEntityValidator
 
 
@@ -20,8 +22,8 @@ class UpdateContractStructureService:
 
     Strategia:
     - update metadata kontraktu (replace)
-    - delete ALL cost nodes
-    - rebuild cost node tree
+    - brak kosztów: delete ALL cost nodes + rebuild cost node tree
+    - są koszty: diff drzew, zapis tylko zmienionych / nowych / usuniętych
     """
 
     def __init__(
@@ -30,11 +32,13 @@ class UpdateContractStructureService:
         cost_node_repository: CostNodeRepository,
         cost_node_tree_builder: CostNodeTreeBuilder,
         cost_node_tree_validator: CostNodeEntityValidator,
+        unit_of_work: UnitOfWork | None = None,
     ) -> None:
         self._contract_repository = contract_repository
         self._cost_node_repository = cost_node_repository
         self._builder = cost_node_tree_builder
         self._cost_node_tree_validator = cost_node_tree_validator
+        self._uow = unit_of_work or NullUnitOfWork()
 
     def execute(
             self,
@@ -61,26 +65,28 @@ class UpdateContractStructureService:
             status=contract_starter["status"],
         )
 
-        existing_nodes = self._cost_node_repository.list_by_contract(contract_id)
+        # delete + insert + update metadata atomowo
+        with self._uow.transaction():
+            existing_nodes = self._cost_node_repository.list_by_contract(contract_id)
 
-        if not self._cost_node_repository.has_costs(contract_id):
-            logger.info(
-                "Using HARD replace strategy for contract_id=%s (no existing costs)",
-                contract_id,
-            )
-            self._replace_structure_hard(contract_id, cost_node_input)
-        else:
-            logger.info(
-                "Using SAFE replace strategy for contract_id=%s (existing costs detected)",
-                contract_id,
-            )
-            self._replace_structure_safe(
-                contract_id=contract_id,
-                cost_node_input=cost_node_input,
-                existing_nodes=existing_nodes,
-            )
-
-        self._contract_repository.update(updated_contract)
+            if not self._cost_node_repository.has_costs(contract_id):
+                logger.info(
+                    "Using HARD replace strategy for contract_id=%s (no existing costs)",
+                    contract_id,
+                )
+                self._replace_structure_hard(contract_id, cost_node_input)
+            else:
+                logger.info(
+                    "Using SAFE replace strategy for contract_id=%s (existing costs detected)",
+                    contract_id,
+                )
+                self._replace_structure_safe(
+                    contract_id=contract_id,
+                    cost_node_input=cost_node_input,
+                    existing_nodes=existing_nodes,
+                )
+
+            self._contract_repository.update(updated_contract)
 
     def _replace_structure_hard(self, contract_id: UUID, cost_node_input: list[CostNodeInput]) -> None:
         # --- usuń starą strukturę kosztów ---
@@ -114,9 +120,9 @@ class UpdateContractStructureService:
     ) -> None:
         """
         SAFE replace:
-        - zachowuje UUID cost nodes z kosztami
-        - usuwa tylko te bez kosztów
-        - dodaje nowe
+        - zachowuje UUID cost nodes (dopasowanie po code)
+        - diff starego i nowego drzewa – zapisujemy tylko realne zmiany
+        - usuwa tylko węzły bez kosztów (jedno zapytanie dla wszystkich)
         """
         logger.info(
             "SAFE replace started for contract_id=%s, existing_nodes=%d",
@@ -134,47 +140,44 @@ class UpdateContractStructureService:
 
         self._cost_node_tree_validator.validate(new_nodes)
 
-        # --- podział ---
-        new_by_code = {n.code: n for n in new_nodes}
+        diff = diff_cost_nodes(existing_nodes, new_nodes)
 
-        to_update = []
-        to_insert = []
-        to_delete = []
+        if diff.deleted:
+            with_costs = self._cost_node_repository.nodes_with_costs(
+                [n.id for n in diff.deleted]
+            )
+            blocked = sorted(n.code for n in diff.deleted if n.id in with_costs)
+            if blocked:
+                logger.error(
+                    "SAFE replace blocked: cost nodes %s have existing costs (contract_id=%s)",
+                    blocked,
+                    contract_id,
+                )
+                raise ValueError(
+                    f"Cannot remove cost node '{', '.join(blocked)}' – costs already exist"
+                )
 
-        for code, node in new_by_code.items():
-            if code in existing_by_code:
-                to_update.append(node)
-            else:
-                to_insert.append(node)
-
-        for code, old_node in existing_by_code.items():
-            if code not in new_by_code:
-                if self._cost_node_repository.node_has_costs(old_node.id):
-                    logger.error(
-                        "SAFE replace blocked: cost node '%s' has existing costs (contract_id=%s)",
-                        code,
-                        contract_id,
-                    )
-                    raise ValueError(
-                        f"Cannot remove cost node '{code}' – costs already exist"
-                    )
-                to_delete.append(old_node.id)
         logger.info(
-            "SAFE replace summary for contract_id=%s: update=%d, insert=%d, delete=%d",
+            "SAFE replace summary for contract_id=%s: unchanged=%d, update=%d, "
+            "move=%d, insert=%d, delete=%d",
             contract_id,
-            len(to_update),
-            len(to_insert),
-            len(to_delete),
+            len(diff.unchanged),
+            len(diff.updated),
+            len(diff.moved),
+            len(diff.inserted),
+            len(diff.deleted),
         )
         # --- persist ---
-        if to_delete:
-            self._cost_node_repository.delete_many(to_delete)
+        # insert -> update -> delete: przenoszone węzły mogą trafić pod nowe,
+        # a usuwany rodzic nie może (kaskadą) zabrać przeniesionych dzieci
+        if diff.inserted:
+            self._cost_node_repository.add_all(diff.inserted)
 
-        if to_update:
-            self._cost_node_repository.update_many(to_update)
+        if diff.to_update:
+            self._cost_node_repository.update_many(diff.to_update)
 
-        if to_insert:
-            self._cost_node_repository.add_all(to_insert)
+        if diff.deleted:
+            self._cost_node_repository.delete_many([n.id for n in diff.deleted])
 
         logger.info(
             "Contract metadata updated successfully: contract_id=%s",
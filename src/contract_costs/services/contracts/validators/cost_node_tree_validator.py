@@ -1,3 +1,4 @@
+from collections import Counter
 from typing import Dict, Set
 from uuid import UUID
 
@@ -27,8 +28,8 @@ class CostNodeEntityValidator:
             raise ValueError("Cost nodes belong to multiple contracts")
 
     def _validate_unique_codes(self, nodes: list[CostNode]) -> None:
-        codes = [n.code for n in nodes]
-        duplicates = {c for c in codes if codes.count(c) > 1}
+        counts = Counter(n.code for n in nodes)
+        duplicates = {c for c, count in counts.items() if count > 1}
         if duplicates:
             raise ValueError(f"Duplicate cost node codes: {duplicates}")
 
@@ -57,17 +58,26 @@ class CostNodeEntityValidator:
                 raise ValueError(f"Node '{node.code}' cannot be its own parent")
 
     def _validate_no_cycles(self, nodes: list[CostNode]) -> None:
+        """
+        Każdy węzeł odwiedzany raz: ścieżka w górę kończy się na korzeniu
+        albo na węźle już sprawdzonym (safe) – wtedy cała ścieżka jest safe.
+        """
         by_id: Dict[UUID, CostNode] = {n.id: n for n in nodes}
+        safe: Set[UUID] = set()
 
         for node in nodes:
-            visited: Set[UUID] = set()
+            path: Set[UUID] = set()
             current = node
 
-            while current.parent_id:
-                if current.parent_id in visited:
+            while current.id not in safe:
+                if current.id in path:
                     raise ValueError(
                         f"Cycle detected starting at node '{node.code}'"
                     )
 
-                visited.add(current.id)
+                path.add(current.id)
+                if not current.parent_id:
+                    break
                 current = by_id[current.parent_id]
+
+            safe |= path
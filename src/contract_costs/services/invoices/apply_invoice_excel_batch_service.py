@@ -1,10 +1,14 @@
-from uuid import UUID
+import logging
 
+from contract_costs.repository.unit_of_work import UnitOfWork, NullUnitOfWork
+from contract_costs.services.companies.evaluation_context import CompanyEvaluationStats
 from contract_costs.services.invoices.apply_company_excel_batch_service import ApplyCompanyExcelBatchService
 from contract_costs.services.invoices.dto.common import InvoiceExcelBatch
 from contract_costs.services.invoices.excel.invoice_excel_resolver import InvoiceExcelBatchResolver
 from contract_costs.services.invoices.ochestrator.invoice_ingest_orchestrator import InvoiceIngestOrchestrator
 
+logger = logging.getLogger(__name__)
+
 
 class ApplyInvoiceExcelBatchService:
     """
@@ -18,29 +22,44 @@ class ApplyInvoiceExcelBatchService:
         self,
         excel_resolver: InvoiceExcelBatchResolver,
         company_apply_service: ApplyCompanyExcelBatchService,
-        orchestrator: InvoiceIngestOrchestrator
+        orchestrator: InvoiceIngestOrchestrator,
+        unit_of_work: UnitOfWork | None = None,
     ) -> None:
         self._excel_resolver = excel_resolver
         self._company_apply_service = company_apply_service
         self._orchestrator = orchestrator
+        self._uow = unit_of_work or NullUnitOfWork()
 
-    def apply(self, batch: InvoiceExcelBatch) -> None:
+    def apply(self, batch: InvoiceExcelBatch) -> CompanyEvaluationStats:
         """
         Contract:
         - faktury bez kompletnych linii NIE są procesowane
         - linie bez invoice_id pozostają kosztami nieewidencjonowanymi
+        - firmy + faktury + linie zapisywane atomowo (jedna transakcja)
+        - każda firma (NIP) ewaluowana raz na cały batch
         """
 
-        #  Aktualizacja firm (NOWE)
+        context = self._excel_resolver.new_context()
 
-        # Resolver (NIP → UUID)
+        with self._uow.transaction():
+            #  Aktualizacja firm (NOWE)
+            self._company_apply_service.apply(batch.buyers, context)
+            self._company_apply_service.apply(batch.sellers, context)
 
-        self._company_apply_service.apply(batch.buyers)
-        self._company_apply_service.apply(batch.sellers)
+            # Resolver (NIP → UUID)
+            ingest_batch = self._excel_resolver.resolve(batch, context)
 
-        ingest_batch = self._excel_resolver.resolve(batch)
+            self._orchestrator.ingest_from_excel(
+             batch=ingest_batch
+            )
 
-        self._orchestrator.ingest_from_excel(
-         batch=ingest_batch
+        stats = context.stats()
+        logger.info(
+            "Company evaluation: requested=%d evaluated=%d reused=%d provider_queries_saved=%d",
+            stats.requested,
+            stats.evaluated,
+            stats.reused,
+            stats.provider_queries_saved,
         )
+        return stats
 
@@ -44,3 +44,26 @@ class InvoiceDetailsView:
     total_vat: Decimal
     total_gross: Decimal
     total_not_evidenced: Decimal
+
+
+@dataclass(frozen=True)
+class InvoiceSummaryView:
+    invoice_number: str
+    status: str
+    invoice_date: date | None
+    due_date: date | None
+
+    buyer_name: str
+    buyer_tax_number: str
+
+    seller_name: str
+    seller_tax_number: str
+
+    payment_method: str
+    payment_status: str
+
+    total_net: Decimal
+    total_vat: Decimal
+    total_gross: Decimal
+    total_not_evidenced: Decimal
+    line_count: int
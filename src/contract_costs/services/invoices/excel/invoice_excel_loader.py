@@ -1,11 +1,13 @@
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 from uuid import UUID
-from decimal import Decimal
-from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from datetime import date, datetime
+from enum import Enum
 
 import contract_costs.config as cfg
 
-import pandas as pd
+from openpyxl import load_workbook
 
 from contract_costs.services.common.resolve_utils import normalize_tax_number
 from contract_costs.services.invoices.commands.invoice_command import InvoiceCommand
@@ -20,170 +22,253 @@ from contract_costs.model.amount import Amount, VatRate, TaxTreatment
 from contract_costs.model.invoice import PaymentMethod
 from contract_costs.services.invoices.dto.export.company_export import CompanyExport
 
+T = TypeVar("T")
+E = TypeVar("E", bound=Enum)
 
-def _parse_uuid(value):
-    if pd.isna(value):
-        return None
-    return UUID(str(value))
 
+class InvoiceExcelValidationError(ValueError):
+    """Wszystkie błędy arkusza naraz (jeden przebieg), nie tylko pierwszy."""
 
-def _parse_date(value):
-    if pd.isna(value):
-        return None
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        super().__init__(
+            f"Invoice Excel contains {len(errors)} error(s):\n" + "\n".join(errors)
+        )
+
+
+def _parse_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value).strip())
+
+
+def _parse_date(value) -> date:
     if isinstance(value, datetime):
         return value.date()
-    return datetime.fromisoformat(str(value)).date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value).strip()).date()
 
-def normalize(value):
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-    return value
 
-def _parse_vat_rate(value) -> VatRate:
-    if not value:
-        raise ValueError("vat_rate is required")
+def _parse_decimal(value) -> Decimal:
+    return Decimal(str(value).strip())
+
 
+def _parse_text(value) -> str:
+    return str(value)
+
+
+def _parse_vat_rate(value) -> VatRate:
     try:
-        return VatRate[value.strip().upper()]
+        return VatRate[str(value).strip().upper()]
     except KeyError:
         raise ValueError(f"Invalid vat_rate: {value}")
 
 
-def load_invoice_excel_batch(path: Path) -> InvoiceExcelBatch:
-    df_invoices = pd.read_excel(path, sheet_name=cfg.INVOICE_METADATA_SHEET_NAME)
-    df_lines = pd.read_excel(path, sheet_name=cfg.INVOICE_ITEMS_SHEET_NAME)
-    df_buyers = pd.read_excel(path, sheet_name=cfg.DICTS_BUYERS)
-    df_sellers = pd.read_excel(path, sheet_name=cfg.DICTS_SELLERS)
+def _enum_by_value(enum_cls: type[E]) -> Callable[[Any], E]:
+    # słownik budowany raz na kolumnę – bez Enum(value) per komórka
+    members = {str(m.value): m for m in enum_cls}
 
-    df_invoices = df_invoices.dropna(how="all")
+    def parse(value) -> E:
+        try:
+            return members[str(value).strip()]
+        except KeyError:
+            raise ValueError(f"Invalid {enum_cls.__name__}: {value}")
 
-    col = df_invoices["invoice_number"]
+    return parse
 
-    invalid_mask = col.isna() | (col.astype(str).str.strip() == "")
 
-    if invalid_mask.any():
-        bad_rows = list(invalid_mask[invalid_mask].index + 1)  # +1 = numer wiersza dla usera
-        raise ValueError(
-            f"Invoice sheet contains empty invoice_number in rows: {bad_rows}. "
-            "Please fill all invoice numbers."
-        )
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
 
-    df_invoices = df_invoices.reset_index(drop=True)
 
-    col = df_lines["item_name"]
+class _SheetColumns:
+    """
+    Arkusz wczytany kolumnami (pomija całkiem puste wiersze).
+    Błędy konwersji są zbierane we wspólnej liście, z numerem wiersza Excela.
+    """
 
-    invalid_mask = col.isna() | (col.astype(str).str.strip() == "")
+    def __init__(self, wb, sheet_name: str, errors: list[str]) -> None:
+        self._sheet = sheet_name
+        self._errors = errors
+        self.row_numbers: list[int] = []
+        self._columns: dict[str, tuple] = {}
 
-    if invalid_mask.any():
-        bad_rows = list(invalid_mask[invalid_mask].index + 1)
-        raise ValueError(
-            f"[{cfg.INVOICE_METADATA_SHEET_NAME}] "
-            f"Empty invoice_number in rows: {bad_rows}. "
-            "Please fill all invoice numbers."
-        )
+        if sheet_name not in wb.sheetnames:
+            errors.append(f"[{sheet_name}] missing sheet")
+            return
 
-    df_lines = df_lines.reset_index(drop=True)
-
-    # # 2. tylko logiczne faktury
-    # df_invoices = df_invoices[df_invoices["invoice_number"].notna()]
-    # df_invoices = df_invoices[df_invoices["invoice_number"].astype(str).str.strip() != ""]
-    #
-    # # 3. odetnij wszystko po pierwszej dziurze
-    # df_invoices = df_invoices.reset_index(drop=True)
-    # mask = df_invoices["invoice_number"].notna()
-    # if not mask.all():
-    #     raise ValueError(
-    #         "Invoice sheet contains empty rows between invoices. "
-    #         "Please remove empty rows."
-    #     )
-    #
-    # df_lines = df_lines.dropna(how="all")
-    # df_lines = df_lines[df_lines["item_name"].notna()]
-    # df_lines = df_lines[df_lines["item_name"].astype(str).str.strip() != ""]
-    #
-    # # 3. odetnij wszystko po pierwszej dziurze
-    # df_lines = df_lines.reset_index(drop=True)
-    # mask = df_lines["item_name"].notna()
-    # if not mask.all():
-    #     raise ValueError(
-    #         "Invoice Line sheet contains empty rows between lines. "
-    #         "Please remove empty rows."
-    #     )
-
-    invoices: list[InvoiceUpdate] = []
-    for _, row in df_invoices.iterrows():
-
-        invoices.append(
-            InvoiceUpdate(
-                command=InvoiceCommand(str(row["action"])) if not pd.isna(row["action"]) else InvoiceCommand.APPLY,
-                invoice_number=str(row["invoice_number"]) ,
-                old_invoice_number=str(row["old_invoice_number"]) if not pd.isna(row["old_invoice_number"]) else None,
-                invoice_date=_parse_date(row["invoice_date"]),
-                selling_date=_parse_date(row["selling_date"]),
-                buyer_tax_number=normalize_tax_number(row["buyer_NIP"]),
-                seller_tax_number=normalize_tax_number(row["seller_NIP"]) if not pd.isna(row["seller_NIP"]) else None,
-                payment_method=PaymentMethod(row["payment_method"])
-                if not pd.isna(row["payment_method"])
-                else PaymentMethod.UNKNOWN,
-                due_date=_parse_date(row["due_date"]),
-                payment_status=PaymentStatus(row["payment_status"])
-                if not pd.isna(row["payment_status"])
-                else PaymentStatus.UNKNOWN,
-                status=InvoiceStatus.IN_PROGRESS, ## OR PROCESSED
-            )
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+
+        kept: list[tuple] = []
+        for row_number, row in enumerate(rows, start=2):
+            if all(_is_blank(v) for v in row):
+                continue
+            self.row_numbers.append(row_number)
+            kept.append(row)
+
+        width = len(header)
+        columns = list(zip(*(row[:width] + (None,) * (width - len(row)) for row in kept)))
+        for idx, name in enumerate(header):
+            if name is not None:
+                self._columns[str(name).strip()] = columns[idx] if columns else ()
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def convert(
+        self,
+        column: str,
+        parse: Callable[[Any], T],
+        *,
+        required: bool = False,
+        default: T | None = None,
+    ) -> list[T | None]:
+        values = self._columns.get(column)
+        if values is None:
+            if required and self.row_numbers:
+                self._errors.append(f"[{self._sheet}] missing column: {column}")
+            return [default] * len(self.row_numbers)
+
+        result: list[T | None] = []
+        for row_number, value in zip(self.row_numbers, values):
+            if _is_blank(value):
+                if required:
+                    self._errors.append(
+                        f"[{self._sheet}] row {row_number}, {column}: value is required"
+                    )
+                result.append(default)
+                continue
+            try:
+                result.append(parse(value))
+            except (ValueError, TypeError, InvalidOperation) as e:
+                self._errors.append(
+                    f"[{self._sheet}] row {row_number}, {column}: {e or repr(value)}"
+                )
+                result.append(default)
+        return result
+
+
+def load_invoice_excel_batch(path: Path) -> InvoiceExcelBatch:
+    # jeden odczyt pliku (read-only, strumieniowo) dla wszystkich arkuszy
+    wb = load_workbook(path, read_only=True, data_only=True)
+    errors: list[str] = []
+    try:
+        inv = _SheetColumns(wb, cfg.INVOICE_METADATA_SHEET_NAME, errors)
+        ln = _SheetColumns(wb, cfg.INVOICE_ITEMS_SHEET_NAME, errors)
+        buy = _SheetColumns(wb, cfg.DICTS_BUYERS, errors)
+        sell = _SheetColumns(wb, cfg.DICTS_SELLERS, errors)
+    finally:
+        wb.close()
+
+    invoices = _invoices(inv)
+    lines = _lines(ln)
+    buyers = _companies(buy)
+    sellers = _companies(sell)
+
+    if errors:
+        raise InvoiceExcelValidationError(errors)
+
+    return InvoiceExcelBatch(
+        invoices=invoices,
+        lines=lines,
+        buyers=buyers,
+        sellers=sellers
+    )
+
+
+def _invoices(sheet: _SheetColumns) -> list[InvoiceUpdate]:
+    columns = zip(
+        sheet.convert("action", _enum_by_value(InvoiceCommand), default=InvoiceCommand.APPLY),
+        sheet.convert("invoice_number", _parse_text, required=True),
+        sheet.convert("old_invoice_number", _parse_text),
+        sheet.convert("invoice_date", _parse_date),
+        sheet.convert("selling_date", _parse_date),
+        sheet.convert("buyer_NIP", normalize_tax_number),
+        sheet.convert("seller_NIP", normalize_tax_number),
+        sheet.convert("payment_method", _enum_by_value(PaymentMethod), default=PaymentMethod.UNKNOWN),
+        sheet.convert("due_date", _parse_date),
+        sheet.convert("payment_status", _enum_by_value(PaymentStatus), default=PaymentStatus.UNKNOWN),
+    )
+
+    return [
+        InvoiceUpdate(
+            command=command,
+            invoice_number=number,
+            old_invoice_number=old_number,
+            invoice_date=invoice_date,
+            selling_date=selling_date,
+            buyer_tax_number=buyer_nip,
+            seller_tax_number=seller_nip,
+            payment_method=payment_method,
+            due_date=due_date,
+            payment_status=payment_status,
+            status=InvoiceStatus.IN_PROGRESS, ## OR PROCESSED
         )
+        for (
+            command, number, old_number, invoice_date, selling_date,
+            buyer_nip, seller_nip, payment_method, due_date, payment_status,
+        ) in columns
+    ]
+
+
+def _lines(sheet: _SheetColumns) -> list[InvoiceLineUpdate]:
+    columns = zip(
+        sheet.convert("id", _parse_uuid),
+        sheet.convert("invoice_number", _parse_text),
+        sheet.convert("item_name", _parse_text, required=True),
+        sheet.convert("description", _parse_text),
+        sheet.convert("quantity", _parse_decimal, required=True),
+        sheet.convert("unit", _enum_by_value(UnitOfMeasure), required=True),
+        sheet.convert("net", _parse_decimal, required=True),
+        sheet.convert("vat_rate", _parse_vat_rate, default=VatRate.VAT_ZW),
+        sheet.convert("tax_treatment", _enum_by_value(TaxTreatment), required=True),
+        sheet.convert("contract_code", _parse_text),
+        sheet.convert("cost_node_code", _parse_text),
+        sheet.convert("cost_type_code", _parse_text),
+    )
 
     lines: list[InvoiceLineUpdate] = []
-    for _, row in df_lines.iterrows():
+    for (
+        line_id, number, item_name, description, quantity, unit,
+        net, vat_rate, tax_treatment, contract_code, cost_node_code, cost_type_code,
+    ) in columns:
+        if net is None or tax_treatment is None:
+            continue  # błąd już zapisany – cała partia i tak zostanie odrzucona
         lines.append(
             InvoiceLineUpdate(
-                invoice_line_id=_parse_uuid(normalize(row["id"])),
-                invoice_number=str(row["invoice_number"])
-                if not pd.isna(row["invoice_number"])
-                else None,
-                item_name=normalize(row["item_name"]),
-                description=normalize(row.get("description")),
-                quantity=Decimal(str(row["quantity"])),
-                unit=normalize(UnitOfMeasure(row["unit"])),
+                invoice_line_id=line_id,
+                invoice_number=number,
+                item_name=item_name,
+                description=description,
+                quantity=quantity,
+                unit=unit,
                 amount=Amount(
-                    value=Decimal(str(row["net"])),
-                    vat_rate=_parse_vat_rate(row["vat_rate"])
-                    if not pd.isna(row["vat_rate"])
-                    else VatRate.VAT_ZW,
-                    tax_treatment=TaxTreatment(row["tax_treatment"]),
+                    value=net,
+                    vat_rate=vat_rate,
+                    tax_treatment=tax_treatment,
                 ),
-                contract_id=normalize(row.get("contract_code")),  # <-- CODE
-                cost_node_id=normalize(row.get("cost_node_code")),  # <-- CODE
-                cost_type_id=normalize(row.get("cost_type_code")),  # <-- CODE
+                contract_id=contract_code,  # <-- CODE
+                cost_node_id=cost_node_code,  # <-- CODE
+                cost_type_id=cost_type_code,  # <-- CODE
             )
         )
+    return lines
 
-    buyers: list[CompanyExport] = []
-    for _, row in df_buyers.iterrows():
-        buyers.append(
-            CompanyExport(
-                id = row["id"],
-                name = row["name"],
-                tax_number =row["tax_number"]
-            )
-        )
-    sellers: list[CompanyExport] = []
-    for _, row in df_sellers.iterrows():
-        sellers.append(
+
+def _companies(sheet: _SheetColumns) -> list[CompanyExport]:
+    companies: list[CompanyExport] = []
+    for company_id, name, tax_number in zip(
+        sheet.convert("id", _parse_uuid, required=True),
+        sheet.convert("name", _parse_text, required=True),
+        sheet.convert("tax_number", _parse_text, required=True),
+    ):
+        if company_id is None or name is None or tax_number is None:
+            continue  # błąd już zapisany – cała partia i tak zostanie odrzucona
+        companies.append(
             CompanyExport(
-                id = row["id"],
-                name = row["name"],
-                tax_number =row["tax_number"]
+                id=company_id,
+                name=name,
+                tax_number=tax_number,
             )
         )
-
-    return InvoiceExcelBatch(
-        invoices=invoices,
-        lines=lines,
-        buyers=buyers,
-        sellers=sellers
-    )
-
-
+    return companies
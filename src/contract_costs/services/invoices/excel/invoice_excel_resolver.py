@@ -2,6 +2,7 @@ import logging
 
 from contract_costs.model.company import CompanyType
 from contract_costs.services.companies.company_evaluate_orchestrator import CompanyEvaluateOrchestrator
+from contract_costs.services.companies.evaluation_context import CompanyEvaluationContext
 from contract_costs.services.invoices.dto.common import (
     InvoiceExcelBatch, ResolvedInvoiceUpdate, InvoiceIngestBatch,
 )
@@ -13,14 +14,23 @@ class InvoiceExcelBatchResolver:
     def __init__(self, company_evaluate_orchestrator: CompanyEvaluateOrchestrator) -> None:
         self._company_evaluate_orchestrator = company_evaluate_orchestrator
 
-    def resolve(self, batch: InvoiceExcelBatch) -> InvoiceIngestBatch:
+    def new_context(self) -> CompanyEvaluationContext:
+        return CompanyEvaluationContext(self._company_evaluate_orchestrator)
+
+    def resolve(
+        self,
+        batch: InvoiceExcelBatch,
+        context: CompanyEvaluationContext | None = None,
+    ) -> InvoiceIngestBatch:
+        # każdy NIP rozwiązywany raz na batch (bufor OWN / powtarzający się dostawcy)
+        context = context or self.new_context()
         resolved_invoices: list[ResolvedInvoiceUpdate] = []
 
         for inv in batch.invoices:
             raw_buyer_nip = inv.buyer_tax_number
             raw_seller_nip = inv.seller_tax_number
-            buyer_company = self._company_evaluate_orchestrator.evaluate_from_tax(raw_buyer_nip,role=CompanyType.BUYER)
-            seller_company = self._company_evaluate_orchestrator.evaluate_from_tax(raw_seller_nip,role=CompanyType.SELLER)
+            buyer_company = context.evaluate_from_tax(raw_buyer_nip,role=CompanyType.BUYER)
+            seller_company = context.evaluate_from_tax(raw_seller_nip,role=CompanyType.SELLER)
             if buyer_company.role != CompanyType.OWN:
                 logger.error(f"Buyer: {buyer_company.name} evaluated by NIP: {raw_buyer_nip} is not OWN company, and cannot act as buyer in cost invoice")
                 raise RuntimeError(f"Buyer company role must be OWN! Wrong NIP: {raw_buyer_nip}")
@@ -1,12 +1,13 @@
 from enum import Enum
 from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
 
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import Alignment, PatternFill, Font
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.worksheet.worksheet import Worksheet
 
 from contract_costs.repository.contract_repository import ContractRepository
 from contract_costs.repository.cost_node_repository import CostNodeRepository
@@ -17,6 +18,135 @@ from contract_costs.services.invoices.export.invoice_assignment_exporter import
 
 import contract_costs.config as cfg
 
+# dropdowny także na wierszach dopisanych ręcznie pod eksportem
+DROPDOWN_MIN_ROWS = 2000
+
+
+def _declare_dimension(ws, ref: str) -> None:
+    """
+    Zapisuje <dimension ref=...> w arkuszu write-only – bez niego czytniki
+    (openpyxl read-only, pandas) skanują cały arkusz, żeby poznać rozmiar.
+
+    openpyxl (sprawdzone na 3.1.5) nie ma API dla write-only: WorksheetWriter
+    .write_dimensions() bierze getattr(ws, "calculate_dimension") i pomija
+    tag, gdy go brak. Podstawiamy tę metodę na instancji arkusza; test
+    eksportera czyta <dimension> z pliku, więc zmiana w openpyxl wyjdzie w CI.
+    """
+    ws.calculate_dimension = lambda: ref
+
+
+class _SheetStream:
+    """
+    Arkusz w trybie write-only (openpyxl): wiersze idą prosto do pliku,
+    bez obiektów Cell w pamięci.
+
+    XLSX wymaga <cols> (szerokości, ukryte kolumny) i widoku (freeze)
+    przed danymi, więc szerokości liczymy z wartości wierszy (maks. długość
+    per kolumna) przed zapisem – nie z komórek arkusza. Filtr, zebra
+    i walidacje trafiają na koniec arkusza, więc wystarczy im licznik wierszy.
+    """
+
+    def __init__(
+        self,
+        wb: Workbook,
+        title: str,
+        headers: list[str],
+        *,
+        hidden: Sequence[str] = (),
+        data_sheet: bool = False,
+        max_width: int = 50,
+    ) -> None:
+        self.title = title
+        self.ws = wb.create_sheet(title)
+        self._headers = headers
+        self._hidden = hidden
+        self._data_sheet = data_sheet
+        self._max_width = max_width
+        self.max_row = 0
+
+    def write(self, rows: Callable[[], Iterable[Sequence[Any]]]) -> "_SheetStream":
+        """`rows` zwraca świeży iterator wierszy (bez nagłówka)."""
+        lengths = [len(h) for h in self._headers]
+        count = 0
+        for row in rows():
+            count += 1
+            for idx, value in enumerate(row):
+                if value:
+                    size = len(str(value))
+                    if size > lengths[idx]:
+                        lengths[idx] = size
+
+        for idx, size in enumerate(lengths, start=1):
+            dim = self.ws.column_dimensions[get_column_letter(idx)]
+            dim.width = min(size + 4, self._max_width + 1)
+        for col in self._hidden:
+            self.ws.column_dimensions[col].hidden = True
+        if self._data_sheet:
+            self.ws.freeze_panes = "A2"
+
+        _declare_dimension(self.ws, f"A1:{get_column_letter(len(self._headers))}{count + 1}")
+
+        self.ws.append(self._header_cells())
+        for row in rows():
+            self.ws.append(row)
+        self.max_row = count + 1
+
+        if self._data_sheet and self.max_row >= 2:
+            end_col = get_column_letter(len(self._headers))
+            self.ws.auto_filter.ref = f"A1:{end_col}{self.max_row}"
+            self._zebra_rows(end_col)
+        return self
+
+    def add_data_validation(self, dv: DataValidation) -> None:
+        self.ws.data_validations.append(dv)
+
+    def _header_cells(
+            self,
+            bg_color: str = "1F4E79",  # ciemny niebieski
+            font_color: str = "FFFFFF",
+    ) -> list[Cell]:
+        font = Font(bold=True, color=font_color)
+        fill = PatternFill(
+            fill_type="solid",
+            start_color=bg_color,
+            end_color=bg_color,
+        )
+        alignment = Alignment(
+            horizontal="left",
+            vertical="center",
+            wrap_text=True,
+        )
+
+        cells = []
+        for header in self._headers:
+            cell = WriteOnlyCell(self.ws, value=header)
+            cell.font = font
+            cell.fill = fill
+            cell.alignment = alignment
+            cells.append(cell)
+        return cells
+
+    def _zebra_rows(
+            self,
+            end_col: str,
+            start_row: int = 2,  # od pierwszego wiersza danych
+            bg_color: str = "EAF2FB",  # bardzo jasny niebieski
+    ) -> None:
+        fill = PatternFill(
+            fill_type="solid",
+            start_color=bg_color,
+            end_color=bg_color,
+        )
+        rule = FormulaRule(
+            formula=["MOD(ROW(),2)=0"],
+            fill=fill,
+        )
+        self.ws.conditional_formatting.add(
+            f"A{start_row}:{end_col}{self.max_row}",
+            rule,
+        )
+
+
 class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
     def __init__(self,
                  contract_repository: ContractRepository,
@@ -31,7 +161,8 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             bundle: InvoiceAssignmentExportBundle,
             output_path: Path
     ) -> None:
-        wb = Workbook()
+        # write-only: pamięć nie rośnie z liczbą wierszy
+        wb = Workbook(write_only=True)
 
         invoices_ws = self._write_invoices(wb, bundle.invoices)
         lines_ws = self._write_invoice_lines(wb, bundle.invoice_lines)
@@ -47,7 +178,7 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         vat_rates_ws = self._write_dictionary(wb, bundle.vat_rates, cfg.DICTS_VAT_RATES)
         actions_ws = self._write_dictionary(wb, bundle.actions, cfg.DICTS_ACTIONS)
 
-
+        # walidacje są zapisywane na końcu arkusza – po wierszach
         self._apply_dropdowns(
             invoices_ws=invoices_ws,
             lines_ws=lines_ws,
@@ -64,29 +195,9 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             actions_ws=actions_ws
         )
 
-        DATA_SHEETS = {
-            cfg.INVOICE_METADATA_SHEET_NAME,
-            cfg.INVOICE_ITEMS_SHEET_NAME,
-        }
-
-        for ws in wb.worksheets:
-            self.style_header(ws)
-            self.autosize_columns(ws)
-
-            if ws.title in DATA_SHEETS:
-                self.freeze_header(ws)
-                self.apply_autofilter(ws)
-                self.zebra_rows(ws)
-
-        # opcjonalnie: usuń domyślny pusty sheet
-        if "Sheet" in wb.sheetnames:
-            del wb["Sheet"]
-
         wb.save(output_path)
 
-    def _write_invoices(self, wb: Workbook, invoices) -> Worksheet:
-        ws = wb.create_sheet(cfg.INVOICE_METADATA_SHEET_NAME)
-
+    def _write_invoices(self, wb: Workbook, invoices) -> _SheetStream:
         headers = [
             "action",  # APPLY | MODIFY | DELETE
             "invoice_number",  # nowy numer (lub pusty → generator)
@@ -100,28 +211,28 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             "due_date",
             "timestamp",
         ]
-        ws.append(headers)
-
-        for i in invoices:
-            ws.append([
-                str(InvoiceCommand.APPLY.value),
-                i.invoice_number,
-                i.invoice_number,  # old_invoice_number
-                i.invoice_date,
-                i.selling_date,
-                str(i.buyer_tax_number) if i.buyer_tax_number else None,
-                str(i.seller_tax_number) if i.seller_tax_number else None,
-                i.payment_method.value if i.payment_method else None,
-                i.payment_status.value if i.payment_status else None,
-                i.due_date,
-                i.timestamp,
-            ])
-        ws.column_dimensions["C"].hidden = True
-        return ws
-
-    def _write_invoice_lines(self, wb: Workbook, lines) -> Worksheet:
-        ws = wb.create_sheet(cfg.INVOICE_ITEMS_SHEET_NAME)
 
+        def rows():
+            for i in invoices:
+                yield [
+                    str(InvoiceCommand.APPLY.value),
+                    i.invoice_number,
+                    i.invoice_number,  # old_invoice_number
+                    i.invoice_date,
+                    i.selling_date,
+                    str(i.buyer_tax_number) if i.buyer_tax_number else None,
+                    str(i.seller_tax_number) if i.seller_tax_number else None,
+                    i.payment_method.value if i.payment_method else None,
+                    i.payment_status.value if i.payment_status else None,
+                    i.due_date,
+                    i.timestamp,
+                ]
+
+        return _SheetStream(
+            wb, cfg.INVOICE_METADATA_SHEET_NAME, headers, hidden=["C"], data_sheet=True
+        ).write(rows)
+
+    def _write_invoice_lines(self, wb: Workbook, lines) -> _SheetStream:
         headers = [
             "id",
             "invoice_number",
@@ -136,7 +247,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             "cost_node_code",
             "cost_type_code",
         ]
-        ws.append(headers)
 
         contracts = {
             c.id: c.code
@@ -153,119 +263,101 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             for t in self._cost_type_repository.list()
         }
 
-        for l in lines:
-            ws.append([
-                str(l.id),
-                str(l.invoice_number) if l.invoice_number else None,
-                l.item_name,
-                l.description,
-                l.quantity,
-                l.unit.value,
-                l.net,
-                l.vat_rate.name if isinstance(l.vat_rate, Enum) else l.vat_rate,
-                l.tax_treatment.value,
-                contracts.get(l.contract_id),
-                cost_nodes.get(l.cost_node_id),
-                cost_types.get(l.cost_type_id),
-            ])
-        ws.column_dimensions["A"].hidden = True
-        return ws
-
-    def _write_buyers(self, wb: Workbook, buyers) -> Worksheet:
-        ws = wb.create_sheet(cfg.DICTS_BUYERS)
-        ws.append(["tax_number","name","id" ])
-
-        for c in buyers:
-            ws.append([c.tax_number,c.name,str(c.id)  ])
-        ws.column_dimensions["C"].hidden = True
-        return ws
-
-    def _write_sellers(self, wb: Workbook, sellers) -> Worksheet:
-        ws = wb.create_sheet(cfg.DICTS_SELLERS)
-        ws.append(["tax_number","name","id" ])
-
-        for c in sellers:
-            ws.append([c.tax_number,c.name,str(c.id)  ])
-        ws.column_dimensions["C"].hidden = True
-        return ws
-
-    def _write_contracts(self, wb: Workbook, contracts) -> Worksheet:
-        ws = wb.create_sheet(cfg.DICTS_CONTRACTS)
-        ws.append(["code",  "name","id"])
-
-        for c in contracts:
-            ws.append([c.code, c.name ,str(c.id)])
-        ws.column_dimensions["C"].hidden = True
-        return ws
-
-    def _write_cost_nodes(self, wb: Workbook, cost_nodes) -> Worksheet:
-        ws = wb.create_sheet(cfg.DICTS_COST_NODES)
-        ws.append([
+        def rows():
+            for l in lines:
+                yield [
+                    str(l.id),
+                    str(l.invoice_number) if l.invoice_number else None,
+                    l.item_name,
+                    l.description,
+                    l.quantity,
+                    l.unit.value,
+                    l.net,
+                    l.vat_rate.name if isinstance(l.vat_rate, Enum) else l.vat_rate,
+                    l.tax_treatment.value,
+                    contracts.get(l.contract_id),
+                    cost_nodes.get(l.cost_node_id),
+                    cost_types.get(l.cost_type_id),
+                ]
+
+        return _SheetStream(
+            wb, cfg.INVOICE_ITEMS_SHEET_NAME, headers, hidden=["A"], data_sheet=True
+        ).write(rows)
+
+    def _write_buyers(self, wb: Workbook, buyers) -> _SheetStream:
+        return _SheetStream(
+            wb, cfg.DICTS_BUYERS, ["tax_number", "name", "id"], hidden=["C"]
+        ).write(lambda: ([c.tax_number, c.name, str(c.id)] for c in buyers))
+
+    def _write_sellers(self, wb: Workbook, sellers) -> _SheetStream:
+        return _SheetStream(
+            wb, cfg.DICTS_SELLERS, ["tax_number", "name", "id"], hidden=["C"]
+        ).write(lambda: ([c.tax_number, c.name, str(c.id)] for c in sellers))
+
+    def _write_contracts(self, wb: Workbook, contracts) -> _SheetStream:
+        return _SheetStream(
+            wb, cfg.DICTS_CONTRACTS, ["code", "name", "id"], hidden=["C"]
+        ).write(lambda: ([c.code, c.name, str(c.id)] for c in contracts))
+
+    def _write_cost_nodes(self, wb: Workbook, cost_nodes) -> _SheetStream:
+        headers = [
             "code",
             "name",
             "budget",
             "id",
             "contract_id",
             "parent_id"
-        ])
-
-        for n in cost_nodes:
-            ws.append([
-                n.code,
-                n.name,
-                n.budget,
-                str(n.id),
-                str(n.contract_id),
-                str(n.parent_id) if n.parent_id else None
-            ])
-        ws.column_dimensions["D"].hidden = True  # id
-        ws.column_dimensions["E"].hidden = True  # contract_id
-        ws.column_dimensions["F"].hidden = True  # parent_id
-        return ws
-
-    def _write_cost_types(self, wb: Workbook, cost_types) -> Worksheet:
-        ws = wb.create_sheet(cfg.DICTS_COST_TYPES)
-        ws.append(["code", "name","id"])
-
-        for ct in cost_types:
-            ws.append([ ct.code, ct.name,str(ct.id)])
-
-        ws.column_dimensions["C"].hidden = True
-        return ws
+        ]
 
-    @staticmethod
-    def _write_dictionary( wb: Workbook, dictionary: dict[str,str],dicts_sheet_name: str) -> Worksheet:
-        ws = wb.create_sheet(dicts_sheet_name)
-        ws.append(["label","code" ])
+        def rows():
+            for n in cost_nodes:
+                yield [
+                    n.code,
+                    n.name,
+                    n.budget,
+                    str(n.id),
+                    str(n.contract_id),
+                    str(n.parent_id) if n.parent_id else None
+                ]
+
+        return _SheetStream(
+            wb,
+            cfg.DICTS_COST_NODES,
+            headers,
+            hidden=["D", "E", "F"],  # id, contract_id, parent_id
+        ).write(rows)
 
-        for code,label in dictionary.items():
-            ws.append([label,code])
+    def _write_cost_types(self, wb: Workbook, cost_types) -> _SheetStream:
+        return _SheetStream(
+            wb, cfg.DICTS_COST_TYPES, ["code", "name", "id"], hidden=["C"]
+        ).write(lambda: ([ct.code, ct.name, str(ct.id)] for ct in cost_types))
 
-        return ws
+    @staticmethod
+    def _write_dictionary( wb: Workbook, dictionary: dict[str,str],dicts_sheet_name: str) -> _SheetStream:
+        return _SheetStream(wb, dicts_sheet_name, ["label", "code"]).write(
+            lambda: ([label, code] for code, label in dictionary.items())
+        )
 
     def _apply_dropdowns(
         self,
         *,
-        invoices_ws:Worksheet,
-        lines_ws: Worksheet,
-        buyers_ws: Worksheet,
-        sellers_ws: Worksheet,
-        contracts_ws: Worksheet,
-        cost_nodes_ws: Worksheet,
-        cost_types_ws: Worksheet,
-        tax_treatments_ws: Worksheet,
-        payment_method_ws: Worksheet,
-        payment_status_ws: Worksheet,
-        units_ws: Worksheet,
-        vat_rates_ws: Worksheet,
-        actions_ws: Worksheet,
+        invoices_ws:_SheetStream,
+        lines_ws: _SheetStream,
+        buyers_ws: _SheetStream,
+        sellers_ws: _SheetStream,
+        contracts_ws: _SheetStream,
+        cost_nodes_ws: _SheetStream,
+        cost_types_ws: _SheetStream,
+        tax_treatments_ws: _SheetStream,
+        payment_method_ws: _SheetStream,
+        payment_status_ws: _SheetStream,
+        units_ws: _SheetStream,
+        vat_rates_ws: _SheetStream,
+        actions_ws: _SheetStream,
 
     ) -> None:
 
-        max_rows = 2000  # bezpieczny limit
-
         self._apply_one_dropdown(
-            max_rows,
             actions_ws,
             cfg.DICTS_ACTIONS,
             invoices_ws,
@@ -273,7 +365,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             buyers_ws,
             cfg.DICTS_BUYERS,
             invoices_ws,
@@ -281,21 +372,18 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             sellers_ws,
             cfg.DICTS_SELLERS,
             invoices_ws,
             "G"
         )
         self._apply_one_dropdown(
-            max_rows,
             payment_method_ws,
             cfg.DICTS_PAYMENT_METHODS,
             invoices_ws,
             "H"
         )
         self._apply_one_dropdown(
-            max_rows,
             payment_status_ws,
             cfg.DICTS_PAYMENT_STATUS,
             invoices_ws,
@@ -303,7 +391,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             units_ws,
             cfg.DICTS_UNITS,
             lines_ws,
@@ -312,7 +399,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
 
 
         self._apply_one_dropdown(
-            max_rows,
             vat_rates_ws,
             cfg.DICTS_VAT_RATES,
             lines_ws,
@@ -321,7 +407,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             tax_treatments_ws,
             cfg.DICTS_TAX_TREATMENTS,
             lines_ws,
@@ -329,7 +414,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             contracts_ws,
             cfg.DICTS_CONTRACTS,
             lines_ws,
@@ -337,7 +421,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             cost_nodes_ws,
             cfg.DICTS_COST_NODES,
             lines_ws,
@@ -345,7 +428,6 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
         )
 
         self._apply_one_dropdown(
-            max_rows,
             cost_types_ws,
             cfg.DICTS_COST_TYPES,
             lines_ws,
@@ -354,10 +436,9 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
 
 
     @staticmethod
-    def _apply_one_dropdown(max_rows: int,
-                            dict_ws: Worksheet,
+    def _apply_one_dropdown(dict_ws: _SheetStream,
                             dict_ws_name: str,
-                            source_ws: Worksheet,
+                            source_ws: _SheetStream,
                             target_column: str,
                             source_column: str = "A"
                             ) -> None:
@@ -367,83 +448,7 @@ class ExcelInvoiceAssignmentExporter(InvoiceAssignmentExporter):
             formula1=f"={data_range}",
             allow_blank=True,
         )
-        source_ws.add_data_validation(dv)
+        # cały eksport (np. kwartał linii) + zapas na ręczne wiersze
+        max_rows = max(source_ws.max_row, DROPDOWN_MIN_ROWS)
         dv.add(f"{target_column}2:{target_column}{max_rows}")
-
-    @staticmethod
-    def autosize_columns(ws: Worksheet, max_width: int = 50) -> None:
-        for idx, col in enumerate(ws.columns, start=1):
-            max_length = 0
-            col_letter = get_column_letter(idx)
-
-            for cell in col:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-
-            ws.column_dimensions[col_letter].width = min(max_length + 4, max_width + 1)
-
-
-    @staticmethod
-    def style_header(
-            ws: Worksheet,
-            header_row: int = 1,
-            bg_color: str = "1F4E79",  # ciemny niebieski
-            font_color: str = "FFFFFF",
-    ) -> None:
-        header_font = Font(bold=True, color=font_color)
-        header_fill = PatternFill(
-            fill_type="solid",
-            start_color=bg_color,
-            end_color=bg_color,
-        )
-        header_alignment = Alignment(
-            horizontal="left",
-            vertical="center",
-            wrap_text=True,
-        )
-
-        for cell in ws[header_row]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-
-
-    @staticmethod
-    def zebra_rows(
-            ws: Worksheet,
-            start_row: int = 2,  # od pierwszego wiersza danych
-            bg_color: str = "EAF2FB"  # bardzo jasny niebieski
-    ) -> None:
-
-        if ws.max_row < start_row:
-            return
-
-        fill = PatternFill(
-            fill_type="solid",
-            start_color=bg_color,
-            end_color=bg_color,
-        )
-
-        rule = FormulaRule(
-            formula=[f"MOD(ROW(),2)=0"],
-            fill=fill,
-        )
-
-        end_col = get_column_letter(ws.max_column)
-
-        ws.conditional_formatting.add(
-            f"A{start_row}:{end_col}{ws.max_row}",
-            rule,
-        )
-
-    @staticmethod
-    def freeze_header(ws: Worksheet) -> None:
-        ws.freeze_panes = "A2"
-
-    @staticmethod
-    def apply_autofilter(ws: Worksheet) -> None:
-        if ws.max_row < 2:
-            return  # brak danych
-
-        end_col = get_column_letter(ws.max_column)
-        ws.auto_filter.ref = f"A1:{end_col}{ws.max_row}"
+        source_ws.add_data_validation(dv)
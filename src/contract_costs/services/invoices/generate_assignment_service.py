@@ -3,6 +3,7 @@ from pathlib import Path
 import logging
 
 from contract_costs.model.invoice import InvoiceStatus, Invoice
+from contract_costs.repository.batch_loader import BatchLoader
 from contract_costs.repository.invoice_repository import InvoiceRepository
 from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 from contract_costs.repository.company_repository import CompanyRepository
@@ -80,14 +81,18 @@ class GenerateInvoiceAssignmentService:
             inv.seller_id for inv in updated_invoices
         }
 
+        # wszystkie firmy faktur jednym get_many
+        companies = BatchLoader(self._company_repo.get_many).prime(
+            company_buyers | company_sellers
+        )
+
         buyers = [
             CompanyExport(
                 id=c.id,
                 name=c.name,
                 tax_number=c.tax_number,
             )
-            for c in (self._company_repo.get(cid) for cid in company_buyers)
-            if c is not None
+            for c in companies.load_many(company_buyers)
         ]
         if len(buyers)==0:
             buyers = [
@@ -105,8 +110,7 @@ class GenerateInvoiceAssignmentService:
                 name=c.name,
                 tax_number=c.tax_number,
             )
-            for c in (self._company_repo.get(cid) for cid in company_sellers)
-            if c is not None
+            for c in companies.load_many(company_sellers)
         ]
 
         #  Contracts
@@ -145,8 +149,8 @@ class GenerateInvoiceAssignmentService:
         #  Mapowanie faktur
         invoice_exports = []
         for i in updated_invoices:
-            buyer = self._company_repo.get(i.buyer_id) if i.buyer_id else None
-            seller = self._company_repo.get(i.seller_id) if i.seller_id else None
+            buyer = companies.load(i.buyer_id)
+            seller = companies.load(i.seller_id)
 
             invoice_exports.append(
                 InvoiceExport(
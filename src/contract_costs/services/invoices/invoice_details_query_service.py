@@ -1,5 +1,6 @@
 from decimal import Decimal
 
+from contract_costs.repository.batch_loader import BatchLoader
 from contract_costs.repository.invoice_repository import InvoiceRepository
 from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 from contract_costs.repository.company_repository import CompanyRepository
@@ -34,8 +35,22 @@ class InvoiceDetailsQueryService:
 
         lines = self._invoice_line_repo.list_by_invoice(invoice.id)
 
-        buyer = self._company_repo.get(invoice.buyer_id)
-        seller = self._company_repo.get(invoice.seller_id)
+        companies = BatchLoader(self._company_repo.get_many).prime(
+            [invoice.buyer_id, invoice.seller_id]
+        )
+        buyer = companies.load(invoice.buyer_id)
+        seller = companies.load(invoice.seller_id)
+
+        # słowniki linii – po jednym get_many na typ encji
+        contracts = BatchLoader(self._contract_repo.get_many).prime(
+            line.contract_id for line in lines
+        )
+        cost_nodes = BatchLoader(self._cost_node_repo.get_many).prime(
+            line.cost_node_id for line in lines
+        )
+        cost_types = BatchLoader(self._cost_type_repo.get_many).prime(
+            line.cost_type_id for line in lines
+        )
 
         line_views: list[InvoiceLineView] = []
 
@@ -55,20 +70,9 @@ class InvoiceDetailsQueryService:
             total_gross += gross
             total_not_evidenced += not_evidenced
 
-            contract = (
-                self._contract_repo.get(line.contract_id)
-                if line.contract_id else None
-            )
-
-            cost_node = (
-                self._cost_node_repo.get(line.cost_node_id)
-                if line.cost_node_id else None
-            )
-
-            cost_type = (
-                self._cost_type_repo.get(line.cost_type_id)
-                if line.cost_type_id else None
-            )
+            contract = contracts.load(line.contract_id)
+            cost_node = cost_nodes.load(line.cost_node_id)
+            cost_type = cost_types.load(line.cost_type_id)
 
             line_views.append(
                 InvoiceLineView(
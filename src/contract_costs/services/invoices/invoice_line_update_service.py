@@ -1,5 +1,6 @@
 from collections import defaultdict
 from dataclasses import replace
+from typing import Any, Callable, Sequence
 from uuid import uuid4, UUID
 
 from contract_costs.model.invoice_line import InvoiceLine
@@ -9,8 +10,6 @@ from contract_costs.repository.cost_type_repository import CostTypeRepository
 from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 from contract_costs.services.invoices.dto.apply import InvoiceRefResult, InvoiceApplyAction
 from contract_costs.services.invoices.dto.common import InvoiceLineUpdate
-
-from contract_costs.services.common.resolve_utils import resolve_or_none
 import logging
 
 
@@ -42,6 +41,12 @@ class InvoiceLineUpdateService:
         lines: list[InvoiceLineUpdate],
         ref_map: dict[str, InvoiceRefResult],
     ) ->  set[UUID]:
+        """
+        Zbiorczy (set-based) zapis linii:
+        - kody contract / cost node / cost type rozwiązywane jednym zapytaniem na typ
+        - istniejące linie pobierane jednym IN (...)
+        - zapis jednym upsert_many
+        """
 
         invoice_line_states: dict[UUID, list[bool]] = defaultdict(list)
 
@@ -53,6 +58,8 @@ class InvoiceLineUpdateService:
             if ref.invoice_id is not None
         }
 
+        accepted: list[tuple[InvoiceLineUpdate, UUID | None]] = []
+
         for update in lines:
             if update.invoice_number:
                 ref_result = ref_map.get(update.invoice_number)
@@ -84,36 +91,64 @@ class InvoiceLineUpdateService:
                 )
                 continue
 
-            contract_id = resolve_or_none(
-                self._contract_repository.get_by_code,
-                update.contract_id,
-                "Contract",
-            )
+            accepted.append((update, resolved_invoice_id))
 
-            cost_node_id = resolve_or_none(
-                self._cost_node_repository.get_by_code,
-                update.cost_node_id,
-                "CostNode",
-            )
+        # ---------- batch resolve ----------
+
+        contract_ids = self._resolve_codes(
+            self._contract_repository.list_by_codes,
+            {u.contract_id for u, _ in accepted if u.contract_id},
+            "Contract",
+        )
+        cost_node_ids = self._resolve_codes(
+            self._cost_node_repository.list_by_codes,
+            {u.cost_node_id for u, _ in accepted if u.cost_node_id},
+            "CostNode",
+        )
+        cost_type_ids = self._resolve_codes(
+            self._cost_type_repository.list_by_codes,
+            {u.cost_type_id for u, _ in accepted if u.cost_type_id},
+            "CostType",
+        )
+
+        existing_lines = {
+            line.id: line
+            for line in self._invoice_line_repository.get_many([
+                u.invoice_line_id
+                for u, invoice_id in accepted
+                if invoice_id and u.invoice_line_id is not None
+            ])
+        }
+
+        # ---------- build ----------
+
+        to_write: list[InvoiceLine] = []
 
-            cost_type_id = resolve_or_none(
-                self._cost_type_repository.get_by_code,
-                update.cost_type_id,
-                "CostType",
+        for update, resolved_invoice_id in accepted:
+            if not resolved_invoice_id:
+                continue
+
+            contract_id = contract_ids.get(update.contract_id) if update.contract_id else None
+            cost_node_id = cost_node_ids.get(update.cost_node_id) if update.cost_node_id else None
+            cost_type_id = cost_type_ids.get(update.cost_type_id) if update.cost_type_id else None
+
+            if update.invoice_line_id is None:
+                line = self._build_new_line(update, resolved_invoice_id, contract_id, cost_node_id, cost_type_id)
+            else:
+                existing = existing_lines.get(update.invoice_line_id)
+                if existing is None:
+                    raise ValueError("Invoice line not found")
+                line = self._build_updated_line(existing, update, resolved_invoice_id, contract_id, cost_node_id, cost_type_id)
+
+            to_write.append(line)
+            invoice_lines_ids_updated[resolved_invoice_id].append(line.id) # adding updated invoice lines ids by invoice_id
+            invoice_line_states[resolved_invoice_id].append(
+                self._is_line_complete(update)
             )
 
-            if resolved_invoice_id:
-                if update.invoice_line_id is None:
-                    new_id = self._create_line(update, resolved_invoice_id, contract_id, cost_node_id, cost_type_id)
-                    invoice_lines_ids_updated[resolved_invoice_id].append(new_id)  # adding updated invoice lines ids by invoice_id
-                else:
-                    self._update_line(update, resolved_invoice_id, contract_id, cost_node_id, cost_type_id)
-                    invoice_lines_ids_updated[resolved_invoice_id].append(update.invoice_line_id) #adding updated invoice lines ids by invoice_id
+        # ---------- persist ----------
 
-                if resolved_invoice_id is not None:
-                    invoice_line_states[resolved_invoice_id].append(
-                        self._is_line_complete(update)
-                    )
+        self._invoice_line_repository.upsert_many(to_write)
 
         self._delete_items_erased_from_excel(invoice_ids_from_excel,invoice_lines_ids_updated)
 
@@ -122,13 +157,37 @@ class InvoiceLineUpdateService:
         }
 
         logger.info(
-            "Invoice lines processed: total=%d, invoices_affected=%d",
+            "Invoice lines processed: total=%d, written=%d, invoices_affected=%d",
             len(lines),
+            len(to_write),
             len(invoice_lines_ids_updated),
         )
 
         return fully_assigned_invoice_ids
 
+    @staticmethod
+    def _resolve_codes(
+        list_by_codes: Callable[[list[str]], Sequence[Any]],
+        codes: set[str],
+        label: str,
+    ) -> dict[str, UUID]:
+        """
+        Odpowiednik resolve_or_none dla całego batcha: code -> id.
+        Brak któregokolwiek kodu = błąd (jak przy pojedynczym get_by_code).
+        """
+        if not codes:
+            return {}
+
+        resolved: dict[str, UUID] = {}
+        for entity in list_by_codes(sorted(codes)):
+            resolved.setdefault(entity.code, entity.id)
+
+        missing = sorted(codes - resolved.keys())
+        if missing:
+            raise ValueError(f"{label} not found for code: {missing[0]}")
+
+        return resolved
+
     def _delete_items_erased_from_excel(
             self,
             invoice_ids: set[UUID],
@@ -163,15 +222,15 @@ class InvoiceLineUpdateService:
                 update.cost_type_id is not None
         )
 
-    def _create_line(
-        self,
+    @staticmethod
+    def _build_new_line(
         update: InvoiceLineUpdate,
         invoice_id: UUID | None,
         contract_id: UUID | None,
         cost_node_id: UUID | None,
         cost_type_id: UUID | None
-    ) -> UUID:
-        line = InvoiceLine(
+    ) -> InvoiceLine:
+        return InvoiceLine(
             id=uuid4(),
             invoice_id=invoice_id,
             item_name=update.item_name,
@@ -184,24 +243,16 @@ class InvoiceLineUpdateService:
             cost_type_id=cost_type_id,
         )
 
-        self._invoice_line_repository.add(line)
-        return line.id
-
-    def _update_line(
-        self,
+    @staticmethod
+    def _build_updated_line(
+        line: InvoiceLine,
         update: InvoiceLineUpdate,
         invoice_id: UUID | None,
         contract_id: UUID | None,
         cost_node_id: UUID | None,
         cost_type_id: UUID | None
-    ) -> None:
-        if update.invoice_line_id:
-            line = self._invoice_line_repository.get(update.invoice_line_id)
-            if line is None:
-                raise ValueError("Invoice line not found")
-        else: raise ValueError("Invoice line not found")
-
-        updated = replace(
+    ) -> InvoiceLine:
+        return replace(
             line,
             invoice_id=invoice_id,  # 🔥 TU JEST RÓŻNICA
             item_name=update.item_name,
@@ -213,5 +264,3 @@ class InvoiceLineUpdateService:
             cost_node_id=cost_node_id,
             cost_type_id=cost_type_id,
         )
-
-        self._invoice_line_repository.update(updated)
@@ -0,0 +1,44 @@
+from contract_costs.model.invoice import InvoiceStatus
+from contract_costs.repository.invoice_summary_repository import InvoiceSummaryRepository
+from contract_costs.services.invoices.dto.invoice_query import InvoiceSummaryView
+
+
+class InvoiceSummaryQueryService:
+    """Lista faktur do `show invoices` – bez linii, tylko sumy."""
+
+    def __init__(self, summary_repository: InvoiceSummaryRepository) -> None:
+        self._repo = summary_repository
+
+    def list_summaries(
+        self,
+        *,
+        statuses: list[InvoiceStatus] | None = None,
+        unpaid: bool = False,
+        limit: int | None = None,
+    ) -> list[InvoiceSummaryView]:
+        rows = self._repo.list_summaries(statuses=statuses, unpaid=unpaid, limit=limit)
+
+        return [
+            InvoiceSummaryView(
+                invoice_number=r["invoice_number"],
+                status=r["status"],
+                invoice_date=r["invoice_date"],
+                due_date=r["due_date"],
+
+                buyer_name=r["buyer_name"] or "UNKNOWN",
+                buyer_tax_number=r["buyer_tax_number"] or "",
+
+                seller_name=r["seller_name"] or "UNKNOWN",
+                seller_tax_number=r["seller_tax_number"] or "",
+
+                payment_method=r["payment_method"],
+                payment_status=r["payment_status"],
+
+                total_net=r["net_amount"],
+                total_vat=r["vat_amount"],
+                total_gross=r["gross_amount"],
+                total_not_evidenced=r["non_tax_amount"],
+                line_count=r["line_count"],
+            )
+            for r in rows
+        ]
@@ -182,9 +182,8 @@ class InvoiceUpdateService:
         )
 
     def mark_processed(self, invoice_ids: list[UUID]) -> None:
-        for inv_id in invoice_ids:
-            invoice = self._invoice_repository.get(inv_id)
-            if not invoice or invoice.status == InvoiceStatus.PROCESSED:
+        for invoice in self._invoice_repository.get_many(invoice_ids):
+            if invoice.status == InvoiceStatus.PROCESSED:
                 continue
 
             updated = replace(invoice, status=InvoiceStatus.PROCESSED)
@@ -1,3 +1,5 @@
+from contract_costs.repository.unit_of_work import UnitOfWork, NullUnitOfWork
+from contract_costs.services.invoices.dto.apply import InvoiceRefResult
 from contract_costs.services.invoices.dto.common import  InvoiceIngestBatch
 
 from contract_costs.services.invoices.invoice_line_update_service import InvoiceLineUpdateService
@@ -10,41 +12,48 @@ class InvoiceIngestOrchestrator:
         self,
         invoice_service: InvoiceUpdateService,
         invoice_line_service: InvoiceLineUpdateService,
+        unit_of_work: UnitOfWork | None = None,
     ) -> None:
         self._invoice_service = invoice_service
         self._invoice_line_service = invoice_line_service
+        self._uow = unit_of_work or NullUnitOfWork()
 
-    def ingest_from_pdf(self, batch: InvoiceIngestBatch) -> None:
+    def ingest_from_pdf(self, batch: InvoiceIngestBatch) -> dict[str, InvoiceRefResult]:
         """
         PDF → NEW / IN_PROGRESS
         - brak finalizacji
         - brak DELETE / MODIFY
+
+        Zwraca mapę invoice_ref -> InvoiceRefResult (id zapisanych faktur).
         """
 
-        ref_map = self._invoice_service.apply(batch.invoices)
+        with self._uow.transaction():
+            ref_map = self._invoice_service.apply(batch.invoices)
+
+            self._invoice_line_service.apply(
+                batch.lines,
+                ref_map,
+            )
 
-        self._invoice_line_service.apply(
-            batch.lines,
-            ref_map,
-        )
+        return ref_map
 
     def ingest_from_excel(self, batch: InvoiceIngestBatch) -> None:
         """
         Excel → APPLY / MODIFY / DELETE
         - możliwa finalizacja (PROCESSED)
+        - całość w jednej transakcji (błąd = nic nie zapisane)
         """
 
+        with self._uow.transaction():
+            ref_map = self._invoice_service.apply(batch.invoices)
 
-
-        ref_map = self._invoice_service.apply(batch.invoices)
-
-        finalized_invoice_ids = self._invoice_line_service.apply(
-            batch.lines,
-            ref_map,
-        )
-
-        if finalized_invoice_ids:
-            self._invoice_service.mark_processed(
-                invoice_ids=list(finalized_invoice_ids)
+            finalized_invoice_ids = self._invoice_line_service.apply(
+                batch.lines,
+                ref_map,
             )
 
+            if finalized_invoice_ids:
+                self._invoice_service.mark_processed(
+                    invoice_ids=list(finalized_invoice_ids)
+                )
+
@@ -1,10 +1,17 @@
+import json
 import logging
-from dataclasses import replace
-from datetime import datetime
+from dataclasses import asdict, replace
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
 from pathlib import Path
+from uuid import UUID
 
+from contract_costs.infrastructure.filesystem.file_hash import sha256_file
 from contract_costs.model.company import CompanyType
+from contract_costs.model.invoice_file_hash import InvoiceFileHash
 from contract_costs.repository.company_repository import CompanyRepository
+from contract_costs.repository.invoice_file_hash_repository import InvoiceFileHashRepository
 from contract_costs.services.catalogues.invoice_file_organizer import InvoiceFileOrganizer
 from contract_costs.services.companies.company_evaluate_orchestrator import CompanyEvaluateOrchestrator
 from contract_costs.services.invoices.commands.invoice_command import InvoiceCommand
@@ -12,6 +19,7 @@ from contract_costs.services.invoices.commands.invoice_command import InvoiceCom
 
 from contract_costs.services.invoices.dto.common import InvoiceLineUpdate, ResolvedInvoiceUpdate, \
     InvoiceIngestBatch
+from contract_costs.services.invoices.dto.parse import InvoiceParseResult
 
 from contract_costs.services.invoices.normalization.invoice_parser_normalizer import InvoiceParseNormalizer
 from contract_costs.services.invoices.ochestrator.invoice_ingest_orchestrator import InvoiceIngestOrchestrator
@@ -33,7 +41,8 @@ class ParseInvoiceFromFileService:
         invoice_file_organizer: InvoiceFileOrganizer,
         company_repository: CompanyRepository,
         normalizer: InvoiceParseNormalizer,
-        orchestrator: InvoiceIngestOrchestrator
+        orchestrator: InvoiceIngestOrchestrator,
+        file_hash_repository: InvoiceFileHashRepository | None = None,
 
     ) -> None:
         self._parser = parser
@@ -42,12 +51,18 @@ class ParseInvoiceFromFileService:
         self._company_repository = company_repository
         self._normalizer = normalizer
         self._orchestrator = orchestrator
+        self._file_hashes = file_hash_repository
 
 
     def execute(self, file_path: Path) -> None:
         """
         Główny entry-point importu faktury z pliku.
         """
+        # Duplikat treści (np. ten sam PDF z maila i ze skanera) – bez OCR / AI
+        sha256 = sha256_file(file_path) if self._file_hashes else None
+        if sha256 and self._skip_duplicate(file_path, sha256):
+            return
+
         # Parsowanie dokumentu (DTO!)
 
         logger.info("Parsing invoice file: %s", file_path)
@@ -106,10 +121,20 @@ class ParseInvoiceFromFileService:
                 lines=line_updates,
             )
 
-            self._orchestrator.ingest_from_pdf(
+            ref_map = self._orchestrator.ingest_from_pdf(
                 batch=batch,
             )
 
+            ref = ref_map.get(invoice_ref)
+            self._remember(
+                sha256,
+                file_path,
+                outcome="imported",
+                parse_result=parse_result,
+                invoice_id=ref.invoice_id if ref else None,
+                invoice_number=invoice_ref,
+            )
+
             # --- FILE ORGANIZATION (after successful persistence) ---
             logger.debug(
                 "Ingesting invoice %s with %d lines",
@@ -141,6 +166,12 @@ class ParseInvoiceFromFileService:
                 file_path=file_path,
                 reason="revenue_not_supported",
             )
+            self._remember(
+                sha256,
+                file_path,
+                outcome="revenue_not_supported",
+                parse_result=parse_result,
+            )
             logger.warning(
                 "Revenue invoice detected (seller=OWN). File moved to failed.",
             )
@@ -151,6 +182,85 @@ class ParseInvoiceFromFileService:
             file_path=file_path,
             reason="no_owner",
         )
+        self._remember(
+            sha256,
+            file_path,
+            outcome="no_owner",
+            parse_result=parse_result,
+        )
         logger.warning(
             "Invoice skipped: no OWN company found. File moved to failed."
-        )
\ No newline at end of file
+        )
+
+    # ---------- deduplikacja ----------
+
+    def _skip_duplicate(self, file_path: Path, sha256: str) -> bool:
+        file_hashes = self._file_hashes
+        if file_hashes is None:
+            return False
+
+        known = file_hashes.get(sha256)
+        if known is None:
+            return False
+
+        # odrzucenie (no_owner / revenue_not_supported) może zniknąć po
+        # uzupełnieniu danych firm – pomijamy tylko faktycznie zaimportowane
+        if known.outcome != "imported":
+            logger.info(
+                "Re-processing invoice file %s (same content as %s, previous outcome=%s)",
+                file_path,
+                known.file_name,
+                known.outcome,
+            )
+            return False
+
+        file_hashes.register_hit(sha256)
+        logger.info(
+            "Duplicate invoice file %s (same content as %s, outcome=%s, invoice=%s), skipping",
+            file_path,
+            known.file_name,
+            known.outcome,
+            known.invoice_number,
+        )
+        self._invoice_file_organizer.move_to_failed(
+            file_path=file_path,
+            reason="duplicate",
+        )
+        return True
+
+    def _remember(
+        self,
+        sha256: str | None,
+        file_path: Path,
+        *,
+        outcome: str,
+        parse_result: InvoiceParseResult,
+        invoice_id: UUID | None = None,
+        invoice_number: str | None = None,
+    ) -> None:
+        if not self._file_hashes or not sha256:
+            return
+        self._file_hashes.add(
+            InvoiceFileHash(
+                sha256=sha256,
+                file_name=file_path.name,
+                outcome=outcome,
+                invoice_id=invoice_id,
+                invoice_number=invoice_number,
+                parse_result=json.dumps(
+                    asdict(parse_result),
+                    default=_json_default,
+                    ensure_ascii=False,
+                ),
+            )
+        )
+
+
+def _json_default(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
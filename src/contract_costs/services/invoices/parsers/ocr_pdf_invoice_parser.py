@@ -22,9 +22,13 @@ logger = logging.getLogger(__name__)
 
 class OCRAIAgentInvoiceParser(InvoiceParser):
 
-    def __init__(self):
-        self._text_extractor = PdfTextExtractor()
-        self._ai_client = OpenAIInvoiceClient(AI_SCHEMA, AI_PROMPT)
+    def __init__(
+        self,
+        ai_client: OpenAIInvoiceClient | None = None,
+        text_extractor: PdfTextExtractor | None = None,
+    ):
+        self._text_extractor = text_extractor or PdfTextExtractor()
+        self._ai_client = ai_client or OpenAIInvoiceClient(AI_SCHEMA, AI_PROMPT)
         self._mapper = AIInvoiceMapper()
 
     def parse(self, file_path: Path) -> InvoiceParseResult:
@@ -1,4 +1,292 @@
-from queue import Queue
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
+from typing import Callable, Collection, Iterator
 
-invoice_queue = Queue[Path]()
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+
+class InvoiceJobStatus(str, Enum):
+    ENQUEUED = "enqueued"
+    IN_PROGRESS = "in_progress"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class InvoiceJob:
+    id: int
+    file_path: Path
+    attempts: int
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoice_jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_path   TEXT NOT NULL UNIQUE,
+    status      TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    visible_at  REAL NOT NULL,
+    last_error  TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_invoice_jobs_status_visible
+    ON invoice_jobs (status, visible_at);
+"""
+
+
+class PersistentInvoiceQueue:
+    """
+    Trwała kolejka plików faktur (SQLite, przeżywa restart / crash).
+
+    Cykl życia joba:
+        enqueued -> in_progress -> done
+                               \\-> enqueued (retry z opóźnieniem)
+                               \\-> failed   (po max_attempts)
+
+    - get() przejmuje job na `visibility_timeout` sekund; jeśli worker
+      padnie bez ack()/fail(), job wraca do puli po upływie timeoutu
+    - każde przejęcie zwiększa attempts – plik, który wywraca proces,
+      też w końcu trafi do failed zamiast zapętlać kolejkę
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        max_attempts: int = 3,
+        visibility_timeout: float = 600.0,
+        retry_delay: float = 30.0,
+        poll_interval: float = 0.5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._db_path = db_path
+        self._max_attempts = max_attempts
+        self._visibility_timeout = visibility_timeout
+        self._retry_delay = retry_delay
+        self._poll_interval = poll_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @property
+    def visibility_timeout(self) -> float:
+        return self._visibility_timeout
+
+    # ---------- producer ----------
+
+    def put(
+        self,
+        file_path: Path,
+        *,
+        requeue: bool | Collection[InvoiceJobStatus] = False,
+    ) -> bool:
+        """
+        Dodaje plik do kolejki. Zwraca False, jeśli był już znany.
+
+        requeue=True (nowy plik pod tą samą ścieżką, np. event watchera)
+        wznawia job zakończony (done / failed) od zera; kolekcja statusów
+        zawęża wznawianie do wskazanych (np. tylko done).
+        """
+        now = self._clock()
+        path = str(file_path)
+
+        with self._connect() as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO invoice_jobs
+                    (file_path, status, attempts, visible_at, created_at, updated_at)
+                VALUES (?, ?, 0, ?, ?, ?)
+                ON CONFLICT(file_path) DO NOTHING
+                """,
+                (path, InvoiceJobStatus.ENQUEUED.value, now, now, now),
+            )
+            if cur.rowcount:
+                return True
+
+            if requeue is True:
+                requeue = (InvoiceJobStatus.DONE, InvoiceJobStatus.FAILED)
+            if not requeue:
+                return False
+
+            statuses = [InvoiceJobStatus(s).value for s in requeue]
+            cur = conn.execute(
+                f"""
+                UPDATE invoice_jobs
+                SET status = ?, attempts = 0, visible_at = ?,
+                    last_error = NULL, updated_at = ?
+                WHERE file_path = ? AND status IN ({", ".join("?" * len(statuses))})
+                """,
+                (InvoiceJobStatus.ENQUEUED.value, now, now, path, *statuses),
+            )
+            return cur.rowcount > 0
+
+    # ---------- consumer ----------
+
+    def get(self, timeout: float | None = None) -> InvoiceJob | None:
+        """Przejmuje najstarszy dostępny job; None po upływie timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            job = self._claim()
+            if job is not None:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self._poll_interval)
+
+    def ack(self, job: InvoiceJob) -> None:
+        self._set_status(job, InvoiceJobStatus.DONE)
+
+    def fail(self, job: InvoiceJob, error: str) -> bool:
+        """
+        Zwraca True, jeśli job ostatecznie przeszedł do failed
+        (wyczerpane próby), False gdy wróci do kolejki.
+        """
+        if job.attempts >= self._max_attempts:
+            self._set_status(job, InvoiceJobStatus.FAILED, error=error)
+            logger.error(
+                "Invoice job failed permanently after %d attempts: %s",
+                job.attempts,
+                job.file_path,
+            )
+            return True
+
+        self._set_status(
+            job,
+            InvoiceJobStatus.ENQUEUED,
+            error=error,
+            visible_at=self._clock() + self._retry_delay * job.attempts,
+        )
+        return False
+
+    def release_in_progress(self) -> int:
+        """
+        Przy starcie procesu: joby in_progress należą do martwego
+        workera – udostępniamy je od razu, bez czekania na timeout.
+        """
+        now = self._clock()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE invoice_jobs SET visible_at = ?, updated_at = ? WHERE status = ?",
+                (now, now, InvoiceJobStatus.IN_PROGRESS.value),
+            )
+            return cur.rowcount
+
+    def stats(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM invoice_jobs GROUP BY status"
+            ).fetchall()
+        counts = {s.value: 0 for s in InvoiceJobStatus}
+        counts.update(dict(rows))
+        return counts
+
+    # ---------- helpers ----------
+
+    def _claim(self) -> InvoiceJob | None:
+        now = self._clock()
+
+        # lock: jeden claim naraz w procesie; BEGIN IMMEDIATE – między procesami
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._claim_next(conn, now)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return job
+
+    def _claim_next(self, conn: sqlite3.Connection, now: float) -> InvoiceJob | None:
+        while True:
+            row = conn.execute(
+                """
+                SELECT id, file_path, attempts FROM invoice_jobs
+                WHERE status IN (?, ?) AND visible_at <= ?
+                ORDER BY visible_at, id
+                LIMIT 1
+                """,
+                (
+                    InvoiceJobStatus.ENQUEUED.value,
+                    InvoiceJobStatus.IN_PROGRESS.value,
+                    now,
+                ),
+            ).fetchone()
+            if row is None:
+                return None
+
+            job_id, path, attempts = row
+
+            # przeterminowany in_progress po max próbach = poison
+            if attempts >= self._max_attempts:
+                conn.execute(
+                    """
+                    UPDATE invoice_jobs
+                    SET status = ?, last_error = COALESCE(last_error, ?), updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        InvoiceJobStatus.FAILED.value,
+                        "visibility timeout exceeded",
+                        now,
+                        job_id,
+                    ),
+                )
+                logger.error("Invoice job abandoned too many times: %s", path)
+                continue
+
+            conn.execute(
+                """
+                UPDATE invoice_jobs
+                SET status = ?, attempts = attempts + 1,
+                    visible_at = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    InvoiceJobStatus.IN_PROGRESS.value,
+                    now + self._visibility_timeout,
+                    now,
+                    job_id,
+                ),
+            )
+            return InvoiceJob(id=job_id, file_path=Path(path), attempts=attempts + 1)
+
+    def _set_status(
+        self,
+        job: InvoiceJob,
+        status: InvoiceJobStatus,
+        *,
+        error: str | None = None,
+        visible_at: float | None = None,
+    ) -> None:
+        now = self._clock()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE invoice_jobs
+                SET status = ?, last_error = COALESCE(?, last_error),
+                    visible_at = COALESCE(?, visible_at), updated_at = ?
+                WHERE id = ?
+                """,
+                (status.value, error, visible_at, now, job.id),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # połączenie per operacja – bezpieczne dla wielu wątków workerów
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
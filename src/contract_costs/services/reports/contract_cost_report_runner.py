@@ -32,8 +32,39 @@ DISPLAY_NAMES = {
     "non_tax_amount": "Nieopodatkowane",
     "total": "Razem",
     "earned": "Wynik",
+    "depth": "Poziom",
 }
 
+TREE_COLUMN_ORDER = [
+    "cost_node_code",
+    "cost_node_name",
+    "cost_node_budget",
+    "net_amount",
+    "vat_amount",
+    "gross_amount",
+    "non_tax_amount",
+    "total",
+    "earned",
+    "depth",
+]
+
+ROW_COLUMNS = [
+    "contract_code",
+    "contract_name",
+    "cost_node_id",
+    "cost_node_code",
+    "cost_node_name",
+    "cost_node_budget",
+    "cost_type_code",
+    "cost_type_name",
+    "invoice_number",
+    "net_amount",
+    "vat_amount",
+    "gross_amount",
+    "non_tax_amount",
+    "line_count",
+]
+
 
 class ContractCostReportRunner:
 
@@ -50,17 +81,18 @@ class ContractCostReportRunner:
             invoice_statuses: list[str] | None = None,
     ):
 
-        rows = self._row_service.generate_rows(contract_id)
+        # filtry i sumy liczone po stronie repozytorium (SQL),
+        # tu trafiają już zagregowane wiersze
+        rows = self._row_service.generate_rows(
+            contract_id,
+            group_by_invoice="invoice" in group_by,
+            invoice_numbers=invoice_numbers,
+            invoice_statuses=invoice_statuses,
+        )
 
-        df = pd.DataFrame(rows, )
+        df = pd.DataFrame(rows, columns=ROW_COLUMNS)
         df["total"] =  df["non_tax_amount"] + df["net_amount"]
 
-        if invoice_numbers:
-            df = df[df["invoice_number"].isin(invoice_numbers)]
-
-        if invoice_statuses:
-            df = df[df["invoice_status"].isin(invoice_statuses)]
-
         groups = resolve_grouping(group_by)
 
         result = self._aggregator.aggregate(df, group_by=groups)
@@ -104,3 +136,43 @@ class ContractCostReportRunner:
         )
 
         return result
+
+
+class ContractCostTreeReportRunner:
+    """
+    Raport drzewa: każda pozycja (nie tylko liście) z sumą poddrzewa
+    i budżetem vs wykonanie na każdym poziomie, w kolejności drzewa.
+    Kolumna "Poziom" służy rendererom do wcięć / grupowania wierszy.
+    """
+
+    def __init__(self, row_service):
+        self._row_service = row_service
+
+    def run(
+            self,
+            *,
+            contract_id: UUID,
+            invoice_numbers: list[str] | None = None,
+            invoice_statuses: list[str] | None = None,
+    ):
+        rows = self._row_service.generate_tree_rows(
+            contract_id,
+            invoice_numbers=invoice_numbers,
+            invoice_statuses=invoice_statuses,
+        )
+
+        df = pd.DataFrame(rows, columns=TREE_COLUMN_ORDER)
+        if df.empty:
+            return df.rename(columns=DISPLAY_NAMES)
+
+        numeric_columns = TREE_COLUMN_ORDER[2:-1]
+        df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors="coerce")
+
+        # suma = korzenie (poziom 0) – dzieci są już w sumach rodziców
+        sum_row = df.loc[df["depth"] == 0, numeric_columns].sum().to_frame().T
+        sum_row["depth"] = 0
+        sum_row["cost_node_code"] = "SUMA"
+        sum_row["cost_node_name"] = ""
+
+        result = pd.concat([df, sum_row[TREE_COLUMN_ORDER]], ignore_index=True)
+        return result.rename(columns=DISPLAY_NAMES)
@@ -1,11 +1,26 @@
-from decimal import Decimal
-from typing import Iterable
 from uuid import UUID
 
+import numpy as np
+
+from contract_costs.model.invoice import InvoiceStatus
+from contract_costs.repository.contract_cost_report_repository import ContractCostReportRepository
 from contract_costs.repository.contract_repository import ContractRepository
-from contract_costs.repository.invoice_line_repository import InvoiceLineRepository
 from contract_costs.repository.cost_node_repository import CostNodeRepository
-from contract_costs.repository.cost_type_repository import CostTypeRepository
+from contract_costs.services.reports.cost_tree import CostNodeTree, from_cents, to_cents
+
+# statusy płatności z CLI (--status PAID / NOT_PAID)
+PAYMENT_FILTERS = {
+    "PAID": True,
+    "NOT_PAID": False,
+}
+
+# kolumny kwot sumowane w górę drzewa (generate_tree_rows)
+ROLLUP_AMOUNTS = [
+    "net_amount",
+    "vat_amount",
+    "gross_amount",
+    "non_tax_amount",
+]
 
 
 class ContractCostReportService:
@@ -13,80 +28,132 @@ class ContractCostReportService:
     def __init__(
         self,
         contract_repository: ContractRepository,
-        invoice_line_repository: InvoiceLineRepository,
         cost_node_repository: CostNodeRepository,
-        cost_type_repository: CostTypeRepository,
+        report_repository: ContractCostReportRepository,
     ):
         self._contracts = contract_repository
-        self._invoice_lines = invoice_line_repository
         self._cost_nodes = cost_node_repository
-        self._cost_types = cost_type_repository
+        # agregacja w repozytorium (SQL / in-memory z RepositoryFactory)
+        self._report = report_repository
 
-    def generate_rows(self, contract_id: UUID) -> list[dict]:
+    def generate_rows(
+        self,
+        contract_id: UUID,
+        *,
+        group_by_invoice: bool = False,
+        invoice_numbers: list[str] | None = None,
+        invoice_statuses: list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Wiersze zagregowane per liść cost node + cost type
+        (+ numer faktury przy group_by_invoice).
+        """
         contract = self._contracts.get(contract_id)
         if contract is None:
             raise ValueError("Contract does not exist")
 
-        # --- cost nodes ---
-        cost_nodes = self._cost_nodes.list_by_contract(contract_id)
-        leaf_nodes = self._leaf_nodes(cost_nodes)
-        leaf_by_id = {n.id: n for n in leaf_nodes}
-
-        # --- invoice lines ---
-        lines = [
-            line
-            for line in self._invoice_lines.list_lines()
-            if line.contract_id == contract_id
+        statuses, paid = self._split_statuses(invoice_statuses)
+
+        rows = self._report.aggregate_costs(
+            contract_id,
+            group_by_invoice=group_by_invoice,
+            invoice_numbers=invoice_numbers,
+            invoice_statuses=statuses,
+            paid=paid,
+        )
+
+        return [
+            {
+                # --- contract ---
+                "contract_code": contract.code,
+                "contract_name": contract.name,
+                **row,
+            }
+            for row in rows
         ]
 
-        cost_types = {ct.id: ct for ct in self._cost_types.list()}
-
-        rows: list[dict] = []
-
-        for line in lines:
-            if line.cost_node_id not in leaf_by_id:
-                continue  # tylko leaf
-            if line.cost_node_id is None:
-                continue
-            if line.cost_node_id not in leaf_by_id:
-                continue
-
-            node = leaf_by_id[line.cost_node_id]
-            if line.cost_type_id:
-                cost_type = cost_types.get(line.cost_type_id)
-            else: cost_type = None
-
-            rows.append(
-                {
-                    # --- contract ---
-                    # "contract_id": contract.id,
-                    "contract_code": contract.code,
-                    "contract_name": contract.name,
-
-                    # --- cost node ---
-                    "cost_node_id": node.id,
-                    "cost_node_code": node.code,
-                    "cost_node_name": node.name,
-                    "cost_node_budget": node.budget,
-
-                    # --- cost type ---
-                    "cost_type_code": cost_type.code if cost_type else None,
-                    "cost_type_name": cost_type.name if cost_type else None,
-
-                    # --- amounts ---
-                    # "quantity": line.quantity,
-                    # "unit": line.unit.value,
-                    "net_amount": line.amount.net if line.amount.net else Decimal("0"),
-                    "vat_amount": line.amount.tax,
-                    "gross_amount": line.amount.gross,
-                    "non_tax_amount": line.amount.non_tax_cost,
-
-                }
+    def generate_tree_rows(
+        self,
+        contract_id: UUID,
+        *,
+        invoice_numbers: list[str] | None = None,
+        invoice_statuses: list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Wszystkie pozycje drzewa (preorder, dzieci po kodzie) z kosztami
+        całego poddrzewa i budżetem na każdym poziomie.
+
+        Row keys:
+        contract_code, contract_name, cost_node_id, cost_node_code,
+        cost_node_name, depth, is_leaf, cost_node_budget, net_amount,
+        vat_amount, gross_amount, non_tax_amount, total, earned, line_count
+        """
+        contract = self._contracts.get(contract_id)
+        if contract is None:
+            raise ValueError("Contract does not exist")
+
+        statuses, paid = self._split_statuses(invoice_statuses)
+
+        rows = self._report.aggregate_costs(
+            contract_id,
+            invoice_numbers=invoice_numbers,
+            invoice_statuses=statuses,
+            paid=paid,
+            leaves_only=False,
+        )
+        tree = CostNodeTree(self._cost_nodes.list_by_contract(contract_id))
+
+        # kwoty własne węzłów (grosze) -> sumy poddrzew jednym przebiegiem
+        own = np.zeros((len(tree), len(ROLLUP_AMOUNTS) + 1), dtype=np.int64)
+        booked = [
+            (i, r) for r in rows
+            if (i := tree.index_of(r["cost_node_id"])) is not None
+        ]
+        if booked:
+            np.add.at(
+                own,
+                [i for i, _ in booked],
+                [[to_cents(r[c]) for c in ROLLUP_AMOUNTS] + [r["line_count"]] for _, r in booked],
             )
 
-        return rows
+        totals = tree.rollup(own)
+        budgets = tree.rollup_budget([n.budget for n in tree.nodes])
+
+        result = []
+        for i, node in enumerate(tree.nodes):
+            amounts = {c: from_cents(v) for c, v in zip(ROLLUP_AMOUNTS, totals[i])}
+            total = amounts["net_amount"] + amounts["non_tax_amount"]
+            result.append({
+                "contract_code": contract.code,
+                "contract_name": contract.name,
+                "cost_node_id": node.id,
+                "cost_node_code": node.code,
+                "cost_node_name": node.name,
+                "depth": int(tree.depth[i]),
+                "is_leaf": bool(tree.is_leaf[i]),
+                "cost_node_budget": budgets[i],
+                **amounts,
+                "total": total,
+                "earned": budgets[i] - total,
+                "line_count": int(totals[i][-1]),
+            })
+        return result
 
     @staticmethod
-    def _leaf_nodes(nodes: Iterable) -> list:
-        parents = {n.parent_id for n in nodes if n.parent_id}
-        return [n for n in nodes if n.id not in parents]
+    def _split_statuses(
+        values: list[str] | None,
+    ) -> tuple[list[InvoiceStatus] | None, bool | None]:
+        if not values:
+            return None, None
+
+        statuses = [
+            InvoiceStatus(v.lower())
+            for v in values
+            if v.upper() not in PAYMENT_FILTERS
+        ]
+        payment = {PAYMENT_FILTERS[v.upper()] for v in values if v.upper() in PAYMENT_FILTERS}
+
+        # PAID + NOT_PAID razem = bez filtra płatności
+        paid = payment.pop() if len(payment) == 1 else None
+
+        return statuses or None, paid
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from contract_costs.repository.cost_progress_snapshot_repository import (
+    CostProgressSnapshotRepository,
+)
+
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class BurnRate:
+    date_from: date
+    date_to: date
+    days: int
+    spent: Decimal
+    daily_rate: Decimal
+    planned: Decimal
+    executed: Decimal
+    remaining: Decimal
+    # dzień wyczerpania budżetu przy obecnym tempie (None = brak wydatków)
+    projected_exhaustion: date | None
+
+
+class CostProgressHistoryService:
+    """
+    Historia postępu i burn rate czytane wyłącznie z gotowych
+    snapshotów – bez przeliczania linii faktur.
+    """
+
+    def __init__(self, snapshot_repository: CostProgressSnapshotRepository) -> None:
+        self._snapshots = snapshot_repository
+
+    def history(
+        self,
+        contract_id: UUID,
+        cost_node_id: UUID | None = None,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[dict]:
+        """
+        Row keys:
+        snapshot_date, planned_amount, executed_amount, progress_percent,
+        executed_delta (przyrost od poprzedniego snapshotu)
+        """
+        snapshots = self._snapshots.list_history(
+            contract_id, cost_node_id, date_from=date_from, date_to=date_to
+        )
+
+        rows = []
+        previous = None
+        for s in snapshots:
+            rows.append({
+                "snapshot_date": s.snapshot_date,
+                "planned_amount": s.planned_amount,
+                "executed_amount": s.executed_amount,
+                "progress_percent": s.progress_percent,
+                "executed_delta": (
+                    s.executed_amount - previous.executed_amount
+                    if previous else Decimal("0")
+                ),
+            })
+            previous = s
+        return rows
+
+    def burn_rate(
+        self,
+        contract_id: UUID,
+        cost_node_id: UUID | None = None,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> BurnRate | None:
+        """Średnie dzienne tempo wydatków między pierwszym a ostatnim snapshotem okresu"""
+        snapshots = self._snapshots.list_history(
+            contract_id, cost_node_id, date_from=date_from, date_to=date_to
+        )
+        if len(snapshots) < 2:
+            return None
+
+        first, last = snapshots[0], snapshots[-1]
+        days = (last.snapshot_date - first.snapshot_date).days
+        spent = last.executed_amount - first.executed_amount
+        daily_rate = (spent / days).quantize(CENT) if days else Decimal("0")
+        remaining = last.planned_amount - last.executed_amount
+
+        projected = None
+        if daily_rate > 0:
+            days_left = max(int(remaining / daily_rate), 0)
+            projected = last.snapshot_date + timedelta(days=days_left)
+
+        return BurnRate(
+            date_from=first.snapshot_date,
+            date_to=last.snapshot_date,
+            days=days,
+            spent=spent,
+            daily_rate=daily_rate,
+            planned=last.planned_amount,
+            executed=last.executed_amount,
+            remaining=remaining,
+            projected_exhaustion=projected,
+        )
@@ -0,0 +1,270 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from contract_costs.model.contract import Contract, ContractStatus
+from contract_costs.model.cost_node import CostNode
+from contract_costs.model.cost_progress_snapshot import CostProgressSnapshot
+from contract_costs.repository.contract_cost_report_repository import (
+    ContractCostReportRepository,
+)
+from contract_costs.repository.contract_repository import ContractRepository
+from contract_costs.repository.cost_node_repository import CostNodeRepository
+from contract_costs.repository.cost_progress_snapshot_repository import (
+    CostProgressSnapshotRepository,
+)
+from contract_costs.services.reports.cost_tree import CostNodeTree, from_cents, to_cents
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+CENT = Decimal("0.01")
+# progress_percent to decimal(5,2)
+MAX_PROGRESS = Decimal("999.99")
+
+
+@dataclass(frozen=True)
+class _Base:
+    """Poprzedni snapshot kontraktu jako baza przebiegu przyrostowego"""
+    snapshot_date: date
+    counted_at: datetime
+    counted_lines: int
+    executed: dict[UUID | None, Decimal]
+
+
+@dataclass(frozen=True)
+class SnapshotRunResult:
+    snapshot_date: date
+    contracts: int
+    incremental: int
+    snapshots: int
+
+
+class CostProgressSnapshotService:
+    """
+    Silnik snapshotów postępu kosztów (cost_progress_snapshots).
+
+    Dla każdego aktywnego kontraktu zapisuje na dzień D jeden wiersz
+    kontraktu (cost_node_id = None) + wiersz dla każdego cost node:
+    - planned  = budżet pozycji (brak budżetu -> suma budżetów dzieci)
+    - executed = koszty faktur z datą <= D, pozycja + całe poddrzewo
+    - progress = executed / planned (ułamek, jak w tabeli: 0.25 = 25%)
+
+    Przyrostowo: poprzedni snapshot (< D) + linie, których nie policzył –
+    z datą w (poprzedni, D] albo dodane po jego znaczniku (mark_lines),
+    także z datą wsteczną. Pełne przeliczenie gdy brak poprzedniego
+    snapshotu (albo jego znacznika), zmieniła się lista pozycji, albo
+    po znaczniku zmieniono / usunięto policzone linie, ich faktury lub
+    pozycje kontraktu (changed_since); full=True wymusza je zawsze.
+    Ponowny przebieg dla tego samego dnia zastępuje jego wiersze.
+    """
+
+    def __init__(
+        self,
+        contract_repository: ContractRepository,
+        cost_node_repository: CostNodeRepository,
+        snapshot_repository: CostProgressSnapshotRepository,
+        report_repository: ContractCostReportRepository,
+        *,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self._contracts = contract_repository
+        self._cost_nodes = cost_node_repository
+        self._snapshots = snapshot_repository
+        self._report = report_repository
+        self._today = today
+
+    def run(
+        self,
+        snapshot_date: date | None = None,
+        *,
+        full: bool = False,
+        contract_ids: list[UUID] | None = None,
+    ) -> SnapshotRunResult:
+        day = snapshot_date or self._today()
+
+        contracts = [
+            c for c in (
+                self._contracts.get_many(contract_ids)
+                if contract_ids is not None
+                else self._contracts.list()
+            )
+            if c.status == ContractStatus.ACTIVE
+        ]
+        if not contracts:
+            return SnapshotRunResult(day, 0, 0, 0)
+
+        nodes_by_contract = {
+            c.id: self._cost_nodes.list_by_contract(c.id) for c in contracts
+        }
+        # znacznik przed sprawdzeniem bazy i odczytem – zmiany w trakcie
+        # przebiegu wyłapie następny (changed_since / nowe linie)
+        marked_at, line_counts = self._report.mark_lines([c.id for c in contracts])
+        previous = {} if full else self._previous(contracts, nodes_by_contract, day)
+
+        # jedno zapytanie dla pełnych + jedno na każdą bazę (data, znacznik)
+        windows: dict[tuple[date, datetime] | None, list[UUID]] = defaultdict(list)
+        for c in contracts:
+            base = previous.get(c.id)
+            windows[(base.snapshot_date, base.counted_at) if base else None].append(c.id)
+
+        executed: dict[UUID, dict[UUID | None, Decimal]] = defaultdict(dict)
+        for window, ids in windows.items():
+            after, counted_at = window if window else (None, None)
+            for row in self._report.executed_by_node(
+                ids,
+                until=day,
+                as_of=marked_at,
+                after=after,
+                counted_at=counted_at,
+            ):
+                executed[row["contract_id"]][row["cost_node_id"]] = row["executed_amount"]
+
+        snapshots: list[CostProgressSnapshot] = []
+        for c in contracts:
+            base = previous.get(c.id)
+            snapshots.extend(
+                self._contract_snapshots(
+                    c,
+                    nodes_by_contract[c.id],
+                    executed.get(c.id, {}),
+                    base.executed if base else {},
+                    day,
+                    (marked_at, line_counts.get(c.id, 0)),
+                )
+            )
+
+        self._snapshots.add_many(snapshots)
+
+        result = SnapshotRunResult(
+            snapshot_date=day,
+            contracts=len(contracts),
+            incremental=len(previous),
+            snapshots=len(snapshots),
+        )
+        logger.info(
+            "Cost progress snapshot %s: %d contracts (%d incremental), %d rows",
+            day, result.contracts, result.incremental, result.snapshots,
+        )
+        return result
+
+    # ---------- internals ----------
+
+    def _previous(
+        self,
+        contracts: list[Contract],
+        nodes_by_contract: dict[UUID, list[CostNode]],
+        day: date,
+    ) -> dict[UUID, _Base]:
+        """
+        contract_id -> baza poprzedniego snapshotu – tylko kontrakty, dla
+        których ma znacznik, obejmuje dokładnie obecne drzewo i nic
+        policzonego od tamtej pory się nie zmieniło.
+        """
+        rows: dict[UUID, list[CostProgressSnapshot]] = defaultdict(list)
+        for s in self._snapshots.list_latest_before([c.id for c in contracts], day):
+            rows[s.contract_id].append(s)
+
+        previous: dict[UUID, _Base] = {}
+        for contract_id, snapshots in rows.items():
+            base = {s.cost_node_id: s.executed_amount for s in snapshots}
+            required = {None, *(n.id for n in nodes_by_contract[contract_id])}
+            mark = next((s for s in snapshots if s.cost_node_id is None), None)
+            if (
+                required == base.keys()
+                and mark is not None
+                and mark.counted_at is not None
+                and mark.counted_lines is not None
+            ):
+                previous[contract_id] = _Base(
+                    mark.snapshot_date, mark.counted_at, mark.counted_lines, base
+                )
+        if not previous:
+            return {}
+
+        changed = self._report.changed_since(
+            {c: (b.counted_at, b.counted_lines) for c, b in previous.items()}
+        )
+        if changed:
+            logger.info("%d contract(s) changed since their last snapshot – full recompute", len(changed))
+
+        return {c: b for c, b in previous.items() if c not in changed}
+
+    def _contract_snapshots(
+        self,
+        contract: Contract,
+        nodes: list[CostNode],
+        executed: dict[UUID | None, Decimal],
+        base: dict[UUID | None, Decimal],
+        day: date,
+        mark: tuple[datetime, int],
+    ) -> list[CostProgressSnapshot]:
+        tree = CostNodeTree(nodes)
+
+        own = np.zeros(len(tree), dtype=np.int64)
+        for node_id, amount in executed.items():
+            i = tree.index_of(node_id) if node_id is not None else None
+            if i is not None:
+                own[i] = to_cents(amount)
+
+        spent = tree.rollup(own)
+        planned = tree.rollup_budget([n.budget for n in tree.nodes])
+
+        contract_planned = (
+            contract.budget
+            if contract.budget is not None
+            else sum((p for p, d in zip(planned, tree.depth) if d == 0), ZERO)
+        )
+        # wiersz kontraktu liczy też linie bez przypisanej pozycji
+        contract_spent = sum(executed.values(), ZERO)
+
+        rows: list[tuple[UUID | None, Decimal, Decimal]] = [
+            (None, contract_planned, contract_spent)
+        ]
+        rows.extend(
+            (node.id, planned[i], from_cents(spent[i]))
+            for i, node in enumerate(tree.nodes)
+        )
+
+        snapshots = [
+            self._snapshot(
+                contract.id,
+                node_id,
+                day,
+                plan,
+                base.get(node_id, ZERO) + amount,
+            )
+            for node_id, plan, amount in rows
+        ]
+        # znacznik na wierszu kontraktu – baza kolejnego przebiegu
+        snapshots[0].counted_at, snapshots[0].counted_lines = mark
+        return snapshots
+
+    @staticmethod
+    def _snapshot(
+        contract_id: UUID,
+        cost_node_id: UUID | None,
+        day: date,
+        planned: Decimal,
+        executed: Decimal,
+    ) -> CostProgressSnapshot:
+        progress = (
+            min((executed / planned).quantize(CENT), MAX_PROGRESS)
+            if planned > 0
+            else ZERO
+        )
+        return CostProgressSnapshot(
+            id=uuid4(),
+            contract_id=contract_id,
+            cost_node_id=cost_node_id,
+            snapshot_date=day,
+            planned_amount=planned.quantize(CENT),
+            executed_amount=executed.quantize(CENT),
+            progress_percent=progress,
+        )
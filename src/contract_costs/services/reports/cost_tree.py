@@ -0,0 +1,121 @@
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+
+from contract_costs.model.cost_node import CostNode
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value: Decimal | None) -> int:
+    return int((value or Decimal("0")).quantize(CENT) * 100)
+
+
+def from_cents(value: int) -> Decimal:
+    return (Decimal(int(value)) / 100).quantize(CENT)
+
+
+class CostNodeTree:
+    """
+    Drzewo pozycji kontraktu zbudowane raz z list_by_contract.
+
+    - rodzic -> dzieci jako zakresy w jednej tablicy (offsety, bez list per węzeł)
+    - węzły w kolejności preorder (dzieci po kodzie): poddrzewo węzła i
+      to ciągły zakres [i, end[i]) – suma poddrzewa = różnica sum prefiksowych
+    - pozycje z nieznanym rodzicem traktujemy jak korzenie
+    """
+
+    def __init__(self, nodes: Sequence[CostNode]) -> None:
+        ordered = sorted(nodes, key=lambda n: n.code)
+        position = {n.id: i for i, n in enumerate(ordered)}
+        count = len(ordered)
+
+        # -1 = korzeń; kubełek 0 w offsetach to dzieci "wirtualnego korzenia"
+        parent_of = [
+            position.get(n.parent_id, -1) if n.parent_id is not None else -1
+            for n in ordered
+        ]
+        offsets = [0] * (count + 2)
+        for p in parent_of:
+            offsets[p + 2] += 1
+        for i in range(1, count + 2):
+            offsets[i] += offsets[i - 1]
+
+        # dzieci węzła p: child_ids[offsets[p + 1]:offsets[p + 2]]
+        child_ids = [0] * count
+        cursor = offsets[:]
+        for i, p in enumerate(parent_of):
+            child_ids[cursor[p + 1]] = i
+            cursor[p + 1] += 1
+
+        # iteracyjny preorder – bez rekurencji (głębokie drzewa)
+        order: list[int] = []
+        depth_of = [0] * count
+        stack = child_ids[offsets[0]:offsets[1]][::-1]
+        while stack:
+            i = stack.pop()
+            order.append(i)
+            children = child_ids[offsets[i + 1]:offsets[i + 2]]
+            for c in children:
+                depth_of[c] = depth_of[i] + 1
+            stack.extend(reversed(children))
+
+        index = {old: new for new, old in enumerate(order)}
+
+        parent = [index.get(parent_of[i], -1) for i in order]
+
+        # rozmiar poddrzewa: jedno przejście od liści do korzeni
+        size = [1] * len(order)
+        for i in range(len(order) - 1, -1, -1):
+            if parent[i] >= 0:
+                size[parent[i]] += size[i]
+
+        self.nodes: list[CostNode] = [ordered[i] for i in order]
+        self.depth = np.array([depth_of[i] for i in order], dtype=np.int64)
+        self.parent = np.array(parent, dtype=np.int64)
+        self.end = np.arange(len(order), dtype=np.int64) + np.array(size, dtype=np.int64)
+        self.is_leaf = self.end == np.arange(len(order)) + 1
+        self._index: dict[UUID, int] = {n.id: i for i, n in enumerate(self.nodes)}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def index_of(self, node_id: UUID) -> int | None:
+        return self._index.get(node_id)
+
+    def subtree(self, node_id: UUID) -> list[CostNode]:
+        """Węzeł + wszyscy potomkowie (preorder)"""
+        i = self._index.get(node_id)
+        if i is None:
+            return []
+        return self.nodes[i:self.end[i]]
+
+    def rollup(self, values: np.ndarray) -> np.ndarray:
+        """
+        values: macierz (węzły w kolejności self.nodes) x (kolumny kwot),
+        kwoty własne węzła. Zwraca sumy całych poddrzew, wszystkie kolumny naraz.
+        """
+        values = np.asarray(values)
+        if values.ndim == 1:
+            return self.rollup(values[:, None])[:, 0]
+
+        prefix = np.zeros((len(values) + 1, values.shape[1]), dtype=values.dtype)
+        np.cumsum(values, axis=0, out=prefix[1:])
+        return prefix[self.end] - prefix[np.arange(len(values))]
+
+    def rollup_budget(self, budgets: Sequence[Decimal | None]) -> list[Decimal]:
+        """Budżet pozycji; brak budżetu -> suma (efektywnych) budżetów dzieci"""
+        parent = self.parent.tolist()
+        effective = [Decimal("0")] * len(budgets)
+        from_children = [Decimal("0")] * len(budgets)
+
+        # odwrócony preorder = dzieci zawsze przed rodzicem
+        for i in range(len(budgets) - 1, -1, -1):
+            budget = budgets[i]
+            effective[i] = budget if budget is not None else from_children[i]
+            if parent[i] >= 0:
+                from_children[parent[i]] += effective[i]
+
+        return effective
@@ -4,3 +4,25 @@ def render_stdout(df):
         return
 
     print(df.to_string(index=False))
+
+
+
+def render_tree_stdout(df, *, level_column: str = "Poziom"):
+    """Raport drzewa: kod pozycji wcięty wg poziomu"""
+    if df.empty:
+        print("No data.")
+        return
+
+    df = df.copy()
+    first = df.columns[0]
+    df[first] = [
+        "  " * int(level) + str(value)
+        for value, level in zip(df[first], df[level_column])
+    ]
+    df = df.drop(columns=[level_column])
+
+    # to_string wyrównuje tekst do prawej – wcięcia byłyby niewidoczne
+    for col in df.select_dtypes(include="object").columns:
+        values = df[col].fillna("").astype(str)
+        df[col] = values.str.ljust(max(int(values.str.len().max()), len(str(col))))
+    print(df.to_string(index=False, justify="left"))
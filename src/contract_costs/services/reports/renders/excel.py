@@ -1,7 +1,7 @@
 from pathlib import Path
 import pandas as pd
 from openpyxl.formatting.rule import CellIsRule
-from openpyxl.styles import PatternFill, Font
+from openpyxl.styles import Alignment, PatternFill, Font
 
 
 class ExcelReportRenderer:
@@ -22,7 +22,12 @@ class ExcelReportRenderer:
         *,
         output_path: Path,
         sheet_name: str = "report",
+        level_column: str | None = None,
     ) -> None:
+        """
+        level_column: kolumna z poziomem drzewa – wcięcie pierwszej kolumny
+        i grupowanie wierszy (zwijanie poddrzew w Excelu).
+        """
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
@@ -77,6 +82,20 @@ class ExcelReportRenderer:
                     for cell in row:
                         cell.font = bold_font
 
+            if level_column in col_letters:
+                ExcelReportRenderer._outline_rows(ws, df[level_column])
+
+    @staticmethod
+    def _outline_rows(ws, levels) -> None:
+        ws.sheet_properties.outlinePr.summaryBelow = False
+
+        for row_idx, level in enumerate(levels, start=2):
+            level = int(level)
+            ws.cell(row=row_idx, column=1).alignment = Alignment(indent=level)
+            if level:
+                # Excel obsługuje maks. 7 poziomów grupowania
+                ws.row_dimensions[row_idx].outline_level = min(level, 7)
+
     @staticmethod
     def _excel_col_letter(n: int) -> str:
         """1 -> A, 2 -> B, ..., 27 -> AA"""
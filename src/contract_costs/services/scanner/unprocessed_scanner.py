@@ -1,4 +1,26 @@
+import logging
 from pathlib import Path
 
+from contract_costs.services.queue.invoice_queue import InvoiceJobStatus, PersistentInvoiceQueue
+
+logger = logging.getLogger(__name__)
+
+
 def scan_unprocessed(folder: Path) -> list[Path]:
-    return list(folder.glob("*.pdf"))
\ No newline at end of file
+    return list(folder.glob("*.pdf"))
+
+
+def enqueue_unprocessed(folder: Path, queue: PersistentInvoiceQueue) -> int:
+    """
+    Dokłada do kolejki pliki, które pojawiły się gdy watcher nie działał.
+
+    Przetworzony plik wyjeżdża z folderu, więc PDF pod ścieżką joba done
+    to nowy plik o powtórzonej nazwie (np. scan_001.pdf) – job wraca do
+    kolejki. Pomijane są joby w toku i failed (plik nieprzeniesiony).
+    """
+    added = sum(
+        queue.put(file, requeue=(InvoiceJobStatus.DONE,))
+        for file in scan_unprocessed(folder)
+    )
+    logger.info("Startup scan: %d new invoice file(s) enqueued", added)
+    return added
@@ -3,14 +3,15 @@ import time
 from pathlib import Path
 
 from contract_costs.infrastructure.filesystem.file_watcher import FileWatcher
-from contract_costs.services.queue.invoice_queue import invoice_queue
+from contract_costs.services.queue.invoice_queue import PersistentInvoiceQueue
 
 logger = logging.getLogger(__name__)
 
 
 class InvoiceWatcherService:
-    def __init__(self, watch_dir: Path) -> None:
+    def __init__(self, watch_dir: Path, queue: PersistentInvoiceQueue) -> None:
         self._watch_dir = watch_dir
+        self._queue = queue
         self.watcher: FileWatcher | None = None
 
     def run(self) -> None:
@@ -30,7 +31,8 @@ class InvoiceWatcherService:
             return
 
         logger.info("Enqueuing new invoice file: %s", file_path)
-        invoice_queue.put(file_path)
+        # nowy plik pod starą ścieżką = nowy job, nawet jeśli poprzedni był failed
+        self._queue.put(file_path, requeue=True)
 
     @staticmethod
     def _wait_until_file_ready(
@@ -1,73 +1,133 @@
-import time
 import logging
+import threading
 from pathlib import Path
-from queue import Empty
-from multiprocessing import Process
+from typing import Callable
 
-from contract_costs.services.queue.invoice_queue import invoice_queue
-from contract_costs.services.invoices.parse_invoice_from_file import (
-    ParseInvoiceFromFileService,
-)
+from contract_costs.services.queue.invoice_queue import PersistentInvoiceQueue
 
 logger = logging.getLogger(__name__)
 
-def process_invoice_in_subprocess(file_path: Path):
-    """
-    URUCHAMIANA W OSOBNYM PROCESIE.
-    NIE WOLNO tu nic importować globalnie, co tworzy locki.
-    """
-    from contract_costs.cli.context import get_services
-
 
-    logger.info("Subprocess started for %s", file_path)
+class InvoiceAIWorker:
+    """
+    Pula workerów AI zasilana z trwałej kolejki faktur.
 
-    services = get_services()
-    parser = services.parse_invoice_from_file
+    Tempo wyznacza wspólny limiter RPM/TPM w OpenAIInvoiceClient
+    (+ backoff po 429), a nie stały sleep po każdej fakturze.
 
-    parser.execute(file_path)
+    Błąd -> job wraca do kolejki (retry); po wyczerpaniu prób
+    wywoływane jest on_failed (np. przeniesienie PDF do failed).
 
+    Każdy job ma limit `job_timeout` (krótszy niż visibility_timeout
+    kolejki – inaczej ten sam plik dostałby drugi worker). process()
+    działa w osobnym wątku; po przekroczeniu limitu job jest oznaczany
+    jako błąd, a slot przechodzi do kolejnego pliku. Wątku nie da się
+    zabić – jego późniejszy wynik jest ignorowany.
+    """
 
-class InvoiceAIWorker:
-    def __init__(self, rpm: int = 3, timeout: int = 180) -> None:
-        self._sleep = 65 / rpm
-        self._timeout = timeout
-        self._running = True
+    def __init__(
+        self,
+        process: Callable[[Path], None],
+        queue: PersistentInvoiceQueue,
+        workers: int = 4,
+        on_failed: Callable[[Path], None] | None = None,
+        job_timeout: float = 180.0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if not 0 < job_timeout < queue.visibility_timeout:
+            raise ValueError("job_timeout must be > 0 and shorter than the queue visibility timeout")
+
+        self._process = process
+        self._queue = queue
+        self._workers = workers
+        self._on_failed = on_failed
+        self._job_timeout = job_timeout
+        self._running = threading.Event()
+        self._processed = 0
+        self._failed = 0
+        self._lock = threading.Lock()
 
     def run(self) -> None:
-        logger.info("AI worker started")
+        """Blokuje do stop() – uruchamiać w osobnym wątku."""
+        logger.info("AI worker pool started (%d workers)", self._workers)
+        self._running.set()
+
+        threads = [
+            threading.Thread(
+                target=self._work_loop,
+                name=f"invoice-ai-worker-{i}",
+                daemon=True,
+            )
+            for i in range(self._workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        logger.info(
+            "AI worker pool stopped (processed=%d, failed=%d)",
+            self._processed,
+            self._failed,
+        )
 
-        while self._running:
-            try:
-                file_path: Path = invoice_queue.get(timeout=1)
-            except Empty:
+    def stop(self) -> None:
+        logger.info("Stopping AI worker")
+        self._running.clear()
+
+    def _work_loop(self) -> None:
+        while self._running.is_set():
+            job = self._queue.get(timeout=1)
+            if job is None:
                 continue
 
             try:
-                logger.info("Processing invoice via AI (process): %s", file_path)
-
-                p = Process(
-                    target=process_invoice_in_subprocess,
-                    args=(file_path,),
+                logger.info(
+                    "Processing invoice via AI (attempt %d): %s",
+                    job.attempts,
+                    job.file_path,
                 )
-                p.start()
-                p.join(timeout=self._timeout)
-
-                if p.is_alive():
-                    logger.error(
-                        "Invoice processing timed out, killing process: %s",
-                        file_path,
-                    )
-                    p.terminate()
-                    p.join()
-
-            except Exception:
-                logger.exception("AI processing failed: %s", file_path)
-
-            finally:
-                invoice_queue.task_done()
-                if self._running:
-                    time.sleep(self._sleep)
-
-    def stop(self) -> None:
-        logger.info("Stopping AI worker")
-        self._running = False
+                self._process_with_timeout(job.file_path)
+            except Exception as e:
+                logger.exception("AI processing failed: %s", job.file_path)
+                with self._lock:
+                    self._failed += 1
+                if self._queue.fail(job, f"{type(e).__name__}: {e}"):
+                    self._handle_failed(job.file_path)
+            else:
+                self._queue.ack(job)
+                with self._lock:
+                    self._processed += 1
+
+    def _process_with_timeout(self, file_path: Path) -> None:
+        errors: list[Exception] = []
+
+        def target() -> None:
+            try:
+                self._process(file_path)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(
+            target=target,
+            name=f"{threading.current_thread().name}-job",
+            daemon=True,
+        )
+        thread.start()
+        thread.join(self._job_timeout)
+
+        if thread.is_alive():
+            raise TimeoutError(
+                f"invoice processing exceeded {self._job_timeout:g}s: {file_path}"
+            )
+        if errors:
+            raise errors[0]
+
+    def _handle_failed(self, file_path: Path) -> None:
+        if self._on_failed is None or not file_path.exists():
+            return
+        try:
+            self._on_failed(file_path)
+        except Exception:
+            logger.exception("Failed to move poison invoice file: %s", file_path)
@@ -0,0 +1,60 @@
+from benchmarks.data_generator import changed_structure, excel_batch, generate
+from benchmarks.suite import SCENARIOS, compare, environment_mismatch, run_suite
+from contract_costs.repository.factory.repository_factory import RepoBackend
+
+
+def test_generator_is_deterministic_for_seed():
+    first, second = generate("tiny", seed=7), generate("tiny", seed=7)
+
+    assert [c.tax_number for c in first.companies] == [c.tax_number for c in second.companies]
+    assert first.invoice_lines == second.invoice_lines
+    assert excel_batch(first) == excel_batch(second)
+    assert generate("tiny", seed=8).owner.id != first.owner.id
+
+
+def test_changed_structure_renames_moves_adds_and_removes_cost_free_leaves():
+    dataset = generate("tiny")
+    contract = dataset.contracts[0]
+    existing = {n.code: n for n in dataset.cost_nodes[contract.id]}
+    by_id = {n.id: n for n in existing.values()}
+    costed = {line.cost_node_id for line in dataset.invoice_lines}
+    excel_codes = {line.cost_node_id for line in excel_batch(dataset).lines}
+
+    parents, stack = {}, [(None, node) for node in changed_structure(dataset, contract, 8)]
+    while stack:
+        parent_code, node = stack.pop()
+        parents[node["code"]] = parent_code
+        stack.extend((node["code"], child) for child in node["children"])
+
+    removed = existing.keys() - parents.keys()
+    moved = {
+        code for code, node in existing.items()
+        if code in parents and node.parent_id and parents[code] != by_id[node.parent_id].code
+    }
+
+    assert len(removed) == 2
+    assert all(existing[code].id not in costed and code not in excel_codes for code in removed)
+    assert moved
+    assert len(parents) == len(existing) - 2 + 2
+
+
+def test_suite_runs_every_scenario_on_memory_backend():
+    result = run_suite(RepoBackend.MEMORY, "tiny", repeat=1)
+
+    assert list(result["results"]) == ["load_dataset", *(s.name for s in SCENARIOS)]
+    assert all(r["items"] > 0 for r in result["results"].values())
+
+
+def test_compare_reports_only_slower_scenarios_above_noise_floor():
+    baseline = {"results": {"a": {"best_s": 1.0}, "b": {"best_s": 1.0}, "c": {"best_s": 0.001}}}
+    current = {"results": {"a": {"best_s": 1.1}, "b": {"best_s": 1.5}, "c": {"best_s": 0.005}}}
+
+    assert compare(current, baseline, threshold=1.25) == ["b"]
+
+
+def test_environment_mismatch_rejects_other_python_or_platform():
+    current = {"python": "3.13.1", "platform": "Linux-x86_64"}
+
+    assert environment_mismatch(current, {"python": "3.13.0", "platform": "Linux-x86_64"}) == []
+    assert len(environment_mismatch(current, {"python": "3.11.7", "platform": "Linux-x86_64"})) == 1
+    assert len(environment_mismatch(current, {"python": "3.11.7", "platform": "macOS-arm64"})) == 2
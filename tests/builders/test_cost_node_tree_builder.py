@@ -51,3 +51,35 @@ class TestCostNodeTreeBuilder:
 
 
 
+
+
+def _chain(depth: int) -> dict:
+    root = {"code": "ROOT", "name": "Root", "budget": Decimal("1"), "children": []}
+    current = root
+    for i in range(depth):
+        child = {"code": f"N{i}", "name": f"N{i}", "budget": Decimal("1"), "children": []}
+        current["children"].append(child)
+        current = child
+    return root
+
+
+def test_builder_handles_trees_deeper_than_recursion_limit() -> None:
+    nodes = DefaultCostNodeTreeBuilder().build(uuid.uuid4(), [_chain(5000)])
+
+    assert len(nodes) == 5001
+    assert all(child.parent_id == parent.id for parent, child in zip(nodes, nodes[1:]))
+
+
+def test_builder_keeps_preorder_and_sums_budgets_for_technical_root() -> None:
+    tree = [
+        {"code": "A", "name": "A", "budget": None, "children": [
+            {"code": "A1", "name": "A1", "budget": Decimal("5"), "children": []},
+            {"code": "A2", "name": "A2", "budget": Decimal("7"), "children": []},
+        ]},
+        {"code": "B", "name": "B", "budget": Decimal("3"), "children": []},
+    ]
+
+    nodes = DefaultCostNodeTreeBuilder().build(uuid.uuid4(), tree)
+
+    assert [n.code for n in nodes] == ["ROOT", "A", "A1", "A2", "B"]
+    assert nodes[0].budget == Decimal("15")
@@ -0,0 +1,56 @@
+import pytest
+
+from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache, cache_key
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def _make(max_bytes: int = 1024) -> DiskLRUCache:
+        return DiskLRUCache(tmp_path / "cache.sqlite3", max_bytes=max_bytes)
+
+    return _make
+
+
+def test_get_set_and_counters(make_cache):
+    cache = make_cache()
+
+    assert cache.get("k") is None
+    cache.set("k", "value")
+
+    assert cache.get("k") == "value"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_values_survive_reopen(make_cache):
+    make_cache().set("k", "value")
+
+    assert make_cache().get("k") == "value"
+
+
+def test_least_recently_used_is_evicted(make_cache):
+    cache = make_cache(max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.get("a")  # a świeższe niż b
+
+    cache.set("c", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+    assert cache.stats().size_bytes <= 10
+    assert cache.stats().evictions == 1
+
+
+def test_value_larger_than_limit_is_not_stored(make_cache):
+    cache = make_cache(max_bytes=3)
+
+    cache.set("k", "too long")
+
+    assert cache.get("k") is None
+
+
+def test_cache_key_separates_parts():
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+    assert cache_key("a", "b") == cache_key("a", "b")
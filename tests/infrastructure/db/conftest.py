@@ -0,0 +1,45 @@
+import pytest
+
+from contract_costs.infrastructure.db.connection_pool import MySQLConnectionPool
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.commits = 0
+        self.healthy = True
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def ping(self, reconnect: bool = False) -> None:
+        if not self.healthy:
+            raise ConnectionError("gone")
+
+    def commit(self) -> None:
+        self.commits += 1
+        self.in_transaction = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def created():
+    return []
+
+
+@pytest.fixture
+def pool_factory(created):
+    def factory(**kwargs) -> MySQLConnectionPool:
+        def connect():
+            conn = FakeConnection()
+            created.append(conn)
+            return conn
+
+        return MySQLConnectionPool(connect, **kwargs)
+
+    return factory
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from contract_costs.infrastructure.db.connection_pool import (
+    PoolClosedError,
+    PoolTimeoutError,
+)
+
+
+def test_connection_is_reused(pool_factory, created):
+    pool = pool_factory(size=2)
+
+    with pool.acquire():
+        pass
+    with pool.acquire():
+        pass
+
+    stats = pool.stats()
+    assert len(created) == 1
+    assert stats.checkouts == 2
+    assert stats.hits == 1
+    assert stats.created == 1
+    assert stats.idle == 1
+
+
+def test_close_returns_connection_instead_of_closing(pool_factory, created):
+    pool = pool_factory(size=1)
+
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # idempotentne
+
+    assert created[0].closed is False
+    assert pool.stats().in_use == 0
+
+
+def test_open_transaction_is_rolled_back_on_release(pool_factory, created):
+    pool = pool_factory(size=1)
+
+    with pool.acquire():
+        created[0].in_transaction = True
+
+    assert created[0].rollbacks == 1
+
+
+def test_stale_connection_is_replaced(pool_factory, created):
+    pool = pool_factory(size=1, ping_interval=0)
+
+    with pool.acquire():
+        pass
+    created[0].healthy = False
+
+    with pool.acquire():
+        pass
+
+    assert len(created) == 2
+    assert created[0].closed is True
+    assert pool.stats().health_failures == 1
+
+
+def test_acquire_times_out_when_pool_exhausted(pool_factory):
+    pool = pool_factory(size=1, timeout=0.05)
+
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    held.close()
+    assert pool.stats().waits == 1
+
+
+def test_waiting_thread_gets_released_connection(pool_factory, created):
+    pool = pool_factory(size=1, timeout=5)
+    held = pool.acquire()
+    result = []
+
+    def worker():
+        with pool.acquire() as conn:
+            result.append(conn._raw)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    held.close()
+    t.join(timeout=5)
+
+    assert result == [created[0]]
+    assert len(created) == 1
+
+
+def test_close_pool_closes_idle_and_rejects_checkout(pool_factory, created):
+    pool = pool_factory(size=2)
+    with pool.acquire():
+        pass
+
+    pool.close()
+
+    assert created[0].closed is True
+    with pytest.raises(PoolClosedError):
+        pool.acquire()
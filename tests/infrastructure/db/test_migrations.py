@@ -0,0 +1,200 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from contract_costs.infrastructure.db.migrations.migration import Migration
+from contract_costs.infrastructure.db.migrations.runner import (
+    MIGRATIONS,
+    MigrationError,
+    MigrationRunner,
+)
+
+
+class FakeDatabase:
+    """Minimalny stan: tabela schema_migrations + log wykonanych SQL."""
+
+    def __init__(self) -> None:
+        self.versions: dict[int, str] = {}
+        self.statements: list[str] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+
+class FakeCursor:
+    def __init__(self, db: FakeDatabase) -> None:
+        self._db = db
+        self._result: list[tuple] = []
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        sql = " ".join(sql.split())
+        self._db.statements.append(sql)
+        if sql.startswith("SELECT GET_LOCK") or sql.startswith("SELECT RELEASE_LOCK"):
+            self._result = [(1,)]
+        elif sql.startswith("SELECT version FROM schema_migrations"):
+            self._result = [(v,) for v in self._db.versions]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self._db.versions[params[0]] = params[1]
+        else:
+            # pusta baza: brak tabel / kolumn / indeksów / wierszy
+            self._result = []
+
+    def executemany(self, sql: str, values) -> None:
+        self._db.statements.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db: FakeDatabase) -> None:
+        self._db = db
+
+    def cursor(self, dictionary: bool = False) -> FakeCursor:
+        return FakeCursor(self._db)
+
+    def commit(self) -> None:
+        self._db.commits += 1
+
+    def rollback(self) -> None:
+        self._db.rollbacks += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+def make_runner(db: FakeDatabase, migrations: list[Migration]) -> MigrationRunner:
+    return MigrationRunner(lambda: FakeConnection(db), migrations)
+
+
+def recording(calls: list[int], version: int) -> Migration:
+    return Migration(version, f"m{version}", lambda conn: calls.append(version))
+
+
+def test_applies_pending_migrations_in_order(db):
+    calls: list[int] = []
+    runner = make_runner(db, [recording(calls, 1), recording(calls, 2)])
+
+    done = runner.migrate()
+
+    assert [m.version for m in done] == [1, 2]
+    assert calls == [1, 2]
+    assert db.versions == {1: "m1", 2: "m2"}
+
+
+def test_already_applied_migrations_are_skipped(db):
+    calls: list[int] = []
+    db.versions[1] = "m1"
+    runner = make_runner(db, [recording(calls, 1), recording(calls, 2)])
+
+    assert [m.version for m in runner.pending()] == [2]
+    runner.migrate()
+
+    assert calls == [2]
+    assert runner.migrate() == []
+
+
+def test_migrate_stops_at_target(db):
+    calls: list[int] = []
+    runner = make_runner(db, [recording(calls, 1), recording(calls, 2)])
+
+    runner.migrate(target=1)
+
+    assert calls == [1]
+    assert set(db.versions) == {1}
+
+
+def test_failed_migration_is_not_recorded_and_stops_run(db):
+    calls: list[int] = []
+
+    def boom(conn):
+        raise RuntimeError("syntax error")
+
+    runner = make_runner(
+        db, [recording(calls, 1), Migration(2, "broken", boom), recording(calls, 3)]
+    )
+
+    with pytest.raises(MigrationError, match="0002_broken"):
+        runner.migrate()
+
+    assert set(db.versions) == {1}
+    assert calls == [1]
+    assert db.rollbacks == 1
+    assert db.statements[-1].startswith("SELECT RELEASE_LOCK")
+
+
+def test_versions_must_be_ascending(db):
+    with pytest.raises(MigrationError):
+        make_runner(db, [recording([], 2), recording([], 1)])
+
+
+def test_bundled_migrations_are_ordered():
+    versions = [m.version for m in MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+
+def test_bundled_migrations_run_on_the_runner_connection(db, monkeypatch):
+    import contract_costs.infrastructure.db.mysql_connection as mysql_connection
+    import contract_costs.repository.mysql.company_repository as company_repository
+    import contract_costs.repository.mysql.cost_node_repository as cost_node_repository
+
+    def second_connection():
+        raise AssertionError("migration checked out a second pooled connection")
+
+    for module in (mysql_connection, company_repository, cost_node_repository):
+        monkeypatch.setattr(module, "get_connection", second_connection)
+
+    done = make_runner(db, MIGRATIONS).migrate()
+
+    assert [m.version for m in done] == [m.version for m in MIGRATIONS]
+    # backfille zatwierdza runner razem z wpisem wersji
+    assert db.commits == len(MIGRATIONS)
+
+
+SCHEMA_SQL = Path(__file__).parents[3] / "schema.sql"
+
+# tabele bazy sprzed wersjonowanych migracji – każda nowsza tabela ze
+# schema.sql musi mieć migrację, inaczej `db migrate` jej nie utworzy
+PRE_MIGRATION_TABLES = {
+    "companies",
+    "contracts",
+    "cost_nodes",
+    "cost_progress_snapshots",
+    "cost_types",
+    "invoice_lines",
+    "invoices",
+}
+
+CREATE_TABLE = re.compile(r"CREATE TABLE (?:IF NOT EXISTS )?`(\w+)`")
+
+
+def test_bundled_migrations_create_every_schema_table(db):
+    # dump z mysqldump (UTF-16)
+    schema_tables = set(CREATE_TABLE.findall(SCHEMA_SQL.read_text(encoding="utf-16")))
+
+    make_runner(db, MIGRATIONS).migrate()
+    created = {
+        table
+        for sql in db.statements
+        for table in CREATE_TABLE.findall(sql)
+    }
+
+    assert schema_tables - PRE_MIGRATION_TABLES - created == set()
@@ -0,0 +1,105 @@
+from contract_costs.infrastructure.db.query_plan_check import (
+    HOT_QUERIES,
+    RepositoryQuery,
+    find_full_scans,
+)
+
+QUERY = RepositoryQuery("invoice.get_by_invoice_number", "SELECT 1", ())
+
+
+def test_full_table_scan_is_flagged():
+    plan = [{"table": "invoices", "type": "ALL", "rows": 12000, "key": None}]
+
+    issues = find_full_scans(QUERY, plan)
+
+    assert len(issues) == 1
+    assert issues[0].table == "invoices"
+    assert issues[0].rows == 12000
+
+
+def test_index_lookup_and_derived_tables_are_ok():
+    plan = [
+        {"table": "<derived2>", "type": "ALL", "rows": 3, "key": None},
+        {"table": "c", "type": "eq_ref", "rows": 1, "key": "PRIMARY"},
+        {"table": "company_street_tokens", "type": "range", "rows": 4, "key": "PRIMARY"},
+    ]
+
+    assert find_full_scans(QUERY, plan) == []
+
+
+def test_hot_queries_have_matching_placeholders():
+    for q in HOT_QUERIES:
+        assert q.sql.count("%s") == len(q.params), q.name
+
+
+class RecordingConnection:
+    """Zapisuje SQL wykonany przez repozytorium (bez wyników)."""
+
+    def __init__(self) -> None:
+        self.executed: list[str] = []
+
+    def cursor(self, dictionary: bool = False):
+        return self
+
+    def execute(self, sql: str, params=()) -> None:
+        self.executed.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+def test_hot_queries_are_the_sql_repositories_execute(monkeypatch):
+    from uuid import uuid4
+
+    from contract_costs.model.invoice import InvoiceStatus
+    from contract_costs.repository.mysql import (
+        company_repository,
+        contract_repository,
+        cost_node_repository,
+        cost_type_repository,
+        invoice_line_repository,
+        invoice_repository,
+    )
+
+    conn = RecordingConnection()
+    for module in (
+        company_repository, contract_repository, cost_node_repository,
+        cost_type_repository, invoice_line_repository, invoice_repository,
+    ):
+        monkeypatch.setattr(module, "get_connection", lambda: conn)
+
+    invoices = invoice_repository.MySQLInvoiceRepository()
+    invoices.get_by_invoice_number("FV/1")
+    invoices.get_unique_invoice("FV/1", uuid4())
+    invoices.get_for_assignment(InvoiceStatus.NEW)
+    lines = invoice_line_repository.MySQLInvoiceLineRepository()
+    lines.list_by_invoice(uuid4())
+    lines.list_by_contract(uuid4())
+    companies = company_repository.MySQLCompanyRepository()
+    companies.get_by_tax_number("1234567890")
+    companies.find_by_bank_account("61109010140000071219812874")
+    companies.find_by_email("biuro@example.com")
+    companies.find_by_phone("600100200")
+    companies.find_by_street_tokens(["RYNEK", "28"])
+    cost_node_repository.MySQLCostNodeRepository().list_by_contract(uuid4())
+    cost_node_repository.MySQLCostNodeRepository().get_by_code("K001_01")
+    contract_repository.MySQLContractRepository().get_by_code("K001")
+    cost_type_repository.MySQLCostTypeRepository().get_by_code("MAT")
+
+    checked = [" ".join(q.sql.split()) for q in HOT_QUERIES]
+    assert conn.executed == checked
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import contract_costs.infrastructure.db.mysql_connection as db
+
+
+@pytest.fixture
+def pool(pool_factory, monkeypatch):
+    pool = pool_factory(size=3)
+    monkeypatch.setattr(db, "_pool", pool)
+    monkeypatch.setattr(db, "_pool_pid", os.getpid())
+    return pool
+
+
+def test_repositories_share_one_connection_and_one_commit(pool, created):
+    with db.transaction():
+        with db.get_connection() as first:
+            first.commit()
+        with db.get_connection() as second:
+            second.commit()
+
+    assert len(created) == 1
+    assert created[0].commits == 1
+    assert pool.stats().in_use == 0
+
+
+def test_exception_rolls_back_whole_transaction(pool, created):
+    with pytest.raises(ValueError):
+        with db.transaction():
+            db.get_connection().commit()
+            raise ValueError("boom")
+
+    assert created[0].commits == 0
+    assert created[0].rollbacks == 1
+    assert pool.stats().in_use == 0
+
+
+def test_nested_transaction_joins_outer(pool, created):
+    with db.transaction():
+        with db.transaction():
+            db.get_connection().commit()
+        assert created[0].commits == 0
+
+    assert len(created) == 1
+    assert created[0].commits == 1
+
+
+def test_outside_transaction_connection_comes_from_pool(pool, created):
+    with db.get_connection() as conn:
+        conn.commit()
+
+    assert created[0].commits == 1
+    assert pool.stats().idle == 1
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import pytest
+from openai import RateLimitError
+
+from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache
+from contract_costs.infrastructure.openai_invoice_client import OpenAIInvoiceClient
+
+
+class FakeResponses:
+    def __init__(self, outcomes: list) -> None:
+        self._outcomes = outcomes
+        self.calls = 0
+
+    def create(self, **kwargs):
+        outcome = self._outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, tuple):
+            text, total_tokens = outcome
+            return SimpleNamespace(output_text=text, usage=SimpleNamespace(total_tokens=total_tokens))
+        return type("Response", (), {"output_text": outcome})()
+
+
+class FakeLimiter:
+    def __init__(self) -> None:
+        self.acquired: list[int] = []
+        self.backoffs: list[float] = []
+        self.settled: list[tuple[int, int]] = []
+
+    def acquire(self, tokens: int = 1) -> None:
+        self.acquired.append(tokens)
+
+    def settle(self, reserved: int, used: int) -> None:
+        self.settled.append((reserved, used))
+
+    def backoff(self, seconds: float) -> None:
+        self.backoffs.append(seconds)
+
+
+def rate_limit_error(headers: dict | None = None) -> RateLimitError:
+    response = SimpleNamespace(status_code=429, request=None, headers=headers or {})
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    def _make(outcomes: list, max_retries: int = 3, cache: DiskLRUCache | None = None):
+        limiter = FakeLimiter()
+        client = OpenAIInvoiceClient(
+            {"invoice_number": "string"},
+            "{SCHEMA}\n{TEXT}",
+            rate_limiter=limiter,
+            max_retries=max_retries,
+            cache=cache,
+        )
+        client._client = type("Client", (), {})()
+        client._client.responses = FakeResponses(outcomes)
+        return client, limiter
+
+    return _make
+
+
+def test_extract_goes_through_rate_limiter(make_client):
+    client, limiter = make_client(['{"invoice_number": "FV/1"}'])
+
+    result = client.extract("text")
+
+    assert result == {"invoice_number": "FV/1"}
+    assert len(limiter.acquired) == 1
+    assert limiter.backoffs == []
+
+
+def test_actual_usage_is_settled_with_limiter(make_client):
+    client, limiter = make_client([('{"invoice_number": "FV/1"}', 4321)])
+
+    client.extract("text")
+
+    assert limiter.settled == [(limiter.acquired[0], 4321)]
+
+
+def test_response_without_usage_is_not_settled(make_client):
+    client, limiter = make_client(['{"invoice_number": "FV/1"}'])
+
+    client.extract("text")
+
+    assert limiter.settled == []
+
+
+def test_429_backs_off_using_retry_after(make_client):
+    client, limiter = make_client([
+        rate_limit_error({"retry-after": "7"}),
+        '{"invoice_number": "FV/1"}',
+    ])
+
+    result = client.extract("text")
+
+    assert result["invoice_number"] == "FV/1"
+    assert limiter.backoffs == [7.0]
+    assert len(limiter.acquired) == 2
+
+
+def test_429_without_header_backs_off_exponentially(make_client):
+    client, limiter = make_client([
+        rate_limit_error(),
+        rate_limit_error(),
+        '{"invoice_number": "FV/1"}',
+    ])
+
+    client.extract("text")
+
+    assert limiter.backoffs == [2.0, 4.0]
+
+
+def test_429_raises_after_max_retries(make_client):
+    client, limiter = make_client([rate_limit_error()] * 3, max_retries=2)
+
+    with pytest.raises(RateLimitError):
+        client.extract("text")
+
+    assert len(limiter.backoffs) == 2
+
+
+def test_cached_extraction_skips_api_call(make_client, tmp_path):
+    cache = DiskLRUCache(tmp_path / "cache.sqlite3")
+    client, limiter = make_client(['{"invoice_number": "FV/1"}'], cache=cache)
+
+    first = client.extract("text")
+    second = client.extract("text")
+
+    assert first == second == {"invoice_number": "FV/1"}
+    assert client._client.responses.calls == 1
+
+
+def test_unparseable_response_is_not_cached(make_client, tmp_path):
+    cache = DiskLRUCache(tmp_path / "cache.sqlite3")
+    client, _ = make_client(["no json here", '{"invoice_number": "FV/1"}'], cache=cache)
+
+    with pytest.raises(ValueError):
+        client.extract("text")
+
+    assert client.extract("text") == {"invoice_number": "FV/1"}
@@ -0,0 +1,129 @@
+import pytest
+
+from contract_costs.infrastructure.cache.disk_cache import DiskLRUCache
+from contract_costs.infrastructure.pdf_text_extractor import PdfTextExtractor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskLRUCache(tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    calls = []
+
+    def fake_pdfplumber(pdf_path, timeout=5):
+        calls.append(pdf_path)
+        return f"text of {pdf_path.read_bytes().decode()}"
+
+    monkeypatch.setattr(PdfTextExtractor, "extract_with_pdfplumber_safe", staticmethod(fake_pdfplumber))
+    return calls
+
+
+def test_same_content_is_extracted_once(cache, extractions, tmp_path):
+    first = tmp_path / "a.pdf"
+    copy = tmp_path / "copy.pdf"
+    first.write_bytes(b"invoice")
+    copy.write_bytes(b"invoice")
+    extractor = PdfTextExtractor(cache=cache)
+
+    assert extractor.extract(first) == "text of invoice"
+    assert extractor.extract(copy) == "text of invoice"
+
+    assert extractions == [first]
+
+
+def test_without_cache_always_extracts(extractions, tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"invoice")
+    extractor = PdfTextExtractor()
+
+    extractor.extract(pdf)
+    extractor.extract(pdf)
+
+    assert len(extractions) == 2
+
+
+@pytest.fixture
+def scanned_pdf(monkeypatch, tmp_path):
+    """3-stronicowy skan: pdfplumber nic nie zwraca, OCR per strona."""
+    import contract_costs.infrastructure.pdf_text_extractor as module
+
+    rendered = []
+
+    def fake_convert(pdf_path, dpi, fmt, grayscale, first_page, last_page):
+        rendered.append((first_page, last_page))
+        return [f"image {first_page}"]
+
+    monkeypatch.setattr(PdfTextExtractor, "extract_with_pdfplumber_safe", staticmethod(lambda p, timeout=5: ""))
+    monkeypatch.setattr(module, "pdfinfo_from_path", lambda p: {"Pages": 3})
+    monkeypatch.setattr(module, "convert_from_path", fake_convert)
+    monkeypatch.setattr(PdfTextExtractor, "_extract_with_ocr", staticmethod(lambda img: f"text of {img}"))
+
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"scan")
+    return pdf, rendered
+
+
+def test_ocr_renders_one_page_at_a_time(scanned_pdf):
+    pdf, rendered = scanned_pdf
+
+    text = PdfTextExtractor(ocr_workers=1).extract(pdf)
+
+    assert rendered == [(1, 1), (2, 2), (3, 3)]
+    assert text.index("=== PAGE 1 ===\ntext of image 1") < text.index("=== PAGE 3 ===\ntext of image 3")
+
+
+def test_parallel_ocr_keeps_page_order(scanned_pdf):
+    pdf, _ = scanned_pdf
+    extractor = PdfTextExtractor(ocr_workers=2)
+
+    try:
+        text = extractor.extract(pdf)
+    finally:
+        extractor.close()
+
+    assert [line for line in text.splitlines() if line.startswith("text of")] == [
+        "text of image 1",
+        "text of image 2",
+        "text of image 3",
+    ]
+
+
+def test_broken_ocr_pool_is_recreated_without_closing_pdfplumber(monkeypatch, tmp_path):
+    import contract_costs.infrastructure.pdf_text_extractor as module
+    from concurrent.futures.process import BrokenProcessPool
+
+    pools = []
+
+    class BrokenPool:
+        def __init__(self, max_workers):
+            self.shut_down = False
+            pools.append(self)
+
+        def map(self, *args):
+            raise BrokenProcessPool("OCR worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    monkeypatch.setattr(module, "ProcessPoolExecutor", BrokenPool)
+    monkeypatch.setattr(module, "pdfinfo_from_path", lambda p: {"Pages": 2})
+    monkeypatch.setattr(module, "convert_from_path", lambda pdf_path, **kw: [f"image {kw['first_page']}"])
+    monkeypatch.setattr(PdfTextExtractor, "_extract_with_ocr", staticmethod(lambda img: f"text of {img}"))
+
+    scan = tmp_path / "scan.pdf"
+    scan.write_bytes(b"not a text pdf")
+    extractor = PdfTextExtractor(ocr_workers=2, pdfplumber_workers=1)
+    try:
+        # pdfplumber (prawdziwa pula) nic nie znajduje -> OCR -> zepsuta pula -> seryjnie
+        assert "text of image 2" in extractor.extract(scan)
+        assert "text of image 2" in extractor.extract(scan)
+
+        assert len(pools) == 2 and all(p.shut_down for p in pools)
+        # pula pdfplumber nadal działa (wcześniej: WorkerPoolClosedError)
+        assert extractor.extract_with_pdfplumber_safe(scan) == ""
+        assert extractor._pdfplumber_pool.stats().tasks == 3
+    finally:
+        extractor.close()
@@ -0,0 +1,94 @@
+import pytest
+
+from contract_costs.infrastructure.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_up_to_rpm_without_waiting(clock):
+    limiter = TokenBucketRateLimiter(rpm=3, tpm=10_000, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        limiter.acquire(100)
+
+    assert clock.sleeps == []
+    assert limiter.stats().requests == 3
+
+
+def test_waits_for_request_refill(clock):
+    limiter = TokenBucketRateLimiter(rpm=60, tpm=10_000, clock=clock, sleep=clock.sleep)
+    for _ in range(60):
+        limiter.acquire()
+
+    limiter.acquire()
+
+    # 60 rpm -> 1 request / s
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+    assert limiter.stats().waits == 1
+
+
+def test_waits_for_token_budget(clock):
+    limiter = TokenBucketRateLimiter(rpm=100, tpm=600, clock=clock, sleep=clock.sleep)
+    limiter.acquire(600)
+
+    limiter.acquire(300)
+
+    # 600 tpm -> 10 tokens / s
+    assert sum(clock.sleeps) == pytest.approx(30.0)
+
+
+def test_backoff_pauses_all_callers(clock):
+    limiter = TokenBucketRateLimiter(rpm=100, tpm=10_000, clock=clock, sleep=clock.sleep)
+
+    limiter.backoff(20)
+    limiter.acquire()
+
+    assert clock.now >= 20
+    assert limiter.stats().backoffs == 1
+
+
+def test_request_larger_than_tpm_is_capped(clock):
+    limiter = TokenBucketRateLimiter(rpm=10, tpm=100, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(1_000)
+
+    assert clock.sleeps == []
+
+
+def test_settle_underestimate_delays_next_caller(clock):
+    limiter = TokenBucketRateLimiter(rpm=100, tpm=600, clock=clock, sleep=clock.sleep)
+    limiter.acquire(300)
+
+    # faktycznie zużyto 600 -> kubełek pusty
+    limiter.settle(300, 600)
+    limiter.acquire(300)
+
+    assert sum(clock.sleeps) == pytest.approx(30.0)
+    assert limiter.stats().tokens == 900
+
+
+def test_settle_overestimate_returns_tokens(clock):
+    limiter = TokenBucketRateLimiter(rpm=100, tpm=600, clock=clock, sleep=clock.sleep)
+    limiter.acquire(600)
+
+    limiter.settle(600, 100)
+    limiter.acquire(500)
+
+    assert clock.sleeps == []
+    assert limiter.stats().tokens == 600
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+from contract_costs.infrastructure.supervised_process_pool import (
+    SupervisedProcessPool,
+    WorkerCrashedError,
+    WorkerPoolClosedError,
+    WorkerTaskError,
+    WorkerTimeoutError,
+)
+
+
+def task(value):
+    if value == "hang":
+        time.sleep(30)
+    if value == "crash":
+        os._exit(1)
+    if value == "error":
+        raise ValueError("bad input")
+    return value, os.getpid()
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def _make(**kwargs) -> SupervisedProcessPool:
+        pool = SupervisedProcessPool(task, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def test_worker_process_is_reused(make_pool):
+    pool = make_pool(size=1)
+
+    _, pid_1 = pool.run("a", timeout=5)
+    _, pid_2 = pool.run("b", timeout=5)
+
+    assert pid_1 == pid_2 != os.getpid()
+    assert pool.stats().spawned == 1
+
+
+def test_worker_is_recycled_after_max_tasks(make_pool):
+    pool = make_pool(size=1, max_tasks=2)
+
+    pids = {pool.run(i, timeout=5)[1] for i in range(4)}
+
+    assert len(pids) == 2
+    assert pool.stats().recycled == 2
+
+
+def test_hanging_task_is_killed_and_worker_replaced(make_pool):
+    pool = make_pool(size=1)
+
+    with pytest.raises(WorkerTimeoutError):
+        pool.run("hang", timeout=0.2)
+
+    assert pool.run("ok", timeout=5)[0] == "ok"
+    stats = pool.stats()
+    assert stats.timeouts == 1
+    assert stats.spawned == 2
+
+
+def test_crashed_worker_is_replaced(make_pool):
+    pool = make_pool(size=1)
+
+    with pytest.raises(WorkerCrashedError):
+        pool.run("crash", timeout=5)
+
+    assert pool.run("ok", timeout=5)[0] == "ok"
+
+
+def test_task_exception_keeps_worker(make_pool):
+    pool = make_pool(size=1)
+
+    with pytest.raises(WorkerTaskError, match="bad input"):
+        pool.run("error", timeout=5)
+    pool.run("ok", timeout=5)
+
+    assert pool.stats().spawned == 1
+
+
+def test_closed_pool_rejects_tasks(make_pool):
+    pool = make_pool(size=1)
+    pool.run("ok", timeout=5)
+
+    pool.close()
+
+    assert pool.stats().alive == 0
+    with pytest.raises(WorkerPoolClosedError):
+        pool.run("ok", timeout=5)
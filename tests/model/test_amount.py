@@ -16,6 +16,11 @@ class TestAmount:
         assert amount.gross == Decimal("123.00")
         assert amount.non_tax_cost == Decimal("0.00")
 
+    def test_tax_rounds_half_cent_up(self) -> None:
+        # 10.50 * 5% = 0.525 – half-even dałoby 0.52
+        assert Amount(Decimal("10.50"), VatRate.VAT_5).tax == Decimal("0.53")
+        assert Amount(Decimal("-10.50"), VatRate.VAT_5).tax == Decimal("-0.53")
+
     def test_no_tax(self) -> None:
         amount = Amount(
             value=Decimal("100.00"),
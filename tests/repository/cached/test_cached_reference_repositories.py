@@ -0,0 +1,153 @@
+from dataclasses import replace
+from uuid import uuid4
+
+from contract_costs.repository.cached.contract_repository import CachedContractRepository
+from contract_costs.repository.cached.cost_node_repository import CachedCostNodeRepository
+from contract_costs.repository.cached.cost_type_repository import CachedCostTypeRepository
+from contract_costs.repository.cached.reference_cache import ReferenceCache
+from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
+from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
+from contract_costs.repository.inmemory.cost_type_repository import InMemoryCostTypeRepository
+
+
+class CountingContractRepository(InMemoryContractRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def get(self, contract_id):
+        self.reads += 1
+        return super().get(contract_id)
+
+    def get_by_code(self, contract_code):
+        self.reads += 1
+        return super().get_by_code(contract_code)
+
+    def list_by_codes(self, contract_codes):
+        self.reads += 1
+        return super().list_by_codes(contract_codes)
+
+
+def test_get_is_served_from_cache_after_first_read(contract_1):
+    inner = CountingContractRepository()
+    inner.add(contract_1)
+    repo = CachedContractRepository(inner)
+
+    assert repo.get(contract_1.id) == contract_1
+    assert repo.get(contract_1.id) == contract_1
+    assert repo.get_by_code(contract_1.code) == contract_1
+
+    assert inner.reads == 1
+    stats = repo.cache.stats()
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_list_by_codes_only_loads_missing_codes(contract_1, contract_2):
+    inner = CountingContractRepository()
+    inner.add(contract_1)
+    inner.add(contract_2)
+    repo = CachedContractRepository(inner)
+    repo.get_by_code(contract_1.code)
+
+    result = repo.list_by_codes([contract_1.code, contract_2.code])
+
+    assert {c.id for c in result} == {contract_1.id, contract_2.id}
+    assert inner.reads == 2
+    repo.list_by_codes([contract_1.code, contract_2.code])
+    assert inner.reads == 2
+
+
+def test_write_invalidates_cache(contract_1):
+    inner = CountingContractRepository()
+    inner.add(contract_1)
+    repo = CachedContractRepository(inner)
+    repo.get(contract_1.id)
+
+    renamed = replace(contract_1, name="Renamed")
+    repo.update(renamed)
+
+    assert repo.get(contract_1.id).name == "Renamed"
+    assert repo.cache.stats().invalidations == 1
+
+
+def test_missing_rows_are_not_cached(contract_1):
+    repo = CachedContractRepository(InMemoryContractRepository())
+
+    assert repo.get(contract_1.id) is None
+    repo.add(contract_1)
+
+    assert repo.get(contract_1.id) == contract_1
+
+
+def test_cache_expires_after_max_age(contract_1):
+    now = [0.0]
+    inner = CountingContractRepository()
+    inner.add(contract_1)
+    repo = CachedContractRepository(
+        inner, ReferenceCache("contracts", max_age=10, clock=lambda: now[0])
+    )
+    repo.get(contract_1.id)
+
+    now[0] = 11.0
+    repo.get(contract_1.id)
+
+    assert inner.reads == 2
+
+
+def test_cost_node_list_by_codes_keeps_nodes_sharing_a_code(root_node):
+    other = replace(root_node, id=uuid4())
+    inner = InMemoryCostNodeRepository()
+    inner.add_all([root_node, other])
+    repo = CachedCostNodeRepository(inner)
+
+    first = repo.list_by_codes([root_node.code])
+    second = repo.list_by_codes([root_node.code])
+
+    assert len(first) == len(second) == 2
+    assert repo.cache.stats().hits == 1
+
+
+def test_cost_node_list_by_codes_does_not_cache_unknown_codes(root_node):
+    inner = InMemoryCostNodeRepository()
+    repo = CachedCostNodeRepository(inner)
+
+    assert repo.list_by_codes([root_node.code]) == []
+    # węzeł dodany z pominięciem cache (inny proces)
+    inner.add(root_node)
+
+    assert repo.list_by_codes([root_node.code]) == [root_node]
+
+
+def test_cost_node_delete_invalidates_contract_listing(root_node, child_node):
+    repo = CachedCostNodeRepository(InMemoryCostNodeRepository())
+    repo.add_all([root_node, child_node])
+    assert len(repo.list_by_contract(root_node.contract_id)) == 2
+
+    repo.delete_many([child_node.id])
+
+    assert repo.list_by_contract(root_node.contract_id) == [root_node]
+    assert repo.get(child_node.id) is None
+
+
+def test_cost_type_get_by_code_indexes_id(cost_type_material):
+    repo = CachedCostTypeRepository(InMemoryCostTypeRepository())
+    repo.add(cost_type_material)
+
+    repo.get_by_code("MAT")
+    repo.get(cost_type_material.id)
+
+    assert repo.cache.stats().hits == 1
+
+
+
+def test_cost_type_get_many_loads_only_uncached_ids(cost_type_material, cost_type_service):
+    repo = CachedCostTypeRepository(InMemoryCostTypeRepository())
+    repo.add(cost_type_material)
+    repo.add(cost_type_service)
+    repo.get(cost_type_material.id)
+
+    result = repo.get_many([cost_type_material.id, cost_type_service.id, uuid4()])
+
+    assert {ct.id for ct in result} == {cost_type_material.id, cost_type_service.id}
+    stats = repo.cache.stats()
+    assert (stats.hits, stats.misses) == (1, 3)
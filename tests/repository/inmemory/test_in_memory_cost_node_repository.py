@@ -1,7 +1,11 @@
 from dataclasses import replace
 from decimal import Decimal
+from uuid import uuid4
+
+import pytest
 
 from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
+from contract_costs.repository.inmemory.invoice_line_repository import InMemoryInvoiceLineRepository
 
 
 class TestInMemoryCostNodeRepository:
@@ -72,3 +76,36 @@ class TestInMemoryCostNodeRepository:
 
 
 
+
+    def test_cost_node_repository_hierarchy_queries(self, root_node, child_node):
+        repo = InMemoryCostNodeRepository()
+        grandchild = replace(child_node, id=uuid4(), parent_id=child_node.id, code="GRAND")
+        sibling = replace(child_node, id=uuid4(), code="A_SIBLING")
+        repo.add_all([grandchild, root_node, child_node, sibling])
+
+        assert repo.list_leaves(root_node.contract_id) == [sibling, grandchild]
+        assert repo.list_subtree(root_node.id) == [root_node, sibling, child_node, grandchild]
+        assert repo.list_subtree(child_node.id) == [child_node, grandchild]
+        assert repo.list_ancestors(grandchild.id) == [root_node, child_node]
+        assert repo.list_ancestors(root_node.id) == []
+
+    def test_cost_node_repository_costs_from_invoice_lines(self, root_node, child_node, invoice_line_complete):
+        lines = InMemoryInvoiceLineRepository()
+        repo = InMemoryCostNodeRepository(lines)
+        repo.add_all([root_node, child_node])
+
+        assert repo.nodes_with_costs([root_node.id, child_node.id]) == set()
+        assert repo.has_costs(root_node.contract_id) is False
+
+        lines.add(replace(invoice_line_complete, contract_id=child_node.contract_id, cost_node_id=child_node.id))
+
+        assert repo.nodes_with_costs([root_node.id, child_node.id]) == {child_node.id}
+        assert repo.node_has_costs(child_node.id) is True
+        assert repo.node_has_costs(root_node.id) is False
+        assert repo.has_costs(root_node.contract_id) is True
+
+    def test_cost_node_repository_costs_without_invoice_lines(self, root_node):
+        repo = InMemoryCostNodeRepository()
+
+        with pytest.raises(NotImplementedError):
+            repo.nodes_with_costs([root_node.id])
@@ -1,4 +1,7 @@
+from dataclasses import replace
+from datetime import date
 from decimal import Decimal
+from uuid import uuid4
 
 from contract_costs.repository.inmemory.cost_progress_snapshot_repository import InMemoryCostProgressSnapshotRepository
 
@@ -67,3 +70,48 @@ class TestInMemoryCostProgressSnapshotRepository:
 
 
 
+
+    def test_cost_progress_snapshot_repository_add_many_replaces_same_day(
+            self,
+            contract_id,
+            snapshot_1,
+            snapshot_2,
+    ):
+        repo = InMemoryCostProgressSnapshotRepository()
+        repo.add_many([snapshot_1, snapshot_2])
+
+        rerun = replace(snapshot_1, id=uuid4(), executed_amount=Decimal("30"))
+        repo.add_many([rerun])
+
+        result = repo.get_by_contract(contract_id)
+        assert len(result) == 2
+        assert rerun in result
+        assert snapshot_1 not in result
+
+    def test_cost_progress_snapshot_repository_list_latest_before(
+            self,
+            contract_id,
+            snapshot_1,
+            snapshot_2,
+    ):
+        repo = InMemoryCostProgressSnapshotRepository()
+        repo.add_many([snapshot_1, snapshot_2])
+
+        assert repo.list_latest_before([contract_id], date(2024, 2, 1)) == [snapshot_1]
+        assert repo.list_latest_before([contract_id], date(2024, 1, 1)) == []
+
+    def test_cost_progress_snapshot_repository_list_history(
+            self,
+            contract_id,
+            cost_node_id,
+            snapshot_1,
+            snapshot_2,
+            snapshot_other_node,
+    ):
+        repo = InMemoryCostProgressSnapshotRepository()
+        repo.add_many([snapshot_2, snapshot_1, snapshot_other_node])
+
+        assert repo.list_history(contract_id, cost_node_id) == [snapshot_1, snapshot_2]
+        assert repo.list_history(
+            contract_id, cost_node_id, date_from=date(2024, 1, 15)
+        ) == [snapshot_2]
@@ -0,0 +1,52 @@
+from contract_costs.model.invoice_file_hash import InvoiceFileHash
+from contract_costs.repository.inmemory.invoice_file_hash_repository import (
+    InMemoryInvoiceFileHashRepository,
+)
+
+
+def entry(sha256: str) -> InvoiceFileHash:
+    return InvoiceFileHash(
+        sha256=sha256,
+        file_name=f"{sha256}.pdf",
+        outcome="imported",
+        invoice_id=None,
+        invoice_number=None,
+        parse_result=None,
+    )
+
+
+class TestInMemoryInvoiceFileHashRepository:
+
+    def test_add_is_first_writer_wins(self):
+        repo = InMemoryInvoiceFileHashRepository()
+
+        repo.add(entry("a"))
+        repo.add(InvoiceFileHash(**{**entry("a").__dict__, "file_name": "other.pdf"}))
+
+        assert repo.get("a").file_name == "a.pdf"
+        assert repo.get("a").created_at is not None
+
+    def test_add_replaces_rejected_entry_until_imported(self):
+        repo = InMemoryInvoiceFileHashRepository()
+
+        repo.add(InvoiceFileHash(**{**entry("a").__dict__, "outcome": "no_owner"}))
+        repo.add(InvoiceFileHash(**{**entry("a").__dict__, "file_name": "fixed.pdf"}))
+        repo.add(InvoiceFileHash(**{**entry("a").__dict__, "outcome": "no_owner", "file_name": "late.pdf"}))
+
+        assert repo.get("a").outcome == "imported"
+        assert repo.get("a").file_name == "fixed.pdf"
+
+    def test_hits_and_stats(self):
+        repo = InMemoryInvoiceFileHashRepository()
+        repo.add(entry("a"))
+        repo.add(entry("b"))
+
+        repo.register_hit("a")
+        repo.register_hit("a")
+        repo.register_hit("missing")
+
+        stats = repo.stats()
+        assert stats.files == 2
+        assert stats.duplicates_skipped == 2
+        assert stats.files_with_duplicates == 1
+        assert [e.sha256 for e in repo.list_duplicated()] == ["a"]
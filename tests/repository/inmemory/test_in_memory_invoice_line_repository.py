@@ -90,3 +90,42 @@ class TestInMemoryInvoiceLineRepository:
 
 
 
+
+    def test_invoice_line_repository_get_many_ignores_missing(
+            self,
+            invoice_line_complete,
+            invoice_line_missing_cost_node,
+    ):
+        repo = InMemoryInvoiceLineRepository()
+        repo.add(invoice_line_complete)
+
+        result = repo.get_many([invoice_line_complete.id, invoice_line_missing_cost_node.id])
+
+        assert result == [invoice_line_complete]
+
+    def test_invoice_line_repository_upsert_many(
+            self,
+            invoice_line_complete,
+            invoice_line_missing_cost_node,
+    ):
+        repo = InMemoryInvoiceLineRepository()
+        repo.add(invoice_line_complete)
+
+        changed = replace(invoice_line_complete, description="Changed")
+        repo.upsert_many([changed, invoice_line_missing_cost_node])
+
+        assert repo.get(invoice_line_complete.id).description == "Changed"
+        assert repo.exists(invoice_line_missing_cost_node.id)
+
+    def test_invoice_line_repository_list_by_invoice_ids(
+            self,
+            invoice_line_complete,
+            invoice_line_missing_cost_node,
+    ):
+        repo = InMemoryInvoiceLineRepository()
+        repo.add(invoice_line_complete)
+        repo.add(invoice_line_missing_cost_node)
+
+        result = repo.list_by_invoice_ids([invoice_line_complete.invoice_id])
+
+        assert result == [invoice_line_complete]
@@ -1,3 +1,4 @@
+from uuid import uuid4
 from dataclasses import replace
 
 from contract_costs.model.invoice import InvoiceStatus
@@ -73,5 +74,11 @@ class TestInMemoryInvoiceRepository:
         assert InvoiceStatus.IN_PROGRESS in statuses
         assert InvoiceStatus.PROCESSED not in statuses
 
+    def test_invoice_repository_get_many(self, invoice_new, invoice_processed):
+        repo = InMemoryInvoiceRepository()
+        repo.add(invoice_new)
+        repo.add(invoice_processed)
 
+        result = repo.get_many([invoice_processed.id, uuid4(), invoice_processed.id])
 
+        assert result == [invoice_processed]
@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.amount import Amount, TaxTreatment, VatRate
+from contract_costs.model.company import Company, CompanyType
+from contract_costs.model.invoice import Invoice, InvoiceStatus, PaymentMethod, PaymentStatus
+from contract_costs.model.invoice_line import InvoiceLine
+from contract_costs.model.unit_of_measure import UnitOfMeasure
+from contract_costs.repository.inmemory.company_repository import InMemoryCompanyRepository
+from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
+from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
+from contract_costs.repository.inmemory.cost_type_repository import InMemoryCostTypeRepository
+from contract_costs.repository.inmemory.invoice_line_repository import InMemoryInvoiceLineRepository
+from contract_costs.repository.inmemory.invoice_repository import InMemoryInvoiceRepository
+from contract_costs.repository.inmemory.invoice_summary_repository import (
+    InMemoryInvoiceSummaryRepository,
+)
+from contract_costs.services.invoices.invoice_details_query_service import InvoiceDetailsQueryService
+from contract_costs.services.invoices.invoice_summary_query_service import InvoiceSummaryQueryService
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def company(name: str, nip: str) -> Company:
+    return Company(
+        id=uuid4(), name=name, description=None, tax_number=nip,
+        address=None, contact=None, bank_account=None,
+        role=CompanyType.SUPPLIER, tags=set(), is_active=True,
+    )
+
+
+@pytest.fixture
+def repos():
+    return (
+        InMemoryInvoiceRepository(),
+        InMemoryInvoiceLineRepository(),
+        InMemoryCompanyRepository(),
+    )
+
+
+@pytest.fixture
+def seeded(repos):
+    invoices, lines, companies = repos
+    buyer, seller = company("Own", "1111111111"), company("Budmax", "2222222222")
+    companies.add(buyer)
+    companies.add(seller)
+
+    for n, (status, payment) in enumerate([
+        (InvoiceStatus.NEW, PaymentStatus.UNPAID),
+        (InvoiceStatus.PROCESSED, PaymentStatus.PAID),
+        (InvoiceStatus.PROCESSED, PaymentStatus.UNPAID),
+    ]):
+        inv = Invoice(
+            id=uuid4(), invoice_number=f"FV/{n}",
+            invoice_date=date(2024, 1, n + 1), selling_date=None,
+            buyer_id=buyer.id, seller_id=seller.id,
+            payment_method=PaymentMethod.CASH, due_date=None,
+            payment_status=payment, status=status,
+            timestamp=NOW + timedelta(minutes=n),
+        )
+        invoices.add(inv)
+        for value, rate, treatment in [
+            ("100.00", VatRate.VAT_23, TaxTreatment.TAX_DEDUCTIBLE),
+            ("10.00", VatRate.VAT_ZW, TaxTreatment.NON_DEDUCTIBLE),
+        ]:
+            lines.add(InvoiceLine(
+                id=uuid4(), invoice_id=inv.id, contract_id=None,
+                cost_node_id=None, cost_type_id=None, item_name="x",
+                quantity=Decimal("1"), unit=UnitOfMeasure.PIECE,
+                amount=Amount(Decimal(value), rate, treatment),
+                description=None,
+            ))
+    return repos
+
+
+def test_totals_match_invoice_details(seeded):
+    invoices, lines, companies = seeded
+    service = InvoiceSummaryQueryService(InMemoryInvoiceSummaryRepository(*seeded))
+    details = InvoiceDetailsQueryService(
+        invoices, lines, companies,
+        InMemoryContractRepository(), InMemoryCostNodeRepository(), InMemoryCostTypeRepository(),
+    )
+
+    for summary in service.list_summaries():
+        full = details.get_by_invoice_number(summary.invoice_number)
+        assert summary.total_net == full.total_net
+        assert summary.total_vat == full.total_vat
+        assert summary.total_gross == full.total_gross
+        assert summary.total_not_evidenced == full.total_not_evidenced
+        assert summary.seller_name == "Budmax"
+        assert summary.line_count == 2
+
+
+def test_filters_order_and_limit(seeded):
+    repo = InMemoryInvoiceSummaryRepository(*seeded)
+
+    rows = repo.list_summaries()
+    assert [r["invoice_number"] for r in rows] == ["FV/2", "FV/1", "FV/0"]
+
+    rows = repo.list_summaries(statuses=[InvoiceStatus.PROCESSED], unpaid=True)
+    assert [r["invoice_number"] for r in rows] == ["FV/2"]
+
+    rows = repo.list_summaries(limit=2)
+    assert [r["invoice_number"] for r in rows] == ["FV/2", "FV/1"]
@@ -0,0 +1,150 @@
+import sqlite3
+
+import pytest
+
+# tabele w dialekcie wspólnym dla MySQL i SQLite (kolumny jak w schema.sql)
+SCHEMA = """
+CREATE TABLE companies (
+  id char(36) NOT NULL PRIMARY KEY,
+  name varchar(255) NOT NULL,
+  description text,
+  tax_number varchar(32) NOT NULL UNIQUE,
+  street varchar(255) DEFAULT NULL,
+  city varchar(255) DEFAULT NULL,
+  zip_code varchar(255) DEFAULT NULL,
+  country varchar(255) DEFAULT NULL,
+  bank_account_number varchar(64) DEFAULT NULL,
+  bank_account_country_code varchar(2) DEFAULT NULL,
+  role varchar(32) NOT NULL,
+  is_active tinyint(1) NOT NULL,
+  created_at timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  phone_number varchar(20) DEFAULT NULL,
+  email varchar(64) DEFAULT NULL,
+  bank_account_key varchar(32) DEFAULT NULL,
+  phone_key varchar(16) DEFAULT NULL,
+  email_key varchar(64) DEFAULT NULL
+);
+CREATE TABLE company_street_tokens (
+  token varchar(64) NOT NULL,
+  company_id char(36) NOT NULL,
+  PRIMARY KEY (token, company_id)
+);
+CREATE TABLE cost_nodes (
+  id char(36) NOT NULL PRIMARY KEY,
+  contract_id char(36) NOT NULL,
+  parent_id char(36) DEFAULT NULL REFERENCES cost_nodes (id) ON DELETE CASCADE,
+  code varchar(64) NOT NULL,
+  name varchar(255) NOT NULL,
+  budget decimal(15,2) DEFAULT NULL,
+  quantity decimal(15,4) DEFAULT NULL,
+  unit varchar(32) DEFAULT NULL,
+  created_at timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  is_active tinyint(1) DEFAULT NULL,
+  depth int NOT NULL DEFAULT 0,
+  is_leaf tinyint(1) NOT NULL DEFAULT 1,
+  updated_at timestamp NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE cost_node_closure (
+  contract_id char(36) NOT NULL,
+  ancestor_id char(36) NOT NULL REFERENCES cost_nodes (id) ON DELETE CASCADE,
+  descendant_id char(36) NOT NULL REFERENCES cost_nodes (id) ON DELETE CASCADE,
+  distance int NOT NULL,
+  PRIMARY KEY (ancestor_id, descendant_id)
+);
+CREATE TABLE cost_types (
+  id char(36) NOT NULL PRIMARY KEY,
+  code varchar(64) NOT NULL,
+  name varchar(255) NOT NULL
+);
+CREATE TABLE invoices (
+  id char(36) NOT NULL PRIMARY KEY,
+  invoice_number varchar(128) NOT NULL,
+  invoice_date date DEFAULT NULL,
+  selling_date date DEFAULT NULL,
+  status varchar(32) NOT NULL,
+  payment_status varchar(32) DEFAULT NULL,
+  timestamp datetime DEFAULT NULL,
+  created_at timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at timestamp NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE invoice_lines (
+  id char(36) NOT NULL PRIMARY KEY,
+  invoice_id char(36) DEFAULT NULL,
+  contract_id char(36) DEFAULT NULL,
+  cost_node_id char(36) DEFAULT NULL,
+  cost_type_id char(36) DEFAULT NULL,
+  item_name varchar(255) NOT NULL,
+  amount_value decimal(15,2) NOT NULL,
+  vat_rate varchar(16) DEFAULT NULL,
+  tax_treatment varchar(32) DEFAULT NULL,
+  created_at timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at timestamp NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+class SQLiteCursor:
+    """Kursor w stylu mysql.connector (%s, dictionary=True) na SQLite."""
+
+    def __init__(self, conn: sqlite3.Connection, dictionary: bool) -> None:
+        self._cur = conn.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, sql: str, params=()) -> None:
+        self._cur.execute(sql.replace("%s", "?"), tuple(params))
+
+    def executemany(self, sql: str, values) -> None:
+        self._cur.executemany(sql.replace("%s", "?"), list(values))
+
+    def fetchone(self):
+        row = self._cur.fetchone()
+        return self._map(row) if row is not None else None
+
+    def fetchall(self):
+        return [self._map(row) for row in self._cur.fetchall()]
+
+    def _map(self, row):
+        if not self._dictionary:
+            return tuple(row)
+        return {d[0]: v for d, v in zip(self._cur.description, row)}
+
+    def close(self) -> None:
+        self._cur.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SQLiteConnection:
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def cursor(self, dictionary: bool = False) -> SQLiteCursor:
+        return SQLiteCursor(self._conn, dictionary)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+@pytest.fixture
+def sqlite_connection():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    yield SQLiteConnection(conn)
+    conn.close()
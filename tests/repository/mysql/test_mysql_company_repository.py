@@ -0,0 +1,89 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+import contract_costs.repository.mysql.company_repository as module
+from contract_costs.model.company import Address, BankAccount, Company, CompanyType, Contact
+from contract_costs.repository.mysql.company_repository import MySQLCompanyRepository
+
+
+def make_company(name: str, nip: str, **overrides) -> Company:
+    data = dict(
+        id=uuid4(),
+        name=name,
+        description=None,
+        tax_number=nip,
+        address=Address(street="ul. Rynek Główny 28", city="Kraków", zip_code="31-010", country="PL"),
+        contact=Contact(phone_number="+48 600 100 200", email="Biuro@Budmax.PL"),
+        bank_account=BankAccount(number="61 1090 1014 0000 0712 1981 2874", country_code="PL"),
+        role=CompanyType.SUPPLIER,
+        tags=set(),
+        is_active=True,
+    )
+    data.update(overrides)
+    return Company(**data)
+
+
+@pytest.fixture
+def repo(sqlite_connection, monkeypatch):
+    monkeypatch.setattr(module, "get_connection", lambda: sqlite_connection)
+    return MySQLCompanyRepository()
+
+
+@pytest.fixture
+def budmax(repo):
+    company = make_company("Budmax", "1111111111")
+    repo.add(company)
+    repo.add(make_company(
+        "Stalex",
+        "2222222222",
+        address=Address(street="ul. Jana Pawła II 12/3", city="Kraków", zip_code="30-001", country="PL"),
+        contact=Contact(phone_number="500 600 700", email="stalex@example.com"),
+        bank_account=None,
+    ))
+    return company
+
+
+def ids(companies: list[Company]) -> list:
+    return [c.id for c in companies]
+
+
+def test_find_by_bank_account_uses_normalized_key(repo, budmax):
+    assert ids(repo.find_by_bank_account("PL61109010140000071219812874")) == [budmax.id]
+    assert repo.find_by_bank_account("00109010140000071219812874") == []
+
+
+def test_find_by_phone_uses_normalized_key(repo, budmax):
+    assert ids(repo.find_by_phone("600-100-200")) == [budmax.id]
+    assert repo.find_by_phone("600100201") == []
+
+
+def test_find_by_email_ignores_case_and_whitespace(repo, budmax):
+    assert ids(repo.find_by_email(" biuro@budmax.pl ")) == [budmax.id]
+
+
+def test_find_by_street_tokens_requires_every_token(repo, budmax):
+    assert ids(repo.find_by_street_tokens(["RYNEK", "GŁÓWNY", "28"])) == [budmax.id]
+    assert repo.find_by_street_tokens(["RYNEK", "29"]) == []
+    assert repo.find_by_street_tokens([]) == []
+
+
+def test_find_by_street_tokens_matches_token_prefix(repo, budmax):
+    # jak dawny LIKE: numer "12" znajduje zapisany "12/3"
+    found = repo.find_by_street_tokens(["JANA", "PAWŁA", "12"])
+
+    assert [c.name for c in found] == ["Stalex"]
+
+
+def test_update_replaces_match_keys(repo, budmax):
+    repo.update(replace(
+        budmax,
+        address=Address(street="ul. Długa 5", city="Gdańsk", zip_code="30-001", country="PL"),
+        contact=Contact(phone_number="700 800 900", email="nowy@budmax.pl"),
+    ))
+
+    assert repo.find_by_phone("600100200") == []
+    assert ids(repo.find_by_phone("700800900")) == [budmax.id]
+    assert repo.find_by_street_tokens(["RYNEK"]) == []
+    assert ids(repo.find_by_street_tokens(["DŁUGA", "5"])) == [budmax.id]
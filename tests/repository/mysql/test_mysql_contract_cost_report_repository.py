@@ -0,0 +1,118 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+import contract_costs.repository.mysql.contract_cost_report_repository as module
+from contract_costs.model.amount import Amount, TaxTreatment, VatRate
+from contract_costs.model.invoice import InvoiceStatus
+from contract_costs.repository.mysql.contract_cost_report_repository import (
+    MySQLContractCostReportRepository,
+)
+
+CONTRACT = uuid4()
+NODE = uuid4()
+MARK = datetime(2024, 2, 1, 2, 0, 0)
+BEFORE = "2024-01-31 12:00:00"
+AFTER = "2024-02-01 03:00:00"
+
+
+@pytest.fixture
+def repo(sqlite_connection, monkeypatch):
+    monkeypatch.setattr(module, "get_connection", lambda: sqlite_connection)
+    return MySQLContractCostReportRepository()
+
+
+@pytest.fixture
+def db(sqlite_connection):
+    conn = sqlite_connection
+
+    def add_node(node_id=NODE, updated_at=BEFORE):
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO cost_nodes (id, contract_id, code, name, created_at, updated_at)"
+                " VALUES (%s, %s, %s, %s, %s, %s)",
+                (str(node_id), str(CONTRACT), f"N{node_id.hex[:4]}", "Node", BEFORE, updated_at),
+            )
+
+    def add_line(day: str, value: str, *, created_at=BEFORE, updated_at=None,
+                 status=InvoiceStatus.PROCESSED):
+        invoice_id, line_id = uuid4(), uuid4()
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO invoices (id, invoice_number, invoice_date, status, created_at, updated_at)"
+                " VALUES (%s, %s, %s, %s, %s, %s)",
+                (str(invoice_id), "FV/1", day, status.value, created_at, created_at),
+            )
+            cur.execute(
+                "INSERT INTO invoice_lines (id, invoice_id, contract_id, cost_node_id,"
+                " item_name, amount_value, created_at, updated_at)"
+                " VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                (str(line_id), str(invoice_id), str(CONTRACT), str(NODE),
+                 "Cement", value, created_at, updated_at or created_at),
+            )
+        return invoice_id, line_id
+
+    def execute(sql: str, params=()):
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+
+    add_node()
+    return add_line, execute
+
+
+def executed(repo, **kwargs) -> Decimal:
+    rows = repo.executed_by_node([CONTRACT], until=date(2024, 2, 29), **kwargs)
+    return sum((Decimal(str(r["executed_amount"])) for r in rows), Decimal("0"))
+
+
+def test_window_counts_new_window_and_lines_added_after_mark(repo, db):
+    add_line, _ = db
+    add_line("2024-01-10", "100")                      # w bazie
+    add_line("2024-02-05", "50")                       # nowe okno dat
+    add_line("2024-01-15", "30", created_at=AFTER)     # wstecz, po znaczniku
+
+    assert executed(repo, after=date(2024, 1, 31), counted_at=MARK) == Decimal("80")
+    assert executed(repo, as_of=MARK) == Decimal("150")
+
+
+def test_changed_since_flags_updated_lines_invoices_nodes_and_removals(repo, db):
+    add_line, execute = db
+    marks = {CONTRACT: (MARK, 2)}
+    invoice_id, line_id = add_line("2024-01-10", "100")
+    add_line("2024-01-12", "40")
+    add_line("2024-01-15", "30", created_at=AFTER)     # nowa linia – nie unieważnia
+
+    assert repo.changed_since(marks) == set()
+
+    execute("UPDATE invoice_lines SET updated_at = %s WHERE id = %s", (AFTER, str(line_id)))
+    assert repo.changed_since(marks) == {CONTRACT}
+
+    execute("UPDATE invoice_lines SET updated_at = %s", (BEFORE,))
+    execute("UPDATE invoices SET updated_at = %s WHERE id = %s", (AFTER, str(invoice_id)))
+    assert repo.changed_since(marks) == {CONTRACT}
+
+    execute("UPDATE invoices SET updated_at = %s", (BEFORE,))
+    execute("UPDATE cost_nodes SET updated_at = %s", (AFTER,))
+    assert repo.changed_since(marks) == {CONTRACT}
+
+    execute("UPDATE cost_nodes SET updated_at = %s", (BEFORE,))
+    execute("DELETE FROM invoice_lines WHERE id = %s", (str(line_id),))
+    assert repo.changed_since(marks) == {CONTRACT}
+
+
+def test_aggregate_costs_rounds_vat_like_amount_tax(repo, db):
+    add_line, execute = db
+    _, line_id = add_line("2024-01-10", "10.50")
+    execute(
+        "UPDATE invoice_lines SET vat_rate = %s, tax_treatment = %s WHERE id = %s",
+        (str(VatRate.VAT_5.value), TaxTreatment.TAX_DEDUCTIBLE.value, str(line_id)),
+    )
+    execute("UPDATE cost_nodes SET is_leaf = 1")
+
+    [row] = repo.aggregate_costs(CONTRACT)
+
+    # 0.525 -> 0.53 w SQL i w Amount.tax (in-memory); SQLite zwraca float -> do groszy
+    assert round(row["vat_amount"], 2) == Amount(Decimal("10.50"), VatRate.VAT_5).tax == Decimal("0.53")
+    assert round(row["gross_amount"], 2) == Decimal("11.03")
@@ -0,0 +1,93 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+import contract_costs.repository.mysql.cost_node_repository as module
+from contract_costs.model.cost_node import CostNode
+from contract_costs.repository.cost_node_hierarchy import build_hierarchy
+from contract_costs.repository.mysql.cost_node_repository import MySQLCostNodeRepository
+
+CONTRACT = uuid4()
+
+
+def make_node(code: str, parent: CostNode | None = None) -> CostNode:
+    return CostNode(
+        id=uuid4(),
+        contract_id=CONTRACT,
+        code=code,
+        name=code,
+        parent_id=parent.id if parent else None,
+        quantity=None,
+        unit=None,
+        budget=None,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def repo(sqlite_connection, monkeypatch):
+    monkeypatch.setattr(module, "get_connection", lambda: sqlite_connection)
+    return MySQLCostNodeRepository()
+
+
+def assert_hierarchy_matches_full_rebuild(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT id, parent_id, depth, is_leaf FROM cost_nodes")
+        nodes = cur.fetchall()
+        cur.execute("SELECT ancestor_id, descendant_id, distance FROM cost_node_closure")
+        paths = cur.fetchall()
+
+    expected = build_hierarchy({n[0]: n[1] for n in nodes})
+    assert sorted(paths) == sorted(expected.paths)
+    assert {n[0]: (n[2], bool(n[3])) for n in nodes} == {
+        node_id: (expected.depth[node_id], expected.is_leaf[node_id])
+        for node_id in expected.depth
+    }
+
+
+def test_hierarchy_follows_inserts_moves_and_deletes(repo, sqlite_connection):
+    a = make_node("A")
+    b = make_node("A.B", a)
+    c = make_node("A.B.C", b)
+    d = make_node("A.D", a)
+
+    repo.add_all([a, b, c, d])
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+    e = make_node("A.B.C.E", c)
+    repo.add(e)
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+    # B z poddrzewem pod D: A -> D -> B -> C -> E
+    repo.update_many([replace(b, parent_id=d.id)])
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+    repo.update(replace(c, parent_id=a.id))
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+    # kaskadowo znika D z B; A ma jeszcze C
+    repo.delete_many([d.id])
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+    repo.delete_many([c.id])
+    assert_hierarchy_matches_full_rebuild(sqlite_connection)
+
+
+def test_update_without_new_parent_skips_hierarchy_refresh(repo, monkeypatch):
+    a = make_node("A")
+    b = make_node("A.B", a)
+    repo.add_all([a, b])
+
+    calls = []
+    monkeypatch.setattr(
+        MySQLCostNodeRepository,
+        "_refresh_subtrees",
+        staticmethod(lambda cur, node_ids, parent_ids=(): calls.append(list(node_ids))),
+    )
+
+    repo.update_many([replace(a, name="Renamed"), replace(b, budget=None, name="B")])
+    assert calls == []
+
+    repo.update(replace(b, parent_id=None))
+    assert calls == [[b.id]]
@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+from contract_costs.repository.batch_loader import BatchLoader
+from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
+
+
+class RecordingContractRepository(InMemoryContractRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[list] = []
+
+    def get_many(self, contract_ids):
+        self.calls.append(list(contract_ids))
+        return super().get_many(contract_ids)
+
+
+def test_primed_keys_are_fetched_in_one_call(contract_1, contract_2):
+    repo = RecordingContractRepository()
+    repo.add(contract_1)
+    repo.add(contract_2)
+    loader = BatchLoader(repo.get_many).prime([contract_1.id, contract_2.id, None])
+
+    assert loader.load(contract_1.id) == contract_1
+    assert loader.load(contract_2.id) == contract_2
+    assert loader.load(contract_1.id) == contract_1
+
+    assert len(repo.calls) == 1
+    assert set(repo.calls[0]) == {contract_1.id, contract_2.id}
+
+
+def test_missing_keys_are_remembered(contract_1):
+    repo = RecordingContractRepository()
+    missing = uuid4()
+    loader = BatchLoader(repo.get_many)
+
+    assert loader.load(missing) is None
+    assert loader.load(missing) is None
+    assert loader.load(None) is None
+
+    assert repo.calls == [[missing]]
+
+
+def test_load_many_keeps_key_order_and_skips_missing(contract_1, contract_2):
+    repo = RecordingContractRepository()
+    repo.add(contract_1)
+    repo.add(contract_2)
+    loader = BatchLoader(repo.get_many)
+
+    result = loader.load_many([contract_2.id, uuid4(), contract_1.id, contract_2.id])
+
+    assert result == [contract_2, contract_1]
+    assert len(repo.calls) == 1
+
+
+def test_only_new_keys_are_fetched(contract_1, contract_2):
+    repo = RecordingContractRepository()
+    repo.add(contract_1)
+    repo.add(contract_2)
+    loader = BatchLoader(repo.get_many)
+    loader.load(contract_1.id)
+
+    loader.load_many([contract_1.id, contract_2.id])
+
+    assert repo.calls == [[contract_1.id], [contract_2.id]]
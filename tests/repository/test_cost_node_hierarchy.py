@@ -0,0 +1,71 @@
+from contract_costs.repository.cost_node_hierarchy import build_hierarchy
+
+
+def test_build_hierarchy_depth_leaves_and_closure():
+    hierarchy = build_hierarchy({
+        "root": None,
+        "a": "root",
+        "a1": "a",
+        "b": "root",
+        "orphan": "missing",
+    })
+
+    assert hierarchy.depth == {"root": 0, "a": 1, "a1": 2, "b": 1, "orphan": 0}
+    assert hierarchy.is_leaf == {
+        "root": False, "a": False, "a1": True, "b": True, "orphan": True,
+    }
+    assert sorted(hierarchy.paths) == sorted([
+        ("root", "root", 0), ("a", "a", 0), ("a1", "a1", 0), ("b", "b", 0),
+        ("orphan", "orphan", 0),
+        ("root", "a", 1), ("root", "b", 1), ("a", "a1", 1), ("root", "a1", 2),
+    ])
+
+
+def test_build_hierarchy_handles_deep_chains_and_cycles():
+    parents = {0: None, **{i: i - 1 for i in range(1, 3000)}, "x": "y", "y": "x"}
+
+    hierarchy = build_hierarchy(parents)
+
+    assert hierarchy.depth[2999] == 2999
+    # cykl nie wchodzi do drzewa – tylko wiersz (w, w, 0)
+    assert ("x", "x", 0) in hierarchy.paths
+    assert hierarchy.depth["x"] == 0
+
+
+class RecordingCursor:
+    def __init__(self, rows):
+        self._rows = rows
+        self.executed: list[tuple[str, object]] = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((" ".join(sql.split()), params))
+
+    def executemany(self, sql, values):
+        self.executed.append((" ".join(sql.split()), list(values)))
+
+    def fetchall(self):
+        return self._rows
+
+
+def test_mysql_refresh_writes_closure_and_only_changed_flags():
+    from contract_costs.repository.mysql.cost_node_repository import MySQLCostNodeRepository
+
+    # (id, contract_id, parent_id, depth, is_leaf) – "a" świeżo dodany pod liść "root"
+    cur = RecordingCursor([
+        ("root", "c1", None, 0, 1),
+        ("a", "c1", "root", 0, 1),
+    ])
+
+    MySQLCostNodeRepository._refresh_hierarchy(cur, ["c1", "c1"])
+
+    statements = [sql.split(" (")[0] for sql, _ in cur.executed]
+    assert statements == [
+        "SELECT id, contract_id, parent_id, depth, is_leaf FROM cost_nodes WHERE contract_id IN",
+        "DELETE FROM cost_node_closure WHERE contract_id IN",
+        "INSERT INTO cost_node_closure",
+        "UPDATE cost_nodes SET depth = %s, is_leaf = %s WHERE id = %s",
+    ]
+    assert sorted(cur.executed[2][1]) == [
+        ("c1", "a", "a", 0), ("c1", "root", "a", 1), ("c1", "root", "root", 0),
+    ]
+    assert sorted(cur.executed[3][1]) == [(0, 0, "root"), (1, 1, "a")]
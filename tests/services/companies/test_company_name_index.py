@@ -0,0 +1,159 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.company import Company, CompanyType
+from contract_costs.repository.inmemory.company_repository import InMemoryCompanyRepository
+from contract_costs.services.companies.index.company_name_index import (
+    CompanyNameIndex,
+    NameIndexedCompanyRepository,
+)
+from contract_costs.services.companies.providers.name import NameCandidateProvider
+from contract_costs.services.invoices.dto.parse import CompanyInput
+
+
+def make_company(name: str, nip: str = "1234567890") -> Company:
+    return Company(
+        id=uuid4(),
+        name=name,
+        description=None,
+        tax_number=nip,
+        address=None,
+        contact=None,
+        bank_account=None,
+        role=CompanyType.SUPPLIER,
+        tags=set(),
+        is_active=True,
+    )
+
+
+def make_input(name: str | None) -> CompanyInput:
+    return CompanyInput(
+        name=name,
+        tax_number=None,
+        street=None,
+        city=None,
+        state=None,
+        zip_code=None,
+        country=None,
+        phone_number=None,
+        email=None,
+        bank_account=None,
+        role="seller",
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def inner():
+    return InMemoryCompanyRepository()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def index(inner, clock):
+    return CompanyNameIndex(inner, max_age=60, clock=clock)
+
+
+@pytest.fixture
+def repo(inner, index):
+    return NameIndexedCompanyRepository(inner, index)
+
+
+NAMES = [
+    "Budmax Sp. z o.o.",
+    "BUDMAX HURT SPÓŁKA JAWNA",
+    "Max",
+    "Elektro-Instal",
+    "Hurtownia Stali ABC",
+]
+
+
+@pytest.mark.parametrize("query", [
+    "Budmax sp z o o",
+    "BUDMAX HURT",
+    "Hurtownia Stali ABC Oddział Kraków",
+    "Elektro Instal",
+    "Stali",
+    "ma",
+    "Nieznana Firma",
+])
+def test_index_matches_legacy_scan(inner, index, query):
+    for i, name in enumerate(NAMES):
+        inner.add(make_company(name, nip=f"{i:010d}"))
+
+    legacy = NameCandidateProvider(inner)
+    indexed = NameCandidateProvider(inner, index)
+
+    expected = [c.id for c in legacy.find_candidates(make_input(query))]
+    actual = [c.id for c in indexed.find_candidates(make_input(query))]
+
+    # ta sama kolejność – remisy w dopasowaniu rozstrzyga pozycja kandydata
+    assert actual == expected
+
+
+def test_find_does_not_scan_repository_again(inner, index, monkeypatch):
+    inner.add(make_company("Budmax"))
+    assert len(index.find("Budmax")) == 1
+
+    calls = []
+    monkeypatch.setattr(inner, "list_all", lambda: calls.append(1) or [])
+
+    assert len(index.find("Budmax")) == 1
+    assert calls == []
+
+
+def test_writes_through_decorator_update_index(repo, index):
+    company = make_company("Budmax")
+    repo.add(company)
+    assert [c.id for c in index.find("Budmax")] == [company.id]
+
+    renamed = replace(company, name="Stalex")
+    repo.update(renamed)
+    assert index.find("Budmax") == []
+    assert [c.name for c in index.find("Stalex")] == ["Stalex"]
+
+    repo.delete(company.id)
+    assert index.find("Stalex") == []
+
+
+def test_results_keep_repository_order_after_updates(repo, index):
+    first = make_company("Budmax Hurt", nip="1")
+    second = make_company("Budmax", nip="2")
+    repo.add(first)
+    repo.add(second)
+    assert [c.id for c in index.find("Budmax")] == [first.id, second.id]
+
+    repo.update(replace(first, description="zmiana"))
+    third = make_company("Budmax Beton", nip="3")
+    repo.add(third)
+
+    assert [c.id for c in index.find("Budmax")] == [first.id, second.id, third.id]
+
+
+def test_index_rebuilds_after_max_age(inner, index, clock):
+    assert index.find("Budmax") == []
+
+    # zapis z pominięciem dekoratora (inny proces)
+    inner.add(make_company("Budmax"))
+    assert index.find("Budmax") == []
+
+    clock.now = 61
+    assert len(index.find("Budmax")) == 1
+
+
+def test_empty_name_returns_nothing(index):
+    assert index.find(None) == []
+    assert index.find("sp. z o.o.") == []
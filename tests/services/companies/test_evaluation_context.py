@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.infrastructure.openai_invoice_client import OpenAIInvoiceClient
+from contract_costs.model.company import CompanyType
+from contract_costs.repository.inmemory.company_repository import InMemoryCompanyRepository
+from contract_costs.services.companies.company_evaluate_orchestrator import CompanyEvaluateOrchestrator
+from contract_costs.services.companies.evaluation_context import CompanyEvaluationContext
+from contract_costs.services.companies.providers.composite import CompositeCompanyCandidateProvider
+from contract_costs.services.companies.providers.email import EmailCandidateProvider
+from contract_costs.services.companies.providers.excact_nip import ExactNipCandidateProvider
+from contract_costs.services.invoices.apply_company_excel_batch_service import ApplyCompanyExcelBatchService
+from contract_costs.services.invoices.dto.export.company_export import CompanyExport
+
+
+@pytest.fixture
+def repo():
+    return InMemoryCompanyRepository()
+
+
+@pytest.fixture
+def nip_provider(repo):
+    provider = ExactNipCandidateProvider(repo)
+    provider.find_candidates = MagicMock(wraps=provider.find_candidates)
+    return provider
+
+
+@pytest.fixture
+def orchestrator(repo, nip_provider):
+    return CompanyEvaluateOrchestrator(
+        repo,
+        CompositeCompanyCandidateProvider([nip_provider, EmailCandidateProvider(repo)]),
+        MagicMock(OpenAIInvoiceClient),
+    )
+
+
+def test_same_nip_is_evaluated_once(orchestrator, nip_provider, repo):
+    context = CompanyEvaluationContext(orchestrator)
+
+    first = context.evaluate_from_tax("PL 123-456-78-90", role=CompanyType.SELLER)
+    second = context.evaluate_from_tax("1234567890", role=CompanyType.SELLER)
+
+    assert first.id == second.id
+    assert nip_provider.find_candidates.call_count == 1
+    assert len(repo.list_all()) == 1
+
+    stats = context.stats()
+    assert stats.requested == 2
+    assert stats.evaluated == 1
+    assert stats.reused == 1
+    assert stats.provider_queries_saved == 2  # 2 providery w composite
+
+
+def test_companies_applied_from_excel_are_reused(orchestrator, nip_provider, repo):
+    context = CompanyEvaluationContext(orchestrator)
+    service = ApplyCompanyExcelBatchService(repo)
+    row = CompanyExport(id=uuid4(), name="Budmax", tax_number="1234567890")
+
+    # ten sam wiersz w buyers i sellers
+    service.apply([row, row], context)
+
+    company = context.evaluate_from_tax("1234567890", role=CompanyType.SELLER)
+
+    assert company.name == "Budmax"
+    assert nip_provider.find_candidates.call_count == 0
+    assert len(repo.list_all()) == 1
+
+
+def test_unparseable_nip_is_still_memoized(orchestrator, repo):
+    context = CompanyEvaluationContext(orchestrator)
+
+    first = context.evaluate_from_tax("brak", role=CompanyType.SELLER)
+    second = context.evaluate_from_tax("brak", role=CompanyType.SELLER)
+
+    # bez pamięci powstałyby dwie firmy z placeholderem TMP-...
+    assert first.id == second.id
+    assert len(repo.list_all()) == 1
@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+from contract_costs.model.company import Address, BankAccount, Company, CompanyType, Contact
+from contract_costs.services.companies.normalize.match_keys import (
+    company_match_keys,
+    email_key,
+    street_keys,
+)
+from contract_costs.services.companies.providers.address import (
+    extract_street_number,
+    extract_street_tokens,
+)
+
+
+def make_company(**overrides) -> Company:
+    data = dict(
+        id=uuid4(),
+        name="Budmax",
+        description=None,
+        tax_number="1234567890",
+        address=Address(street="ul. Rynek Główny 28", city="Kraków", zip_code="31-010", country="PL"),
+        contact=Contact(phone_number="+48 600 100 200", email=" Biuro@Budmax.PL "),
+        bank_account=BankAccount(number="61109010140000071219812874", country_code="PL"),
+        role=CompanyType.SUPPLIER,
+        tags=set(),
+        is_active=True,
+    )
+    data.update(overrides)
+    return Company(**data)
+
+
+def test_company_match_keys_are_normalized():
+    keys = company_match_keys(make_company())
+
+    assert keys.bank_account == "61109010140000071219812874"
+    assert keys.phone == "600100200"
+    assert keys.email == "biuro@budmax.pl"
+    assert keys.street_tokens == {"RYNEK", "GŁÓWNY", "28"}
+
+
+def test_company_without_optional_data_has_empty_keys():
+    keys = company_match_keys(make_company(address=None, contact=None, bank_account=None))
+
+    assert keys.bank_account is None
+    assert keys.phone is None
+    assert keys.email is None
+    assert keys.street_tokens == frozenset()
+
+
+def test_street_keys_cover_address_provider_query_tokens():
+    # provider pyta o tokeny + numer – wszystkie muszą być w kluczach firmy
+    street = "al. Jana Pawła II 12A"
+    query = extract_street_tokens(street) + [extract_street_number(street)]
+
+    assert set(query) <= street_keys(street)
+
+
+def test_email_key_blank():
+    assert email_key("   ") is None
+    assert email_key(None) is None
@@ -0,0 +1,57 @@
+from dataclasses import replace
+from decimal import Decimal
+from uuid import uuid4
+
+from contract_costs.model.cost_node import CostNode
+from contract_costs.services.contracts.cost_node_structure_diff import diff_cost_nodes
+
+
+def _node(code, parent=None, **kwargs) -> CostNode:
+    return CostNode(
+        id=uuid4(),
+        contract_id=kwargs.pop("contract_id", None) or uuid4(),
+        code=code,
+        name=kwargs.pop("name", code),
+        parent_id=parent.id if parent else None,
+        quantity=None,
+        unit=None,
+        budget=kwargs.pop("budget", None),
+        is_active=True,
+    )
+
+
+def test_diff_classifies_every_node_once():
+    root = _node("ROOT")
+    a = _node("A", root, budget=Decimal("10"))
+    b = _node("B", root)
+    c = _node("C", a)
+    gone = _node("GONE", root)
+
+    new_x = _node("X", root)
+    new_nodes = [
+        root,
+        replace(a, budget=Decimal("10.00")),  # ta sama wartość – bez zmiany
+        replace(b, name="B renamed"),
+        replace(c, parent_id=b.id),
+        new_x,
+    ]
+
+    diff = diff_cost_nodes([root, a, b, c, gone], new_nodes)
+
+    assert [n.code for n in diff.unchanged] == ["ROOT", "A"]
+    assert [n.code for n in diff.updated] == ["B"]
+    assert [n.code for n in diff.moved] == ["C"]
+    assert diff.inserted == [new_x]
+    assert diff.deleted == [gone]
+    assert [n.code for n in diff.to_update] == ["C", "B"]
+    assert diff.has_changes
+
+
+def test_identical_trees_have_no_changes():
+    root = _node("ROOT")
+    leaf = _node("L", root)
+
+    diff = diff_cost_nodes([root, leaf], [replace(root), replace(leaf)])
+
+    assert not diff.has_changes
+    assert len(diff.unchanged) == 2
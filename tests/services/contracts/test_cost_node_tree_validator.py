@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.cost_node import CostNode
+from contract_costs.services.contracts.validators.cost_node_tree_validator import (
+    CostNodeEntityValidator,
+)
+
+
+def _node(code, node_id=None, parent_id=None, contract_id=None) -> CostNode:
+    return CostNode(
+        id=node_id or uuid4(),
+        contract_id=contract_id,
+        code=code,
+        name=code,
+        parent_id=parent_id,
+        quantity=None,
+        unit=None,
+        budget=None,
+        is_active=True,
+    )
+
+
+def test_validate_accepts_deep_chain():
+    nodes = [_node("ROOT")]
+    for i in range(5000):
+        nodes.append(_node(f"N{i}", parent_id=nodes[-1].id))
+
+    CostNodeEntityValidator().validate(nodes)
+
+
+def test_validate_reports_duplicate_codes():
+    root = _node("ROOT")
+
+    with pytest.raises(ValueError, match="Duplicate cost node codes: {'A'}"):
+        CostNodeEntityValidator().validate(
+            [root, _node("A", parent_id=root.id), _node("A", parent_id=root.id)]
+        )
+
+
+def test_validate_detects_cycle_outside_root_branch():
+    a_id, b_id = uuid4(), uuid4()
+
+    with pytest.raises(ValueError, match="Cycle detected starting at node 'A'"):
+        CostNodeEntityValidator().validate(
+            [_node("ROOT"), _node("A", a_id, b_id), _node("B", b_id, a_id)]
+        )
@@ -231,3 +231,111 @@ def test_update_contract_structure_rejects_empty_cost_node_input(
             cost_node_input=[],
         )
 
+
+
+class RecordingCostNodeRepository(InMemoryCostNodeRepository):
+    def __init__(self, with_costs=()) -> None:
+        super().__init__()
+        self.with_costs = set(with_costs)
+        self.calls: list[tuple] = []
+
+    def has_costs(self, contract_id):
+        return True
+
+    def nodes_with_costs(self, cost_node_ids):
+        self.calls.append(("nodes_with_costs", list(cost_node_ids)))
+        return self.with_costs & set(cost_node_ids)
+
+    def add_all(self, cost_nodes):
+        self.calls.append(("add_all", [n.code for n in cost_nodes]))
+        super().add_all(cost_nodes)
+
+    def update_many(self, cost_nodes):
+        self.calls.append(("update_many", [n.code for n in cost_nodes]))
+        super().update_many(cost_nodes)
+
+    def delete_many(self, ids):
+        self.calls.append(("delete_many", list(ids)))
+        super().delete_many(ids)
+
+
+def _tree(*children, root_name="Root"):
+    return [
+        {
+            "code": "ROOT",
+            "name": root_name,
+            "budget": None,
+            "quantity": None,
+            "unit": None,
+            "is_active": True,
+            "children": list(children),
+        }
+    ]
+
+
+def _item(code, name=None, children=()):
+    return {
+        "code": code,
+        "name": name or code,
+        "budget": Decimal("10"),
+        "quantity": None,
+        "unit": None,
+        "is_active": True,
+        "children": list(children),
+    }
+
+
+def test_safe_replace_writes_only_changed_nodes(contract_repo, contract_1):
+    contract_repo.add(contract_1)
+    repo = RecordingCostNodeRepository()
+    repo.add_all(DefaultCostNodeTreeBuilder().build(
+        contract_1.id, _tree(_item("A", children=[_item("A1")]), _item("B"), _item("OLD"))
+    ))
+    old_id = repo.get_by_code("OLD").id
+    repo.calls.clear()
+    service = UpdateContractStructureService(
+        contract_repo, repo, DefaultCostNodeTreeBuilder(), CostNodeEntityValidator()
+    )
+
+    service.execute(
+        contract_id=contract_1.id,
+        contract_starter=contract_1.__dict__,
+        cost_node_input=_tree(
+            _item("A"), _item("B", "B renamed", children=[_item("A1"), _item("NEW")])
+        ),
+    )
+
+    assert repo.calls == [
+        ("nodes_with_costs", [old_id]),
+        ("add_all", ["NEW"]),
+        ("update_many", ["A1", "B"]),
+        ("delete_many", [old_id]),
+    ]
+    assert not repo.exists(old_id)
+    codes = {n.code: n for n in repo.list_by_contract(contract_1.id)}
+    assert codes["A1"].parent_id == codes["B"].id
+
+
+def test_safe_replace_checks_all_removed_nodes_in_one_query(contract_repo, contract_1):
+    contract_repo.add(contract_1)
+    nodes = DefaultCostNodeTreeBuilder().build(
+        contract_1.id, _tree(_item("A"), _item("B"), _item("C"))
+    )
+    by_code = {n.code: n for n in nodes}
+    repo = RecordingCostNodeRepository(with_costs={by_code["A"].id, by_code["C"].id})
+    repo.add_all(nodes)
+    repo.calls.clear()
+    service = UpdateContractStructureService(
+        contract_repo, repo, DefaultCostNodeTreeBuilder(), CostNodeEntityValidator()
+    )
+
+    with pytest.raises(ValueError, match="Cannot remove cost node 'A, C'"):
+        service.execute(
+            contract_id=contract_1.id,
+            contract_starter=contract_1.__dict__,
+            cost_node_input=_tree(),
+        )
+
+    assert len(repo.calls) == 1
+    assert sorted(repo.calls[0][1]) == sorted(by_code[c].id for c in "ABC")
+    assert len(repo.list_by_contract(contract_1.id)) == 4
@@ -1,6 +1,6 @@
 from pathlib import Path
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime
 from uuid import uuid4
 
 import pytest
@@ -18,6 +18,8 @@ from contract_costs.model.contract import (
 from contract_costs.model.cost_node import CostNode
 from contract_costs.model.cost_type import CostType
 from contract_costs.model.unit_of_measure import UnitOfMeasure
+from contract_costs.model.amount import TaxTreatment, VatRate
+from contract_costs.model.invoice import InvoiceStatus, PaymentMethod, PaymentStatus
 
 # ============================================================
 # REPOZYTORIA (IN-MEMORY)
@@ -46,6 +48,16 @@ from contract_costs.services.invoices.invoice_line_update_service import (
 )
 from contract_costs.services.invoices.invoice_update_service import InvoiceUpdateService
 from contract_costs.services.invoices.ochestrator.invoice_ingest_orchestrator import InvoiceIngestOrchestrator
+from contract_costs.services.invoices.commands.invoice_command import InvoiceCommand
+from contract_costs.services.invoices.dto.export.assignment_export_bundle import (
+    InvoiceAssignmentExportBundle,
+)
+from contract_costs.services.invoices.dto.export.company_export import CompanyExport
+from contract_costs.services.invoices.dto.export.invoice_export import InvoiceExport
+from contract_costs.services.invoices.dto.export.invoice_line_export import InvoiceLineExport
+from contract_costs.services.invoices.export.excel_invoice_assignment_exporter import (
+    ExcelInvoiceAssignmentExporter,
+)
 
 
 # ============================================================
@@ -316,3 +328,62 @@ def orchestrator(invoice_update_service, invoice_line_update_service):
         invoice_line_service=invoice_line_update_service,
     )
 
+
+# ============================================================
+# EKSPORT / IMPORT EXCELA PRZYPISAŃ
+# ============================================================
+
+@pytest.fixture
+def make_assignment_bundle():
+    def _make(line_count: int) -> InvoiceAssignmentExportBundle:
+        invoice = InvoiceExport(
+            action=InvoiceCommand.APPLY,
+            invoice_number="FV/1/2024",
+            invoice_date=date(2024, 1, 1),
+            selling_date=date(2024, 1, 1),
+            buyer_tax_number="1234567890",
+            seller_tax_number="0987654321",
+            payment_method=PaymentMethod.BANK_TRANSFER,
+            payment_status=PaymentStatus.UNPAID,
+            status=InvoiceStatus.IN_PROGRESS,
+            due_date=date(2024, 1, 15),
+            timestamp=datetime(2024, 1, 1, 12, 0),
+        )
+        lines = [
+            InvoiceLineExport(
+                id=uuid4(),
+                invoice_number="FV/1/2024",
+                item_name=f"Item {n}" + ("x" * 80 if n == 0 else ""),
+                description=None,
+                quantity=Decimal("1"),
+                unit=UnitOfMeasure.PIECE,
+                net=Decimal("10.00"),
+                vat_rate=VatRate.VAT_23,
+                tax_treatment=TaxTreatment.TAX_DEDUCTIBLE,
+                contract_id=None,
+                cost_node_id=None,
+                cost_type_id=None,
+            )
+            for n in range(line_count)
+        ]
+        seller = CompanyExport(id=uuid4(), name="Seller", tax_number="0987654321")
+        return InvoiceAssignmentExportBundle(
+            invoices=[invoice],
+            invoice_lines=lines,
+            buyers=[],
+            sellers=[seller],
+            contracts=[],
+            cost_nodes=[],
+            cost_types=[],
+        )
+
+    return _make
+
+
+@pytest.fixture
+def assignment_exporter() -> ExcelInvoiceAssignmentExporter:
+    return ExcelInvoiceAssignmentExporter(
+        InMemoryContractRepository(),
+        InMemoryCostNodeRepository(),
+        InMemoryCostTypeRepository(),
+    )
@@ -0,0 +1,71 @@
+from openpyxl import load_workbook
+
+import contract_costs.config as cfg
+
+
+def test_export_writes_rows_styles_and_validations(
+    tmp_path, make_assignment_bundle, assignment_exporter
+):
+    path = tmp_path / "assignment.xlsx"
+
+    assignment_exporter.export(make_assignment_bundle(3), path)
+
+    wb = load_workbook(path)
+    assert wb.sheetnames[:2] == [cfg.INVOICE_METADATA_SHEET_NAME, cfg.INVOICE_ITEMS_SHEET_NAME]
+    assert "Sheet" not in wb.sheetnames
+
+    lines_ws = wb[cfg.INVOICE_ITEMS_SHEET_NAME]
+    assert lines_ws.max_row == 4
+    assert lines_ws["C2"].value.startswith("Item 0")
+    assert lines_ws["A1"].font.b is True
+    assert lines_ws.freeze_panes == "A2"
+    assert lines_ws.auto_filter.ref == "A1:L4"
+    assert lines_ws.column_dimensions["A"].hidden is True
+    # szerokość z najdłuższej wartości, przycięta do max_width + 1
+    assert lines_ws.column_dimensions["C"].width == 51
+    assert lines_ws.column_dimensions["B"].width == len("invoice_number") + 4
+
+    validated = {str(dv.sqref) for dv in lines_ws.data_validations.dataValidation}
+    assert "F2:F2000" in validated
+
+    invoices_ws = wb[cfg.INVOICE_METADATA_SHEET_NAME]
+    assert invoices_ws["B2"].value == "FV/1/2024"
+    assert invoices_ws.column_dimensions["C"].hidden is True
+
+
+def test_empty_data_sheet_has_header_only(
+    tmp_path, make_assignment_bundle, assignment_exporter
+):
+    path = tmp_path / "assignment.xlsx"
+
+    assignment_exporter.export(make_assignment_bundle(0), path)
+
+    lines_ws = load_workbook(path)[cfg.INVOICE_ITEMS_SHEET_NAME]
+    assert lines_ws.max_row == 1
+    assert lines_ws.auto_filter.ref is None
+
+
+def test_dropdowns_cover_every_exported_row(
+    tmp_path, make_assignment_bundle, assignment_exporter
+):
+    path = tmp_path / "assignment.xlsx"
+
+    assignment_exporter.export(make_assignment_bundle(2500), path)
+
+    lines_ws = load_workbook(path)[cfg.INVOICE_ITEMS_SHEET_NAME]
+    validated = {str(dv.sqref) for dv in lines_ws.data_validations.dataValidation}
+    assert "K2:K2501" in validated
+
+
+def test_sheets_declare_their_dimension(
+    tmp_path, make_assignment_bundle, assignment_exporter
+):
+    path = tmp_path / "assignment.xlsx"
+
+    assignment_exporter.export(make_assignment_bundle(3), path)
+
+    # read-only rzuca ValueError dla arkusza bez <dimension>
+    wb = load_workbook(path, read_only=True)
+    assert wb[cfg.INVOICE_ITEMS_SHEET_NAME].calculate_dimension() == "A1:L4"
+    assert wb[cfg.INVOICE_METADATA_SHEET_NAME].calculate_dimension() == "A1:K2"
+    wb.close()
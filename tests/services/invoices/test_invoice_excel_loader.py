@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+from openpyxl import load_workbook
+
+import contract_costs.config as cfg
+from contract_costs.model.amount import VatRate
+from contract_costs.model.invoice import PaymentMethod
+from contract_costs.model.unit_of_measure import UnitOfMeasure
+from contract_costs.services.invoices.commands.invoice_command import InvoiceCommand
+from contract_costs.services.invoices.excel.invoice_excel_loader import (
+    InvoiceExcelValidationError,
+    load_invoice_excel_batch,
+)
+
+
+@pytest.fixture
+def exported(tmp_path, make_assignment_bundle, assignment_exporter):
+    path = tmp_path / "assignment.xlsx"
+    bundle = make_assignment_bundle(3)
+    assignment_exporter.export(bundle, path)
+    return path, bundle
+
+
+def test_loads_exported_workbook(exported):
+    path, bundle = exported
+
+    batch = load_invoice_excel_batch(path)
+
+    assert len(batch.invoices) == 1
+    invoice = batch.invoices[0]
+    assert invoice.command == InvoiceCommand.APPLY
+    assert invoice.invoice_number == "FV/1/2024"
+    assert invoice.invoice_date == bundle.invoices[0].invoice_date
+    assert invoice.seller_tax_number == "0987654321"
+    assert invoice.payment_method == PaymentMethod.BANK_TRANSFER
+
+    assert [l.invoice_line_id for l in batch.lines] == [l.id for l in bundle.invoice_lines]
+    line = batch.lines[1]
+    assert line.quantity == Decimal("1")
+    assert line.unit == UnitOfMeasure.PIECE
+    assert line.amount.value == Decimal("10")
+    assert line.amount.vat_rate == VatRate.VAT_23
+    assert line.contract_id is None
+
+    assert batch.buyers == []
+    assert batch.sellers[0].id == bundle.sellers[0].id
+
+
+def test_collects_every_error_in_one_pass(exported):
+    path, _ = exported
+    wb = load_workbook(path)
+    ws = wb[cfg.INVOICE_ITEMS_SHEET_NAME]
+    ws["C2"] = None        # item_name
+    ws["E3"] = "abc"       # quantity
+    ws["F4"] = "parsecs"   # unit
+    wb[cfg.INVOICE_METADATA_SHEET_NAME]["H2"] = "BARTER"
+    ws.append([None] * 12)  # pusty wiersz – pomijany
+    wb.save(path)
+
+    with pytest.raises(InvoiceExcelValidationError) as exc:
+        load_invoice_excel_batch(path)
+
+    errors = exc.value.errors
+    assert len(errors) == 4
+    assert any("row 2, item_name" in e for e in errors)
+    assert any("row 3, quantity" in e for e in errors)
+    assert any("row 4, unit" in e for e in errors)
+    assert any(cfg.INVOICE_METADATA_SHEET_NAME in e and "payment_method" in e for e in errors)
+
+
+def test_company_without_tax_number_is_rejected(exported):
+    path, _ = exported
+    wb = load_workbook(path)
+    wb[cfg.DICTS_SELLERS]["A2"] = None
+    wb.save(path)
+
+    with pytest.raises(InvoiceExcelValidationError) as exc:
+        load_invoice_excel_batch(path)
+
+    assert exc.value.errors == [f"[{cfg.DICTS_SELLERS}] row 2, tax_number: value is required"]
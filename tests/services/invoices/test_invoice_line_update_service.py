@@ -239,3 +239,58 @@ def test_invoice_not_fully_assigned_when_missing_cost_type(
     result = invoice_line_update_service.apply([update], ref_map)
 
     assert result == set()
+
+
+def test_unknown_code_fails_before_any_line_is_written(
+    invoice_line_update_service, invoice_line_repo, ref_map
+):
+    ok = make_line_update(contract_id="C1", cost_node_id="N1", cost_type_id="MATERIAL")
+    broken = make_line_update(contract_id="C1", cost_node_id="NOPE", cost_type_id="MATERIAL")
+
+    with pytest.raises(ValueError, match="CostNode not found for code: NOPE"):
+        invoice_line_update_service.apply([ok, broken], ref_map)
+
+    assert invoice_line_repo.list_lines() == []
+
+
+def test_update_of_missing_line_raises(invoice_line_update_service, ref_map):
+    update = make_line_update(invoice_line_id=uuid4())
+
+    with pytest.raises(ValueError, match="Invoice line not found"):
+        invoice_line_update_service.apply([update], ref_map)
+
+
+def test_batch_creates_and_updates_lines_sharing_codes(
+    invoice_line_update_service, invoice_line_repo, ref_map, invoice_id
+):
+    existing = InvoiceLine(
+        id=uuid4(),
+        invoice_id=invoice_id,
+        item_name="Old",
+        description=None,
+        quantity=Decimal("1"),
+        unit=UnitOfMeasure.PIECE,
+        amount=Amount(Decimal("50"), VatRate.VAT_23),
+        contract_id=None,
+        cost_node_id=None,
+        cost_type_id=None,
+    )
+    invoice_line_repo.add(existing)
+
+    updates = [
+        make_line_update(
+            invoice_line_id=existing.id,
+            contract_id="C1", cost_node_id="N1", cost_type_id="MATERIAL",
+        ),
+        *[
+            make_line_update(contract_id="C1", cost_node_id="N1", cost_type_id="MATERIAL")
+            for _ in range(3)
+        ],
+    ]
+
+    result = invoice_line_update_service.apply(updates, ref_map)
+
+    lines = invoice_line_repo.list_by_invoice(invoice_id)
+    assert len(lines) == 4
+    assert all(line.cost_type_id is not None for line in lines)
+    assert result == {invoice_id}
@@ -0,0 +1,140 @@
+import json
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.company import Company, CompanyType
+from contract_costs.repository.inmemory.invoice_file_hash_repository import (
+    InMemoryInvoiceFileHashRepository,
+)
+from contract_costs.services.invoices.dto.apply import InvoiceApplyAction, InvoiceRefResult
+from contract_costs.services.invoices.parse_invoice_from_file import ParseInvoiceFromFileService
+from contract_costs.services.invoices.parsers.fake_invoice_parser import FakeInvoiceParser
+
+
+def company(role: CompanyType) -> Company:
+    return Company(
+        id=uuid4(),
+        name=f"{role.value} company",
+        tax_number="1111111111",
+        description=None,
+        address=None,
+        contact=None,
+        bank_account=None,
+        role=role,
+        tags=set(),
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def file_hash_repo():
+    return InMemoryInvoiceFileHashRepository()
+
+
+@pytest.fixture
+def parser():
+    return MagicMock(wraps=FakeInvoiceParser())
+
+
+@pytest.fixture
+def organizer():
+    return MagicMock()
+
+
+@pytest.fixture
+def evaluate():
+    evaluate = MagicMock()
+    evaluate.evaluate.side_effect = [
+        company(CompanyType.OWN), company(CompanyType.SUPPLIER),
+    ] * 2
+    return evaluate
+
+
+@pytest.fixture
+def service(parser, organizer, file_hash_repo, evaluate):
+
+    invoice_id = uuid4()
+    orchestrator = MagicMock()
+    orchestrator.ingest_from_pdf.return_value = {
+        "FV/1/2024": InvoiceRefResult(
+            invoice_id=invoice_id,
+            action=InvoiceApplyAction.APPLIED,
+            invoice_number="FV/1/2024",
+        )
+    }
+
+    normalizer = MagicMock()
+    normalizer.normalize.side_effect = lambda result: result
+
+    return ParseInvoiceFromFileService(
+        parser=parser,
+        company_evaluate_orchestrator=evaluate,
+        invoice_file_organizer=organizer,
+        company_repository=MagicMock(),
+        normalizer=normalizer,
+        orchestrator=orchestrator,
+        file_hash_repository=file_hash_repo,
+    ), invoice_id
+
+
+def test_duplicate_content_is_skipped_before_parsing(service, parser, organizer, file_hash_repo, tmp_path):
+    service, invoice_id = service
+    first = tmp_path / "from_mail.pdf"
+    second = tmp_path / "from_scanner.pdf"
+    first.write_bytes(b"%PDF-1.4 same content")
+    second.write_bytes(b"%PDF-1.4 same content")
+
+    service.execute(first)
+    service.execute(second)
+
+    assert parser.parse.call_count == 1
+    organizer.move_to_failed.assert_called_once_with(file_path=second, reason="duplicate")
+
+    stats = file_hash_repo.stats()
+    assert stats.files == 1
+    assert stats.duplicates_skipped == 1
+
+    entry = file_hash_repo.list_duplicated()[0]
+    assert entry.file_name == "from_mail.pdf"
+    assert entry.invoice_id == invoice_id
+    assert json.loads(entry.parse_result)["invoice"]["invoice_number"] == "FV/1/2024"
+
+
+def test_different_content_is_processed(service, parser, file_hash_repo, tmp_path):
+    service, _ = service
+    first = tmp_path / "a.pdf"
+    second = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 a")
+    second.write_bytes(b"%PDF-1.4 b")
+
+    service.execute(first)
+    service.execute(second)
+
+    assert parser.parse.call_count == 2
+    assert file_hash_repo.stats().duplicates_skipped == 0
+
+
+def test_rejected_content_is_reprocessed_once_company_data_is_fixed(
+        service, parser, organizer, file_hash_repo, evaluate, tmp_path,
+):
+    service, invoice_id = service
+    # 1. brak firmy OWN (no_owner), 2. po uzupełnieniu danych – import, 3. duplikat
+    evaluate.evaluate.side_effect = [
+        company(CompanyType.SUPPLIER), company(CompanyType.SUPPLIER),
+        company(CompanyType.OWN), company(CompanyType.SUPPLIER),
+    ]
+    files = [tmp_path / f"{name}.pdf" for name in ("first", "retry", "copy")]
+    for file in files:
+        file.write_bytes(b"%PDF-1.4 same content")
+
+    for file in files:
+        service.execute(file)
+
+    assert parser.parse.call_count == 2
+    assert [c.kwargs["reason"] for c in organizer.move_to_failed.call_args_list] == ["no_owner", "duplicate"]
+    entry = file_hash_repo.list_duplicated()[0]
+    assert entry.outcome == "imported"
+    assert entry.file_name == "retry.pdf"
+    assert entry.invoice_id == invoice_id
@@ -0,0 +1,158 @@
+from pathlib import Path
+
+import pytest
+
+from contract_costs.services.queue.invoice_queue import InvoiceJobStatus, PersistentInvoiceQueue
+from contract_costs.services.scanner.unprocessed_scanner import enqueue_unprocessed
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_queue(tmp_path, clock):
+    def _make(**kwargs) -> PersistentInvoiceQueue:
+        kwargs.setdefault("visibility_timeout", 60)
+        kwargs.setdefault("retry_delay", 10)
+        return PersistentInvoiceQueue(tmp_path / "queue.sqlite3", clock=clock, **kwargs)
+
+    return _make
+
+
+def test_put_is_idempotent(make_queue):
+    queue = make_queue()
+
+    assert queue.put(Path("a.pdf")) is True
+    assert queue.put(Path("a.pdf")) is False
+
+    assert queue.stats()["enqueued"] == 1
+
+
+def test_get_ack_marks_done(make_queue):
+    queue = make_queue()
+    queue.put(Path("a.pdf"))
+
+    job = queue.get(timeout=0)
+    queue.ack(job)
+
+    assert job.file_path == Path("a.pdf")
+    assert job.attempts == 1
+    assert queue.get(timeout=0) is None
+    assert queue.stats()["done"] == 1
+
+
+def test_jobs_survive_restart(make_queue):
+    make_queue().put(Path("a.pdf"))
+
+    job = make_queue().get(timeout=0)
+
+    assert job.file_path == Path("a.pdf")
+
+
+def test_in_progress_job_is_hidden_until_visibility_timeout(make_queue, clock):
+    queue = make_queue()
+    queue.put(Path("a.pdf"))
+    queue.get(timeout=0)
+
+    assert queue.get(timeout=0) is None
+
+    clock.now += 61
+    job = queue.get(timeout=0)
+    assert job.attempts == 2
+
+
+def test_release_in_progress_resumes_after_crash(make_queue):
+    queue = make_queue()
+    queue.put(Path("a.pdf"))
+    queue.get(timeout=0)
+
+    restarted = make_queue()
+    assert restarted.release_in_progress() == 1
+    assert restarted.get(timeout=0).file_path == Path("a.pdf")
+
+
+def test_failed_job_is_retried_after_delay(make_queue, clock):
+    queue = make_queue(max_attempts=3)
+    queue.put(Path("a.pdf"))
+
+    job = queue.get(timeout=0)
+    assert queue.fail(job, "boom") is False
+    assert queue.get(timeout=0) is None
+
+    clock.now += 10
+    assert queue.get(timeout=0).attempts == 2
+
+
+def test_poison_file_ends_in_failed(make_queue, clock):
+    queue = make_queue(max_attempts=2)
+    queue.put(Path("bad.pdf"))
+
+    queue.fail(queue.get(timeout=0), "boom")
+    clock.now += 100
+    assert queue.fail(queue.get(timeout=0), "boom") is True
+
+    clock.now += 100
+    assert queue.get(timeout=0) is None
+    assert queue.stats()["failed"] == 1
+    # rescan przy starcie nie wskrzesza failed
+    assert queue.put(Path("bad.pdf")) is False
+
+
+def test_job_abandoned_by_crashing_worker_ends_in_failed(make_queue, clock):
+    queue = make_queue(max_attempts=2)
+    queue.put(Path("crash.pdf"))
+
+    queue.get(timeout=0)
+    clock.now += 61
+    queue.get(timeout=0)
+    clock.now += 61
+
+    assert queue.get(timeout=0) is None
+    assert queue.stats()["failed"] == 1
+
+
+def test_requeue_restarts_finished_job(make_queue):
+    queue = make_queue(max_attempts=1)
+    queue.put(Path("a.pdf"))
+    queue.fail(queue.get(timeout=0), "boom")
+
+    assert queue.put(Path("a.pdf"), requeue=True) is True
+
+    assert queue.get(timeout=0).attempts == 1
+
+
+def test_requeue_limited_to_given_statuses(make_queue):
+    queue = make_queue(max_attempts=1)
+    queue.put(Path("done.pdf"))
+    queue.put(Path("failed.pdf"))
+    queue.ack(queue.get(timeout=0))
+    queue.fail(queue.get(timeout=0), "boom")
+
+    assert queue.put(Path("done.pdf"), requeue=[InvoiceJobStatus.DONE]) is True
+    assert queue.put(Path("failed.pdf"), requeue=[InvoiceJobStatus.DONE]) is False
+    assert queue.stats() == {"enqueued": 1, "in_progress": 0, "done": 0, "failed": 1}
+
+
+def test_startup_scan_requeues_reused_name_of_done_job(make_queue, tmp_path):
+    queue = make_queue(max_attempts=1)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for name in ("scan_001.pdf", "broken.pdf", "new.pdf"):
+        (inbox / name).write_bytes(b"%PDF")
+    queue.put(inbox / "scan_001.pdf")
+    queue.put(inbox / "broken.pdf")
+    queue.ack(queue.get(timeout=0))
+    queue.fail(queue.get(timeout=0), "boom")
+
+    assert enqueue_unprocessed(inbox, queue) == 2
+    assert queue.stats() == {"enqueued": 2, "in_progress": 0, "done": 0, "failed": 1}
@@ -10,6 +10,9 @@ from contract_costs.model.invoice_line import InvoiceLine
 from contract_costs.model.amount import Amount, VatRate
 from contract_costs.model.unit_of_measure import UnitOfMeasure
 
+from contract_costs.repository.inmemory.contract_cost_report_repository import (
+    InMemoryContractCostReportRepository,
+)
 from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
 from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
 from contract_costs.repository.inmemory.cost_type_repository import InMemoryCostTypeRepository
@@ -129,7 +132,8 @@ def report_service(contract, cost_nodes, cost_type, invoice, invoice_line):
 
     return ContractCostReportService(
         contract_repo,
-        invoice_line_repo,
         cost_node_repo,
-        cost_type_repo,
+        InMemoryContractCostReportRepository(
+            invoice_line_repo, cost_node_repo, cost_type_repo, invoice_repo,
+        ),
     )
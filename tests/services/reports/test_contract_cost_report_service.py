@@ -1,4 +1,13 @@
+from dataclasses import replace
 from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.amount import Amount, VatRate
+from contract_costs.repository.inmemory.contract_cost_report_repository import (
+    InMemoryContractCostReportRepository,
+)
 
 from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
 from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
@@ -27,13 +36,99 @@ def test_contract_cost_report_empty_when_no_invoice_lines(contract):
     contract_repo = InMemoryContractRepository()
     contract_repo.add(contract)
 
+    cost_node_repo = InMemoryCostNodeRepository()
     service = ContractCostReportService(
         contract_repo,
-        InMemoryInvoiceLineRepository(),
-        InMemoryCostNodeRepository(),
-        InMemoryCostTypeRepository(),
+        cost_node_repo,
+        InMemoryContractCostReportRepository(
+            InMemoryInvoiceLineRepository(), cost_node_repo, InMemoryCostTypeRepository(),
+        ),
     )
 
     rows = service.generate_rows(contract.id)
     assert rows == []
 
+
+
+@pytest.fixture
+def report_repos(contract, cost_nodes, cost_type, invoice):
+    contract_repo = InMemoryContractRepository()
+    cost_node_repo = InMemoryCostNodeRepository()
+    cost_type_repo = InMemoryCostTypeRepository()
+    invoice_repo = InMemoryInvoiceRepository()
+    invoice_line_repo = InMemoryInvoiceLineRepository()
+
+    contract_repo.add(contract)
+    cost_node_repo.add_all(list(cost_nodes))
+    cost_type_repo.add(cost_type)
+    invoice_repo.add(invoice)
+
+    return contract_repo, cost_node_repo, cost_type_repo, invoice_repo, invoice_line_repo
+
+
+@pytest.fixture
+def indexed_report_service(report_repos):
+    contract_repo, cost_node_repo, cost_type_repo, invoice_repo, invoice_line_repo = report_repos
+    return ContractCostReportService(
+        contract_repo,
+        cost_node_repo,
+        InMemoryContractCostReportRepository(
+            invoice_line_repo, cost_node_repo, cost_type_repo, invoice_repo,
+        ),
+    )
+
+
+def test_contract_cost_report_aggregates_lines_per_leaf_and_cost_type(
+    indexed_report_service, report_repos, invoice_line, contract,
+):
+    *_, invoice_line_repo = report_repos
+    invoice_line_repo.add(invoice_line)
+    invoice_line_repo.add(replace(invoice_line, id=uuid4(), amount=Amount(Decimal("50"), VatRate.VAT_8)))
+    # linia innego kontraktu nie wchodzi do raportu
+    invoice_line_repo.add(replace(invoice_line, id=uuid4(), contract_id=uuid4()))
+
+    rows = indexed_report_service.generate_rows(contract.id)
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["contract_code"] == "C1"
+    assert row["line_count"] == 2
+    assert row["net_amount"] == Decimal("150")
+    assert row["vat_amount"] == Decimal("27.00")
+    assert row["gross_amount"] == Decimal("177.00")
+
+
+def test_contract_cost_report_filters_by_invoice_status(
+    indexed_report_service, report_repos, invoice_line, contract,
+):
+    *_, invoice_line_repo = report_repos
+    invoice_line_repo.add(invoice_line)
+
+    assert len(indexed_report_service.generate_rows(contract.id, invoice_statuses=["PROCESSED"])) == 1
+    assert indexed_report_service.generate_rows(contract.id, invoice_statuses=["NEW"]) == []
+    assert indexed_report_service.generate_rows(contract.id, invoice_statuses=["PAID"]) == []
+
+
+def test_contract_cost_report_groups_by_invoice_number(
+    indexed_report_service, report_repos, invoice_line, contract,
+):
+    *_, invoice_line_repo = report_repos
+    invoice_line_repo.add(invoice_line)
+
+    rows = indexed_report_service.generate_rows(contract.id, group_by_invoice=True)
+
+    assert [r["invoice_number"] for r in rows] == ["FV/1"]
+
+
+def test_tree_rows_roll_costs_up_to_parents(report_service, contract):
+    rows = report_service.generate_tree_rows(contract.id)
+
+    assert [(r["cost_node_code"], r["depth"], r["is_leaf"]) for r in rows] == [
+        ("ROOT", 0, False),
+        ("MAT", 1, True),
+    ]
+    root, leaf = rows
+    assert root["net_amount"] == leaf["net_amount"] == Decimal("100.00")
+    assert root["gross_amount"] == Decimal("123.00")
+    assert root["line_count"] == 1
+    assert root["earned"] == Decimal("-100.00")
@@ -0,0 +1,230 @@
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from contract_costs.model.amount import Amount, VatRate
+from contract_costs.model.contract import ContractStatus
+from contract_costs.model.invoice import InvoiceStatus
+from contract_costs.repository.inmemory.contract_cost_report_repository import (
+    InMemoryContractCostReportRepository,
+)
+from contract_costs.repository.inmemory.contract_repository import InMemoryContractRepository
+from contract_costs.repository.inmemory.cost_node_repository import InMemoryCostNodeRepository
+from contract_costs.repository.inmemory.cost_progress_snapshot_repository import (
+    InMemoryCostProgressSnapshotRepository,
+)
+from contract_costs.repository.inmemory.cost_type_repository import InMemoryCostTypeRepository
+from contract_costs.repository.inmemory.invoice_line_repository import InMemoryInvoiceLineRepository
+from contract_costs.repository.inmemory.invoice_repository import InMemoryInvoiceRepository
+from contract_costs.services.reports.cost_progress_history_service import (
+    CostProgressHistoryService,
+)
+from contract_costs.services.reports.cost_progress_snapshot_service import (
+    CostProgressSnapshotService,
+)
+
+
+class RecordingReportRepository(InMemoryContractCostReportRepository):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.windows: list[tuple] = []
+
+    def executed_by_node(self, contract_ids, *, until, after=None, **kwargs):
+        self.windows.append((after, until))
+        return super().executed_by_node(contract_ids, until=until, after=after, **kwargs)
+
+
+@pytest.fixture
+def setup(contract, cost_nodes, invoice, invoice_line):
+    root, leaf = cost_nodes
+    contract = replace(contract, status=ContractStatus.ACTIVE)
+
+    contracts = InMemoryContractRepository()
+    nodes = InMemoryCostNodeRepository()
+    invoices = InMemoryInvoiceRepository()
+    lines = InMemoryInvoiceLineRepository()
+    snapshots = InMemoryCostProgressSnapshotRepository()
+    report = RecordingReportRepository(lines, nodes, InMemoryCostTypeRepository(), invoices)
+
+    contracts.add(contract)
+    nodes.add(root)
+    nodes.add(replace(leaf, budget=Decimal("400")))
+
+    def add_line(day: date, value: str, **kwargs):
+        inv = replace(invoice, id=uuid4(), invoice_date=day, **kwargs)
+        invoices.add(inv)
+        line = replace(
+            invoice_line,
+            id=uuid4(),
+            invoice_id=inv.id,
+            amount=Amount(Decimal(value), VatRate.VAT_23),
+        )
+        lines.add(line)
+        return inv, line
+
+    service = CostProgressSnapshotService(contracts, nodes, snapshots, report)
+    return service, snapshots, report, add_line, contract, root, leaf
+
+
+def test_full_snapshot_rolls_up_to_parents_and_contract(setup):
+    service, snapshots, _, add_line, contract, root, leaf = setup
+    add_line(date(2024, 1, 10), "100")
+    add_line(date(2024, 2, 10), "900")  # po dacie snapshotu
+
+    result = service.run(date(2024, 1, 31))
+
+    assert result.contracts == 1
+    assert result.snapshots == 3
+    rows = {s.cost_node_id: s for s in snapshots.get_by_contract(contract.id)}
+
+    assert rows[leaf.id].executed_amount == Decimal("100.00")
+    assert rows[leaf.id].planned_amount == Decimal("400.00")
+    assert rows[leaf.id].progress_percent == Decimal("0.25")
+    # rodzic bez budżetu – plan z dzieci
+    assert rows[root.id].planned_amount == Decimal("400.00")
+    assert rows[root.id].executed_amount == Decimal("100.00")
+    assert rows[None].executed_amount == Decimal("100.00")
+
+
+def test_incremental_run_reads_only_new_window(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 31))
+
+    add_line(date(2024, 2, 5), "50")
+    add_line(date(2024, 2, 6), "70", status=InvoiceStatus.DELETED)
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 1
+    assert report.windows[-1] == (date(2024, 1, 31), date(2024, 2, 29))
+    latest = snapshots.get_latest(contract.id, leaf.id)
+    assert latest.snapshot_date == date(2024, 2, 29)
+    assert latest.executed_amount == Decimal("150.00")
+
+
+def test_backdated_invoice_added_after_snapshot_is_counted(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 31))
+
+    # wpływa po snapshocie, ale z datą sprzed niego
+    add_line(date(2024, 1, 15), "30")
+    add_line(date(2024, 2, 5), "50")
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 1
+    rows = {s.cost_node_id: s for s in snapshots.get_by_contract(contract.id)
+            if s.snapshot_date == date(2024, 2, 29)}
+    assert rows[leaf.id].executed_amount == Decimal("180.00")
+    assert rows[root.id].executed_amount == Decimal("180.00")
+    assert rows[None].executed_amount == Decimal("180.00")
+
+    # kolejny przebieg nie liczy jej drugi raz
+    service.run(date(2024, 3, 31))
+    assert snapshots.get_latest(contract.id, None).executed_amount == Decimal("180.00")
+
+
+def test_invoice_deleted_after_snapshot_forces_full_recompute(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    inv, _ = add_line(date(2024, 1, 10), "100")
+    add_line(date(2024, 1, 20), "40")
+    service.run(date(2024, 1, 31))
+
+    report._invoices.update(replace(inv, status=InvoiceStatus.DELETED))
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 0
+    assert report.windows[-1] == (None, date(2024, 2, 29))
+    assert snapshots.get_latest(contract.id, leaf.id).executed_amount == Decimal("40.00")
+
+
+def test_removed_line_forces_full_recompute(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    inv, _ = add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 31))
+
+    report._invoice_lines.delete_not_in_ids(inv.id, set())
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 0
+    assert snapshots.get_latest(contract.id, None).executed_amount == Decimal("0.00")
+
+
+def test_line_reassigned_to_other_node_is_subtracted(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    _, line = add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 31))
+
+    report._invoice_lines.update(replace(line, cost_node_id=root.id))
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 0
+    assert snapshots.get_latest(contract.id, leaf.id).executed_amount == Decimal("0.00")
+    assert snapshots.get_latest(contract.id, root.id).executed_amount == Decimal("100.00")
+
+
+def test_moved_cost_node_forces_full_recompute(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    other = replace(root, id=uuid4(), code="OTHER")
+    service._cost_nodes.add(other)
+    add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 31))
+
+    service._cost_nodes.update(replace(leaf, budget=Decimal("400"), parent_id=other.id))
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 0
+    assert snapshots.get_latest(contract.id, root.id).executed_amount == Decimal("0.00")
+    assert snapshots.get_latest(contract.id, other.id).executed_amount == Decimal("100.00")
+
+
+def test_rerun_for_same_day_replaces_rows(setup):
+    service, snapshots, _, add_line, contract, *_ = setup
+    add_line(date(2024, 1, 10), "100")
+
+    service.run(date(2024, 1, 31))
+    service.run(date(2024, 1, 31), full=True)
+
+    assert len(snapshots.get_by_contract(contract.id)) == 3
+
+
+def test_new_cost_node_forces_full_recompute(setup):
+    service, snapshots, report, add_line, contract, root, leaf = setup
+    service.run(date(2024, 1, 31))
+
+    service._cost_nodes.add(replace(leaf, id=uuid4(), code="NEW", budget=None))
+    result = service.run(date(2024, 2, 29))
+
+    assert result.incremental == 0
+    assert report.windows[-1] == (None, date(2024, 2, 29))
+
+
+def test_inactive_contracts_are_skipped(setup):
+    service, snapshots, _, _, contract, *_ = setup
+    service._contracts.update(replace(contract, status=ContractStatus.COMPLETED))
+
+    result = service.run(date(2024, 1, 31))
+
+    assert result.contracts == 0
+    assert snapshots.get_by_contract(contract.id) == []
+
+
+def test_history_and_burn_rate_read_snapshots(setup):
+    service, snapshots, _, add_line, contract, root, leaf = setup
+    add_line(date(2024, 1, 10), "100")
+    service.run(date(2024, 1, 1))
+    service.run(date(2024, 1, 11))
+
+    history = CostProgressHistoryService(snapshots)
+    rows = history.history(contract.id, leaf.id)
+
+    assert [r["executed_delta"] for r in rows] == [Decimal("0"), Decimal("100.00")]
+
+    burn = history.burn_rate(contract.id, leaf.id)
+    assert burn.days == 10
+    assert burn.daily_rate == Decimal("10.00")
+    assert burn.remaining == Decimal("300.00")
+    assert burn.projected_exhaustion == date(2024, 2, 10)
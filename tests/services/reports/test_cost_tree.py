@@ -0,0 +1,80 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+
+from contract_costs.model.cost_node import CostNode
+from contract_costs.services.reports.cost_tree import CostNodeTree
+
+
+def _node(code, parent=None, budget=None):
+    return CostNode(
+        id=uuid4(),
+        contract_id=uuid4(),
+        code=code,
+        name=code,
+        parent_id=parent.id if parent else None,
+        quantity=None,
+        unit=None,
+        budget=Decimal(budget) if budget is not None else None,
+        is_active=True,
+    )
+
+
+def _tree():
+    a = _node("A")
+    a2 = _node("A.2", a, "50")
+    a1 = _node("A.1", a, "100")
+    a11 = _node("A.1.1", a1, "60")
+    b = _node("B", budget="10")
+    # kolejność wejścia dowolna – drzewo porządkuje preorder po kodzie
+    return CostNodeTree([a11, b, a2, a, a1]), (a, a1, a11, a2, b)
+
+
+def test_nodes_are_in_preorder_with_depth_and_leaf_flags():
+    tree, (a, a1, a11, a2, b) = _tree()
+
+    assert [n.code for n in tree.nodes] == ["A", "A.1", "A.1.1", "A.2", "B"]
+    assert tree.depth.tolist() == [0, 1, 2, 1, 0]
+    assert tree.is_leaf.tolist() == [False, False, True, True, True]
+    assert tree.subtree(a1.id) == [a1, a11]
+    assert tree.subtree(uuid4()) == []
+
+
+def test_rollup_sums_every_column_over_subtrees():
+    tree, _ = _tree()
+    own = np.array([
+        [1, 10],   # A
+        [2, 20],   # A.1
+        [3, 30],   # A.1.1
+        [4, 40],   # A.2
+        [5, 50],   # B
+    ])
+
+    assert tree.rollup(own).tolist() == [
+        [10, 100],
+        [5, 50],
+        [3, 30],
+        [4, 40],
+        [5, 50],
+    ]
+
+
+def test_rollup_budget_uses_children_when_missing():
+    tree, _ = _tree()
+
+    budgets = tree.rollup_budget([n.budget for n in tree.nodes])
+
+    # A bez budżetu = A.1 (własny 100) + A.2 (50)
+    assert budgets == [Decimal("150"), Decimal("100"), Decimal("60"), Decimal("50"), Decimal("10")]
+
+
+def test_deep_chain_does_not_recurse():
+    nodes = [_node("N0")]
+    for i in range(1, 5000):
+        nodes.append(_node(f"N{i}", nodes[-1]))
+
+    tree = CostNodeTree(nodes)
+
+    assert tree.depth.max() == 4999
+    assert tree.rollup(np.ones(len(tree), dtype=np.int64))[0] == 5000
@@ -0,0 +1,108 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from contract_costs.services.queue.invoice_queue import PersistentInvoiceQueue
+from contract_costs.services.workers.ai_invoice_worker import InvoiceAIWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return PersistentInvoiceQueue(
+        tmp_path / "queue.sqlite3",
+        max_attempts=2,
+        retry_delay=0,
+        poll_interval=0.01,
+    )
+
+
+def run_until_drained(worker: InvoiceAIWorker, queue: PersistentInvoiceQueue) -> None:
+    t = threading.Thread(target=worker.run)
+    t.start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = queue.stats()
+        if stats["enqueued"] == 0 and stats["in_progress"] == 0:
+            break
+        time.sleep(0.01)
+    worker.stop()
+    t.join(timeout=5)
+    assert not t.is_alive()
+
+
+def test_pool_processes_files_concurrently(queue):
+    barrier = threading.Barrier(3, timeout=5)
+    processed = []
+
+    def process(path: Path) -> None:
+        # przejdzie tylko gdy 3 workery pracują jednocześnie
+        barrier.wait()
+        processed.append(path)
+
+    for i in range(3):
+        queue.put(Path(f"{i}.pdf"))
+
+    run_until_drained(InvoiceAIWorker(process, queue, workers=3), queue)
+
+    assert sorted(processed) == [Path("0.pdf"), Path("1.pdf"), Path("2.pdf")]
+    assert queue.stats()["done"] == 3
+
+
+def test_failure_is_retried_then_reported(queue, tmp_path):
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"%PDF")
+    attempts = []
+    failed = []
+
+    def process(path: Path) -> None:
+        attempts.append(path)
+        raise ValueError("broken pdf")
+
+    queue.put(bad)
+    queue.put(Path("good.pdf"))
+
+    worker = InvoiceAIWorker(
+        lambda p: process(p) if p == bad else None,
+        queue,
+        workers=1,
+        on_failed=failed.append,
+    )
+    run_until_drained(worker, queue)
+
+    assert attempts == [bad, bad]
+    assert failed == [bad]
+    assert queue.stats() == {"enqueued": 0, "in_progress": 0, "done": 1, "failed": 1}
+
+
+def test_hung_job_times_out_and_frees_the_slot(queue, tmp_path):
+    hung = tmp_path / "hung.pdf"
+    hung.write_bytes(b"%PDF")
+    release = threading.Event()
+    processed = []
+    failed = []
+
+    def process(path: Path) -> None:
+        if path == hung:
+            release.wait(5)
+            return
+        processed.append(path)
+
+    queue.put(hung)
+    queue.put(Path("good.pdf"))
+
+    worker = InvoiceAIWorker(process, queue, workers=1, on_failed=failed.append, job_timeout=0.1)
+    try:
+        run_until_drained(worker, queue)
+    finally:
+        release.set()
+
+    assert processed == [Path("good.pdf")]
+    assert failed == [hung]
+    assert queue.stats() == {"enqueued": 0, "in_progress": 0, "done": 1, "failed": 1}
+
+
+def test_job_timeout_must_be_shorter_than_visibility_timeout(queue):
+    with pytest.raises(ValueError):
+        InvoiceAIWorker(lambda p: None, queue, job_timeout=queue.visibility_timeout)